@@ -158,6 +158,7 @@ export const knowledgeService = {
       domainFilter?: string;
       limit?: number;
       offset?: number;
+      cursor?: string;
     },
   ): Promise<ChunksResponse> {
     const params = new URLSearchParams();
@@ -170,6 +171,9 @@ export const knowledgeService = {
     if (options?.offset !== undefined) {
       params.append("offset", options.offset.toString());
     }
+    if (options?.cursor) {
+      params.append("cursor", options.cursor);
+    }
 
     const queryString = params.toString();
     const endpoint = `/api/knowledge-items/${sourceId}/chunks${queryString ? `?${queryString}` : ""}`;
@@ -185,6 +189,7 @@ export const knowledgeService = {
     options?: {
       limit?: number;
       offset?: number;
+      cursor?: string;
     },
   ): Promise<CodeExamplesResponse> {
     const params = new URLSearchParams();
@@ -194,6 +199,9 @@ export const knowledgeService = {
     if (options?.offset !== undefined) {
       params.append("offset", options.offset.toString());
     }
+    if (options?.cursor) {
+      params.append("cursor", options.cursor);
+    }
 
     const queryString = params.toString();
     const endpoint = `/api/knowledge-items/${sourceId}/code-examples${queryString ? `?${queryString}` : ""}`;
@@ -111,6 +111,8 @@ export interface ChunksResponse {
   limit: number;
   offset: number;
   has_more: boolean;
+  /** Pass as `cursor` to fetch the next page without an offset scan */
+  next_cursor?: string | null;
 }
 
 export interface CodeExamplesResponse {
@@ -121,6 +123,8 @@ export interface CodeExamplesResponse {
   limit: number;
   offset: number;
   has_more: boolean;
+  /** Pass as `cursor` to fetch the next page without an offset scan */
+  next_cursor?: string | null;
 }
 
 // Request types
@@ -1,10 +1,10 @@
 /**
  * Progress Query Hooks
- * Handles polling for operation progress with TanStack Query
+ * Streams operation progress over SSE into TanStack Query, with polling as fallback
  */
 
 import { type UseQueryResult, useQueries, useQuery, useQueryClient } from "@tanstack/react-query";
-import { useEffect, useMemo, useRef } from "react";
+import { useEffect, useMemo, useRef, useState } from "react";
 import { DISABLED_QUERY_KEY, STALE_TIMES } from "../../shared/config/queryPatterns";
 import { useSmartPolling } from "../../shared/hooks";
 import { APIServiceError } from "../../shared/types/errors";
@@ -22,6 +22,49 @@ export const progressKeys = {
 // Terminal states that should stop polling
 const TERMINAL_STATES: ProgressStatus[] = ["completed", "error", "failed", "cancelled"];
 
+/**
+ * Stream progress for the given operations into the query cache
+ * Returns the IDs with an open stream; polling pauses for those and resumes
+ * if the stream fails (e.g. an older server without the stream endpoint)
+ */
+function useProgressStreams(progressIds: string[]): Set<string> {
+  const queryClient = useQueryClient();
+  const [streamingIds, setStreamingIds] = useState<Set<string>>(() => new Set());
+  // Operations whose stream failed stay on polling
+  const failedIds = useRef(new Set<string>());
+  const progressIdsKey = useMemo(() => JSON.stringify([...progressIds].sort()), [progressIds]);
+
+  useEffect(() => {
+    if (typeof EventSource === "undefined") return;
+
+    const ids = (JSON.parse(progressIdsKey) as string[]).filter((id) => !failedIds.current.has(id));
+    if (ids.length === 0) return;
+
+    setStreamingIds(new Set(ids));
+    const closeStreams = ids.map((progressId) =>
+      progressService.streamProgress(
+        progressId,
+        (data) => queryClient.setQueryData(progressKeys.detail(progressId), data),
+        (failed) => {
+          if (failed) failedIds.current.add(progressId);
+          setStreamingIds((prev) => {
+            const next = new Set(prev);
+            next.delete(progressId);
+            return next;
+          });
+        },
+      ),
+    );
+
+    return () => {
+      closeStreams.forEach((close) => close());
+      setStreamingIds(new Set());
+    };
+  }, [progressIdsKey, queryClient]);
+
+  return streamingIds;
+}
+
 /**
  * Poll for operation progress
  * Automatically stops polling when operation completes or fails
@@ -39,6 +82,7 @@ export function useOperationProgress(
   const hasCalledError = useRef(false);
   const consecutiveNotFound = useRef(0);
   const { refetchInterval: smartInterval } = useSmartPolling(options?.pollingInterval ?? 1000);
+  const streamingIds = useProgressStreams(useMemo(() => (progressId ? [progressId] : []), [progressId]));
 
   // Reset refs when progressId changes
   useEffect(() => {
@@ -88,6 +132,11 @@ export function useOperationProgress(
         return false;
       }
 
+      // The open stream pushes updates into the cache
+      if (progressId && streamingIds.has(progressId)) {
+        return false;
+      }
+
       // Keep polling on undefined (initial), null (transient 404), or active operations
       // Use smart interval that pauses when tab is hidden
       return smartInterval;
@@ -237,6 +286,7 @@ export function useMultipleOperations(
   // Track consecutive 404s per operation
   const notFoundCounts = useRef<Map<string, number>>(new Map());
   const { refetchInterval: smartInterval } = useSmartPolling(1000);
+  const streamingIds = useProgressStreams(progressIds);
 
   // Reset tracking sets when progress IDs change
   // Use sorted JSON stringification for stable dependency that handles reordering
@@ -287,6 +337,11 @@ export function useMultipleOperations(
           return false;
         }
 
+        // The open stream pushes updates into the cache
+        if (streamingIds.has(progressId)) {
+          return false;
+        }
+
         // Keep polling on undefined (initial), null (transient 404), or active operations
         // Use smart interval that pauses when tab is hidden
         return smartInterval;
@@ -1,10 +1,13 @@
 /**
- * Progress Service for polling operation status
- * Uses ETag support for efficient polling
+ * Progress Service for polling and streaming operation status
+ * Uses ETag support for efficient polling and Server-Sent Events for push updates
  */
 
+import { API_BASE_URL } from "../../../config/api";
 import { callAPIWithETag } from "../../shared/api/apiClient";
-import type { ActiveOperationsResponse, ProgressResponse } from "../types";
+import type { ActiveOperationsResponse, ProgressResponse, ProgressStatus } from "../types";
+
+const TERMINAL_STATES: ProgressStatus[] = ["completed", "error", "failed", "cancelled"];
 
 export const progressService = {
   /**
@@ -14,6 +17,46 @@ export const progressService = {
     return callAPIWithETag<ProgressResponse>(`/api/progress/${progressId}`);
   },
 
+  /**
+   * Stream progress updates for an operation over Server-Sent Events.
+   * onClose fires once when the stream ends or fails; callers fall back to polling.
+   * Returns a function that closes the stream.
+   */
+  streamProgress(
+    progressId: string,
+    onProgress: (data: ProgressResponse) => void,
+    onClose: (failed: boolean) => void,
+  ): () => void {
+    const eventSource = new EventSource(`${API_BASE_URL}/progress/${progressId}/stream`);
+    let closed = false;
+    const close = (failed: boolean) => {
+      if (closed) return;
+      closed = true;
+      eventSource.close();
+      onClose(failed);
+    };
+
+    eventSource.addEventListener("progress", (event) => {
+      try {
+        const data: ProgressResponse = JSON.parse((event as MessageEvent).data);
+        onProgress(data);
+        if (TERMINAL_STATES.includes(data.status)) {
+          close(false);
+        }
+      } catch (err) {
+        console.error("Failed to parse progress event:", err);
+      }
+    });
+
+    // Includes the server ending the stream: don't let EventSource reconnect
+    eventSource.onerror = () => close(true);
+
+    return () => {
+      closed = true;
+      eventSource.close();
+    };
+  },
+
   /**
    * List all active operations
    */
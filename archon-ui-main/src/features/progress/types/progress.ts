@@ -81,6 +81,23 @@ export interface UploadProgressData extends BaseProgressData {
 
 export type ProgressData = CrawlProgressData | UploadProgressData;
 
+// Count and summed seconds of one stage, provider endpoint, limiter or database target
+export interface StageTiming {
+  count: number;
+  seconds: number;
+}
+
+// Per-crawl breakdown from the backend (snake_case keys)
+export interface CrawlStageMetrics {
+  wall_seconds: number;
+  stages?: Record<string, StageTiming>;
+  provider_requests?: Record<string, StageTiming>;
+  rate_limit_waits?: Record<string, StageTiming>;
+  database?: Record<string, StageTiming>;
+  items: Record<string, number>;
+  throughput: Record<string, number>;
+}
+
 // Progress response from backend (camelCase from API)
 // Response from /api/progress/ list endpoint
 export interface ActiveOperation {
@@ -171,4 +188,6 @@ export interface ProgressResponse {
     code_examples_found?: number;
     current_operation?: string;
   };
+  // Per-stage breakdown, present once a crawl has completed
+  stageMetrics?: CrawlStageMetrics;
 }
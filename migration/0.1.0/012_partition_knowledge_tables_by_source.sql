@@ -0,0 +1,669 @@
+-- =====================================================
+-- Partition knowledge tables by source
+-- =====================================================
+-- This migration converts archon_crawled_pages and archon_code_examples
+-- into LIST-partitioned tables keyed on source_id, with one partition per
+-- source.
+--
+-- Features:
+-- - Source-filtered searches scan only that source's partition and its
+--   own ANN index, instead of post-filtering a single global index
+-- - Partitions are created automatically when a source is inserted
+-- - Deleting a source drops its partitions instead of a cascading DELETE
+--
+-- Notes:
+-- - Vector indexes switch from ivfflat to hnsw. ivfflat trains its lists
+--   on the rows present at build time, and new partitions start empty.
+-- - The (url, chunk_number) unique constraint now includes source_id,
+--   because unique constraints on partitioned tables must include the
+--   partition key.
+-- - This rewrites both tables. On large databases run it during a quiet
+--   period, and take a backup first (backup_database.sql).
+-- =====================================================
+
+-- =====================================================
+-- PARTITION MANAGEMENT FUNCTIONS
+-- =====================================================
+
+-- Name of the partition holding one source's rows for a knowledge table
+CREATE OR REPLACE FUNCTION archon_source_partition_name(parent_table TEXT, p_source_id TEXT)
+RETURNS TEXT AS $$
+BEGIN
+    RETURN parent_table || '_' || substr(md5(p_source_id), 1, 16);
+END;
+$$ LANGUAGE plpgsql IMMUTABLE;
+
+-- Create the partitions for a source. Partitioned indexes on the parent
+-- tables give every new partition its own ANN and search indexes.
+CREATE OR REPLACE FUNCTION archon_ensure_source_partitions(p_source_id TEXT)
+RETURNS VOID
+LANGUAGE plpgsql
+SECURITY DEFINER
+SET search_path = public
+AS $$
+DECLARE
+    parent_table TEXT;
+    partition_name TEXT;
+BEGIN
+    FOREACH parent_table IN ARRAY ARRAY['archon_crawled_pages', 'archon_code_examples'] LOOP
+        partition_name := archon_source_partition_name(parent_table, p_source_id);
+        IF to_regclass(partition_name) IS NULL THEN
+            EXECUTE format(
+                'CREATE TABLE %I PARTITION OF %I FOR VALUES IN (%L)',
+                partition_name, parent_table, p_source_id
+            );
+            -- Partitions are reachable directly through the API, so lock them down
+            EXECUTE format('ALTER TABLE %I ENABLE ROW LEVEL SECURITY', partition_name);
+        END IF;
+    END LOOP;
+END;
+$$;
+
+-- Drop the partitions for a source
+CREATE OR REPLACE FUNCTION archon_drop_source_partitions(p_source_id TEXT)
+RETURNS VOID
+LANGUAGE plpgsql
+SECURITY DEFINER
+SET search_path = public
+AS $$
+DECLARE
+    parent_table TEXT;
+    partition_name TEXT;
+BEGIN
+    FOREACH parent_table IN ARRAY ARRAY['archon_crawled_pages', 'archon_code_examples'] LOOP
+        partition_name := archon_source_partition_name(parent_table, p_source_id);
+        IF to_regclass(partition_name) IS NOT NULL THEN
+            EXECUTE format('DROP TABLE %I', partition_name);
+        END IF;
+    END LOOP;
+END;
+$$;
+
+-- Delete a source by dropping its chunk and code example partitions, then
+-- removing the source row (page metadata still goes through CASCADE).
+-- Returns the number of source rows deleted.
+CREATE OR REPLACE FUNCTION archon_delete_source(p_source_id TEXT)
+RETURNS INTEGER
+LANGUAGE plpgsql
+SECURITY DEFINER
+SET search_path = public
+AS $$
+DECLARE
+    deleted_count INTEGER;
+BEGIN
+    PERFORM archon_drop_source_partitions(p_source_id);
+    DELETE FROM archon_sources WHERE source_id = p_source_id;
+    GET DIAGNOSTICS deleted_count = ROW_COUNT;
+    RETURN deleted_count;
+END;
+$$;
+
+-- The functions above run as their owner so they can create and drop
+-- tables. Only the server (service_role) may call them; PostgreSQL
+-- grants EXECUTE to PUBLIC by default, which would expose them through
+-- PostgREST's /rpc/ to anon and authenticated clients.
+REVOKE EXECUTE ON FUNCTION archon_ensure_source_partitions(TEXT) FROM PUBLIC, anon, authenticated;
+REVOKE EXECUTE ON FUNCTION archon_drop_source_partitions(TEXT) FROM PUBLIC, anon, authenticated;
+REVOKE EXECUTE ON FUNCTION archon_delete_source(TEXT) FROM PUBLIC, anon, authenticated;
+GRANT EXECUTE ON FUNCTION archon_ensure_source_partitions(TEXT) TO service_role;
+GRANT EXECUTE ON FUNCTION archon_drop_source_partitions(TEXT) TO service_role;
+GRANT EXECUTE ON FUNCTION archon_delete_source(TEXT) TO service_role;
+
+-- Create partitions as soon as a source exists. Chunks reference their
+-- source, so the partition is always in place before the first insert.
+CREATE OR REPLACE FUNCTION archon_sources_create_partitions()
+RETURNS TRIGGER AS $$
+BEGIN
+    PERFORM archon_ensure_source_partitions(NEW.source_id);
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+-- =====================================================
+-- CONVERT EXISTING TABLES
+-- =====================================================
+
+DO $$
+DECLARE
+    src RECORD;
+BEGIN
+    -- Skip if already partitioned (makes this migration re-runnable)
+    IF (SELECT relkind FROM pg_class WHERE oid = 'archon_crawled_pages'::regclass) = 'p' THEN
+        RAISE NOTICE 'archon_crawled_pages is already partitioned, skipping conversion';
+        RETURN;
+    END IF;
+
+    -- Documentation chunks
+    CREATE TABLE archon_crawled_pages_partitioned (
+        id BIGSERIAL,
+        url VARCHAR NOT NULL,
+        chunk_number INTEGER NOT NULL,
+        content TEXT NOT NULL,
+        metadata JSONB NOT NULL DEFAULT '{}'::jsonb,
+        source_id TEXT NOT NULL,
+        embedding_384 VECTOR(384),
+        embedding_768 VECTOR(768),
+        embedding_1024 VECTOR(1024),
+        embedding_1536 VECTOR(1536),
+        embedding_3072 VECTOR(3072),
+        llm_chat_model TEXT,
+        embedding_model TEXT,
+        embedding_dimension INTEGER,
+        content_search_vector tsvector GENERATED ALWAYS AS (to_tsvector('english', content)) STORED,
+        created_at TIMESTAMP WITH TIME ZONE DEFAULT timezone('utc'::text, now()) NOT NULL,
+        page_id UUID,
+        CONSTRAINT archon_crawled_pages_part_pkey PRIMARY KEY (source_id, id),
+        CONSTRAINT archon_crawled_pages_part_url_chunk_key UNIQUE (source_id, url, chunk_number),
+        CONSTRAINT archon_crawled_pages_part_source_fk FOREIGN KEY (source_id)
+            REFERENCES archon_sources(source_id) ON DELETE CASCADE,
+        CONSTRAINT archon_crawled_pages_part_page_fk FOREIGN KEY (page_id)
+            REFERENCES archon_page_metadata(id) ON DELETE SET NULL
+    ) PARTITION BY LIST (source_id);
+
+    -- Code examples
+    CREATE TABLE archon_code_examples_partitioned (
+        id BIGSERIAL,
+        url VARCHAR NOT NULL,
+        chunk_number INTEGER NOT NULL,
+        content TEXT NOT NULL,
+        summary TEXT NOT NULL,
+        metadata JSONB NOT NULL DEFAULT '{}'::jsonb,
+        source_id TEXT NOT NULL,
+        embedding_384 VECTOR(384),
+        embedding_768 VECTOR(768),
+        embedding_1024 VECTOR(1024),
+        embedding_1536 VECTOR(1536),
+        embedding_3072 VECTOR(3072),
+        llm_chat_model TEXT,
+        embedding_model TEXT,
+        embedding_dimension INTEGER,
+        content_search_vector tsvector GENERATED ALWAYS AS (to_tsvector('english', content || ' ' || COALESCE(summary, ''))) STORED,
+        created_at TIMESTAMP WITH TIME ZONE DEFAULT timezone('utc'::text, now()) NOT NULL,
+        CONSTRAINT archon_code_examples_part_pkey PRIMARY KEY (source_id, id),
+        CONSTRAINT archon_code_examples_part_url_chunk_key UNIQUE (source_id, url, chunk_number),
+        CONSTRAINT archon_code_examples_part_source_fk FOREIGN KEY (source_id)
+            REFERENCES archon_sources(source_id) ON DELETE CASCADE
+    ) PARTITION BY LIST (source_id);
+
+    -- One partition per existing source
+    FOR src IN SELECT source_id FROM archon_sources LOOP
+        EXECUTE format(
+            'CREATE TABLE %I PARTITION OF archon_crawled_pages_partitioned FOR VALUES IN (%L)',
+            archon_source_partition_name('archon_crawled_pages', src.source_id), src.source_id
+        );
+        EXECUTE format(
+            'ALTER TABLE %I ENABLE ROW LEVEL SECURITY',
+            archon_source_partition_name('archon_crawled_pages', src.source_id)
+        );
+        EXECUTE format(
+            'CREATE TABLE %I PARTITION OF archon_code_examples_partitioned FOR VALUES IN (%L)',
+            archon_source_partition_name('archon_code_examples', src.source_id), src.source_id
+        );
+        EXECUTE format(
+            'ALTER TABLE %I ENABLE ROW LEVEL SECURITY',
+            archon_source_partition_name('archon_code_examples', src.source_id)
+        );
+    END LOOP;
+
+    -- Copy data (indexes are built afterwards, which is much faster)
+    INSERT INTO archon_crawled_pages_partitioned (
+        id, url, chunk_number, content, metadata, source_id,
+        embedding_384, embedding_768, embedding_1024, embedding_1536, embedding_3072,
+        llm_chat_model, embedding_model, embedding_dimension, created_at, page_id
+    )
+    SELECT
+        id, url, chunk_number, content, metadata, source_id,
+        embedding_384, embedding_768, embedding_1024, embedding_1536, embedding_3072,
+        llm_chat_model, embedding_model, embedding_dimension, created_at, page_id
+    FROM archon_crawled_pages;
+
+    INSERT INTO archon_code_examples_partitioned (
+        id, url, chunk_number, content, summary, metadata, source_id,
+        embedding_384, embedding_768, embedding_1024, embedding_1536, embedding_3072,
+        llm_chat_model, embedding_model, embedding_dimension, created_at
+    )
+    SELECT
+        id, url, chunk_number, content, summary, metadata, source_id,
+        embedding_384, embedding_768, embedding_1024, embedding_1536, embedding_3072,
+        llm_chat_model, embedding_model, embedding_dimension, created_at
+    FROM archon_code_examples;
+
+    -- Continue id sequences where the old tables left off
+    PERFORM setval(
+        pg_get_serial_sequence('archon_crawled_pages_partitioned', 'id'),
+        COALESCE((SELECT MAX(id) FROM archon_crawled_pages_partitioned), 0) + 1,
+        false
+    );
+    PERFORM setval(
+        pg_get_serial_sequence('archon_code_examples_partitioned', 'id'),
+        COALESCE((SELECT MAX(id) FROM archon_code_examples_partitioned), 0) + 1,
+        false
+    );
+
+    -- Swap tables (dropping the old tables also drops their indexes and policies)
+    DROP TABLE archon_crawled_pages CASCADE;
+    DROP TABLE archon_code_examples CASCADE;
+    ALTER TABLE archon_crawled_pages_partitioned RENAME TO archon_crawled_pages;
+    ALTER TABLE archon_code_examples_partitioned RENAME TO archon_code_examples;
+    ALTER SEQUENCE archon_crawled_pages_partitioned_id_seq RENAME TO archon_crawled_pages_id_seq;
+    ALTER SEQUENCE archon_code_examples_partitioned_id_seq RENAME TO archon_code_examples_id_seq;
+END $$;
+
+-- =====================================================
+-- PARTITIONED INDEXES
+-- =====================================================
+-- Created on the parent tables, so every partition (existing and future)
+-- gets its own copy. 3072-dimensional embeddings still cannot be indexed.
+
+CREATE INDEX IF NOT EXISTS idx_archon_crawled_pages_embedding_384 ON archon_crawled_pages USING hnsw (embedding_384 vector_cosine_ops);
+CREATE INDEX IF NOT EXISTS idx_archon_crawled_pages_embedding_768 ON archon_crawled_pages USING hnsw (embedding_768 vector_cosine_ops);
+CREATE INDEX IF NOT EXISTS idx_archon_crawled_pages_embedding_1024 ON archon_crawled_pages USING hnsw (embedding_1024 vector_cosine_ops);
+CREATE INDEX IF NOT EXISTS idx_archon_crawled_pages_embedding_1536 ON archon_crawled_pages USING hnsw (embedding_1536 vector_cosine_ops);
+CREATE INDEX IF NOT EXISTS idx_archon_crawled_pages_metadata ON archon_crawled_pages USING GIN (metadata);
+CREATE INDEX IF NOT EXISTS idx_archon_crawled_pages_url ON archon_crawled_pages (url);
+CREATE INDEX IF NOT EXISTS idx_archon_crawled_pages_content_search ON archon_crawled_pages USING GIN (content_search_vector);
+CREATE INDEX IF NOT EXISTS idx_archon_crawled_pages_content_trgm ON archon_crawled_pages USING GIN (content gin_trgm_ops);
+CREATE INDEX IF NOT EXISTS idx_archon_crawled_pages_embedding_model ON archon_crawled_pages (embedding_model);
+CREATE INDEX IF NOT EXISTS idx_archon_crawled_pages_embedding_dimension ON archon_crawled_pages (embedding_dimension);
+CREATE INDEX IF NOT EXISTS idx_archon_crawled_pages_llm_chat_model ON archon_crawled_pages (llm_chat_model);
+CREATE INDEX IF NOT EXISTS idx_archon_crawled_pages_page_id ON archon_crawled_pages (page_id);
+
+CREATE INDEX IF NOT EXISTS idx_archon_code_examples_embedding_384 ON archon_code_examples USING hnsw (embedding_384 vector_cosine_ops);
+CREATE INDEX IF NOT EXISTS idx_archon_code_examples_embedding_768 ON archon_code_examples USING hnsw (embedding_768 vector_cosine_ops);
+CREATE INDEX IF NOT EXISTS idx_archon_code_examples_embedding_1024 ON archon_code_examples USING hnsw (embedding_1024 vector_cosine_ops);
+CREATE INDEX IF NOT EXISTS idx_archon_code_examples_embedding_1536 ON archon_code_examples USING hnsw (embedding_1536 vector_cosine_ops);
+CREATE INDEX IF NOT EXISTS idx_archon_code_examples_metadata ON archon_code_examples USING GIN (metadata);
+CREATE INDEX IF NOT EXISTS idx_archon_code_examples_url ON archon_code_examples (url);
+CREATE INDEX IF NOT EXISTS idx_archon_code_examples_content_search ON archon_code_examples USING GIN (content_search_vector);
+CREATE INDEX IF NOT EXISTS idx_archon_code_examples_content_trgm ON archon_code_examples USING GIN (content gin_trgm_ops);
+CREATE INDEX IF NOT EXISTS idx_archon_code_examples_summary_trgm ON archon_code_examples USING GIN (summary gin_trgm_ops);
+CREATE INDEX IF NOT EXISTS idx_archon_code_examples_embedding_model ON archon_code_examples (embedding_model);
+CREATE INDEX IF NOT EXISTS idx_archon_code_examples_embedding_dimension ON archon_code_examples (embedding_dimension);
+CREATE INDEX IF NOT EXISTS idx_archon_code_examples_llm_chat_model ON archon_code_examples (llm_chat_model);
+
+COMMENT ON COLUMN archon_crawled_pages.page_id IS 'Foreign key linking chunk to parent page';
+
+-- =====================================================
+-- RLS POLICIES
+-- =====================================================
+
+ALTER TABLE archon_crawled_pages ENABLE ROW LEVEL SECURITY;
+ALTER TABLE archon_code_examples ENABLE ROW LEVEL SECURITY;
+
+DROP POLICY IF EXISTS "Allow public read access to archon_crawled_pages" ON archon_crawled_pages;
+DROP POLICY IF EXISTS "Allow public read access to archon_code_examples" ON archon_code_examples;
+
+CREATE POLICY "Allow public read access to archon_crawled_pages"
+  ON archon_crawled_pages
+  FOR SELECT
+  TO public
+  USING (true);
+
+CREATE POLICY "Allow public read access to archon_code_examples"
+  ON archon_code_examples
+  FOR SELECT
+  TO public
+  USING (true);
+
+-- =====================================================
+-- SOURCE PARTITION TRIGGER
+-- =====================================================
+
+DROP TRIGGER IF EXISTS archon_sources_create_partitions_trigger ON archon_sources;
+CREATE TRIGGER archon_sources_create_partitions_trigger
+    AFTER INSERT ON archon_sources
+    FOR EACH ROW
+    EXECUTE FUNCTION archon_sources_create_partitions();
+
+-- =====================================================
+-- PARTITION-AWARE SEARCH FUNCTIONS
+-- =====================================================
+-- The source filter is only added to the query when it is set, as a plain
+-- equality on the partition key, so the planner prunes every other
+-- partition and the ANN scan runs on the source's own index.
+
+CREATE OR REPLACE FUNCTION match_archon_crawled_pages_multi (
+  query_embedding VECTOR,
+  embedding_dimension INTEGER,
+  match_count INT DEFAULT 10,
+  filter JSONB DEFAULT '{}'::jsonb,
+  source_filter TEXT DEFAULT NULL
+) RETURNS TABLE (
+  id BIGINT,
+  url VARCHAR,
+  chunk_number INTEGER,
+  content TEXT,
+  metadata JSONB,
+  source_id TEXT,
+  similarity FLOAT
+)
+LANGUAGE plpgsql
+AS $$
+#variable_conflict use_column
+DECLARE
+  sql_query TEXT;
+  embedding_column TEXT;
+  source_clause TEXT;
+BEGIN
+  -- Determine which embedding column to use based on dimension
+  CASE embedding_dimension
+    WHEN 384 THEN embedding_column := 'embedding_384';
+    WHEN 768 THEN embedding_column := 'embedding_768';
+    WHEN 1024 THEN embedding_column := 'embedding_1024';
+    WHEN 1536 THEN embedding_column := 'embedding_1536';
+    WHEN 3072 THEN embedding_column := 'embedding_3072';
+    ELSE RAISE EXCEPTION 'Unsupported embedding dimension: %', embedding_dimension;
+  END CASE;
+
+  -- Route source-filtered searches to the source's partition
+  source_clause := CASE WHEN source_filter IS NULL THEN '' ELSE 'AND source_id = $4' END;
+
+  -- Build dynamic query
+  sql_query := format('
+    SELECT id, url, chunk_number, content, metadata, source_id,
+           1 - (%I <=> $1) AS similarity
+    FROM archon_crawled_pages
+    WHERE (%I IS NOT NULL)
+      AND metadata @> $3
+      %s
+    ORDER BY %I <=> $1
+    LIMIT $2',
+    embedding_column, embedding_column, source_clause, embedding_column);
+
+  -- Execute dynamic query
+  RETURN QUERY EXECUTE sql_query USING query_embedding, match_count, filter, source_filter;
+END;
+$$;
+
+CREATE OR REPLACE FUNCTION match_archon_code_examples_multi (
+  query_embedding VECTOR,
+  embedding_dimension INTEGER,
+  match_count INT DEFAULT 10,
+  filter JSONB DEFAULT '{}'::jsonb,
+  source_filter TEXT DEFAULT NULL
+) RETURNS TABLE (
+  id BIGINT,
+  url VARCHAR,
+  chunk_number INTEGER,
+  content TEXT,
+  summary TEXT,
+  metadata JSONB,
+  source_id TEXT,
+  similarity FLOAT
+)
+LANGUAGE plpgsql
+AS $$
+#variable_conflict use_column
+DECLARE
+  sql_query TEXT;
+  embedding_column TEXT;
+  source_clause TEXT;
+BEGIN
+  -- Determine which embedding column to use based on dimension
+  CASE embedding_dimension
+    WHEN 384 THEN embedding_column := 'embedding_384';
+    WHEN 768 THEN embedding_column := 'embedding_768';
+    WHEN 1024 THEN embedding_column := 'embedding_1024';
+    WHEN 1536 THEN embedding_column := 'embedding_1536';
+    WHEN 3072 THEN embedding_column := 'embedding_3072';
+    ELSE RAISE EXCEPTION 'Unsupported embedding dimension: %', embedding_dimension;
+  END CASE;
+
+  -- Route source-filtered searches to the source's partition
+  source_clause := CASE WHEN source_filter IS NULL THEN '' ELSE 'AND source_id = $4' END;
+
+  -- Build dynamic query
+  sql_query := format('
+    SELECT id, url, chunk_number, content, summary, metadata, source_id,
+           1 - (%I <=> $1) AS similarity
+    FROM archon_code_examples
+    WHERE (%I IS NOT NULL)
+      AND metadata @> $3
+      %s
+    ORDER BY %I <=> $1
+    LIMIT $2',
+    embedding_column, embedding_column, source_clause, embedding_column);
+
+  -- Execute dynamic query
+  RETURN QUERY EXECUTE sql_query USING query_embedding, match_count, filter, source_filter;
+END;
+$$;
+
+CREATE OR REPLACE FUNCTION hybrid_search_archon_crawled_pages_multi(
+    query_embedding VECTOR,
+    embedding_dimension INTEGER,
+    query_text TEXT,
+    match_count INT DEFAULT 10,
+    filter JSONB DEFAULT '{}'::jsonb,
+    source_filter TEXT DEFAULT NULL
+)
+RETURNS TABLE (
+    id BIGINT,
+    url VARCHAR,
+    chunk_number INTEGER,
+    content TEXT,
+    metadata JSONB,
+    source_id TEXT,
+    similarity FLOAT,
+    match_type TEXT
+)
+LANGUAGE plpgsql
+AS $$
+#variable_conflict use_column
+DECLARE
+    max_vector_results INT;
+    max_text_results INT;
+    sql_query TEXT;
+    embedding_column TEXT;
+    source_clause TEXT;
+BEGIN
+    -- Determine which embedding column to use based on dimension
+    CASE embedding_dimension
+        WHEN 384 THEN embedding_column := 'embedding_384';
+        WHEN 768 THEN embedding_column := 'embedding_768';
+        WHEN 1024 THEN embedding_column := 'embedding_1024';
+        WHEN 1536 THEN embedding_column := 'embedding_1536';
+        WHEN 3072 THEN embedding_column := 'embedding_3072';
+        ELSE RAISE EXCEPTION 'Unsupported embedding dimension: %', embedding_dimension;
+    END CASE;
+
+    -- Calculate how many results to fetch from each search type
+    max_vector_results := match_count;
+    max_text_results := match_count;
+
+    -- Route source-filtered searches to the source's partition
+    source_clause := CASE WHEN source_filter IS NULL THEN '' ELSE 'AND cp.source_id = $5' END;
+
+    -- Build dynamic query with proper embedding column
+    sql_query := format('
+    WITH vector_results AS (
+        -- Vector similarity search
+        SELECT
+            cp.id,
+            cp.url,
+            cp.chunk_number,
+            cp.content,
+            cp.metadata,
+            cp.source_id,
+            1 - (cp.%I <=> $1) AS vector_sim
+        FROM archon_crawled_pages cp
+        WHERE cp.metadata @> $4
+            %s
+            AND cp.%I IS NOT NULL
+        ORDER BY cp.%I <=> $1
+        LIMIT $2
+    ),
+    text_results AS (
+        -- Full-text search with ranking
+        SELECT
+            cp.id,
+            cp.url,
+            cp.chunk_number,
+            cp.content,
+            cp.metadata,
+            cp.source_id,
+            ts_rank_cd(cp.content_search_vector, plainto_tsquery(''english'', $6)) AS text_sim
+        FROM archon_crawled_pages cp
+        WHERE cp.metadata @> $4
+            %s
+            AND cp.content_search_vector @@ plainto_tsquery(''english'', $6)
+        ORDER BY text_sim DESC
+        LIMIT $3
+    ),
+    combined_results AS (
+        -- Combine results from both searches
+        SELECT
+            COALESCE(v.id, t.id) AS id,
+            COALESCE(v.url, t.url) AS url,
+            COALESCE(v.chunk_number, t.chunk_number) AS chunk_number,
+            COALESCE(v.content, t.content) AS content,
+            COALESCE(v.metadata, t.metadata) AS metadata,
+            COALESCE(v.source_id, t.source_id) AS source_id,
+            -- Use vector similarity if available, otherwise text similarity
+            COALESCE(v.vector_sim, t.text_sim, 0)::float8 AS similarity,
+            -- Determine match type
+            CASE
+                WHEN v.id IS NOT NULL AND t.id IS NOT NULL THEN ''hybrid''
+                WHEN v.id IS NOT NULL THEN ''vector''
+                ELSE ''keyword''
+            END AS match_type
+        FROM vector_results v
+        FULL OUTER JOIN text_results t ON v.id = t.id
+    )
+    SELECT * FROM combined_results
+    ORDER BY similarity DESC
+    LIMIT $2',
+    embedding_column, source_clause, embedding_column, embedding_column, source_clause);
+
+    -- Execute dynamic query
+    RETURN QUERY EXECUTE sql_query USING query_embedding, max_vector_results, max_text_results, filter, source_filter, query_text;
+END;
+$$;
+
+CREATE OR REPLACE FUNCTION hybrid_search_archon_code_examples_multi(
+    query_embedding VECTOR,
+    embedding_dimension INTEGER,
+    query_text TEXT,
+    match_count INT DEFAULT 10,
+    filter JSONB DEFAULT '{}'::jsonb,
+    source_filter TEXT DEFAULT NULL
+)
+RETURNS TABLE (
+    id BIGINT,
+    url VARCHAR,
+    chunk_number INTEGER,
+    content TEXT,
+    summary TEXT,
+    metadata JSONB,
+    source_id TEXT,
+    similarity FLOAT,
+    match_type TEXT
+)
+LANGUAGE plpgsql
+AS $$
+#variable_conflict use_column
+DECLARE
+    max_vector_results INT;
+    max_text_results INT;
+    sql_query TEXT;
+    embedding_column TEXT;
+    source_clause TEXT;
+BEGIN
+    -- Determine which embedding column to use based on dimension
+    CASE embedding_dimension
+        WHEN 384 THEN embedding_column := 'embedding_384';
+        WHEN 768 THEN embedding_column := 'embedding_768';
+        WHEN 1024 THEN embedding_column := 'embedding_1024';
+        WHEN 1536 THEN embedding_column := 'embedding_1536';
+        WHEN 3072 THEN embedding_column := 'embedding_3072';
+        ELSE RAISE EXCEPTION 'Unsupported embedding dimension: %', embedding_dimension;
+    END CASE;
+
+    -- Calculate how many results to fetch from each search type
+    max_vector_results := match_count;
+    max_text_results := match_count;
+
+    -- Route source-filtered searches to the source's partition
+    source_clause := CASE WHEN source_filter IS NULL THEN '' ELSE 'AND ce.source_id = $5' END;
+
+    -- Build dynamic query with proper embedding column
+    sql_query := format('
+    WITH vector_results AS (
+        -- Vector similarity search
+        SELECT
+            ce.id,
+            ce.url,
+            ce.chunk_number,
+            ce.content,
+            ce.summary,
+            ce.metadata,
+            ce.source_id,
+            1 - (ce.%I <=> $1) AS vector_sim
+        FROM archon_code_examples ce
+        WHERE ce.metadata @> $4
+            %s
+            AND ce.%I IS NOT NULL
+        ORDER BY ce.%I <=> $1
+        LIMIT $2
+    ),
+    text_results AS (
+        -- Full-text search with ranking (searches both content and summary)
+        SELECT
+            ce.id,
+            ce.url,
+            ce.chunk_number,
+            ce.content,
+            ce.summary,
+            ce.metadata,
+            ce.source_id,
+            ts_rank_cd(ce.content_search_vector, plainto_tsquery(''english'', $6)) AS text_sim
+        FROM archon_code_examples ce
+        WHERE ce.metadata @> $4
+            %s
+            AND ce.content_search_vector @@ plainto_tsquery(''english'', $6)
+        ORDER BY text_sim DESC
+        LIMIT $3
+    ),
+    combined_results AS (
+        -- Combine results from both searches
+        SELECT
+            COALESCE(v.id, t.id) AS id,
+            COALESCE(v.url, t.url) AS url,
+            COALESCE(v.chunk_number, t.chunk_number) AS chunk_number,
+            COALESCE(v.content, t.content) AS content,
+            COALESCE(v.summary, t.summary) AS summary,
+            COALESCE(v.metadata, t.metadata) AS metadata,
+            COALESCE(v.source_id, t.source_id) AS source_id,
+            -- Use vector similarity if available, otherwise text similarity
+            COALESCE(v.vector_sim, t.text_sim, 0)::float8 AS similarity,
+            -- Determine match type
+            CASE
+                WHEN v.id IS NOT NULL AND t.id IS NOT NULL THEN ''hybrid''
+                WHEN v.id IS NOT NULL THEN ''vector''
+                ELSE ''keyword''
+            END AS match_type
+        FROM vector_results v
+        FULL OUTER JOIN text_results t ON v.id = t.id
+    )
+    SELECT * FROM combined_results
+    ORDER BY similarity DESC
+    LIMIT $2',
+    embedding_column, source_clause, embedding_column, embedding_column, source_clause);
+
+    -- Execute dynamic query
+    RETURN QUERY EXECUTE sql_query USING query_embedding, max_vector_results, max_text_results, filter, source_filter, query_text;
+END;
+$$;
+
+COMMENT ON FUNCTION archon_ensure_source_partitions IS 'Creates the per-source partitions of archon_crawled_pages and archon_code_examples';
+COMMENT ON FUNCTION archon_drop_source_partitions IS 'Drops the per-source partitions of archon_crawled_pages and archon_code_examples';
+COMMENT ON FUNCTION archon_delete_source IS 'Deletes a source by dropping its partitions and then its archon_sources row';
+
+-- Record migration application for tracking
+INSERT INTO archon_migrations (version, migration_name)
+VALUES ('0.1.0', '012_partition_knowledge_tables_by_source')
+ON CONFLICT (version, migration_name) DO NOTHING;
+
+-- =====================================================
+-- MIGRATION COMPLETE
+-- =====================================================
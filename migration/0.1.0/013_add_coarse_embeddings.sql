@@ -0,0 +1,209 @@
+-- =====================================================
+-- Add coarse (truncated) embeddings for two-stage vector search
+-- =====================================================
+-- This migration adds a 256-dimension embedding_coarse column to
+-- archon_crawled_pages and archon_code_examples. For Matryoshka-trained
+-- embedding models (text-embedding-3-*, gemini-embedding-001,
+-- nomic-embed-text, ...) the server stores the renormalized leading 256
+-- components of each embedding next to the full vector.
+--
+-- Features:
+-- - Coarse ANN over the small hnsw index on embedding_coarse
+-- - Exact rescoring of the candidates on the full-dimension vector
+-- - Works for every dimension, including 3072 which has no ANN index
+--
+-- Notes:
+-- - Rows stored before this migration (or by non-Matryoshka models) have
+--   no coarse copy. The *_coarse search functions still search them on
+--   the full vector, so results stay complete while sources are recrawled.
+-- =====================================================
+
+-- Add coarse embedding columns (propagates to every source partition)
+ALTER TABLE archon_crawled_pages
+ADD COLUMN IF NOT EXISTS embedding_coarse VECTOR(256);
+
+ALTER TABLE archon_code_examples
+ADD COLUMN IF NOT EXISTS embedding_coarse VECTOR(256);
+
+-- Coarse ANN indexes
+CREATE INDEX IF NOT EXISTS idx_archon_crawled_pages_embedding_coarse
+ON archon_crawled_pages USING hnsw (embedding_coarse vector_cosine_ops);
+
+CREATE INDEX IF NOT EXISTS idx_archon_code_examples_embedding_coarse
+ON archon_code_examples USING hnsw (embedding_coarse vector_cosine_ops);
+
+-- =====================================================
+-- TWO-STAGE SEARCH FUNCTIONS
+-- =====================================================
+
+-- Coarse ANN on embedding_coarse, then exact rescoring on the full vector
+CREATE OR REPLACE FUNCTION match_archon_crawled_pages_coarse (
+  query_embedding VECTOR,
+  query_embedding_coarse VECTOR(256),
+  match_count INT DEFAULT 10,
+  filter JSONB DEFAULT '{}'::jsonb,
+  source_filter TEXT DEFAULT NULL,
+  candidate_count INT DEFAULT 100
+) RETURNS TABLE (
+  id BIGINT,
+  url VARCHAR,
+  chunk_number INTEGER,
+  content TEXT,
+  metadata JSONB,
+  source_id TEXT,
+  similarity FLOAT
+)
+LANGUAGE plpgsql
+AS $$
+#variable_conflict use_column
+DECLARE
+  sql_query TEXT;
+  embedding_column TEXT;
+  source_clause TEXT;
+BEGIN
+  -- Determine which full embedding column to rescore on from the query dimension
+  CASE vector_dims(query_embedding)
+    WHEN 384 THEN embedding_column := 'embedding_384';
+    WHEN 768 THEN embedding_column := 'embedding_768';
+    WHEN 1024 THEN embedding_column := 'embedding_1024';
+    WHEN 1536 THEN embedding_column := 'embedding_1536';
+    WHEN 3072 THEN embedding_column := 'embedding_3072';
+    ELSE RAISE EXCEPTION 'Unsupported embedding dimension: %', vector_dims(query_embedding);
+  END CASE;
+
+  -- Route source-filtered searches to the source's partition
+  source_clause := CASE WHEN source_filter IS NULL THEN '' ELSE 'AND source_id = $6' END;
+
+  -- The hnsw scan returns at most ef_search rows before the metadata and
+  -- source filters apply; widen it so candidate_count rows can survive them
+  PERFORM set_config('hnsw.ef_search', greatest(candidate_count, 40)::text, true);
+
+  -- Candidates come from the coarse index, plus rows that have no coarse copy yet
+  sql_query := format('
+    WITH candidates AS (
+      (SELECT id, url, chunk_number, content, metadata, source_id, %I AS full_embedding
+       FROM archon_crawled_pages
+       WHERE embedding_coarse IS NOT NULL
+         AND %I IS NOT NULL
+         AND metadata @> $4
+         %s
+       ORDER BY embedding_coarse <=> $2
+       LIMIT $5)
+      UNION ALL
+      (SELECT id, url, chunk_number, content, metadata, source_id, %I AS full_embedding
+       FROM archon_crawled_pages
+       WHERE embedding_coarse IS NULL
+         AND %I IS NOT NULL
+         AND metadata @> $4
+         %s
+       ORDER BY %I <=> $1
+       LIMIT $3)
+    )
+    SELECT id, url, chunk_number, content, metadata, source_id,
+           1 - (full_embedding <=> $1) AS similarity
+    FROM candidates
+    ORDER BY full_embedding <=> $1
+    LIMIT $3',
+    embedding_column, embedding_column, source_clause,
+    embedding_column, embedding_column, source_clause, embedding_column);
+
+  RETURN QUERY EXECUTE sql_query
+    USING query_embedding, query_embedding_coarse, match_count, filter, candidate_count, source_filter;
+END;
+$$;
+
+CREATE OR REPLACE FUNCTION match_archon_code_examples_coarse (
+  query_embedding VECTOR,
+  query_embedding_coarse VECTOR(256),
+  match_count INT DEFAULT 10,
+  filter JSONB DEFAULT '{}'::jsonb,
+  source_filter TEXT DEFAULT NULL,
+  candidate_count INT DEFAULT 100
+) RETURNS TABLE (
+  id BIGINT,
+  url VARCHAR,
+  chunk_number INTEGER,
+  content TEXT,
+  summary TEXT,
+  metadata JSONB,
+  source_id TEXT,
+  similarity FLOAT
+)
+LANGUAGE plpgsql
+AS $$
+#variable_conflict use_column
+DECLARE
+  sql_query TEXT;
+  embedding_column TEXT;
+  source_clause TEXT;
+BEGIN
+  -- Determine which full embedding column to rescore on from the query dimension
+  CASE vector_dims(query_embedding)
+    WHEN 384 THEN embedding_column := 'embedding_384';
+    WHEN 768 THEN embedding_column := 'embedding_768';
+    WHEN 1024 THEN embedding_column := 'embedding_1024';
+    WHEN 1536 THEN embedding_column := 'embedding_1536';
+    WHEN 3072 THEN embedding_column := 'embedding_3072';
+    ELSE RAISE EXCEPTION 'Unsupported embedding dimension: %', vector_dims(query_embedding);
+  END CASE;
+
+  -- Route source-filtered searches to the source's partition
+  source_clause := CASE WHEN source_filter IS NULL THEN '' ELSE 'AND source_id = $6' END;
+
+  -- The hnsw scan returns at most ef_search rows before the metadata and
+  -- source filters apply; widen it so candidate_count rows can survive them
+  PERFORM set_config('hnsw.ef_search', greatest(candidate_count, 40)::text, true);
+
+  -- Candidates come from the coarse index, plus rows that have no coarse copy yet
+  sql_query := format('
+    WITH candidates AS (
+      (SELECT id, url, chunk_number, content, summary, metadata, source_id, %I AS full_embedding
+       FROM archon_code_examples
+       WHERE embedding_coarse IS NOT NULL
+         AND %I IS NOT NULL
+         AND metadata @> $4
+         %s
+       ORDER BY embedding_coarse <=> $2
+       LIMIT $5)
+      UNION ALL
+      (SELECT id, url, chunk_number, content, summary, metadata, source_id, %I AS full_embedding
+       FROM archon_code_examples
+       WHERE embedding_coarse IS NULL
+         AND %I IS NOT NULL
+         AND metadata @> $4
+         %s
+       ORDER BY %I <=> $1
+       LIMIT $3)
+    )
+    SELECT id, url, chunk_number, content, summary, metadata, source_id,
+           1 - (full_embedding <=> $1) AS similarity
+    FROM candidates
+    ORDER BY full_embedding <=> $1
+    LIMIT $3',
+    embedding_column, embedding_column, source_clause,
+    embedding_column, embedding_column, source_clause, embedding_column);
+
+  RETURN QUERY EXECUTE sql_query
+    USING query_embedding, query_embedding_coarse, match_count, filter, candidate_count, source_filter;
+END;
+$$;
+
+-- Enable two-stage search for Matryoshka-capable embedding models
+INSERT INTO archon_settings (key, value, is_encrypted, category, description)
+VALUES
+    ('USE_COARSE_EMBEDDING_SEARCH', 'true', false, 'rag_strategy', 'Stores a truncated 256-dimension copy of Matryoshka-capable embeddings and searches it first, rescoring candidates on the full vector')
+ON CONFLICT (key) DO NOTHING;
+
+COMMENT ON COLUMN archon_crawled_pages.embedding_coarse IS 'Renormalized leading 256 components of a Matryoshka embedding, for coarse ANN search';
+COMMENT ON COLUMN archon_code_examples.embedding_coarse IS 'Renormalized leading 256 components of a Matryoshka embedding, for coarse ANN search';
+COMMENT ON FUNCTION match_archon_crawled_pages_coarse IS 'Two-stage search: coarse ANN on embedding_coarse, exact rescoring on the full embedding';
+COMMENT ON FUNCTION match_archon_code_examples_coarse IS 'Two-stage search: coarse ANN on embedding_coarse, exact rescoring on the full embedding';
+
+-- Record migration application for tracking
+INSERT INTO archon_migrations (version, migration_name)
+VALUES ('0.1.0', '013_add_coarse_embeddings')
+ON CONFLICT (version, migration_name) DO NOTHING;
+
+-- =====================================================
+-- MIGRATION COMPLETE
+-- =====================================================
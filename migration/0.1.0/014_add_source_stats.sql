@@ -0,0 +1,222 @@
+-- =====================================================
+-- Add materialized per-source statistics
+-- =====================================================
+-- This migration adds archon_source_stats, one row per source holding the
+-- counts the knowledge listing shows, so listing a page of sources is a
+-- single primary-key lookup instead of one COUNT query per source.
+--
+-- Features:
+-- - chunk, code example and page counts, first URL, content bytes and
+--   last crawl time per source
+-- - Maintained by statement-level triggers on archon_crawled_pages and
+--   archon_code_examples (one upsert per source per INSERT/DELETE batch)
+-- - Removed together with its source (FK cascade); dropping a source's
+--   partitions does not need to touch it
+-- - Backfilled from existing data
+-- =====================================================
+
+CREATE TABLE IF NOT EXISTS archon_source_stats (
+    source_id TEXT PRIMARY KEY REFERENCES archon_sources(source_id) ON DELETE CASCADE,
+    chunk_count BIGINT NOT NULL DEFAULT 0,
+    code_example_count BIGINT NOT NULL DEFAULT 0,
+    page_count BIGINT NOT NULL DEFAULT 0,
+    first_url TEXT,
+    total_bytes BIGINT NOT NULL DEFAULT 0,
+    last_crawled_at TIMESTAMP WITH TIME ZONE,
+    updated_at TIMESTAMP WITH TIME ZONE DEFAULT timezone('utc'::text, now()) NOT NULL
+);
+
+-- =====================================================
+-- MAINTENANCE TRIGGERS
+-- =====================================================
+
+-- Chunks inserted: add counts, remember the first URL, stamp the crawl time
+CREATE OR REPLACE FUNCTION archon_source_stats_pages_inserted()
+RETURNS TRIGGER
+LANGUAGE plpgsql
+AS $$
+BEGIN
+    INSERT INTO archon_source_stats AS s
+        (source_id, chunk_count, page_count, total_bytes, first_url, last_crawled_at, updated_at)
+    SELECT source_id,
+           count(*),
+           count(*) FILTER (WHERE chunk_number = 0),
+           COALESCE(sum(octet_length(content)), 0),
+           (array_agg(url ORDER BY id))[1],
+           now(),
+           now()
+    FROM inserted_rows
+    GROUP BY source_id
+    ON CONFLICT (source_id) DO UPDATE SET
+        chunk_count = s.chunk_count + EXCLUDED.chunk_count,
+        page_count = s.page_count + EXCLUDED.page_count,
+        total_bytes = s.total_bytes + EXCLUDED.total_bytes,
+        first_url = COALESCE(s.first_url, EXCLUDED.first_url),
+        last_crawled_at = EXCLUDED.last_crawled_at,
+        updated_at = now();
+    RETURN NULL;
+END;
+$$;
+
+-- Chunks deleted: subtract counts, re-pick the first URL if it was removed
+CREATE OR REPLACE FUNCTION archon_source_stats_pages_deleted()
+RETURNS TRIGGER
+LANGUAGE plpgsql
+AS $$
+BEGIN
+    UPDATE archon_source_stats s SET
+        chunk_count = GREATEST(s.chunk_count - d.chunk_count, 0),
+        page_count = GREATEST(s.page_count - d.page_count, 0),
+        total_bytes = GREATEST(s.total_bytes - d.total_bytes, 0),
+        updated_at = now()
+    FROM (
+        SELECT source_id,
+               count(*) AS chunk_count,
+               count(*) FILTER (WHERE chunk_number = 0) AS page_count,
+               COALESCE(sum(octet_length(content)), 0) AS total_bytes
+        FROM deleted_rows
+        GROUP BY source_id
+    ) d
+    WHERE s.source_id = d.source_id;
+
+    UPDATE archon_source_stats s SET
+        first_url = (
+            SELECT p.url FROM archon_crawled_pages p
+            WHERE p.source_id = s.source_id
+            ORDER BY p.id
+            LIMIT 1
+        )
+    WHERE EXISTS (
+        SELECT 1 FROM deleted_rows d
+        WHERE d.source_id = s.source_id AND d.url = s.first_url
+    );
+    RETURN NULL;
+END;
+$$;
+
+CREATE OR REPLACE FUNCTION archon_source_stats_code_inserted()
+RETURNS TRIGGER
+LANGUAGE plpgsql
+AS $$
+BEGIN
+    INSERT INTO archon_source_stats AS s (source_id, code_example_count, updated_at)
+    SELECT source_id, count(*), now()
+    FROM inserted_rows
+    GROUP BY source_id
+    ON CONFLICT (source_id) DO UPDATE SET
+        code_example_count = s.code_example_count + EXCLUDED.code_example_count,
+        updated_at = now();
+    RETURN NULL;
+END;
+$$;
+
+CREATE OR REPLACE FUNCTION archon_source_stats_code_deleted()
+RETURNS TRIGGER
+LANGUAGE plpgsql
+AS $$
+BEGIN
+    UPDATE archon_source_stats s SET
+        code_example_count = GREATEST(s.code_example_count - d.code_example_count, 0),
+        updated_at = now()
+    FROM (
+        SELECT source_id, count(*) AS code_example_count
+        FROM deleted_rows
+        GROUP BY source_id
+    ) d
+    WHERE s.source_id = d.source_id;
+    RETURN NULL;
+END;
+$$;
+
+DROP TRIGGER IF EXISTS archon_source_stats_pages_insert_trigger ON archon_crawled_pages;
+CREATE TRIGGER archon_source_stats_pages_insert_trigger
+    AFTER INSERT ON archon_crawled_pages
+    REFERENCING NEW TABLE AS inserted_rows
+    FOR EACH STATEMENT
+    EXECUTE FUNCTION archon_source_stats_pages_inserted();
+
+DROP TRIGGER IF EXISTS archon_source_stats_pages_delete_trigger ON archon_crawled_pages;
+CREATE TRIGGER archon_source_stats_pages_delete_trigger
+    AFTER DELETE ON archon_crawled_pages
+    REFERENCING OLD TABLE AS deleted_rows
+    FOR EACH STATEMENT
+    EXECUTE FUNCTION archon_source_stats_pages_deleted();
+
+DROP TRIGGER IF EXISTS archon_source_stats_code_insert_trigger ON archon_code_examples;
+CREATE TRIGGER archon_source_stats_code_insert_trigger
+    AFTER INSERT ON archon_code_examples
+    REFERENCING NEW TABLE AS inserted_rows
+    FOR EACH STATEMENT
+    EXECUTE FUNCTION archon_source_stats_code_inserted();
+
+DROP TRIGGER IF EXISTS archon_source_stats_code_delete_trigger ON archon_code_examples;
+CREATE TRIGGER archon_source_stats_code_delete_trigger
+    AFTER DELETE ON archon_code_examples
+    REFERENCING OLD TABLE AS deleted_rows
+    FOR EACH STATEMENT
+    EXECUTE FUNCTION archon_source_stats_code_deleted();
+
+-- =====================================================
+-- BACKFILL
+-- =====================================================
+
+INSERT INTO archon_source_stats
+    (source_id, chunk_count, code_example_count, page_count, first_url, total_bytes, last_crawled_at)
+SELECT s.source_id,
+       COALESCE(p.chunk_count, 0),
+       COALESCE(c.code_example_count, 0),
+       COALESCE(p.page_count, 0),
+       p.first_url,
+       COALESCE(p.total_bytes, 0),
+       p.last_crawled_at
+FROM archon_sources s
+LEFT JOIN (
+    SELECT source_id,
+           count(*) AS chunk_count,
+           count(*) FILTER (WHERE chunk_number = 0) AS page_count,
+           (array_agg(url ORDER BY id))[1] AS first_url,
+           sum(octet_length(content)) AS total_bytes,
+           max(created_at) AS last_crawled_at
+    FROM archon_crawled_pages
+    GROUP BY source_id
+) p ON p.source_id = s.source_id
+LEFT JOIN (
+    SELECT source_id, count(*) AS code_example_count
+    FROM archon_code_examples
+    GROUP BY source_id
+) c ON c.source_id = s.source_id
+ON CONFLICT (source_id) DO UPDATE SET
+    chunk_count = EXCLUDED.chunk_count,
+    code_example_count = EXCLUDED.code_example_count,
+    page_count = EXCLUDED.page_count,
+    first_url = EXCLUDED.first_url,
+    total_bytes = EXCLUDED.total_bytes,
+    last_crawled_at = EXCLUDED.last_crawled_at,
+    updated_at = now();
+
+-- =====================================================
+-- RLS
+-- =====================================================
+
+ALTER TABLE archon_source_stats ENABLE ROW LEVEL SECURITY;
+
+DROP POLICY IF EXISTS "Allow public read access to archon_source_stats" ON archon_source_stats;
+CREATE POLICY "Allow public read access to archon_source_stats"
+  ON archon_source_stats
+  FOR SELECT
+  TO public
+  USING (true);
+
+COMMENT ON TABLE archon_source_stats IS 'Per-source counts for knowledge listings, maintained by triggers on the knowledge tables';
+COMMENT ON COLUMN archon_source_stats.page_count IS 'Number of distinct pages (chunks with chunk_number 0)';
+COMMENT ON COLUMN archon_source_stats.first_url IS 'URL of the earliest stored chunk of the source';
+COMMENT ON COLUMN archon_source_stats.total_bytes IS 'Total bytes of stored chunk content';
+
+-- Record migration application for tracking
+INSERT INTO archon_migrations (version, migration_name)
+VALUES ('0.1.0', '014_add_source_stats')
+ON CONFLICT (version, migration_name) DO NOTHING;
+
+-- =====================================================
+-- MIGRATION COMPLETE
+-- =====================================================
@@ -0,0 +1,55 @@
+-- =====================================================
+-- Add shared operation progress
+-- =====================================================
+-- This migration adds archon_operation_progress, used when the API runs
+-- with several worker processes (PROGRESS_BACKEND=supabase). The worker
+-- running a crawl or upload mirrors its progress here so any worker can
+-- answer progress polls, list active operations and record stop requests.
+--
+-- Features:
+-- - Latest progress state per operation (JSONB) with status and owner
+-- - cancel_requested flag picked up by the owning worker
+-- - Rows are removed by the owning worker after the operation finishes;
+--   rows of workers that died are ignored once updated_at is stale
+-- =====================================================
+
+CREATE TABLE IF NOT EXISTS archon_operation_progress (
+    progress_id TEXT PRIMARY KEY,
+    operation_type TEXT,
+    status TEXT,
+    state JSONB NOT NULL DEFAULT '{}'::jsonb,
+    owner_id TEXT NOT NULL,
+    cancel_requested BOOLEAN NOT NULL DEFAULT false,
+    created_at TIMESTAMP WITH TIME ZONE DEFAULT timezone('utc'::text, now()) NOT NULL,
+    updated_at TIMESTAMP WITH TIME ZONE DEFAULT timezone('utc'::text, now()) NOT NULL
+);
+
+CREATE INDEX IF NOT EXISTS idx_archon_operation_progress_updated_at
+    ON archon_operation_progress(updated_at);
+
+CREATE INDEX IF NOT EXISTS idx_archon_operation_progress_cancel_requested
+    ON archon_operation_progress(owner_id)
+    WHERE cancel_requested;
+
+-- =====================================================
+-- RLS
+-- =====================================================
+
+ALTER TABLE archon_operation_progress ENABLE ROW LEVEL SECURITY;
+
+DROP POLICY IF EXISTS "Allow service role full access to archon_operation_progress" ON archon_operation_progress;
+CREATE POLICY "Allow service role full access to archon_operation_progress" ON archon_operation_progress
+    FOR ALL USING (auth.role() = 'service_role');
+
+COMMENT ON TABLE archon_operation_progress IS 'Progress of running crawl and upload operations, shared between API worker processes';
+COMMENT ON COLUMN archon_operation_progress.owner_id IS 'Worker process (host:pid) running the operation';
+COMMENT ON COLUMN archon_operation_progress.cancel_requested IS 'Set by any worker to ask the owner to stop the operation';
+
+-- Record migration application for tracking
+INSERT INTO archon_migrations (version, migration_name)
+VALUES ('0.1.0', '015_add_operation_progress')
+ON CONFLICT (version, migration_name) DO NOTHING;
+
+-- =====================================================
+-- MIGRATION COMPLETE
+-- =====================================================
@@ -0,0 +1,67 @@
+-- =====================================================
+-- Add index-backed task listing, search and counts
+-- =====================================================
+-- This migration keeps task listings fast with tens of thousands of tasks.
+--
+-- Features:
+-- - task_order becomes NOT NULL (NULLs set to 0) so the keyset cursor
+--   (task_order, created_at, id) always has a position to resume from
+-- - Composite indexes matching the (task_order, created_at, id) keyset
+--   order used for paginated task listings, with and without project filter
+-- - Trigram indexes so the ilike keyword search on title, description and
+--   feature no longer scans the whole table
+-- - get_task_counts_by_project(): per-project, per-status counts of
+--   non-archived tasks aggregated in the database
+-- =====================================================
+
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+
+-- Keyset pagination
+UPDATE archon_tasks SET task_order = 0 WHERE task_order IS NULL;
+ALTER TABLE archon_tasks
+    ALTER COLUMN task_order SET DEFAULT 0,
+    ALTER COLUMN task_order SET NOT NULL;
+
+CREATE INDEX IF NOT EXISTS idx_archon_tasks_keyset
+    ON archon_tasks (task_order, created_at, id);
+
+CREATE INDEX IF NOT EXISTS idx_archon_tasks_project_keyset
+    ON archon_tasks (project_id, task_order, created_at, id);
+
+-- Keyword search (ilike '%term%')
+CREATE INDEX IF NOT EXISTS idx_archon_tasks_title_trgm
+    ON archon_tasks USING gin (title gin_trgm_ops);
+
+CREATE INDEX IF NOT EXISTS idx_archon_tasks_description_trgm
+    ON archon_tasks USING gin (description gin_trgm_ops);
+
+CREATE INDEX IF NOT EXISTS idx_archon_tasks_feature_trgm
+    ON archon_tasks USING gin (feature gin_trgm_ops);
+
+-- Grouped task counts for the project list
+CREATE OR REPLACE FUNCTION get_task_counts_by_project()
+RETURNS TABLE (
+    project_id UUID,
+    status TEXT,
+    task_count BIGINT
+)
+LANGUAGE sql
+STABLE
+AS $$
+    SELECT t.project_id, t.status::text, count(*)
+    FROM archon_tasks t
+    WHERE t.archived IS NOT TRUE
+      AND t.project_id IS NOT NULL
+    GROUP BY t.project_id, t.status;
+$$;
+
+COMMENT ON FUNCTION get_task_counts_by_project() IS 'Non-archived task counts per project and status';
+
+-- Record migration application for tracking
+INSERT INTO archon_migrations (version, migration_name)
+VALUES ('0.1.0', '016_add_task_search_and_counts')
+ON CONFLICT (version, migration_name) DO NOTHING;
+
+-- =====================================================
+-- MIGRATION COMPLETE
+-- =====================================================
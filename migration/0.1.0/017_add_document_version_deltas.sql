@@ -0,0 +1,97 @@
+-- =====================================================
+-- Add delta-encoded document versions
+-- =====================================================
+-- This migration stops archon_document_versions from storing a full copy of
+-- a project field on every edit.
+--
+-- Features:
+-- - is_keyframe / delta columns: keyframe rows keep the full content, the
+--   rows between keyframes store a JSON patch (RFC 6902) against the
+--   previous version; existing rows become keyframes
+-- - content is only required on keyframe rows
+-- - Index for finding the nearest keyframe of a field
+-- - create_document_version(): assigns the next version number under a
+--   per-field lock and rejects deltas computed against an outdated version
+-- =====================================================
+
+ALTER TABLE archon_document_versions
+    ADD COLUMN IF NOT EXISTS is_keyframe BOOLEAN NOT NULL DEFAULT TRUE,
+    ADD COLUMN IF NOT EXISTS delta JSONB;
+
+ALTER TABLE archon_document_versions
+    ALTER COLUMN content DROP NOT NULL;
+
+ALTER TABLE archon_document_versions
+    DROP CONSTRAINT IF EXISTS chk_version_payload;
+
+ALTER TABLE archon_document_versions
+    ADD CONSTRAINT chk_version_payload CHECK (
+        (is_keyframe AND content IS NOT NULL) OR
+        (NOT is_keyframe AND delta IS NOT NULL)
+    );
+
+CREATE INDEX IF NOT EXISTS idx_archon_document_versions_field_version
+    ON archon_document_versions (project_id, field_name, version_number DESC);
+
+CREATE INDEX IF NOT EXISTS idx_archon_document_versions_keyframes
+    ON archon_document_versions (project_id, field_name, version_number DESC)
+    WHERE is_keyframe;
+
+COMMENT ON COLUMN archon_document_versions.content IS 'Full snapshot of field content (keyframe versions only)';
+COMMENT ON COLUMN archon_document_versions.is_keyframe IS 'TRUE if content holds the full snapshot, FALSE if delta must be applied to the previous version';
+COMMENT ON COLUMN archon_document_versions.delta IS 'JSON patch (RFC 6902) from the previous version to this one (non-keyframe versions only)';
+
+-- Atomic version numbering
+CREATE OR REPLACE FUNCTION create_document_version(
+    p_project_id UUID,
+    p_field_name TEXT,
+    p_base_version INTEGER,
+    p_is_keyframe BOOLEAN,
+    p_content JSONB,
+    p_delta JSONB,
+    p_change_summary TEXT,
+    p_change_type TEXT DEFAULT 'update',
+    p_document_id TEXT DEFAULT NULL,
+    p_created_by TEXT DEFAULT 'system'
+)
+RETURNS SETOF archon_document_versions
+LANGUAGE plpgsql
+AS $$
+DECLARE
+    current_version INTEGER;
+BEGIN
+    PERFORM pg_advisory_xact_lock(hashtext(p_project_id::text || ':' || p_field_name));
+
+    SELECT max(version_number) INTO current_version
+    FROM archon_document_versions
+    WHERE project_id = p_project_id AND field_name = p_field_name;
+
+    -- A delta is only valid on top of the version it was computed from
+    IF current_version IS DISTINCT FROM p_base_version THEN
+        RAISE EXCEPTION 'version conflict: latest version is %, expected %',
+            current_version, p_base_version;
+    END IF;
+
+    RETURN QUERY
+    INSERT INTO archon_document_versions (
+        project_id, field_name, version_number, is_keyframe, content, delta,
+        change_summary, change_type, document_id, created_by
+    )
+    VALUES (
+        p_project_id, p_field_name, COALESCE(current_version, 0) + 1, p_is_keyframe,
+        p_content, p_delta, p_change_summary, p_change_type, p_document_id, p_created_by
+    )
+    RETURNING *;
+END;
+$$;
+
+COMMENT ON FUNCTION create_document_version(UUID, TEXT, INTEGER, BOOLEAN, JSONB, JSONB, TEXT, TEXT, TEXT, TEXT) IS 'Insert the next version of a project field, numbered under a per-field lock';
+
+-- Record migration application for tracking
+INSERT INTO archon_migrations (version, migration_name)
+VALUES ('0.1.0', '017_add_document_version_deltas')
+ON CONFLICT (version, migration_name) DO NOTHING;
+
+-- =====================================================
+-- MIGRATION COMPLETE
+-- =====================================================
@@ -0,0 +1,175 @@
+-- =====================================================
+-- Move project documents into their own table
+-- =====================================================
+-- This migration stores each project document as a row instead of an
+-- element of the archon_projects.docs JSONB array, so adding, editing or
+-- deleting a document touches one row and project listings no longer
+-- read document bodies.
+--
+-- Features:
+-- - archon_project_documents table keyed by (project_id, id), ordered by
+--   position, with unknown legacy keys kept in extra
+-- - Positions of new documents assigned in the INSERT (trigger), so
+--   concurrent adds cannot pick the same position
+-- - content_size generated column so document listings can report sizes
+--   without reading content
+-- - Copies existing docs arrays into the table and empties
+--   archon_projects.docs (the column is kept but no longer written)
+-- - archon_projects_with_docs view exposing the old JSONB layout for
+--   clients that read docs from the project row
+-- - count_project_documents(): per-project document counts aggregated in
+--   the database for the project list
+-- =====================================================
+
+CREATE TABLE IF NOT EXISTS archon_project_documents (
+    id TEXT NOT NULL DEFAULT gen_random_uuid()::text,
+    project_id UUID NOT NULL REFERENCES archon_projects(id) ON DELETE CASCADE,
+    position INTEGER NOT NULL,
+    document_type TEXT,
+    title TEXT,
+    content JSONB NOT NULL DEFAULT '{}'::jsonb,
+    tags JSONB NOT NULL DEFAULT '[]'::jsonb,
+    status TEXT DEFAULT 'draft',
+    version TEXT DEFAULT '1.0',
+    author TEXT,
+    extra JSONB NOT NULL DEFAULT '{}'::jsonb,
+    content_size INTEGER GENERATED ALWAYS AS (octet_length(content::text)) STORED,
+    created_at TIMESTAMPTZ DEFAULT NOW(),
+    updated_at TIMESTAMPTZ DEFAULT NOW(),
+    PRIMARY KEY (project_id, id)
+);
+
+CREATE INDEX IF NOT EXISTS idx_archon_project_documents_position
+    ON archon_project_documents (project_id, position);
+
+CREATE OR REPLACE TRIGGER update_archon_project_documents_updated_at
+    BEFORE UPDATE ON archon_project_documents
+    FOR EACH ROW EXECUTE FUNCTION update_updated_at_column();
+
+-- New documents inserted without a position go after the project's last
+-- document. The per-project advisory lock makes concurrent adds wait for
+-- each other, so two documents never get the same position.
+CREATE OR REPLACE FUNCTION assign_project_document_position()
+RETURNS TRIGGER
+LANGUAGE plpgsql
+AS $$
+BEGIN
+    IF NEW.position IS NULL THEN
+        PERFORM pg_advisory_xact_lock(hashtext('archon_project_documents:' || NEW.project_id::text));
+        SELECT COALESCE(max(doc.position) + 1, 0) INTO NEW.position
+        FROM archon_project_documents doc
+        WHERE doc.project_id = NEW.project_id;
+    END IF;
+    RETURN NEW;
+END;
+$$;
+
+CREATE OR REPLACE TRIGGER assign_archon_project_documents_position
+    BEFORE INSERT ON archon_project_documents
+    FOR EACH ROW EXECUTE FUNCTION assign_project_document_position();
+
+ALTER TABLE archon_project_documents ENABLE ROW LEVEL SECURITY;
+
+DROP POLICY IF EXISTS "Allow service role full access to archon_project_documents" ON archon_project_documents;
+CREATE POLICY "Allow service role full access to archon_project_documents" ON archon_project_documents
+    FOR ALL USING (auth.role() = 'service_role');
+
+DROP POLICY IF EXISTS "Allow authenticated users to manage archon_project_documents" ON archon_project_documents;
+CREATE POLICY "Allow authenticated users to manage archon_project_documents" ON archon_project_documents
+    FOR ALL TO authenticated
+    USING (true);
+
+-- Copy documents out of the JSONB arrays
+INSERT INTO archon_project_documents (
+    id, project_id, position, document_type, title, content, tags, status, version, author,
+    extra, created_at, updated_at
+)
+SELECT
+    COALESCE(NULLIF(doc->>'id', ''), gen_random_uuid()::text),
+    p.id,
+    (ordinality - 1)::integer,
+    doc->>'document_type',
+    doc->>'title',
+    COALESCE(doc->'content', '{}'::jsonb),
+    CASE WHEN jsonb_typeof(doc->'tags') = 'array' THEN doc->'tags' ELSE '[]'::jsonb END,
+    COALESCE(doc->>'status', 'draft'),
+    COALESCE(doc->>'version', '1.0'),
+    doc->>'author',
+    doc - ARRAY['id', 'document_type', 'title', 'content', 'tags', 'status', 'version',
+                'author', 'created_at', 'updated_at'],
+    COALESCE((doc->>'created_at')::timestamptz, p.created_at),
+    COALESCE((doc->>'updated_at')::timestamptz, p.updated_at)
+FROM archon_projects p
+CROSS JOIN LATERAL jsonb_array_elements(
+    CASE WHEN jsonb_typeof(p.docs) = 'array' THEN p.docs ELSE '[]'::jsonb END
+) WITH ORDINALITY AS elements(doc, ordinality)
+WHERE jsonb_typeof(doc) = 'object'
+ON CONFLICT (project_id, id) DO NOTHING;
+
+UPDATE archon_projects SET docs = '[]'::jsonb WHERE docs IS DISTINCT FROM '[]'::jsonb;
+
+-- Old JSONB layout, assembled from the documents table
+CREATE OR REPLACE VIEW archon_projects_with_docs AS
+SELECT
+    p.id,
+    p.title,
+    p.description,
+    COALESCE(d.docs, '[]'::jsonb) AS docs,
+    p.features,
+    p.data,
+    p.github_repo,
+    p.pinned,
+    p.created_at,
+    p.updated_at
+FROM archon_projects p
+LEFT JOIN LATERAL (
+    SELECT jsonb_agg(
+        doc.extra || jsonb_build_object(
+            'id', doc.id,
+            'document_type', doc.document_type,
+            'title', doc.title,
+            'content', doc.content,
+            'tags', doc.tags,
+            'status', doc.status,
+            'version', doc.version,
+            'author', doc.author,
+            'created_at', doc.created_at,
+            'updated_at', doc.updated_at
+        )
+        ORDER BY doc.position, doc.created_at
+    ) AS docs
+    FROM archon_project_documents doc
+    WHERE doc.project_id = p.id
+) d ON true;
+
+-- Grouped document counts for the project list
+CREATE OR REPLACE FUNCTION count_project_documents(p_project_ids UUID[])
+RETURNS TABLE (
+    project_id UUID,
+    document_count BIGINT
+)
+LANGUAGE sql
+STABLE
+AS $$
+    SELECT doc.project_id, count(*)
+    FROM archon_project_documents doc
+    WHERE doc.project_id = ANY(p_project_ids)
+    GROUP BY doc.project_id;
+$$;
+
+COMMENT ON TABLE archon_project_documents IS 'Project documents, one row per document (formerly the archon_projects.docs array)';
+COMMENT ON COLUMN archon_project_documents.position IS 'Order of the document within its project (assigned on insert when omitted)';
+COMMENT ON COLUMN archon_project_documents.extra IS 'Document keys without a dedicated column';
+COMMENT ON COLUMN archon_projects.docs IS 'DEPRECATED: documents live in archon_project_documents; read archon_projects_with_docs for the JSONB layout';
+COMMENT ON VIEW archon_projects_with_docs IS 'archon_projects with docs assembled from archon_project_documents (compatibility layout)';
+COMMENT ON FUNCTION count_project_documents(UUID[]) IS 'Document counts of the given projects';
+COMMENT ON FUNCTION assign_project_document_position() IS 'Places a new document after the last document of its project';
+
+-- Record migration application for tracking
+INSERT INTO archon_migrations (version, migration_name)
+VALUES ('0.1.0', '018_add_project_documents_table')
+ON CONFLICT (version, migration_name) DO NOTHING;
+
+-- =====================================================
+-- MIGRATION COMPLETE
+-- =====================================================
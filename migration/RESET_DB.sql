@@ -44,6 +44,9 @@ BEGIN
     -- Code examples policies
     DROP POLICY IF EXISTS "Allow public read access to archon_code_examples" ON archon_code_examples;
     
+    -- Source stats policies
+    DROP POLICY IF EXISTS "Allow public read access to archon_source_stats" ON archon_source_stats;
+    
     -- Projects policies
     DROP POLICY IF EXISTS "Allow service role full access to archon_projects" ON archon_projects;
     DROP POLICY IF EXISTS "Allow authenticated users to read and update archon_projects" ON archon_projects;
@@ -52,6 +55,10 @@ BEGIN
     DROP POLICY IF EXISTS "Allow service role full access to archon_tasks" ON archon_tasks;
     DROP POLICY IF EXISTS "Allow authenticated users to read and update archon_tasks" ON archon_tasks;
     
+    -- Project documents policies
+    DROP POLICY IF EXISTS "Allow service role full access to archon_project_documents" ON archon_project_documents;
+    DROP POLICY IF EXISTS "Allow authenticated users to manage archon_project_documents" ON archon_project_documents;
+    
     -- Project sources policies
     DROP POLICY IF EXISTS "Allow service role full access to archon_project_sources" ON archon_project_sources;
     DROP POLICY IF EXISTS "Allow authenticated users to read and update archon_project_sources" ON archon_project_sources;
@@ -68,6 +75,9 @@ BEGIN
     DROP POLICY IF EXISTS "Allow service role full access to archon_migrations" ON archon_migrations;
     DROP POLICY IF EXISTS "Allow authenticated users to read archon_migrations" ON archon_migrations;
 
+    -- Shared operation progress policies
+    DROP POLICY IF EXISTS "Allow service role full access to archon_operation_progress" ON archon_operation_progress;
+
     -- Legacy table policies (for migration from old schema)
     DROP POLICY IF EXISTS "Allow service role full access" ON settings;
     DROP POLICY IF EXISTS "Allow authenticated users to read and update" ON settings;
@@ -111,6 +121,7 @@ BEGIN
     -- Tasks table triggers
     DROP TRIGGER IF EXISTS update_archon_tasks_updated_at ON archon_tasks;
     DROP TRIGGER IF EXISTS update_tasks_updated_at ON tasks;
+    DROP TRIGGER IF EXISTS update_archon_project_documents_updated_at ON archon_project_documents;
     
     -- Prompts table triggers
     DROP TRIGGER IF EXISTS update_archon_prompts_updated_at ON archon_prompts;
@@ -141,12 +152,31 @@ BEGIN
     DROP FUNCTION IF EXISTS hybrid_search_archon_crawled_pages(vector, text, int, jsonb, text) CASCADE;
     DROP FUNCTION IF EXISTS hybrid_search_archon_code_examples(vector, text, int, jsonb, text) CASCADE;
     
+    -- Two-stage (coarse + rescore) search functions
+    DROP FUNCTION IF EXISTS match_archon_crawled_pages_coarse(vector, vector, int, jsonb, text, int) CASCADE;
+    DROP FUNCTION IF EXISTS match_archon_code_examples_coarse(vector, vector, int, jsonb, text, int) CASCADE;
+    
     -- Search functions (old without prefix)
     DROP FUNCTION IF EXISTS match_crawled_pages(vector, int, jsonb, text) CASCADE;
     DROP FUNCTION IF EXISTS match_code_examples(vector, int, jsonb, text) CASCADE;
     
     -- Task management functions
     DROP FUNCTION IF EXISTS archive_task(UUID, TEXT) CASCADE;
+    DROP FUNCTION IF EXISTS get_task_counts_by_project() CASCADE;
+    DROP FUNCTION IF EXISTS create_document_version(UUID, TEXT, INTEGER, BOOLEAN, JSONB, JSONB, TEXT, TEXT, TEXT, TEXT) CASCADE;
+    
+    -- Source partition management functions
+    DROP FUNCTION IF EXISTS archon_sources_create_partitions() CASCADE;
+    DROP FUNCTION IF EXISTS archon_delete_source(TEXT) CASCADE;
+    DROP FUNCTION IF EXISTS archon_drop_source_partitions(TEXT) CASCADE;
+    DROP FUNCTION IF EXISTS archon_ensure_source_partitions(TEXT) CASCADE;
+    DROP FUNCTION IF EXISTS archon_source_partition_name(TEXT, TEXT) CASCADE;
+    
+    -- Source stats maintenance functions
+    DROP FUNCTION IF EXISTS archon_source_stats_pages_inserted() CASCADE;
+    DROP FUNCTION IF EXISTS archon_source_stats_pages_deleted() CASCADE;
+    DROP FUNCTION IF EXISTS archon_source_stats_code_inserted() CASCADE;
+    DROP FUNCTION IF EXISTS archon_source_stats_code_deleted() CASCADE;
     
     RAISE NOTICE 'Functions dropped successfully.';
     
@@ -166,12 +196,15 @@ BEGIN
     
     -- Project System (complex dependencies) - new archon_ prefixed tables
     DROP TABLE IF EXISTS archon_document_versions CASCADE;
+    DROP VIEW IF EXISTS archon_projects_with_docs CASCADE;
+    DROP TABLE IF EXISTS archon_project_documents CASCADE;
     DROP TABLE IF EXISTS archon_project_sources CASCADE;
     DROP TABLE IF EXISTS archon_tasks CASCADE;
     DROP TABLE IF EXISTS archon_projects CASCADE;
     DROP TABLE IF EXISTS archon_prompts CASCADE;
     
     -- Knowledge Base System - new archon_ prefixed tables
+    DROP TABLE IF EXISTS archon_source_stats CASCADE;
     DROP TABLE IF EXISTS archon_code_examples CASCADE;
     DROP TABLE IF EXISTS archon_crawled_pages CASCADE;
     DROP TABLE IF EXISTS archon_sources CASCADE;
@@ -182,6 +215,9 @@ BEGIN
     -- Migration tracking table
     DROP TABLE IF EXISTS archon_migrations CASCADE;
 
+    -- Shared operation progress
+    DROP TABLE IF EXISTS archon_operation_progress CASCADE;
+
     -- Legacy tables (without archon_ prefix) - for migration purposes
     DROP TABLE IF EXISTS document_versions CASCADE;
     DROP TABLE IF EXISTS project_sources CASCADE;
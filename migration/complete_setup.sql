@@ -80,7 +80,8 @@ INSERT INTO archon_settings (key, value, is_encrypted, category, description) VA
 ('CONTEXTUAL_EMBEDDINGS_MAX_WORKERS', '3', false, 'rag_strategy', 'Maximum parallel workers for contextual embedding generation (1-10)'),
 ('USE_HYBRID_SEARCH', 'true', false, 'rag_strategy', 'Combines vector similarity search with keyword search for better results'),
 ('USE_AGENTIC_RAG', 'true', false, 'rag_strategy', 'Enables code example extraction, storage, and specialized code search functionality'),
-('USE_RERANKING', 'true', false, 'rag_strategy', 'Applies cross-encoder reranking to improve search result relevance');
+('USE_RERANKING', 'true', false, 'rag_strategy', 'Applies cross-encoder reranking to improve search result relevance'),
+('USE_COARSE_EMBEDDING_SEARCH', 'true', false, 'rag_strategy', 'Stores a truncated 256-dimension copy of Matryoshka-capable embeddings and searches it first, rescoring candidates on the full vector');
 
 -- Monitoring Configuration
 INSERT INTO archon_settings (key, value, is_encrypted, category, description) VALUES
@@ -199,8 +200,11 @@ COMMENT ON COLUMN archon_sources.title IS 'Descriptive title for the source (e.g
 COMMENT ON COLUMN archon_sources.metadata IS 'JSONB field storing knowledge_type, tags, and other metadata';
 
 -- Create the documentation chunks table
+-- Partitioned by source so source-filtered searches only scan that source's
+-- partition and its own ANN index. Partitions are created per source by
+-- archon_ensure_source_partitions() (see SECTION 4.6).
 CREATE TABLE IF NOT EXISTS archon_crawled_pages (
-    id BIGSERIAL PRIMARY KEY,
+    id BIGSERIAL,
     url VARCHAR NOT NULL,
     chunk_number INTEGER NOT NULL,
     content TEXT NOT NULL,
@@ -212,6 +216,7 @@ CREATE TABLE IF NOT EXISTS archon_crawled_pages (
     embedding_1024 VECTOR(1024), -- Ollama large models
     embedding_1536 VECTOR(1536), -- OpenAI standard models
     embedding_3072 VECTOR(3072), -- OpenAI large models
+    embedding_coarse VECTOR(256), -- Truncated Matryoshka copy for coarse ANN search
     -- Model tracking columns
     llm_chat_model TEXT,                -- LLM model used for processing (e.g., 'gpt-4', 'llama3:8b')
     embedding_model TEXT,                -- Embedding model used (e.g., 'text-embedding-3-large', 'all-MiniLM-L6-v2')
@@ -220,24 +225,31 @@ CREATE TABLE IF NOT EXISTS archon_crawled_pages (
     content_search_vector tsvector GENERATED ALWAYS AS (to_tsvector('english', content)) STORED,
     created_at TIMESTAMP WITH TIME ZONE DEFAULT timezone('utc'::text, now()) NOT NULL,
 
+    -- Primary and unique keys must include the partition key
+    CONSTRAINT archon_crawled_pages_part_pkey PRIMARY KEY (source_id, id),
+
     -- Add a unique constraint to prevent duplicate chunks for the same URL
-    UNIQUE(url, chunk_number),
+    CONSTRAINT archon_crawled_pages_part_url_chunk_key UNIQUE (source_id, url, chunk_number),
 
     -- Add foreign key constraint to sources table with CASCADE DELETE
-    FOREIGN KEY (source_id) REFERENCES archon_sources(source_id) ON DELETE CASCADE
-);
-
--- Multi-dimensional indexes
-CREATE INDEX IF NOT EXISTS idx_archon_crawled_pages_embedding_384 ON archon_crawled_pages USING ivfflat (embedding_384 vector_cosine_ops) WITH (lists = 100);
-CREATE INDEX IF NOT EXISTS idx_archon_crawled_pages_embedding_768 ON archon_crawled_pages USING ivfflat (embedding_768 vector_cosine_ops) WITH (lists = 100);
-CREATE INDEX IF NOT EXISTS idx_archon_crawled_pages_embedding_1024 ON archon_crawled_pages USING ivfflat (embedding_1024 vector_cosine_ops) WITH (lists = 100);
-CREATE INDEX IF NOT EXISTS idx_archon_crawled_pages_embedding_1536 ON archon_crawled_pages USING ivfflat (embedding_1536 vector_cosine_ops) WITH (lists = 100);
+    CONSTRAINT archon_crawled_pages_part_source_fk FOREIGN KEY (source_id)
+        REFERENCES archon_sources(source_id) ON DELETE CASCADE
+) PARTITION BY LIST (source_id);
+
+-- Multi-dimensional indexes (partitioned: every source partition gets its own)
+-- hnsw rather than ivfflat, because ivfflat trains on the rows present at
+-- build time and new source partitions start empty
+CREATE INDEX IF NOT EXISTS idx_archon_crawled_pages_embedding_384 ON archon_crawled_pages USING hnsw (embedding_384 vector_cosine_ops);
+CREATE INDEX IF NOT EXISTS idx_archon_crawled_pages_embedding_768 ON archon_crawled_pages USING hnsw (embedding_768 vector_cosine_ops);
+CREATE INDEX IF NOT EXISTS idx_archon_crawled_pages_embedding_1024 ON archon_crawled_pages USING hnsw (embedding_1024 vector_cosine_ops);
+CREATE INDEX IF NOT EXISTS idx_archon_crawled_pages_embedding_1536 ON archon_crawled_pages USING hnsw (embedding_1536 vector_cosine_ops);
+CREATE INDEX IF NOT EXISTS idx_archon_crawled_pages_embedding_coarse ON archon_crawled_pages USING hnsw (embedding_coarse vector_cosine_ops);
 -- Note: 3072-dimensional embeddings cannot have vector indexes due to PostgreSQL vector extension 2000 dimension limit
 -- The embedding_3072 column exists but cannot be indexed with current pgvector version
 
 -- Other indexes for archon_crawled_pages
 CREATE INDEX idx_archon_crawled_pages_metadata ON archon_crawled_pages USING GIN (metadata);
-CREATE INDEX idx_archon_crawled_pages_source_id ON archon_crawled_pages (source_id);
+CREATE INDEX idx_archon_crawled_pages_url ON archon_crawled_pages (url);
 -- Hybrid search indexes
 CREATE INDEX idx_archon_crawled_pages_content_search ON archon_crawled_pages USING GIN (content_search_vector);
 CREATE INDEX idx_archon_crawled_pages_content_trgm ON archon_crawled_pages USING GIN (content gin_trgm_ops);
@@ -247,8 +259,9 @@ CREATE INDEX idx_archon_crawled_pages_embedding_dimension ON archon_crawled_page
 CREATE INDEX idx_archon_crawled_pages_llm_chat_model ON archon_crawled_pages (llm_chat_model);
 
 -- Create the code_examples table
+-- Partitioned by source, like archon_crawled_pages
 CREATE TABLE IF NOT EXISTS archon_code_examples (
-    id BIGSERIAL PRIMARY KEY,
+    id BIGSERIAL,
     url VARCHAR NOT NULL,
     chunk_number INTEGER NOT NULL,
     content TEXT NOT NULL,  -- The code example content
@@ -261,6 +274,7 @@ CREATE TABLE IF NOT EXISTS archon_code_examples (
     embedding_1024 VECTOR(1024), -- Ollama large models
     embedding_1536 VECTOR(1536), -- OpenAI standard models
     embedding_3072 VECTOR(3072), -- OpenAI large models
+    embedding_coarse VECTOR(256), -- Truncated Matryoshka copy for coarse ANN search
     -- Model tracking columns
     llm_chat_model TEXT,                -- LLM model used for processing (e.g., 'gpt-4', 'llama3:8b')
     embedding_model TEXT,                -- Embedding model used (e.g., 'text-embedding-3-large', 'all-MiniLM-L6-v2')
@@ -269,12 +283,16 @@ CREATE TABLE IF NOT EXISTS archon_code_examples (
     content_search_vector tsvector GENERATED ALWAYS AS (to_tsvector('english', content || ' ' || COALESCE(summary, ''))) STORED,
     created_at TIMESTAMP WITH TIME ZONE DEFAULT timezone('utc'::text, now()) NOT NULL,
 
+    -- Primary and unique keys must include the partition key
+    CONSTRAINT archon_code_examples_part_pkey PRIMARY KEY (source_id, id),
+
     -- Add a unique constraint to prevent duplicate chunks for the same URL
-    UNIQUE(url, chunk_number),
+    CONSTRAINT archon_code_examples_part_url_chunk_key UNIQUE (source_id, url, chunk_number),
 
     -- Add foreign key constraint to sources table with CASCADE DELETE
-    FOREIGN KEY (source_id) REFERENCES archon_sources(source_id) ON DELETE CASCADE
-);
+    CONSTRAINT archon_code_examples_part_source_fk FOREIGN KEY (source_id)
+        REFERENCES archon_sources(source_id) ON DELETE CASCADE
+) PARTITION BY LIST (source_id);
 
 -- Create archon_page_metadata table
 -- This table stores complete documentation pages alongside chunks for improved agent context retrieval
@@ -313,7 +331,8 @@ CREATE TABLE IF NOT EXISTS archon_page_metadata (
 -- This links chunks back to their parent page
 -- NULLABLE because existing chunks won't have a page_id yet
 ALTER TABLE archon_crawled_pages
-ADD COLUMN IF NOT EXISTS page_id UUID REFERENCES archon_page_metadata(id) ON DELETE SET NULL;
+ADD COLUMN IF NOT EXISTS page_id UUID
+CONSTRAINT archon_crawled_pages_part_page_fk REFERENCES archon_page_metadata(id) ON DELETE SET NULL;
 
 -- Create indexes for query performance
 CREATE INDEX IF NOT EXISTS idx_archon_page_metadata_source_id ON archon_page_metadata(source_id);
@@ -339,17 +358,18 @@ COMMENT ON COLUMN archon_crawled_pages.page_id IS 'Foreign key linking chunk to
 -- Enable RLS on archon_page_metadata
 ALTER TABLE archon_page_metadata ENABLE ROW LEVEL SECURITY;
 
--- Multi-dimensional indexes
-CREATE INDEX IF NOT EXISTS idx_archon_code_examples_embedding_384 ON archon_code_examples USING ivfflat (embedding_384 vector_cosine_ops) WITH (lists = 100);
-CREATE INDEX IF NOT EXISTS idx_archon_code_examples_embedding_768 ON archon_code_examples USING ivfflat (embedding_768 vector_cosine_ops) WITH (lists = 100);
-CREATE INDEX IF NOT EXISTS idx_archon_code_examples_embedding_1024 ON archon_code_examples USING ivfflat (embedding_1024 vector_cosine_ops) WITH (lists = 100);
-CREATE INDEX IF NOT EXISTS idx_archon_code_examples_embedding_1536 ON archon_code_examples USING ivfflat (embedding_1536 vector_cosine_ops) WITH (lists = 100);
+-- Multi-dimensional indexes (partitioned: every source partition gets its own)
+CREATE INDEX IF NOT EXISTS idx_archon_code_examples_embedding_384 ON archon_code_examples USING hnsw (embedding_384 vector_cosine_ops);
+CREATE INDEX IF NOT EXISTS idx_archon_code_examples_embedding_768 ON archon_code_examples USING hnsw (embedding_768 vector_cosine_ops);
+CREATE INDEX IF NOT EXISTS idx_archon_code_examples_embedding_1024 ON archon_code_examples USING hnsw (embedding_1024 vector_cosine_ops);
+CREATE INDEX IF NOT EXISTS idx_archon_code_examples_embedding_1536 ON archon_code_examples USING hnsw (embedding_1536 vector_cosine_ops);
+CREATE INDEX IF NOT EXISTS idx_archon_code_examples_embedding_coarse ON archon_code_examples USING hnsw (embedding_coarse vector_cosine_ops);
 -- Note: 3072-dimensional embeddings cannot have vector indexes due to PostgreSQL vector extension 2000 dimension limit
 -- The embedding_3072 column exists but cannot be indexed with current pgvector version
 
 -- Other indexes for archon_code_examples
 CREATE INDEX idx_archon_code_examples_metadata ON archon_code_examples USING GIN (metadata);
-CREATE INDEX idx_archon_code_examples_source_id ON archon_code_examples (source_id);
+CREATE INDEX idx_archon_code_examples_url ON archon_code_examples (url);
 -- Hybrid search indexes
 CREATE INDEX idx_archon_code_examples_content_search ON archon_code_examples USING GIN (content_search_vector);
 CREATE INDEX idx_archon_code_examples_content_trgm ON archon_code_examples USING GIN (content gin_trgm_ops);
@@ -386,6 +406,262 @@ BEGIN
 END;
 $$ LANGUAGE plpgsql IMMUTABLE;
 
+-- =====================================================
+-- SECTION 4.6: SOURCE PARTITION MANAGEMENT
+-- =====================================================
+
+-- Name of the partition holding one source's rows for a knowledge table
+CREATE OR REPLACE FUNCTION archon_source_partition_name(parent_table TEXT, p_source_id TEXT)
+RETURNS TEXT AS $$
+BEGIN
+    RETURN parent_table || '_' || substr(md5(p_source_id), 1, 16);
+END;
+$$ LANGUAGE plpgsql IMMUTABLE;
+
+-- Create the partitions for a source. Partitioned indexes on the parent
+-- tables give every new partition its own ANN and search indexes.
+CREATE OR REPLACE FUNCTION archon_ensure_source_partitions(p_source_id TEXT)
+RETURNS VOID
+LANGUAGE plpgsql
+SECURITY DEFINER
+SET search_path = public
+AS $$
+DECLARE
+    parent_table TEXT;
+    partition_name TEXT;
+BEGIN
+    FOREACH parent_table IN ARRAY ARRAY['archon_crawled_pages', 'archon_code_examples'] LOOP
+        partition_name := archon_source_partition_name(parent_table, p_source_id);
+        IF to_regclass(partition_name) IS NULL THEN
+            EXECUTE format(
+                'CREATE TABLE %I PARTITION OF %I FOR VALUES IN (%L)',
+                partition_name, parent_table, p_source_id
+            );
+            -- Partitions are reachable directly through the API, so lock them down
+            EXECUTE format('ALTER TABLE %I ENABLE ROW LEVEL SECURITY', partition_name);
+        END IF;
+    END LOOP;
+END;
+$$;
+
+-- Drop the partitions for a source
+CREATE OR REPLACE FUNCTION archon_drop_source_partitions(p_source_id TEXT)
+RETURNS VOID
+LANGUAGE plpgsql
+SECURITY DEFINER
+SET search_path = public
+AS $$
+DECLARE
+    parent_table TEXT;
+    partition_name TEXT;
+BEGIN
+    FOREACH parent_table IN ARRAY ARRAY['archon_crawled_pages', 'archon_code_examples'] LOOP
+        partition_name := archon_source_partition_name(parent_table, p_source_id);
+        IF to_regclass(partition_name) IS NOT NULL THEN
+            EXECUTE format('DROP TABLE %I', partition_name);
+        END IF;
+    END LOOP;
+END;
+$$;
+
+-- Delete a source by dropping its chunk and code example partitions, then
+-- removing the source row (page metadata still goes through CASCADE).
+-- Returns the number of source rows deleted.
+CREATE OR REPLACE FUNCTION archon_delete_source(p_source_id TEXT)
+RETURNS INTEGER
+LANGUAGE plpgsql
+SECURITY DEFINER
+SET search_path = public
+AS $$
+DECLARE
+    deleted_count INTEGER;
+BEGIN
+    PERFORM archon_drop_source_partitions(p_source_id);
+    DELETE FROM archon_sources WHERE source_id = p_source_id;
+    GET DIAGNOSTICS deleted_count = ROW_COUNT;
+    RETURN deleted_count;
+END;
+$$;
+
+-- The functions above run as their owner so they can create and drop
+-- tables. Only the server (service_role) may call them; PostgreSQL
+-- grants EXECUTE to PUBLIC by default, which would expose them through
+-- PostgREST's /rpc/ to anon and authenticated clients.
+REVOKE EXECUTE ON FUNCTION archon_ensure_source_partitions(TEXT) FROM PUBLIC, anon, authenticated;
+REVOKE EXECUTE ON FUNCTION archon_drop_source_partitions(TEXT) FROM PUBLIC, anon, authenticated;
+REVOKE EXECUTE ON FUNCTION archon_delete_source(TEXT) FROM PUBLIC, anon, authenticated;
+GRANT EXECUTE ON FUNCTION archon_ensure_source_partitions(TEXT) TO service_role;
+GRANT EXECUTE ON FUNCTION archon_drop_source_partitions(TEXT) TO service_role;
+GRANT EXECUTE ON FUNCTION archon_delete_source(TEXT) TO service_role;
+
+-- Create partitions as soon as a source exists. Chunks reference their
+-- source, so the partition is always in place before the first insert.
+CREATE OR REPLACE FUNCTION archon_sources_create_partitions()
+RETURNS TRIGGER AS $$
+BEGIN
+    PERFORM archon_ensure_source_partitions(NEW.source_id);
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS archon_sources_create_partitions_trigger ON archon_sources;
+CREATE TRIGGER archon_sources_create_partitions_trigger
+    AFTER INSERT ON archon_sources
+    FOR EACH ROW
+    EXECUTE FUNCTION archon_sources_create_partitions();
+
+COMMENT ON FUNCTION archon_ensure_source_partitions IS 'Creates the per-source partitions of archon_crawled_pages and archon_code_examples';
+COMMENT ON FUNCTION archon_drop_source_partitions IS 'Drops the per-source partitions of archon_crawled_pages and archon_code_examples';
+COMMENT ON FUNCTION archon_delete_source IS 'Deletes a source by dropping its partitions and then its archon_sources row';
+
+-- =====================================================
+-- SECTION 4.7: MATERIALIZED SOURCE STATISTICS
+-- =====================================================
+-- One row per source with the counts the knowledge listing shows, kept
+-- current by statement-level triggers on the knowledge tables.
+
+CREATE TABLE IF NOT EXISTS archon_source_stats (
+    source_id TEXT PRIMARY KEY REFERENCES archon_sources(source_id) ON DELETE CASCADE,
+    chunk_count BIGINT NOT NULL DEFAULT 0,
+    code_example_count BIGINT NOT NULL DEFAULT 0,
+    page_count BIGINT NOT NULL DEFAULT 0,
+    first_url TEXT,
+    total_bytes BIGINT NOT NULL DEFAULT 0,
+    last_crawled_at TIMESTAMP WITH TIME ZONE,
+    updated_at TIMESTAMP WITH TIME ZONE DEFAULT timezone('utc'::text, now()) NOT NULL
+);
+
+-- Chunks inserted: add counts, remember the first URL, stamp the crawl time
+CREATE OR REPLACE FUNCTION archon_source_stats_pages_inserted()
+RETURNS TRIGGER
+LANGUAGE plpgsql
+AS $$
+BEGIN
+    INSERT INTO archon_source_stats AS s
+        (source_id, chunk_count, page_count, total_bytes, first_url, last_crawled_at, updated_at)
+    SELECT source_id,
+           count(*),
+           count(*) FILTER (WHERE chunk_number = 0),
+           COALESCE(sum(octet_length(content)), 0),
+           (array_agg(url ORDER BY id))[1],
+           now(),
+           now()
+    FROM inserted_rows
+    GROUP BY source_id
+    ON CONFLICT (source_id) DO UPDATE SET
+        chunk_count = s.chunk_count + EXCLUDED.chunk_count,
+        page_count = s.page_count + EXCLUDED.page_count,
+        total_bytes = s.total_bytes + EXCLUDED.total_bytes,
+        first_url = COALESCE(s.first_url, EXCLUDED.first_url),
+        last_crawled_at = EXCLUDED.last_crawled_at,
+        updated_at = now();
+    RETURN NULL;
+END;
+$$;
+
+-- Chunks deleted: subtract counts, re-pick the first URL if it was removed
+CREATE OR REPLACE FUNCTION archon_source_stats_pages_deleted()
+RETURNS TRIGGER
+LANGUAGE plpgsql
+AS $$
+BEGIN
+    UPDATE archon_source_stats s SET
+        chunk_count = GREATEST(s.chunk_count - d.chunk_count, 0),
+        page_count = GREATEST(s.page_count - d.page_count, 0),
+        total_bytes = GREATEST(s.total_bytes - d.total_bytes, 0),
+        updated_at = now()
+    FROM (
+        SELECT source_id,
+               count(*) AS chunk_count,
+               count(*) FILTER (WHERE chunk_number = 0) AS page_count,
+               COALESCE(sum(octet_length(content)), 0) AS total_bytes
+        FROM deleted_rows
+        GROUP BY source_id
+    ) d
+    WHERE s.source_id = d.source_id;
+
+    UPDATE archon_source_stats s SET
+        first_url = (
+            SELECT p.url FROM archon_crawled_pages p
+            WHERE p.source_id = s.source_id
+            ORDER BY p.id
+            LIMIT 1
+        )
+    WHERE EXISTS (
+        SELECT 1 FROM deleted_rows d
+        WHERE d.source_id = s.source_id AND d.url = s.first_url
+    );
+    RETURN NULL;
+END;
+$$;
+
+CREATE OR REPLACE FUNCTION archon_source_stats_code_inserted()
+RETURNS TRIGGER
+LANGUAGE plpgsql
+AS $$
+BEGIN
+    INSERT INTO archon_source_stats AS s (source_id, code_example_count, updated_at)
+    SELECT source_id, count(*), now()
+    FROM inserted_rows
+    GROUP BY source_id
+    ON CONFLICT (source_id) DO UPDATE SET
+        code_example_count = s.code_example_count + EXCLUDED.code_example_count,
+        updated_at = now();
+    RETURN NULL;
+END;
+$$;
+
+CREATE OR REPLACE FUNCTION archon_source_stats_code_deleted()
+RETURNS TRIGGER
+LANGUAGE plpgsql
+AS $$
+BEGIN
+    UPDATE archon_source_stats s SET
+        code_example_count = GREATEST(s.code_example_count - d.code_example_count, 0),
+        updated_at = now()
+    FROM (
+        SELECT source_id, count(*) AS code_example_count
+        FROM deleted_rows
+        GROUP BY source_id
+    ) d
+    WHERE s.source_id = d.source_id;
+    RETURN NULL;
+END;
+$$;
+
+DROP TRIGGER IF EXISTS archon_source_stats_pages_insert_trigger ON archon_crawled_pages;
+CREATE TRIGGER archon_source_stats_pages_insert_trigger
+    AFTER INSERT ON archon_crawled_pages
+    REFERENCING NEW TABLE AS inserted_rows
+    FOR EACH STATEMENT
+    EXECUTE FUNCTION archon_source_stats_pages_inserted();
+
+DROP TRIGGER IF EXISTS archon_source_stats_pages_delete_trigger ON archon_crawled_pages;
+CREATE TRIGGER archon_source_stats_pages_delete_trigger
+    AFTER DELETE ON archon_crawled_pages
+    REFERENCING OLD TABLE AS deleted_rows
+    FOR EACH STATEMENT
+    EXECUTE FUNCTION archon_source_stats_pages_deleted();
+
+DROP TRIGGER IF EXISTS archon_source_stats_code_insert_trigger ON archon_code_examples;
+CREATE TRIGGER archon_source_stats_code_insert_trigger
+    AFTER INSERT ON archon_code_examples
+    REFERENCING NEW TABLE AS inserted_rows
+    FOR EACH STATEMENT
+    EXECUTE FUNCTION archon_source_stats_code_inserted();
+
+DROP TRIGGER IF EXISTS archon_source_stats_code_delete_trigger ON archon_code_examples;
+CREATE TRIGGER archon_source_stats_code_delete_trigger
+    AFTER DELETE ON archon_code_examples
+    REFERENCING OLD TABLE AS deleted_rows
+    FOR EACH STATEMENT
+    EXECUTE FUNCTION archon_source_stats_code_deleted();
+
+COMMENT ON TABLE archon_source_stats IS 'Per-source counts for knowledge listings, maintained by triggers on the knowledge tables';
+COMMENT ON COLUMN archon_source_stats.page_count IS 'Number of distinct pages (chunks with chunk_number 0)';
+COMMENT ON COLUMN archon_source_stats.first_url IS 'URL of the earliest stored chunk of the source';
+COMMENT ON COLUMN archon_source_stats.total_bytes IS 'Total bytes of stored chunk content';
+
 -- =====================================================
 -- SECTION 5: SEARCH FUNCTIONS
 -- =====================================================
@@ -412,6 +688,7 @@ AS $$
 DECLARE
   sql_query TEXT;
   embedding_column TEXT;
+  source_clause TEXT;
 BEGIN
   -- Determine which embedding column to use based on dimension
   CASE embedding_dimension
@@ -423,6 +700,9 @@ BEGIN
     ELSE RAISE EXCEPTION 'Unsupported embedding dimension: %', embedding_dimension;
   END CASE;
 
+  -- Route source-filtered searches to the source's partition
+  source_clause := CASE WHEN source_filter IS NULL THEN '' ELSE 'AND source_id = $4' END;
+
   -- Build dynamic query
   sql_query := format('
     SELECT id, url, chunk_number, content, metadata, source_id,
@@ -430,10 +710,10 @@ BEGIN
     FROM archon_crawled_pages
     WHERE (%I IS NOT NULL)
       AND metadata @> $3
-      AND ($4 IS NULL OR source_id = $4)
+      %s
     ORDER BY %I <=> $1
     LIMIT $2',
-    embedding_column, embedding_column, embedding_column);
+    embedding_column, embedding_column, source_clause, embedding_column);
 
   -- Execute dynamic query
   RETURN QUERY EXECUTE sql_query USING query_embedding, match_count, filter, source_filter;
@@ -485,6 +765,7 @@ AS $$
 DECLARE
   sql_query TEXT;
   embedding_column TEXT;
+  source_clause TEXT;
 BEGIN
   -- Determine which embedding column to use based on dimension
   CASE embedding_dimension
@@ -496,6 +777,9 @@ BEGIN
     ELSE RAISE EXCEPTION 'Unsupported embedding dimension: %', embedding_dimension;
   END CASE;
 
+  -- Route source-filtered searches to the source's partition
+  source_clause := CASE WHEN source_filter IS NULL THEN '' ELSE 'AND source_id = $4' END;
+
   -- Build dynamic query
   sql_query := format('
     SELECT id, url, chunk_number, content, summary, metadata, source_id,
@@ -503,10 +787,10 @@ BEGIN
     FROM archon_code_examples
     WHERE (%I IS NOT NULL)
       AND metadata @> $3
-      AND ($4 IS NULL OR source_id = $4)
+      %s
     ORDER BY %I <=> $1
     LIMIT $2',
-    embedding_column, embedding_column, embedding_column);
+    embedding_column, embedding_column, source_clause, embedding_column);
 
   -- Execute dynamic query
   RETURN QUERY EXECUTE sql_query USING query_embedding, match_count, filter, source_filter;
@@ -536,6 +820,162 @@ BEGIN
 END;
 $$;
 
+-- =====================================================
+-- SECTION 5A: TWO-STAGE (COARSE + RESCORE) SEARCH FUNCTIONS
+-- =====================================================
+
+-- Coarse ANN on embedding_coarse, then exact rescoring on the full vector
+CREATE OR REPLACE FUNCTION match_archon_crawled_pages_coarse (
+  query_embedding VECTOR,
+  query_embedding_coarse VECTOR(256),
+  match_count INT DEFAULT 10,
+  filter JSONB DEFAULT '{}'::jsonb,
+  source_filter TEXT DEFAULT NULL,
+  candidate_count INT DEFAULT 100
+) RETURNS TABLE (
+  id BIGINT,
+  url VARCHAR,
+  chunk_number INTEGER,
+  content TEXT,
+  metadata JSONB,
+  source_id TEXT,
+  similarity FLOAT
+)
+LANGUAGE plpgsql
+AS $$
+#variable_conflict use_column
+DECLARE
+  sql_query TEXT;
+  embedding_column TEXT;
+  source_clause TEXT;
+BEGIN
+  -- Determine which full embedding column to rescore on from the query dimension
+  CASE vector_dims(query_embedding)
+    WHEN 384 THEN embedding_column := 'embedding_384';
+    WHEN 768 THEN embedding_column := 'embedding_768';
+    WHEN 1024 THEN embedding_column := 'embedding_1024';
+    WHEN 1536 THEN embedding_column := 'embedding_1536';
+    WHEN 3072 THEN embedding_column := 'embedding_3072';
+    ELSE RAISE EXCEPTION 'Unsupported embedding dimension: %', vector_dims(query_embedding);
+  END CASE;
+
+  -- Route source-filtered searches to the source's partition
+  source_clause := CASE WHEN source_filter IS NULL THEN '' ELSE 'AND source_id = $6' END;
+
+  -- The hnsw scan returns at most ef_search rows before the metadata and
+  -- source filters apply; widen it so candidate_count rows can survive them
+  PERFORM set_config('hnsw.ef_search', greatest(candidate_count, 40)::text, true);
+
+  -- Candidates come from the coarse index, plus rows that have no coarse copy yet
+  sql_query := format('
+    WITH candidates AS (
+      (SELECT id, url, chunk_number, content, metadata, source_id, %I AS full_embedding
+       FROM archon_crawled_pages
+       WHERE embedding_coarse IS NOT NULL
+         AND %I IS NOT NULL
+         AND metadata @> $4
+         %s
+       ORDER BY embedding_coarse <=> $2
+       LIMIT $5)
+      UNION ALL
+      (SELECT id, url, chunk_number, content, metadata, source_id, %I AS full_embedding
+       FROM archon_crawled_pages
+       WHERE embedding_coarse IS NULL
+         AND %I IS NOT NULL
+         AND metadata @> $4
+         %s
+       ORDER BY %I <=> $1
+       LIMIT $3)
+    )
+    SELECT id, url, chunk_number, content, metadata, source_id,
+           1 - (full_embedding <=> $1) AS similarity
+    FROM candidates
+    ORDER BY full_embedding <=> $1
+    LIMIT $3',
+    embedding_column, embedding_column, source_clause,
+    embedding_column, embedding_column, source_clause, embedding_column);
+
+  RETURN QUERY EXECUTE sql_query
+    USING query_embedding, query_embedding_coarse, match_count, filter, candidate_count, source_filter;
+END;
+$$;
+
+CREATE OR REPLACE FUNCTION match_archon_code_examples_coarse (
+  query_embedding VECTOR,
+  query_embedding_coarse VECTOR(256),
+  match_count INT DEFAULT 10,
+  filter JSONB DEFAULT '{}'::jsonb,
+  source_filter TEXT DEFAULT NULL,
+  candidate_count INT DEFAULT 100
+) RETURNS TABLE (
+  id BIGINT,
+  url VARCHAR,
+  chunk_number INTEGER,
+  content TEXT,
+  summary TEXT,
+  metadata JSONB,
+  source_id TEXT,
+  similarity FLOAT
+)
+LANGUAGE plpgsql
+AS $$
+#variable_conflict use_column
+DECLARE
+  sql_query TEXT;
+  embedding_column TEXT;
+  source_clause TEXT;
+BEGIN
+  -- Determine which full embedding column to rescore on from the query dimension
+  CASE vector_dims(query_embedding)
+    WHEN 384 THEN embedding_column := 'embedding_384';
+    WHEN 768 THEN embedding_column := 'embedding_768';
+    WHEN 1024 THEN embedding_column := 'embedding_1024';
+    WHEN 1536 THEN embedding_column := 'embedding_1536';
+    WHEN 3072 THEN embedding_column := 'embedding_3072';
+    ELSE RAISE EXCEPTION 'Unsupported embedding dimension: %', vector_dims(query_embedding);
+  END CASE;
+
+  -- Route source-filtered searches to the source's partition
+  source_clause := CASE WHEN source_filter IS NULL THEN '' ELSE 'AND source_id = $6' END;
+
+  -- The hnsw scan returns at most ef_search rows before the metadata and
+  -- source filters apply; widen it so candidate_count rows can survive them
+  PERFORM set_config('hnsw.ef_search', greatest(candidate_count, 40)::text, true);
+
+  -- Candidates come from the coarse index, plus rows that have no coarse copy yet
+  sql_query := format('
+    WITH candidates AS (
+      (SELECT id, url, chunk_number, content, summary, metadata, source_id, %I AS full_embedding
+       FROM archon_code_examples
+       WHERE embedding_coarse IS NOT NULL
+         AND %I IS NOT NULL
+         AND metadata @> $4
+         %s
+       ORDER BY embedding_coarse <=> $2
+       LIMIT $5)
+      UNION ALL
+      (SELECT id, url, chunk_number, content, summary, metadata, source_id, %I AS full_embedding
+       FROM archon_code_examples
+       WHERE embedding_coarse IS NULL
+         AND %I IS NOT NULL
+         AND metadata @> $4
+         %s
+       ORDER BY %I <=> $1
+       LIMIT $3)
+    )
+    SELECT id, url, chunk_number, content, summary, metadata, source_id,
+           1 - (full_embedding <=> $1) AS similarity
+    FROM candidates
+    ORDER BY full_embedding <=> $1
+    LIMIT $3',
+    embedding_column, embedding_column, source_clause,
+    embedding_column, embedding_column, source_clause, embedding_column);
+
+  RETURN QUERY EXECUTE sql_query
+    USING query_embedding, query_embedding_coarse, match_count, filter, candidate_count, source_filter;
+END;
+$$;
+
 -- =====================================================
 -- SECTION 5B: HYBRID SEARCH FUNCTIONS WITH TS_VECTOR
 -- =====================================================
@@ -567,6 +1007,7 @@ DECLARE
     max_text_results INT;
     sql_query TEXT;
     embedding_column TEXT;
+    source_clause TEXT;
 BEGIN
     -- Determine which embedding column to use based on dimension
     CASE embedding_dimension
@@ -581,7 +1022,10 @@ BEGIN
     -- Calculate how many results to fetch from each search type
     max_vector_results := match_count;
     max_text_results := match_count;
-    
+
+    -- Route source-filtered searches to the source's partition
+    source_clause := CASE WHEN source_filter IS NULL THEN '' ELSE 'AND cp.source_id = $5' END;
+
     -- Build dynamic query with proper embedding column
     sql_query := format('
     WITH vector_results AS (
@@ -596,7 +1040,7 @@ BEGIN
             1 - (cp.%I <=> $1) AS vector_sim
         FROM archon_crawled_pages cp
         WHERE cp.metadata @> $4
-            AND ($5 IS NULL OR cp.source_id = $5)
+            %s
             AND cp.%I IS NOT NULL
         ORDER BY cp.%I <=> $1
         LIMIT $2
@@ -613,7 +1057,7 @@ BEGIN
             ts_rank_cd(cp.content_search_vector, plainto_tsquery(''english'', $6)) AS text_sim
         FROM archon_crawled_pages cp
         WHERE cp.metadata @> $4
-            AND ($5 IS NULL OR cp.source_id = $5)
+            %s
             AND cp.content_search_vector @@ plainto_tsquery(''english'', $6)
         ORDER BY text_sim DESC
         LIMIT $3
@@ -641,7 +1085,7 @@ BEGIN
     SELECT * FROM combined_results
     ORDER BY similarity DESC
     LIMIT $2', 
-    embedding_column, embedding_column, embedding_column);
+    embedding_column, source_clause, embedding_column, embedding_column, source_clause);
 
     -- Execute dynamic query
     RETURN QUERY EXECUTE sql_query USING query_embedding, max_vector_results, max_text_results, filter, source_filter, query_text;
@@ -701,6 +1145,7 @@ DECLARE
     max_text_results INT;
     sql_query TEXT;
     embedding_column TEXT;
+    source_clause TEXT;
 BEGIN
     -- Determine which embedding column to use based on dimension
     CASE embedding_dimension
@@ -715,7 +1160,10 @@ BEGIN
     -- Calculate how many results to fetch from each search type
     max_vector_results := match_count;
     max_text_results := match_count;
-    
+
+    -- Route source-filtered searches to the source's partition
+    source_clause := CASE WHEN source_filter IS NULL THEN '' ELSE 'AND ce.source_id = $5' END;
+
     -- Build dynamic query with proper embedding column
     sql_query := format('
     WITH vector_results AS (
@@ -731,7 +1179,7 @@ BEGIN
             1 - (ce.%I <=> $1) AS vector_sim
         FROM archon_code_examples ce
         WHERE ce.metadata @> $4
-            AND ($5 IS NULL OR ce.source_id = $5)
+            %s
             AND ce.%I IS NOT NULL
         ORDER BY ce.%I <=> $1
         LIMIT $2
@@ -749,7 +1197,7 @@ BEGIN
             ts_rank_cd(ce.content_search_vector, plainto_tsquery(''english'', $6)) AS text_sim
         FROM archon_code_examples ce
         WHERE ce.metadata @> $4
-            AND ($5 IS NULL OR ce.source_id = $5)
+            %s
             AND ce.content_search_vector @@ plainto_tsquery(''english'', $6)
         ORDER BY text_sim DESC
         LIMIT $3
@@ -778,7 +1226,7 @@ BEGIN
     SELECT * FROM combined_results
     ORDER BY similarity DESC
     LIMIT $2', 
-    embedding_column, embedding_column, embedding_column);
+    embedding_column, source_clause, embedding_column, embedding_column, source_clause);
 
     -- Execute dynamic query
     RETURN QUERY EXECUTE sql_query USING query_embedding, max_vector_results, max_text_results, filter, source_filter, query_text;
@@ -825,6 +1273,7 @@ COMMENT ON FUNCTION hybrid_search_archon_code_examples IS 'Legacy hybrid search
 ALTER TABLE archon_crawled_pages ENABLE ROW LEVEL SECURITY;
 ALTER TABLE archon_sources ENABLE ROW LEVEL SECURITY;
 ALTER TABLE archon_code_examples ENABLE ROW LEVEL SECURITY;
+ALTER TABLE archon_source_stats ENABLE ROW LEVEL SECURITY;
 
 -- Create policies that allow anyone to read
 CREATE POLICY "Allow public read access to archon_crawled_pages"
@@ -851,6 +1300,12 @@ CREATE POLICY "Allow public read access to archon_page_metadata"
   TO public
   USING (true);
 
+CREATE POLICY "Allow public read access to archon_source_stats"
+  ON archon_source_stats
+  FOR SELECT
+  TO public
+  USING (true);
+
 -- =====================================================
 -- SECTION 7: PROJECTS AND TASKS MODULE
 -- =====================================================
@@ -878,7 +1333,7 @@ CREATE TABLE IF NOT EXISTS archon_projects (
   id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
   title TEXT NOT NULL,
   description TEXT DEFAULT '',
-  docs JSONB DEFAULT '[]'::jsonb,
+  docs JSONB DEFAULT '[]'::jsonb, -- DEPRECATED: documents live in archon_project_documents
   features JSONB DEFAULT '[]'::jsonb,
   data JSONB DEFAULT '[]'::jsonb,
   github_repo TEXT,
@@ -887,6 +1342,25 @@ CREATE TABLE IF NOT EXISTS archon_projects (
   updated_at TIMESTAMPTZ DEFAULT NOW()
 );
 
+-- Project documents, one row per document
+CREATE TABLE IF NOT EXISTS archon_project_documents (
+  id TEXT NOT NULL DEFAULT gen_random_uuid()::text,
+  project_id UUID NOT NULL REFERENCES archon_projects(id) ON DELETE CASCADE,
+  position INTEGER NOT NULL, -- Order of the document within its project (assigned on insert when omitted)
+  document_type TEXT,
+  title TEXT,
+  content JSONB NOT NULL DEFAULT '{}'::jsonb,
+  tags JSONB NOT NULL DEFAULT '[]'::jsonb,
+  status TEXT DEFAULT 'draft',
+  version TEXT DEFAULT '1.0',
+  author TEXT,
+  extra JSONB NOT NULL DEFAULT '{}'::jsonb, -- Document keys without a dedicated column
+  content_size INTEGER GENERATED ALWAYS AS (octet_length(content::text)) STORED,
+  created_at TIMESTAMPTZ DEFAULT NOW(),
+  updated_at TIMESTAMPTZ DEFAULT NOW(),
+  PRIMARY KEY (project_id, id)
+);
+
 -- Tasks table
 CREATE TABLE IF NOT EXISTS archon_tasks (
   id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
@@ -896,7 +1370,7 @@ CREATE TABLE IF NOT EXISTS archon_tasks (
   description TEXT DEFAULT '',
   status task_status DEFAULT 'todo',
   assignee TEXT DEFAULT 'User' CHECK (assignee IS NOT NULL AND assignee != ''),
-  task_order INTEGER DEFAULT 0,
+  task_order INTEGER NOT NULL DEFAULT 0,
   priority task_priority DEFAULT 'medium' NOT NULL,
   feature TEXT,
   sources JSONB DEFAULT '[]'::jsonb,
@@ -927,7 +1401,9 @@ CREATE TABLE IF NOT EXISTS archon_document_versions (
   task_id UUID REFERENCES archon_tasks(id) ON DELETE CASCADE, -- DEPRECATED: No longer used, kept for historical data
   field_name TEXT NOT NULL, -- 'docs', 'features', 'data', 'prd' (task fields no longer versioned)
   version_number INTEGER NOT NULL,
-  content JSONB NOT NULL, -- Full snapshot of the field content
+  is_keyframe BOOLEAN NOT NULL DEFAULT TRUE, -- TRUE: content is a full snapshot, FALSE: delta against the previous version
+  content JSONB, -- Full snapshot of the field content (keyframes only)
+  delta JSONB, -- JSON patch (RFC 6902) from the previous version (non-keyframes only)
   change_summary TEXT, -- Human-readable description of changes
   change_type TEXT DEFAULT 'update', -- 'create', 'update', 'delete', 'restore', 'backup'
   document_id TEXT, -- For docs array, store the specific document ID
@@ -938,6 +1414,10 @@ CREATE TABLE IF NOT EXISTS archon_document_versions (
     (project_id IS NOT NULL AND task_id IS NULL) OR
     (project_id IS NULL AND task_id IS NOT NULL)
   ),
+  CONSTRAINT chk_version_payload CHECK (
+    (is_keyframe AND content IS NOT NULL) OR
+    (NOT is_keyframe AND delta IS NOT NULL)
+  ),
   -- Unique constraint to prevent duplicate version numbers per field
   UNIQUE(project_id, task_id, field_name, version_number)
 );
@@ -950,6 +1430,14 @@ CREATE INDEX IF NOT EXISTS idx_archon_tasks_order ON archon_tasks(task_order);
 CREATE INDEX IF NOT EXISTS idx_archon_tasks_priority ON archon_tasks(priority);
 CREATE INDEX IF NOT EXISTS idx_archon_tasks_archived ON archon_tasks(archived);
 CREATE INDEX IF NOT EXISTS idx_archon_tasks_archived_at ON archon_tasks(archived_at);
+-- Keyset pagination order (task_order, created_at, id)
+CREATE INDEX IF NOT EXISTS idx_archon_tasks_keyset ON archon_tasks(task_order, created_at, id);
+CREATE INDEX IF NOT EXISTS idx_archon_tasks_project_keyset ON archon_tasks(project_id, task_order, created_at, id);
+-- Trigram indexes for ilike keyword search
+CREATE INDEX IF NOT EXISTS idx_archon_tasks_title_trgm ON archon_tasks USING gin (title gin_trgm_ops);
+CREATE INDEX IF NOT EXISTS idx_archon_tasks_description_trgm ON archon_tasks USING gin (description gin_trgm_ops);
+CREATE INDEX IF NOT EXISTS idx_archon_tasks_feature_trgm ON archon_tasks USING gin (feature gin_trgm_ops);
+CREATE INDEX IF NOT EXISTS idx_archon_project_documents_position ON archon_project_documents(project_id, position);
 CREATE INDEX IF NOT EXISTS idx_archon_project_sources_project_id ON archon_project_sources(project_id);
 CREATE INDEX IF NOT EXISTS idx_archon_project_sources_source_id ON archon_project_sources(source_id);
 CREATE INDEX IF NOT EXISTS idx_archon_document_versions_project_id ON archon_document_versions(project_id);
@@ -957,6 +1445,9 @@ CREATE INDEX IF NOT EXISTS idx_archon_document_versions_task_id ON archon_docume
 CREATE INDEX IF NOT EXISTS idx_archon_document_versions_field_name ON archon_document_versions(field_name);
 CREATE INDEX IF NOT EXISTS idx_archon_document_versions_version_number ON archon_document_versions(version_number);
 CREATE INDEX IF NOT EXISTS idx_archon_document_versions_created_at ON archon_document_versions(created_at);
+-- Latest version and nearest keyframe lookups
+CREATE INDEX IF NOT EXISTS idx_archon_document_versions_field_version ON archon_document_versions(project_id, field_name, version_number DESC);
+CREATE INDEX IF NOT EXISTS idx_archon_document_versions_keyframes ON archon_document_versions(project_id, field_name, version_number DESC) WHERE is_keyframe;
 
 -- Apply triggers to tables
 CREATE OR REPLACE TRIGGER update_archon_projects_updated_at
@@ -967,6 +1458,32 @@ CREATE OR REPLACE TRIGGER update_archon_tasks_updated_at
     BEFORE UPDATE ON archon_tasks
     FOR EACH ROW EXECUTE FUNCTION update_updated_at_column();
 
+CREATE OR REPLACE TRIGGER update_archon_project_documents_updated_at
+    BEFORE UPDATE ON archon_project_documents
+    FOR EACH ROW EXECUTE FUNCTION update_updated_at_column();
+
+-- New documents inserted without a position go after the project's last
+-- document. The per-project advisory lock makes concurrent adds wait for
+-- each other, so two documents never get the same position.
+CREATE OR REPLACE FUNCTION assign_project_document_position()
+RETURNS TRIGGER
+LANGUAGE plpgsql
+AS $$
+BEGIN
+    IF NEW.position IS NULL THEN
+        PERFORM pg_advisory_xact_lock(hashtext('archon_project_documents:' || NEW.project_id::text));
+        SELECT COALESCE(max(doc.position) + 1, 0) INTO NEW.position
+        FROM archon_project_documents doc
+        WHERE doc.project_id = NEW.project_id;
+    END IF;
+    RETURN NEW;
+END;
+$$;
+
+CREATE OR REPLACE TRIGGER assign_archon_project_documents_position
+    BEFORE INSERT ON archon_project_documents
+    FOR EACH ROW EXECUTE FUNCTION assign_project_document_position();
+
 -- Soft delete function for tasks
 CREATE OR REPLACE FUNCTION archive_task(
     task_id_param UUID,
@@ -1008,6 +1525,71 @@ BEGIN
 END;
 $$ LANGUAGE plpgsql;
 
+-- Grouped task counts for the project list
+CREATE OR REPLACE FUNCTION get_task_counts_by_project()
+RETURNS TABLE (
+    project_id UUID,
+    status TEXT,
+    task_count BIGINT
+)
+LANGUAGE sql
+STABLE
+AS $$
+    SELECT t.project_id, t.status::text, count(*)
+    FROM archon_tasks t
+    WHERE t.archived IS NOT TRUE
+      AND t.project_id IS NOT NULL
+    GROUP BY t.project_id, t.status;
+$$;
+
+COMMENT ON FUNCTION get_task_counts_by_project() IS 'Non-archived task counts per project and status';
+
+-- Atomic version numbering
+CREATE OR REPLACE FUNCTION create_document_version(
+    p_project_id UUID,
+    p_field_name TEXT,
+    p_base_version INTEGER,
+    p_is_keyframe BOOLEAN,
+    p_content JSONB,
+    p_delta JSONB,
+    p_change_summary TEXT,
+    p_change_type TEXT DEFAULT 'update',
+    p_document_id TEXT DEFAULT NULL,
+    p_created_by TEXT DEFAULT 'system'
+)
+RETURNS SETOF archon_document_versions
+LANGUAGE plpgsql
+AS $$
+DECLARE
+    current_version INTEGER;
+BEGIN
+    PERFORM pg_advisory_xact_lock(hashtext(p_project_id::text || ':' || p_field_name));
+
+    SELECT max(version_number) INTO current_version
+    FROM archon_document_versions
+    WHERE project_id = p_project_id AND field_name = p_field_name;
+
+    -- A delta is only valid on top of the version it was computed from
+    IF current_version IS DISTINCT FROM p_base_version THEN
+        RAISE EXCEPTION 'version conflict: latest version is %, expected %',
+            current_version, p_base_version;
+    END IF;
+
+    RETURN QUERY
+    INSERT INTO archon_document_versions (
+        project_id, field_name, version_number, is_keyframe, content, delta,
+        change_summary, change_type, document_id, created_by
+    )
+    VALUES (
+        p_project_id, p_field_name, COALESCE(current_version, 0) + 1, p_is_keyframe,
+        p_content, p_delta, p_change_summary, p_change_type, p_document_id, p_created_by
+    )
+    RETURNING *;
+END;
+$$;
+
+COMMENT ON FUNCTION create_document_version(UUID, TEXT, INTEGER, BOOLEAN, JSONB, JSONB, TEXT, TEXT, TEXT, TEXT) IS 'Insert the next version of a project field, numbered under a per-field lock';
+
 -- Add comments to document the soft delete fields
 COMMENT ON COLUMN archon_tasks.assignee IS 'The agent or user assigned to this task. Can be any valid agent name or "User"';
 COMMENT ON COLUMN archon_tasks.priority IS 'Task priority level independent of visual ordering - used for semantic importance (low, medium, high, critical)';
@@ -1015,10 +1597,65 @@ COMMENT ON COLUMN archon_tasks.archived IS 'Soft delete flag - TRUE if task is a
 COMMENT ON COLUMN archon_tasks.archived_at IS 'Timestamp when task was archived';
 COMMENT ON COLUMN archon_tasks.archived_by IS 'User/system that archived the task';
 
+-- Old JSONB layout, assembled from the documents table
+CREATE OR REPLACE VIEW archon_projects_with_docs AS
+SELECT
+    p.id,
+    p.title,
+    p.description,
+    COALESCE(d.docs, '[]'::jsonb) AS docs,
+    p.features,
+    p.data,
+    p.github_repo,
+    p.pinned,
+    p.created_at,
+    p.updated_at
+FROM archon_projects p
+LEFT JOIN LATERAL (
+    SELECT jsonb_agg(
+        doc.extra || jsonb_build_object(
+            'id', doc.id,
+            'document_type', doc.document_type,
+            'title', doc.title,
+            'content', doc.content,
+            'tags', doc.tags,
+            'status', doc.status,
+            'version', doc.version,
+            'author', doc.author,
+            'created_at', doc.created_at,
+            'updated_at', doc.updated_at
+        )
+        ORDER BY doc.position, doc.created_at
+    ) AS docs
+    FROM archon_project_documents doc
+    WHERE doc.project_id = p.id
+) d ON true;
+
+-- Grouped document counts for the project list
+CREATE OR REPLACE FUNCTION count_project_documents(p_project_ids UUID[])
+RETURNS TABLE (
+    project_id UUID,
+    document_count BIGINT
+)
+LANGUAGE sql
+STABLE
+AS $$
+    SELECT doc.project_id, count(*)
+    FROM archon_project_documents doc
+    WHERE doc.project_id = ANY(p_project_ids)
+    GROUP BY doc.project_id;
+$$;
+
+COMMENT ON TABLE archon_project_documents IS 'Project documents, one row per document (formerly the archon_projects.docs array)';
+COMMENT ON VIEW archon_projects_with_docs IS 'archon_projects with docs assembled from archon_project_documents (compatibility layout)';
+COMMENT ON FUNCTION count_project_documents(UUID[]) IS 'Document counts of the given projects';
+
 -- Add comments for versioning table
 COMMENT ON TABLE archon_document_versions IS 'Version control for JSONB fields in projects only - task versioning has been removed to simplify MCP operations';
 COMMENT ON COLUMN archon_document_versions.field_name IS 'Name of JSONB field being versioned (docs, features, data) - task fields and prd removed as unused';
-COMMENT ON COLUMN archon_document_versions.content IS 'Full snapshot of field content at this version';
+COMMENT ON COLUMN archon_document_versions.content IS 'Full snapshot of field content (keyframe versions only)';
+COMMENT ON COLUMN archon_document_versions.is_keyframe IS 'TRUE if content holds the full snapshot, FALSE if delta must be applied to the previous version';
+COMMENT ON COLUMN archon_document_versions.delta IS 'JSON patch (RFC 6902) from the previous version to this one (non-keyframe versions only)';
 COMMENT ON COLUMN archon_document_versions.change_type IS 'Type of change: create, update, delete, restore, backup';
 COMMENT ON COLUMN archon_document_versions.document_id IS 'For docs arrays, the specific document ID that was changed';
 COMMENT ON COLUMN archon_document_versions.task_id IS 'DEPRECATED: No longer used for new versions, kept for historical task version data';
@@ -1062,7 +1699,14 @@ VALUES
   ('0.1.0', '008_add_migration_tracking'),
   ('0.1.0', '009_add_cascade_delete_constraints'),
   ('0.1.0', '010_add_provider_placeholders'),
-  ('0.1.0', '011_add_page_metadata_table')
+  ('0.1.0', '011_add_page_metadata_table'),
+  ('0.1.0', '012_partition_knowledge_tables_by_source'),
+  ('0.1.0', '013_add_coarse_embeddings'),
+  ('0.1.0', '014_add_source_stats'),
+  ('0.1.0', '015_add_operation_progress'),
+  ('0.1.0', '016_add_task_search_and_counts'),
+  ('0.1.0', '017_add_document_version_deltas'),
+  ('0.1.0', '018_add_project_documents_table')
 ON CONFLICT (version, migration_name) DO NOTHING;
 
 -- Enable Row Level Security on migrations table
@@ -1082,6 +1726,40 @@ CREATE POLICY "Allow authenticated users to read archon_migrations" ON archon_mi
     FOR SELECT TO authenticated
     USING (true);
 
+-- =====================================================
+-- SECTION 7.5: SHARED OPERATION PROGRESS
+-- =====================================================
+
+-- Progress of running operations, shared between API worker processes
+-- (used with PROGRESS_BACKEND=supabase)
+CREATE TABLE IF NOT EXISTS archon_operation_progress (
+    progress_id TEXT PRIMARY KEY,
+    operation_type TEXT,
+    status TEXT,
+    state JSONB NOT NULL DEFAULT '{}'::jsonb,
+    owner_id TEXT NOT NULL,
+    cancel_requested BOOLEAN NOT NULL DEFAULT false,
+    created_at TIMESTAMP WITH TIME ZONE DEFAULT timezone('utc'::text, now()) NOT NULL,
+    updated_at TIMESTAMP WITH TIME ZONE DEFAULT timezone('utc'::text, now()) NOT NULL
+);
+
+CREATE INDEX IF NOT EXISTS idx_archon_operation_progress_updated_at
+    ON archon_operation_progress(updated_at);
+
+CREATE INDEX IF NOT EXISTS idx_archon_operation_progress_cancel_requested
+    ON archon_operation_progress(owner_id)
+    WHERE cancel_requested;
+
+ALTER TABLE archon_operation_progress ENABLE ROW LEVEL SECURITY;
+
+DROP POLICY IF EXISTS "Allow service role full access to archon_operation_progress" ON archon_operation_progress;
+CREATE POLICY "Allow service role full access to archon_operation_progress" ON archon_operation_progress
+    FOR ALL USING (auth.role() = 'service_role');
+
+COMMENT ON TABLE archon_operation_progress IS 'Progress of running crawl and upload operations, shared between API worker processes';
+COMMENT ON COLUMN archon_operation_progress.owner_id IS 'Worker process (host:pid) running the operation';
+COMMENT ON COLUMN archon_operation_progress.cancel_requested IS 'Set by any worker to ask the owner to stop the operation';
+
 -- =====================================================
 -- SECTION 8: PROMPTS TABLE
 -- =====================================================
@@ -1111,6 +1789,7 @@ CREATE OR REPLACE TRIGGER update_archon_prompts_updated_at
 -- Enable Row Level Security (RLS) for all tables
 ALTER TABLE archon_projects ENABLE ROW LEVEL SECURITY;
 ALTER TABLE archon_tasks ENABLE ROW LEVEL SECURITY;
+ALTER TABLE archon_project_documents ENABLE ROW LEVEL SECURITY;
 ALTER TABLE archon_project_sources ENABLE ROW LEVEL SECURITY;
 ALTER TABLE archon_document_versions ENABLE ROW LEVEL SECURITY;
 ALTER TABLE archon_prompts ENABLE ROW LEVEL SECURITY;
@@ -1122,6 +1801,9 @@ CREATE POLICY "Allow service role full access to archon_projects" ON archon_proj
 CREATE POLICY "Allow service role full access to archon_tasks" ON archon_tasks
     FOR ALL USING (auth.role() = 'service_role');
 
+CREATE POLICY "Allow service role full access to archon_project_documents" ON archon_project_documents
+    FOR ALL USING (auth.role() = 'service_role');
+
 CREATE POLICY "Allow service role full access to archon_project_sources" ON archon_project_sources
     FOR ALL USING (auth.role() = 'service_role');
 
@@ -1140,6 +1822,10 @@ CREATE POLICY "Allow authenticated users to read and update archon_tasks" ON arc
     FOR ALL TO authenticated
     USING (true);
 
+CREATE POLICY "Allow authenticated users to manage archon_project_documents" ON archon_project_documents
+    FOR ALL TO authenticated
+    USING (true);
+
 CREATE POLICY "Allow authenticated users to read and update archon_project_sources" ON archon_project_sources
     FOR ALL TO authenticated
     USING (true);
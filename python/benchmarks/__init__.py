@@ -0,0 +1,7 @@
+"""
+Archon ingestion and retrieval benchmarks.
+
+Runs chunking, code extraction, embedding, ingestion and RAG query
+scenarios against a local fake OpenAI-compatible provider and an
+in-process database stand-in. See runner.py for usage.
+"""
@@ -0,0 +1,140 @@
+"""
+Benchmark corpus.
+
+Two kinds of pages:
+
+- recorded: real documentation pages read from disk (by default the
+  repository's own docs site, docs/docs/**/*.md[x])
+- synthetic: generated, seeded documentation pages with headings,
+  prose, lists, tables and fenced code blocks in several languages, at
+  a realistic spread of sizes
+
+The same seed always gives the same pages, so results are comparable
+across commits.
+"""
+
+import random
+from dataclasses import dataclass
+from pathlib import Path
+
+# The repository's documentation pages, used as recorded pages when present
+DEFAULT_RECORDED_DIR = Path(__file__).resolve().parents[2] / "docs" / "docs"
+
+_TOPICS = (
+    "authentication", "vector search", "crawling", "rate limits", "embeddings", "webhooks",
+    "pagination", "caching", "deployment", "configuration", "migrations", "streaming",
+)
+_WORDS = (
+    "the", "request", "returns", "client", "server", "configure", "value", "token", "index",
+    "query", "response", "document", "chunk", "page", "source", "provider", "model", "batch",
+    "error", "retry", "timeout", "header", "parameter", "option", "default", "setting", "field",
+    "result", "database", "table", "schema", "function", "method", "async", "await", "event",
+)
+_CODE = {
+    "python": (
+        "import asyncio\n\n\nasync def fetch_{name}(client, limit: int = 10) -> list[dict]:\n"
+        "    \"\"\"Fetch {topic} records.\"\"\"\n"
+        "    response = await client.get(\"/api/{name}\", params={{\"limit\": limit}})\n"
+        "    response.raise_for_status()\n"
+        "    return [item for item in response.json()[\"items\"] if item.get(\"active\")]\n"
+    ),
+    "typescript": (
+        "export async function fetch{Name}(client: ApiClient, limit = 10): Promise<Item[]> {{\n"
+        "  const response = await client.get(`/api/{name}?limit=${{limit}}`);\n"
+        "  if (!response.ok) {{\n    throw new Error(`Failed to load {topic}: ${{response.status}}`);\n  }}\n"
+        "  const body = await response.json();\n  return body.items.filter((item: Item) => item.active);\n}}\n"
+    ),
+    "bash": (
+        "curl -X POST https://api.example.com/v1/{name} \\\n"
+        "  -H \"Authorization: Bearer $API_KEY\" \\\n"
+        "  -H \"Content-Type: application/json\" \\\n"
+        "  -d '{{\"limit\": 10, \"topic\": \"{topic}\"}}'\n"
+    ),
+    "sql": (
+        "SELECT id, url, content\nFROM {name}\nWHERE source_id = $1\n"
+        "  AND created_at > now() - interval '7 days'\nORDER BY created_at DESC\nLIMIT 50;\n"
+    ),
+}
+
+
+@dataclass(frozen=True)
+class Page:
+    url: str
+    title: str
+    markdown: str
+    kind: str  # "recorded" or "synthetic"
+
+
+def _sentence(rng: random.Random, topic: str) -> str:
+    words = [rng.choice(_WORDS) for _ in range(rng.randint(8, 22))]
+    words.insert(rng.randrange(len(words)), topic)
+    return " ".join(words).capitalize() + "."
+
+
+def _paragraph(rng: random.Random, topic: str) -> str:
+    return " ".join(_sentence(rng, topic) for _ in range(rng.randint(3, 7)))
+
+
+def synthetic_page(index: int, rng: random.Random) -> Page:
+    """One generated documentation page of roughly 2-40 KB."""
+    topic = rng.choice(_TOPICS)
+    name = topic.replace(" ", "_")
+    title = f"{topic.title()} guide {index}"
+    parts = [f"# {title}", _paragraph(rng, topic)]
+
+    for section in range(rng.choice((2, 3, 4, 6, 10, 16))):
+        parts.append(f"## {topic.title()} {section + 1}")
+        for _ in range(rng.randint(1, 3)):
+            parts.append(_paragraph(rng, topic))
+        roll = rng.random()
+        if roll < 0.45:
+            language = rng.choice(tuple(_CODE))
+            code = _CODE[language].format(name=name, Name=name.title().replace("_", ""), topic=topic)
+            # Repeat to reach code blocks above the extraction minimum
+            parts.append(f"```{language}\n{code * rng.randint(2, 4)}```")
+        elif roll < 0.65:
+            parts.append("\n".join(f"- {_sentence(rng, topic)}" for _ in range(rng.randint(3, 8))))
+        elif roll < 0.75:
+            rows = [f"| {rng.choice(_WORDS)} | {rng.randint(1, 999)} | {_sentence(rng, topic)} |" for _ in range(5)]
+            parts.append("| Name | Value | Description |\n|---|---|---|\n" + "\n".join(rows))
+
+    return Page(
+        url=f"https://docs.example.com/{name}/page-{index}",
+        title=title,
+        markdown="\n\n".join(parts),
+        kind="synthetic",
+    )
+
+
+def recorded_pages(directory: Path = DEFAULT_RECORDED_DIR) -> list[Page]:
+    """Markdown pages under directory, in path order (none if it doesn't exist)."""
+    if not directory.is_dir():
+        return []
+    pages = []
+    for path in sorted([*directory.rglob("*.md"), *directory.rglob("*.mdx")]):
+        markdown = path.read_text(encoding="utf-8", errors="replace").strip()
+        if markdown:
+            relative = path.relative_to(directory).with_suffix("").as_posix()
+            pages.append(Page(url=f"https://docs.archon.local/{relative}", title=relative, markdown=markdown, kind="recorded"))
+    return pages
+
+
+def build_corpus(synthetic: int = 200, seed: int = 42, recorded_dir: Path | None = DEFAULT_RECORDED_DIR) -> list[Page]:
+    """Recorded pages (if any) followed by the given number of synthetic pages."""
+    rng = random.Random(seed)
+    pages = recorded_pages(recorded_dir) if recorded_dir is not None else []
+    pages.extend(synthetic_page(index, rng) for index in range(synthetic))
+    return pages
+
+
+def build_queries(pages: list[Page], count: int, seed: int = 42) -> list[str]:
+    """Search queries drawn from the corpus's headings and topics."""
+    rng = random.Random(seed)
+    headings = [
+        line.lstrip("#").strip()
+        for page in pages
+        for line in page.markdown.splitlines()
+        if line.startswith("#") and len(line) > 4
+    ]
+    candidates = headings or list(_TOPICS)
+    return [f"how to configure {rng.choice(candidates).lower()}" for _ in range(count)]
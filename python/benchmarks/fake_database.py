@@ -0,0 +1,299 @@
+"""
+In-process stand-in for the Supabase client.
+
+Implements the part of the supabase-py query builder and the pgvector
+search functions that ingestion, credentials and RAG search use, so the
+benchmarks exercise Archon's own code without a database. Vector search
+is an exact cosine scan with numpy, like pgvector without an index.
+"""
+
+import copy
+import itertools
+import re
+import threading
+from dataclasses import dataclass
+from typing import Any
+
+import numpy as np
+
+# Columns holding embeddings, by dimension (see migration/complete_setup.sql)
+EMBEDDING_COLUMNS = ("embedding_384", "embedding_768", "embedding_1024", "embedding_1536", "embedding_3072")
+
+_WORD = re.compile(r"\w+")
+
+
+@dataclass
+class FakeResponse:
+    data: Any
+    count: int | None = None
+
+
+class FakeQuery:
+    """Chainable query on one table, run by execute()"""
+
+    def __init__(self, database: "FakeSupabase", table: str):
+        self._database = database
+        self._table = table
+        self._action = "select"
+        self._payload: Any = None
+        self._on_conflict: str | None = None
+        self._filters: list[tuple[str, str, Any]] = []
+        self._order: list[tuple[str, bool]] = []
+        self._limit: int | None = None
+        self._offset = 0
+        self._count = False
+        self._single = None
+
+    # Actions
+    def select(self, columns: str = "*", count: str | None = None) -> "FakeQuery":
+        self._action = "select"
+        self._count = count is not None
+        return self
+
+    def insert(self, rows: dict | list[dict]) -> "FakeQuery":
+        self._action, self._payload = "insert", rows
+        return self
+
+    def upsert(self, rows: dict | list[dict], on_conflict: str | None = None, **_: Any) -> "FakeQuery":
+        self._action, self._payload, self._on_conflict = "upsert", rows, on_conflict
+        return self
+
+    def update(self, values: dict) -> "FakeQuery":
+        self._action, self._payload = "update", values
+        return self
+
+    def delete(self) -> "FakeQuery":
+        self._action = "delete"
+        return self
+
+    # Filters
+    def eq(self, column: str, value: Any) -> "FakeQuery":
+        return self._filter(column, "eq", value)
+
+    def neq(self, column: str, value: Any) -> "FakeQuery":
+        return self._filter(column, "neq", value)
+
+    def in_(self, column: str, values: list) -> "FakeQuery":
+        return self._filter(column, "in", set(values))
+
+    def gt(self, column: str, value: Any) -> "FakeQuery":
+        return self._filter(column, "gt", value)
+
+    def gte(self, column: str, value: Any) -> "FakeQuery":
+        return self._filter(column, "gte", value)
+
+    def lt(self, column: str, value: Any) -> "FakeQuery":
+        return self._filter(column, "lt", value)
+
+    def lte(self, column: str, value: Any) -> "FakeQuery":
+        return self._filter(column, "lte", value)
+
+    def ilike(self, column: str, pattern: str) -> "FakeQuery":
+        regex = re.compile("^" + re.escape(pattern).replace("%", ".*") + "$", re.IGNORECASE | re.DOTALL)
+        return self._filter(column, "match", regex)
+
+    def like(self, column: str, pattern: str) -> "FakeQuery":
+        regex = re.compile("^" + re.escape(pattern).replace("%", ".*") + "$", re.DOTALL)
+        return self._filter(column, "match", regex)
+
+    def _filter(self, column: str, op: str, value: Any) -> "FakeQuery":
+        self._filters.append((column, op, value))
+        return self
+
+    # Modifiers
+    def order(self, column: str, desc: bool = False, **_: Any) -> "FakeQuery":
+        self._order.append((column, desc))
+        return self
+
+    def limit(self, count: int) -> "FakeQuery":
+        self._limit = count
+        return self
+
+    def range(self, start: int, end: int) -> "FakeQuery":
+        self._offset, self._limit = start, end - start + 1
+        return self
+
+    def single(self) -> "FakeQuery":
+        self._single = "single"
+        return self
+
+    def maybe_single(self) -> "FakeQuery":
+        self._single = "maybe"
+        return self
+
+    def _matches(self, row: dict) -> bool:
+        for column, op, value in self._filters:
+            actual = row.get(column)
+            if op == "eq" and actual != value:
+                return False
+            if op == "neq" and actual == value:
+                return False
+            if op == "in" and actual not in value:
+                return False
+            if op == "match" and not (isinstance(actual, str) and value.match(actual)):
+                return False
+            if op in ("gt", "gte", "lt", "lte"):
+                if actual is None:
+                    return False
+                if op == "gt" and not actual > value:
+                    return False
+                if op == "gte" and not actual >= value:
+                    return False
+                if op == "lt" and not actual < value:
+                    return False
+                if op == "lte" and not actual <= value:
+                    return False
+        return True
+
+    def execute(self) -> FakeResponse:
+        with self._database.lock:
+            rows = self._database.tables.setdefault(self._table, [])
+            if self._action in ("insert", "upsert"):
+                return FakeResponse(self._database.write(self._table, self._payload, self._on_conflict))
+            if self._action == "update":
+                updated = [row for row in rows if self._matches(row)]
+                for row in updated:
+                    row.update(self._payload)
+                self._database.invalidate(self._table)
+                return FakeResponse(copy.deepcopy(updated))
+            if self._action == "delete":
+                kept = [row for row in rows if not self._matches(row)]
+                deleted = [row for row in rows if self._matches(row)]
+                self._database.tables[self._table] = kept
+                self._database.invalidate(self._table)
+                return FakeResponse(deleted)
+
+            selected = [row for row in rows if self._matches(row)]
+            for column, desc in reversed(self._order):
+                selected.sort(key=lambda row, c=column: (row.get(c) is None, row.get(c)), reverse=desc)
+            total = len(selected)
+            end = None if self._limit is None else self._offset + self._limit
+            data = [dict(row) for row in selected[self._offset : end]]
+
+        if self._single is not None:
+            if not data:
+                if self._single == "maybe":
+                    return None
+                raise ValueError(f"No rows in {self._table}")
+            return FakeResponse(data[0], total if self._count else None)
+        return FakeResponse(data, total if self._count else None)
+
+
+class FakeRpc:
+    def __init__(self, database: "FakeSupabase", name: str, params: dict):
+        self._database = database
+        self._name = name
+        self._params = params
+
+    def execute(self) -> FakeResponse:
+        handler = self._database.functions.get(self._name)
+        if handler is None:
+            raise ValueError(f"Function {self._name} does not exist")
+        return FakeResponse(handler(self._params))
+
+
+class FakeSupabase:
+    """Thread-safe in-memory tables with pgvector-style search functions"""
+
+    def __init__(self):
+        self.tables: dict[str, list[dict]] = {}
+        self.lock = threading.RLock()
+        self._ids = itertools.count(1)
+        self._matrices: dict[tuple[str, str], tuple[np.ndarray, list[dict]]] = {}
+        self.functions = {
+            "match_archon_crawled_pages": lambda p: self.match("archon_crawled_pages", p),
+            "match_archon_code_examples": lambda p: self.match("archon_code_examples", p),
+            "hybrid_search_archon_crawled_pages": lambda p: self.hybrid("archon_crawled_pages", p),
+            "hybrid_search_archon_code_examples": lambda p: self.hybrid("archon_code_examples", p),
+        }
+
+    def table(self, name: str) -> FakeQuery:
+        return FakeQuery(self, name)
+
+    def from_(self, name: str) -> FakeQuery:
+        return FakeQuery(self, name)
+
+    def rpc(self, name: str, params: dict | None = None) -> FakeRpc:
+        return FakeRpc(self, name, params or {})
+
+    def write(self, table: str, payload: dict | list[dict], on_conflict: str | None) -> list[dict]:
+        rows = self.tables.setdefault(table, [])
+        new_rows = [dict(row) for row in (payload if isinstance(payload, list) else [payload])]
+        keys = [key.strip() for key in on_conflict.split(",")] if on_conflict else None
+        written = []
+        for row in new_rows:
+            row.setdefault("id", next(self._ids))
+            existing = None
+            if keys:
+                existing = next(
+                    (old for old in rows if all(old.get(k) == row.get(k) for k in keys)), None
+                )
+            if existing is not None:
+                existing.update(row)
+                written.append(existing)
+            else:
+                rows.append(row)
+                written.append(row)
+        self.invalidate(table)
+        return [dict(row) for row in written]
+
+    def invalidate(self, table: str) -> None:
+        for key in [key for key in self._matrices if key[0] == table]:
+            del self._matrices[key]
+
+    def _matrix(self, table: str, column: str) -> tuple[np.ndarray, list[dict]]:
+        key = (table, column)
+        if key not in self._matrices:
+            rows = [row for row in self.tables.get(table, []) if row.get(column) is not None]
+            if rows:
+                matrix = np.asarray([row[column] for row in rows], dtype=np.float32)
+                matrix /= np.maximum(np.linalg.norm(matrix, axis=1, keepdims=True), 1e-12)
+            else:
+                matrix = np.zeros((0, 0), dtype=np.float32)
+            self._matrices[key] = (matrix, rows)
+        return self._matrices[key]
+
+    def _search(self, table: str, params: dict) -> list[tuple[float, dict]]:
+        query = np.asarray(params["query_embedding"], dtype=np.float32)
+        column = f"embedding_{len(query)}"
+        with self.lock:
+            matrix, rows = self._matrix(table, column)
+        if not rows:
+            return []
+        query /= max(float(np.linalg.norm(query)), 1e-12)
+        scores = matrix @ query
+
+        source = params.get("source_filter")
+        metadata_filter = params.get("filter") or {}
+        ranked = []
+        for index in np.argsort(-scores):
+            row = rows[index]
+            if source and row.get("source_id") != source:
+                continue
+            metadata = row.get("metadata") or {}
+            if any(metadata.get(k) != v for k, v in metadata_filter.items()):
+                continue
+            ranked.append((float(scores[index]), row))
+            if len(ranked) >= params.get("match_count", 10):
+                break
+        return ranked
+
+    @staticmethod
+    def _result(row: dict, similarity: float) -> dict:
+        result = {k: v for k, v in row.items() if k not in EMBEDDING_COLUMNS}
+        result["similarity"] = similarity
+        return result
+
+    def match(self, table: str, params: dict) -> list[dict]:
+        return [self._result(row, score) for score, row in self._search(table, params)]
+
+    def hybrid(self, table: str, params: dict) -> list[dict]:
+        """Vector matches, marked "hybrid" when the content also contains a query word."""
+        words = {word.lower() for word in _WORD.findall(params.get("query_text", ""))}
+        results = []
+        for score, row in self._search(table, params):
+            content = (row.get("content") or "").lower()
+            result = self._result(row, score)
+            result["match_type"] = "hybrid" if any(word in content for word in words) else "vector"
+            results.append(result)
+        return results
@@ -0,0 +1,212 @@
+"""
+Local OpenAI-compatible provider for benchmarks.
+
+Serves /v1/embeddings and /v1/chat/completions on a loopback port from
+its own thread and event loop, with configurable latency and a share of
+requests answered with 429 (and retry-after-ms), so the benchmarks
+measure Archon's client, batching and rate-limit handling rather than a
+remote API.
+
+Embeddings are deterministic bag-of-words hashes: texts sharing words
+get similar vectors, so retrieval results are meaningful.
+"""
+
+import asyncio
+import base64
+import hashlib
+import random
+import re
+import socket
+import threading
+import time
+from dataclasses import dataclass
+
+import numpy as np
+import uvicorn
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import JSONResponse
+from starlette.routing import Route
+
+_WORD = re.compile(r"\w+")
+
+
+@dataclass
+class ProviderConfig:
+    """Behaviour of the fake provider"""
+
+    latency_ms: float = 20.0  # Base latency per request
+    per_item_latency_ms: float = 0.05  # Added per embedded text
+    jitter_ms: float = 5.0  # Uniform random extra latency
+    rate_limit_ratio: float = 0.0  # Share of requests answered with 429
+    retry_after_ms: int = 50  # retry-after-ms sent with a 429
+    requests_per_minute: int = 10_000  # Limits advertised in x-ratelimit-limit-* headers
+    tokens_per_minute: int = 10_000_000
+    seed: int = 0
+
+
+@dataclass
+class ProviderStats:
+    requests: int = 0
+    rate_limited: int = 0
+    embedded_texts: int = 0
+    chat_completions: int = 0
+
+    def as_dict(self) -> dict:
+        return {
+            "requests": self.requests,
+            "rate_limited": self.rate_limited,
+            "embedded_texts": self.embedded_texts,
+            "chat_completions": self.chat_completions,
+        }
+
+
+def fake_embedding(text: str, dimensions: int) -> np.ndarray:
+    """Unit bag-of-words vector of the text's hashed words."""
+    vector = np.zeros(dimensions, dtype=np.float32)
+    for word in _WORD.findall(text.lower()):
+        digest = hashlib.blake2b(word.encode(), digest_size=8).digest()
+        index = int.from_bytes(digest[:4], "little") % dimensions
+        vector[index] += 1.0 if digest[4] & 1 else -1.0
+    norm = float(np.linalg.norm(vector))
+    if norm == 0:
+        vector[0] = 1.0
+        return vector
+    return vector / norm
+
+
+class FakeProvider:
+    """OpenAI-compatible server on 127.0.0.1; use as a context manager"""
+
+    def __init__(self, config: ProviderConfig | None = None, dimensions: int = 1536):
+        self.config = config or ProviderConfig()
+        self.dimensions = dimensions
+        self.stats = ProviderStats()
+        self._random = random.Random(self.config.seed)
+        self._server: uvicorn.Server | None = None
+        self._thread: threading.Thread | None = None
+        self._socket: socket.socket | None = None
+        self.app = Starlette(
+            routes=[
+                Route("/v1/embeddings", self._embeddings, methods=["POST"]),
+                Route("/v1/chat/completions", self._chat, methods=["POST"]),
+            ]
+        )
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._socket.getsockname()[:2]
+        return f"http://{host}:{port}/v1"
+
+    def start(self) -> "FakeProvider":
+        self._socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self._socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        self._socket.bind(("127.0.0.1", 0))
+        config = uvicorn.Config(self.app, log_level="warning", access_log=False, lifespan="off")
+        self._server = uvicorn.Server(config)
+        self._thread = threading.Thread(
+            target=self._server.run, kwargs={"sockets": [self._socket]}, daemon=True
+        )
+        self._thread.start()
+        deadline = time.monotonic() + 10
+        while not self._server.started:
+            if time.monotonic() > deadline or not self._thread.is_alive():
+                raise RuntimeError("Fake provider did not start")
+            time.sleep(0.01)
+        return self
+
+    def stop(self) -> None:
+        if self._server is not None:
+            self._server.should_exit = True
+            self._thread.join(timeout=10)
+            self._server = None
+        if self._socket is not None:
+            self._socket.close()
+            self._socket = None
+
+    def __enter__(self) -> "FakeProvider":
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
+
+    async def _respond_later(self, items: int) -> JSONResponse | None:
+        """Wait the configured latency; a 429 response if this request is rate limited."""
+        config = self.config
+        self.stats.requests += 1
+        delay = config.latency_ms + config.per_item_latency_ms * items
+        delay += self._random.uniform(0, config.jitter_ms)
+        await asyncio.sleep(delay / 1000)
+        if self._random.random() < config.rate_limit_ratio:
+            self.stats.rate_limited += 1
+            return JSONResponse(
+                {"error": {"message": "Rate limit reached", "type": "requests", "code": "rate_limit_exceeded"}},
+                status_code=429,
+                headers={"retry-after-ms": str(config.retry_after_ms)},
+            )
+        return None
+
+    def _limit_headers(self) -> dict[str, str]:
+        return {
+            "x-ratelimit-limit-requests": str(self.config.requests_per_minute),
+            "x-ratelimit-limit-tokens": str(self.config.tokens_per_minute),
+        }
+
+    async def _embeddings(self, request: Request) -> JSONResponse:
+        body = await request.json()
+        inputs = body["input"] if isinstance(body["input"], list) else [body["input"]]
+        limited = await self._respond_later(len(inputs))
+        if limited is not None:
+            return limited
+
+        dimensions = body.get("dimensions") or self.dimensions
+        as_base64 = body.get("encoding_format") == "base64"
+        data = []
+        tokens = 0
+        for index, text in enumerate(inputs):
+            vector = fake_embedding(text, dimensions)
+            tokens += max(1, len(text) // 4)
+            embedding = base64.b64encode(vector.tobytes()).decode() if as_base64 else vector.tolist()
+            data.append({"object": "embedding", "index": index, "embedding": embedding})
+        self.stats.embedded_texts += len(inputs)
+        return JSONResponse(
+            {
+                "object": "list",
+                "data": data,
+                "model": body.get("model", "fake-embedding"),
+                "usage": {"prompt_tokens": tokens, "total_tokens": tokens},
+            },
+            headers=self._limit_headers(),
+        )
+
+    async def _chat(self, request: Request) -> JSONResponse:
+        body = await request.json()
+        limited = await self._respond_later(1)
+        if limited is not None:
+            return limited
+
+        prompt = " ".join(str(message.get("content", "")) for message in body.get("messages", []))
+        words = _WORD.findall(prompt)
+        content = "Summary: " + " ".join(words[:40])
+        self.stats.chat_completions += 1
+        return JSONResponse(
+            {
+                "id": f"chatcmpl-{self.stats.requests}",
+                "object": "chat.completion",
+                "created": int(time.time()),
+                "model": body.get("model", "fake-chat"),
+                "choices": [
+                    {
+                        "index": 0,
+                        "message": {"role": "assistant", "content": content},
+                        "finish_reason": "stop",
+                    }
+                ],
+                "usage": {
+                    "prompt_tokens": len(words),
+                    "completion_tokens": min(len(words), 40) + 1,
+                    "total_tokens": len(words) + min(len(words), 40) + 1,
+                },
+            },
+            headers=self._limit_headers(),
+        )
@@ -0,0 +1,81 @@
+"""
+Measurement helpers: latency percentiles and memory high-water marks.
+"""
+
+import threading
+import time
+
+import psutil
+
+_MB = 1024 * 1024
+
+
+def percentiles(samples: list[float], points: tuple[int, ...] = (50, 95, 99)) -> dict[str, float]:
+    """Linearly interpolated percentiles of samples, keyed "p50", "p95", ..."""
+    if not samples:
+        return {f"p{point}": 0.0 for point in points}
+    ordered = sorted(samples)
+    result = {}
+    for point in points:
+        rank = (len(ordered) - 1) * point / 100
+        low = int(rank)
+        high = min(low + 1, len(ordered) - 1)
+        result[f"p{point}"] = ordered[low] + (ordered[high] - ordered[low]) * (rank - low)
+    return result
+
+
+class MemorySampler:
+    """
+    Peak resident memory of this process while the block runs.
+
+    Samples RSS from a background thread (tracemalloc would slow the code
+    being measured several times over). Reports the high-water mark and
+    its growth over the RSS at entry.
+    """
+
+    def __init__(self, interval: float = 0.01):
+        self.interval = interval
+        self._process = psutil.Process()
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+        self.start_rss = 0
+        self.peak_rss = 0
+
+    def _sample(self) -> None:
+        while not self._stop.wait(self.interval):
+            self.peak_rss = max(self.peak_rss, self._process.memory_info().rss)
+
+    def __enter__(self) -> "MemorySampler":
+        self.start_rss = self.peak_rss = self._process.memory_info().rss
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._sample, daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self._stop.set()
+        self._thread.join()
+        self.peak_rss = max(self.peak_rss, self._process.memory_info().rss)
+
+    def as_dict(self) -> dict[str, float]:
+        return {
+            "rss_high_water_mb": round(self.peak_rss / _MB, 1),
+            "rss_growth_mb": round((self.peak_rss - self.start_rss) / _MB, 1),
+        }
+
+
+class Timer:
+    """Wall-clock duration of a block, in seconds"""
+
+    def __enter__(self) -> "Timer":
+        self.started = time.perf_counter()
+        self.seconds = 0.0
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.seconds = time.perf_counter() - self.started
+
+
+def rate(count: float, seconds: float) -> float:
+    """count per second, rounded for reports"""
+    return round(count / seconds, 2) if seconds > 0 else 0.0
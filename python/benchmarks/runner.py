@@ -0,0 +1,240 @@
+"""
+Benchmark runner.
+
+    uv run python -m benchmarks run [--scenarios chunking,retrieval] [--output results.json]
+    uv run python -m benchmarks compare base.json new.json [--fail-above 10]
+
+"run" starts the fake provider, points the OpenAI client at it
+(OPENAI_BASE_URL), loads benchmark settings into the credential service
+from the in-process database, runs the scenarios and writes the results
+as JSON (by default to benchmarks/results/<commit>.json). "compare"
+prints the change of every metric between two result files.
+"""
+
+import argparse
+import asyncio
+import datetime
+import json
+import logging
+import os
+import platform
+import subprocess
+import sys
+from pathlib import Path
+from typing import Any
+
+from .corpus import DEFAULT_RECORDED_DIR, build_corpus, build_queries
+from .fake_database import FakeSupabase
+from .fake_provider import FakeProvider, ProviderConfig
+
+RESULTS_DIR = Path(__file__).resolve().parent / "results"
+
+# Settings the benchmarks run with (override with --setting KEY=VALUE)
+BENCHMARK_SETTINGS = {
+    "OPENAI_API_KEY": "sk-benchmark",
+    "LLM_PROVIDER": "openai",
+    "EMBEDDING_PROVIDER": "openai",
+    "MODEL_CHOICE": "gpt-4.1-nano",
+    "EMBEDDING_MODEL": "text-embedding-3-small",
+    "EMBEDDING_DIMENSIONS": "1536",
+    "EMBEDDING_BATCH_SIZE": "100",
+    "DOCUMENT_STORAGE_BATCH_SIZE": "50",
+    "USE_CONTEXTUAL_EMBEDDINGS": "false",
+    "USE_HYBRID_SEARCH": "false",
+    "USE_AGENTIC_RAG": "false",
+    "USE_RERANKING": "false",
+}
+
+# Metric name patterns and whether higher values are better
+_HIGHER_IS_BETTER = ("_per_sec",)
+_LOWER_IS_BETTER = ("_ms", "_mb", "seconds", "errors", "failures")
+
+
+def _git(*args: str) -> str | None:
+    try:
+        return subprocess.run(
+            ["git", *args], capture_output=True, text=True, check=True, cwd=Path(__file__).parent
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def _settings_rows(overrides: dict[str, str]) -> list[dict[str, Any]]:
+    values = {**BENCHMARK_SETTINGS, **overrides}
+    return [
+        {
+            "key": key,
+            "value": value,
+            "encrypted_value": None,
+            "is_encrypted": False,
+            "category": "api_keys" if key.endswith("_API_KEY") else "rag_strategy",
+            "description": "benchmark setting",
+        }
+        for key, value in values.items()
+    ]
+
+
+async def _configure(database: FakeSupabase, provider: FakeProvider, overrides: dict[str, str]) -> None:
+    """Point the server's credential service and OpenAI client at the fakes."""
+    from src.server.services.credential_service import credential_service
+
+    os.environ["OPENAI_BASE_URL"] = provider.base_url
+    database.tables["archon_settings"] = _settings_rows(overrides)
+    credential_service._supabase = database
+    credential_service._rag_settings_cache = None
+    await credential_service.load_all_credentials()
+
+
+async def run_benchmarks(args: argparse.Namespace) -> dict[str, Any]:
+    from .scenarios import SCENARIOS, BenchmarkContext
+
+    names = list(SCENARIOS) if args.scenarios == "all" else args.scenarios.split(",")
+    unknown = [name for name in names if name not in SCENARIOS]
+    if unknown:
+        raise SystemExit(f"Unknown scenarios: {', '.join(unknown)} (choose from {', '.join(SCENARIOS)})")
+
+    recorded_dir = None if args.no_recorded else Path(args.recorded_dir)
+    pages = build_corpus(synthetic=args.pages, seed=args.seed, recorded_dir=recorded_dir)
+    database = FakeSupabase()
+    provider_config = ProviderConfig(
+        latency_ms=args.latency_ms, rate_limit_ratio=args.rate_limit_ratio, seed=args.seed
+    )
+    overrides = dict(setting.split("=", 1) for setting in args.setting)
+
+    results: dict[str, Any] = {}
+    with FakeProvider(provider_config) as provider:
+        await _configure(database, provider, overrides)
+        ctx = BenchmarkContext(
+            pages=pages,
+            queries=build_queries(pages, args.queries, seed=args.seed),
+            database=database,
+            concurrency=args.concurrency,
+        )
+        for name in names:
+            print(f"Running {name}...", file=sys.stderr)
+            results[name] = await SCENARIOS[name](ctx)
+
+    return {
+        "commit": _git("rev-parse", "HEAD"),
+        "dirty": bool(_git("status", "--porcelain", "--untracked-files=no")),
+        "timestamp": datetime.datetime.now(datetime.UTC).isoformat(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "config": {
+            "synthetic_pages": args.pages,
+            "queries": args.queries,
+            "concurrency": args.concurrency,
+            "seed": args.seed,
+            "provider_latency_ms": args.latency_ms,
+            "provider_rate_limit_ratio": args.rate_limit_ratio,
+            "settings": {**BENCHMARK_SETTINGS, **overrides, "OPENAI_API_KEY": "***"},
+        },
+        "corpus": {
+            "pages": len(pages),
+            "recorded_pages": sum(page.kind == "recorded" for page in pages),
+            "bytes": sum(len(page.markdown) for page in pages),
+        },
+        "provider": provider.stats.as_dict(),
+        "scenarios": results,
+    }
+
+
+def _direction(metric: str) -> int:
+    """1 if higher is better, -1 if lower is better, 0 if informational"""
+    if metric.endswith(_HIGHER_IS_BETTER):
+        return 1
+    if metric.endswith(_LOWER_IS_BETTER):
+        return -1
+    return 0
+
+
+def compare_results(base: dict[str, Any], new: dict[str, Any]) -> list[dict[str, Any]]:
+    """
+    Change of every numeric metric present in both results.
+
+    Returns:
+        Rows with scenario, metric, base, new, change_pct and regression_pct
+        (how much worse the new value is, 0 if better or informational)
+    """
+    rows = []
+    for scenario, base_metrics in base.get("scenarios", {}).items():
+        new_metrics = new.get("scenarios", {}).get(scenario, {})
+        for metric, base_value in base_metrics.items():
+            new_value = new_metrics.get(metric)
+            if not isinstance(base_value, int | float) or not isinstance(new_value, int | float):
+                continue
+            change = (new_value - base_value) / base_value * 100 if base_value else 0.0
+            direction = _direction(metric)
+            rows.append({
+                "scenario": scenario,
+                "metric": metric,
+                "base": base_value,
+                "new": new_value,
+                "change_pct": round(change, 1),
+                "regression_pct": round(max(0.0, -change * direction), 1),
+            })
+    return rows
+
+
+def _print_results(results: dict[str, Any]) -> None:
+    for scenario, metrics in results["scenarios"].items():
+        print(f"\n{scenario}")
+        for metric, value in metrics.items():
+            print(f"  {metric:<24} {value}")
+
+
+def _print_comparison(rows: list[dict[str, Any]]) -> None:
+    print(f"{'scenario':<16} {'metric':<24} {'base':>12} {'new':>12} {'change':>9}")
+    for row in rows:
+        flag = "  <- worse" if row["regression_pct"] else ""
+        print(
+            f"{row['scenario']:<16} {row['metric']:<24} {row['base']:>12} {row['new']:>12} "
+            f"{row['change_pct']:>8}%{flag}"
+        )
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks", description="Archon ingestion and retrieval benchmarks")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run = commands.add_parser("run", help="Run scenarios and save the results as JSON")
+    run.add_argument("--scenarios", default="all", help="Comma-separated scenarios, or 'all'")
+    run.add_argument("--pages", type=int, default=200, help="Synthetic pages in the corpus")
+    run.add_argument("--recorded-dir", default=str(DEFAULT_RECORDED_DIR), help="Directory of recorded markdown pages")
+    run.add_argument("--no-recorded", action="store_true", help="Use synthetic pages only")
+    run.add_argument("--queries", type=int, default=200, help="Retrieval queries")
+    run.add_argument("--concurrency", type=int, default=8, help="Concurrent retrieval queries")
+    run.add_argument("--latency-ms", type=float, default=20.0, help="Fake provider latency per request")
+    run.add_argument("--rate-limit-ratio", type=float, default=0.0, help="Share of provider requests answered with 429")
+    run.add_argument("--seed", type=int, default=42)
+    run.add_argument("--setting", action="append", default=[], metavar="KEY=VALUE", help="Override a benchmark setting")
+    run.add_argument("--output", help="Result file (default: benchmarks/results/<commit>.json)")
+
+    compare = commands.add_parser("compare", help="Compare two result files")
+    compare.add_argument("base")
+    compare.add_argument("new")
+    compare.add_argument("--fail-above", type=float, help="Exit 1 if any metric is this many percent worse")
+    return parser
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = build_parser().parse_args(argv)
+
+    if args.command == "compare":
+        base = json.loads(Path(args.base).read_text())
+        new = json.loads(Path(args.new).read_text())
+        rows = compare_results(base, new)
+        _print_comparison(rows)
+        if args.fail_above is not None and any(row["regression_pct"] > args.fail_above for row in rows):
+            return 1
+        return 0
+
+    logging.basicConfig(level=logging.WARNING)
+    results = asyncio.run(run_benchmarks(args))
+    output = Path(args.output) if args.output else RESULTS_DIR / f"{(results['commit'] or 'local')[:12]}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(results, indent=2))
+    _print_results(results)
+    print(f"\nResults written to {output}")
+    return 0
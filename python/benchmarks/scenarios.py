@@ -0,0 +1,174 @@
+"""
+Benchmark scenarios.
+
+Each scenario runs one stage of ingestion or retrieval over the corpus
+through Archon's own code and returns its metrics. Provider calls go to
+the fake provider and database calls to the in-process stand-in (see
+runner.py for the wiring).
+"""
+
+import asyncio
+import time
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass, field
+from typing import Any
+
+from src.server.services.embeddings.embedding_service import create_embeddings_batch
+from src.server.services.search.rag_service import RAGService
+from src.server.services.storage.base_storage_service import chunk_text
+from src.server.services.storage.code_storage_service import extract_code_blocks
+from src.server.services.storage.document_storage_service import add_documents_to_supabase
+
+from .corpus import Page
+from .fake_database import FakeSupabase
+from .measure import MemorySampler, Timer, percentiles, rate
+
+# Chunk size used by crawl ingestion (document_storage_operations)
+CHUNK_SIZE = 5000
+
+
+@dataclass
+class BenchmarkContext:
+    pages: list[Page]
+    queries: list[str]
+    database: FakeSupabase
+    concurrency: int = 8
+    source_id: str = "benchmark"
+    chunks: dict[str, list[str]] = field(default_factory=dict)
+
+    def chunked(self) -> dict[str, list[str]]:
+        """Chunks of every page by URL (computed once)"""
+        if not self.chunks:
+            self.chunks = {page.url: chunk_text(page.markdown, CHUNK_SIZE) for page in self.pages}
+        return self.chunks
+
+
+async def chunking(ctx: BenchmarkContext) -> dict[str, Any]:
+    """smart_chunk_text over every page"""
+    total_chunks = 0
+    total_bytes = 0
+    with MemorySampler() as memory, Timer() as timer:
+        for page in ctx.pages:
+            total_chunks += len(chunk_text(page.markdown, CHUNK_SIZE))
+            total_bytes += len(page.markdown)
+    return {
+        "seconds": round(timer.seconds, 4),
+        "pages": len(ctx.pages),
+        "chunks": total_chunks,
+        "pages_per_sec": rate(len(ctx.pages), timer.seconds),
+        "chunks_per_sec": rate(total_chunks, timer.seconds),
+        "mb_per_sec": rate(total_bytes / 1024 / 1024, timer.seconds),
+        **memory.as_dict(),
+    }
+
+
+async def code_extraction(ctx: BenchmarkContext) -> dict[str, Any]:
+    """extract_code_blocks over every page"""
+    blocks = 0
+    with MemorySampler() as memory, Timer() as timer:
+        for page in ctx.pages:
+            blocks += len(extract_code_blocks(page.markdown))
+    return {
+        "seconds": round(timer.seconds, 4),
+        "pages": len(ctx.pages),
+        "code_blocks": blocks,
+        "pages_per_sec": rate(len(ctx.pages), timer.seconds),
+        "code_blocks_per_sec": rate(blocks, timer.seconds),
+        **memory.as_dict(),
+    }
+
+
+async def embeddings(ctx: BenchmarkContext) -> dict[str, Any]:
+    """create_embeddings_batch over every chunk"""
+    texts = [chunk for chunks in ctx.chunked().values() for chunk in chunks]
+    with MemorySampler() as memory, Timer() as timer:
+        result = await create_embeddings_batch(texts)
+    return {
+        "seconds": round(timer.seconds, 4),
+        "texts": len(texts),
+        "embeddings": result.success_count,
+        "failures": result.failure_count,
+        "embeddings_per_sec": rate(result.success_count, timer.seconds),
+        **memory.as_dict(),
+    }
+
+
+async def _ingest(ctx: BenchmarkContext) -> dict[str, int]:
+    """Chunk, embed and store every page the way crawl ingestion does"""
+    urls, chunk_numbers, contents, metadatas = [], [], [], []
+    url_to_full_document = {}
+    for page in ctx.pages:
+        url_to_full_document[page.url] = page.markdown
+        for index, chunk in enumerate(chunk_text(page.markdown, CHUNK_SIZE)):
+            urls.append(page.url)
+            chunk_numbers.append(index)
+            contents.append(chunk)
+            metadatas.append({
+                "url": page.url,
+                "title": page.title,
+                "source_id": ctx.source_id,
+                "knowledge_type": "documentation",
+                "crawl_type": "benchmark",
+                "word_count": len(chunk.split()),
+                "char_count": len(chunk),
+                "chunk_index": index,
+            })
+    result = await add_documents_to_supabase(
+        ctx.database, urls, chunk_numbers, contents, metadatas, url_to_full_document
+    )
+    return {"chunks": len(contents), "chunks_stored": result.get("chunks_stored", 0)}
+
+
+async def ingestion(ctx: BenchmarkContext) -> dict[str, Any]:
+    """Chunking, embedding and storage of every page, end to end"""
+    ctx.database.tables.pop("archon_crawled_pages", None)
+    with MemorySampler() as memory, Timer() as timer:
+        counts = await _ingest(ctx)
+    return {
+        "seconds": round(timer.seconds, 4),
+        "pages": len(ctx.pages),
+        **counts,
+        "pages_per_sec": rate(len(ctx.pages), timer.seconds),
+        "chunks_per_sec": rate(counts["chunks_stored"], timer.seconds),
+        **memory.as_dict(),
+    }
+
+
+async def retrieval(ctx: BenchmarkContext) -> dict[str, Any]:
+    """RAGService.perform_rag_query for every query, ctx.concurrency at a time"""
+    if not ctx.database.tables.get("archon_crawled_pages"):
+        await _ingest(ctx)
+
+    service = RAGService(ctx.database)
+    semaphore = asyncio.Semaphore(ctx.concurrency)
+    latencies: list[float] = []
+    errors = 0
+
+    async def query(text: str) -> None:
+        nonlocal errors
+        async with semaphore:
+            started = time.perf_counter()
+            success, _ = await service.perform_rag_query(text, match_count=5, return_mode="chunks")
+            latencies.append((time.perf_counter() - started) * 1000)
+            errors += 0 if success else 1
+
+    with MemorySampler() as memory, Timer() as timer:
+        await asyncio.gather(*(query(text) for text in ctx.queries))
+    return {
+        "seconds": round(timer.seconds, 4),
+        "queries": len(ctx.queries),
+        "errors": errors,
+        "concurrency": ctx.concurrency,
+        "queries_per_sec": rate(len(ctx.queries), timer.seconds),
+        **{f"{key}_ms": round(value, 2) for key, value in percentiles(latencies).items()},
+        **memory.as_dict(),
+    }
+
+
+SCENARIOS: dict[str, Callable[[BenchmarkContext], Awaitable[dict[str, Any]]]] = {
+    "chunking": chunking,
+    "code_extraction": code_extraction,
+    "embeddings": embeddings,
+    "ingestion": ingestion,
+    "retrieval": retrieval,
+}
@@ -147,18 +147,13 @@ class DocumentAgent(BaseAgent[DocumentDependencies, DocumentOperation]):
                 if not ctx.deps.project_id:
                     return "No project is currently selected. Please specify a project or create one first to manage documents."
 
-                supabase = get_supabase_client()
-                response = (
-                    supabase.table("archon_projects")
-                    .select("docs")
-                    .eq("id", ctx.deps.project_id)
-                    .execute()
-                )
+                from ..services.projects.document_service import DocumentService
 
-                if not response.data:
+                success, result = DocumentService().list_documents(ctx.deps.project_id)
+                if not success:
                     return "No project found with the given ID."
 
-                docs = response.data[0].get("docs", [])
+                docs = result["documents"]
                 if not docs:
                     return "No documents found in this project."
 
@@ -178,18 +173,15 @@ class DocumentAgent(BaseAgent[DocumentDependencies, DocumentOperation]):
         async def get_document(ctx: RunContext[DocumentDependencies], document_title: str) -> str:
             """Get the content of a specific document by title."""
             try:
-                supabase = get_supabase_client()
-                response = (
-                    supabase.table("archon_projects")
-                    .select("docs")
-                    .eq("id", ctx.deps.project_id)
-                    .execute()
-                )
+                from ..services.projects.document_service import DocumentService
 
-                if not response.data:
+                success, result = DocumentService().list_documents(
+                    ctx.deps.project_id, include_content=True
+                )
+                if not success:
                     return "No project found."
 
-                docs = response.data[0].get("docs", [])
+                docs = result["documents"]
                 matching_docs = [
                     doc for doc in docs if document_title.lower() in doc.get("title", "").lower()
                 ]
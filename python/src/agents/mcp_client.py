@@ -43,7 +43,11 @@ class MCPClient:
                 else:
                     self.mcp_url = f"http://localhost:{mcp_port}"
 
-        self.client = httpx.AsyncClient(timeout=30.0)
+        # One keep-alive pool for all tool calls of this client
+        self.client = httpx.AsyncClient(
+            timeout=httpx.Timeout(30.0, connect=5.0),
+            limits=httpx.Limits(max_connections=50, max_keepalive_connections=10),
+        )
         logger.info(f"MCP Client initialized with URL: {self.mcp_url}")
 
     async def __aenter__(self):
@@ -154,3 +158,12 @@ async def get_mcp_client() -> MCPClient:
         _mcp_client = MCPClient()
 
     return _mcp_client
+
+
+async def close_mcp_client() -> None:
+    """Close the global MCP client's connections (on shutdown)."""
+    global _mcp_client
+
+    if _mcp_client is not None:
+        await _mcp_client.close()
+        _mcp_client = None
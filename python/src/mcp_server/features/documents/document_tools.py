@@ -13,6 +13,7 @@ import httpx
 
 from mcp.server.fastmcp import Context, FastMCP
 from src.mcp_server.utils.error_handling import MCPErrorFormatter
+from src.mcp_server.utils.http_client import get_http_client
 from src.mcp_server.utils.timeout_config import get_default_timeout
 from src.server.config.service_discovery import get_api_url
 
@@ -71,7 +72,7 @@ def register_document_tools(mcp: FastMCP):
             
             # Single document get mode
             if document_id:
-                async with httpx.AsyncClient(timeout=timeout) as client:
+                async with get_http_client(timeout=timeout) as client:
                     response = await client.get(
                         urljoin(api_url, f"/api/projects/{project_id}/docs/{document_id}")
                     )
@@ -91,7 +92,7 @@ def register_document_tools(mcp: FastMCP):
                         return MCPErrorFormatter.from_http_error(response, "get document")
             
             # List mode
-            async with httpx.AsyncClient(timeout=timeout) as client:
+            async with get_http_client(timeout=timeout) as client:
                 response = await client.get(
                     urljoin(api_url, f"/api/projects/{project_id}/docs")
                 )
@@ -174,7 +175,7 @@ def register_document_tools(mcp: FastMCP):
             api_url = get_api_url()
             timeout = get_default_timeout()
             
-            async with httpx.AsyncClient(timeout=timeout) as client:
+            async with get_http_client(timeout=timeout) as client:
                 if action == "create":
                     if not title or not document_type:
                         return MCPErrorFormatter.format_error(
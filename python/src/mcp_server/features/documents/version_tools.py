@@ -13,6 +13,7 @@ import httpx
 
 from mcp.server.fastmcp import Context, FastMCP
 from src.mcp_server.utils.error_handling import MCPErrorFormatter
+from src.mcp_server.utils.http_client import get_http_client
 from src.mcp_server.utils.timeout_config import get_default_timeout
 from src.server.config.service_discovery import get_api_url
 
@@ -49,7 +50,7 @@ def register_version_tools(mcp: FastMCP):
         
         Args:
             project_id: Project UUID (required)
-            field_name: Filter by field (docs/features/data/prd)
+            field_name: Filter by field (docs/features/data/prd, or docs:<document id> for one document)
             version_number: Get specific version (requires field_name)
             page: Page number for pagination
             per_page: Items per page (default: 10)
@@ -68,7 +69,7 @@ def register_version_tools(mcp: FastMCP):
             
             # Single version get mode
             if field_name and version_number is not None:
-                async with httpx.AsyncClient(timeout=timeout) as client:
+                async with get_http_client(timeout=timeout) as client:
                     response = await client.get(
                         urljoin(api_url, f"/api/projects/{project_id}/versions/{field_name}/{version_number}")
                     )
@@ -92,7 +93,7 @@ def register_version_tools(mcp: FastMCP):
             if field_name:
                 params["field_name"] = field_name
             
-            async with httpx.AsyncClient(timeout=timeout) as client:
+            async with get_http_client(timeout=timeout) as client:
                 response = await client.get(
                     urljoin(api_url, f"/api/projects/{project_id}/versions"),
                     params=params
@@ -145,7 +146,7 @@ def register_version_tools(mcp: FastMCP):
         Args:
             action: "create" | "restore"
             project_id: Project UUID (required)
-            field_name: docs/features/data/prd
+            field_name: docs/features/data/prd, or docs:<document id> for one document
             version_number: Version to restore (for restore action)
             content: Content to snapshot (for create action)
             change_summary: What changed (for create)
@@ -164,7 +165,7 @@ def register_version_tools(mcp: FastMCP):
             api_url = get_api_url()
             timeout = get_default_timeout()
             
-            async with httpx.AsyncClient(timeout=timeout) as client:
+            async with get_http_client(timeout=timeout) as client:
                 if action == "create":
                     if not content:
                         return MCPErrorFormatter.format_error(
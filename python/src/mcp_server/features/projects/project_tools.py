@@ -13,6 +13,7 @@ import httpx
 
 from mcp.server.fastmcp import Context, FastMCP
 from src.mcp_server.utils.error_handling import MCPErrorFormatter
+from src.mcp_server.utils.http_client import get_http_client
 from src.mcp_server.utils.timeout_config import (
     get_default_timeout,
     get_max_polling_attempts,
@@ -84,7 +85,7 @@ def register_project_tools(mcp: FastMCP):
             
             # Single project get mode
             if project_id:
-                async with httpx.AsyncClient(timeout=timeout) as client:
+                async with get_http_client(timeout=timeout) as client:
                     response = await client.get(urljoin(api_url, f"/api/projects/{project_id}"))
                     
                     if response.status_code == 200:
@@ -102,7 +103,7 @@ def register_project_tools(mcp: FastMCP):
                         return MCPErrorFormatter.from_http_error(response, "get project")
             
             # List mode
-            async with httpx.AsyncClient(timeout=timeout) as client:
+            async with get_http_client(timeout=timeout) as client:
                 response = await client.get(urljoin(api_url, "/api/projects"))
                 
                 if response.status_code == 200:
@@ -174,7 +175,7 @@ def register_project_tools(mcp: FastMCP):
             api_url = get_api_url()
             timeout = get_default_timeout()
             
-            async with httpx.AsyncClient(timeout=timeout) as client:
+            async with get_http_client(timeout=timeout) as client:
                 if action == "create":
                     if not title:
                         return MCPErrorFormatter.format_error(
@@ -205,7 +206,7 @@ def register_project_tools(mcp: FastMCP):
                                     sleep_interval = get_polling_interval(attempt)
                                     await asyncio.sleep(sleep_interval)
                                     
-                                    async with httpx.AsyncClient(timeout=polling_timeout) as poll_client:
+                                    async with get_http_client(timeout=polling_timeout) as poll_client:
                                         poll_response = await poll_client.get(
                                             urljoin(api_url, f"/api/progress/{result['progress_id']}")
                                         )
@@ -13,16 +13,26 @@ service modules directly, enabling true microservices architecture.
 import json
 import logging
 import os
+from typing import Any
 from urllib.parse import urljoin
 
 import httpx
 from mcp.server.fastmcp import Context, FastMCP
 
+from src.mcp_server.utils import in_process
+from src.mcp_server.utils.http_client import get_http_client
+from src.mcp_server.utils.timeout_config import get_default_timeout
+
 # Import service discovery for HTTP communication
 from src.server.config.service_discovery import get_api_url
 
 logger = logging.getLogger(__name__)
 
+# Page reads: content returned per call and the size of each section fetched
+DEFAULT_PAGE_READ_TOKENS = 5000
+PAGE_SECTION_TOKENS = 2000
+MIN_PAGE_SECTION_TOKENS = 100
+
 
 def get_setting(key: str, default: str = "false") -> str:
     """Get a setting from environment variable."""
@@ -52,9 +62,9 @@ def register_rag_tools(mcp: FastMCP):
         """
         try:
             api_url = get_api_url()
-            timeout = httpx.Timeout(30.0, connect=5.0)
+            timeout = get_default_timeout()
 
-            async with httpx.AsyncClient(timeout=timeout) as client:
+            async with get_http_client(timeout=timeout) as client:
                 response = await client.get(urljoin(api_url, "/api/rag/sources"))
 
                 if response.status_code == 200:
@@ -81,7 +91,8 @@ def register_rag_tools(mcp: FastMCP):
         query: str,
         source_id: str | None = None,
         match_count: int = 5,
-        return_mode: str = "pages"
+        return_mode: str = "pages",
+        token_budget: int | None = None,
     ) -> str:
         """
         Search knowledge base for relevant content using RAG.
@@ -95,6 +106,9 @@ def register_rag_tools(mcp: FastMCP):
                       Example: "src_1234abcd" not "docs.anthropic.com"
             match_count: Max results (default: 5)
             return_mode: "pages" (default, full pages with metadata) or "chunks" (raw text chunks)
+            token_budget: Optional max tokens for all results (e.g. 4000). Results are packed
+                          best-first; ones that don't fit whole are cut to the passage around
+                          your query terms (content_truncated=true) or left out
 
         Returns:
             JSON string with structure:
@@ -104,48 +118,66 @@ def register_rag_tools(mcp: FastMCP):
                       Chunks include: content, metadata, similarity
             - return_mode: str - Mode used ("pages" or "chunks")
             - reranked: bool - Whether results were reranked
+            - packing: dict - Tokens used and truncated/omitted counts (with token_budget)
             - error: str|null - Error description if success=false
 
         Note: Use "pages" mode for better context (recommended), or "chunks" for raw granular results.
         After getting pages, use rag_read_full_page() to retrieve complete page content.
         """
         try:
-            api_url = get_api_url()
-            timeout = httpx.Timeout(30.0, connect=5.0)
-
-            async with httpx.AsyncClient(timeout=timeout) as client:
-                request_data = {
-                    "query": query,
-                    "match_count": match_count,
-                    "return_mode": return_mode
-                }
-                if source_id:
-                    request_data["source"] = source_id
-
-                response = await client.post(urljoin(api_url, "/api/rag/query"), json=request_data)
-
-                if response.status_code == 200:
-                    result = response.json()
-                    return json.dumps(
-                        {
-                            "success": True,
-                            "results": result.get("results", []),
-                            "return_mode": result.get("return_mode", return_mode),
-                            "reranked": result.get("reranked", False),
-                            "error": None,
-                        },
-                        indent=2,
-                    )
-                else:
-                    error_detail = response.text
+            if in_process.in_process_enabled():
+                # Co-located with the API server: call the service layer directly
+                success, result = await in_process.perform_rag_query(
+                    query, source_id, match_count, return_mode, token_budget
+                )
+                if not success:
                     return json.dumps(
                         {
                             "success": False,
                             "results": [],
-                            "error": f"HTTP {response.status_code}: {error_detail}",
+                            "error": result.get("error", "RAG query failed"),
                         },
                         indent=2,
                     )
+            else:
+                api_url = get_api_url()
+                timeout = get_default_timeout()
+
+                async with get_http_client(timeout=timeout) as client:
+                    request_data = {
+                        "query": query,
+                        "match_count": match_count,
+                        "return_mode": return_mode
+                    }
+                    if source_id:
+                        request_data["source"] = source_id
+                    if token_budget is not None:
+                        request_data["token_budget"] = token_budget
+
+                    response = await client.post(urljoin(api_url, "/api/rag/query"), json=request_data)
+
+                    if response.status_code != 200:
+                        error_detail = response.text
+                        return json.dumps(
+                            {
+                                "success": False,
+                                "results": [],
+                                "error": f"HTTP {response.status_code}: {error_detail}",
+                            },
+                            indent=2,
+                        )
+                    result = response.json()
+
+            response_data = {
+                "success": True,
+                "results": result.get("results", []),
+                "return_mode": result.get("return_mode", return_mode),
+                "reranked": result.get("reranked", False),
+                "error": None,
+            }
+            if "packing" in result:
+                response_data["packing"] = result["packing"]
+            return json.dumps(response_data, indent=2)
 
         except Exception as e:
             logger.error(f"Error performing RAG query: {e}")
@@ -175,17 +207,103 @@ def register_rag_tools(mcp: FastMCP):
             - error: str|null - Error description if success=false
         """
         try:
-            api_url = get_api_url()
-            timeout = httpx.Timeout(30.0, connect=5.0)
+            if in_process.in_process_enabled():
+                # Co-located with the API server: call the service layer directly
+                success, result = await in_process.search_code_examples(
+                    query, source_id, match_count
+                )
+                if not success:
+                    return json.dumps(
+                        {
+                            "success": False,
+                            "results": [],
+                            "error": result.get("error", "Code examples search failed"),
+                        },
+                        indent=2,
+                    )
+            else:
+                api_url = get_api_url()
+                timeout = get_default_timeout()
+
+                async with get_http_client(timeout=timeout) as client:
+                    request_data = {"query": query, "match_count": match_count}
+                    if source_id:
+                        request_data["source"] = source_id
+
+                    # Call the dedicated code examples endpoint
+                    response = await client.post(
+                        urljoin(api_url, "/api/rag/code-examples"), json=request_data
+                    )
+
+                    if response.status_code != 200:
+                        error_detail = response.text
+                        return json.dumps(
+                            {
+                                "success": False,
+                                "results": [],
+                                "error": f"HTTP {response.status_code}: {error_detail}",
+                            },
+                            indent=2,
+                        )
+                    result = response.json()
+
+            return json.dumps(
+                {
+                    "success": True,
+                    "results": result.get("results", []),
+                    "reranked": result.get("reranked", False),
+                    "error": None,
+                },
+                indent=2,
+            )
+
+        except Exception as e:
+            logger.error(f"Error searching code examples: {e}")
+            return json.dumps({"success": False, "results": [], "error": str(e)}, indent=2)
+
+    @mcp.tool()
+    async def rag_batch_search(ctx: Context, queries: list[dict[str, Any]]) -> str:
+        """
+        Run several knowledge base and code example searches in one call.
+
+        Prefer this over calling rag_search_knowledge_base / rag_search_code_examples
+        repeatedly - all queries are embedded together and searched concurrently.
 
-            async with httpx.AsyncClient(timeout=timeout) as client:
-                request_data = {"query": query, "match_count": match_count}
-                if source_id:
-                    request_data["source"] = source_id
+        Args:
+            queries: List of up to 20 query objects, each with:
+                - query: str - Search query, SHORT and FOCUSED (2-5 keywords)
+                - search_type: "documents" (default) or "code_examples"
+                - source_id: Optional source ID filter from rag_get_available_sources()
+                - match_count: Max results (default: 5)
+                - return_mode: "pages" (default) or "chunks", documents only
+                Example: [{"query": "vector search"}, {"query": "React useState", "search_type": "code_examples"}]
+
+        Returns:
+            JSON string with structure:
+            - success: bool - Operation success status
+            - results: list[dict] - One entry per query, in request order, each with
+                      search_type, query, success, results and error
+            - error: str|null - Error description if success=false
+        """
+        try:
+            api_url = get_api_url()
+            timeout = httpx.Timeout(60.0, connect=5.0)
+
+            request_queries = []
+            for item in queries:
+                request_item = {
+                    "query": item.get("query", ""),
+                    "search_type": item.get("search_type", "documents"),
+                    "match_count": item.get("match_count", 5),
+                    "return_mode": item.get("return_mode", "pages"),
+                }
+                if item.get("source_id"):
+                    request_item["source"] = item["source_id"]
+                request_queries.append(request_item)
 
-                # Call the dedicated code examples endpoint
+            async with get_http_client(timeout=timeout) as client:
                 response = await client.post(
-                    urljoin(api_url, "/api/rag/code-examples"), json=request_data
+                    urljoin(api_url, "/api/rag/batch-query"), json={"queries": request_queries}
                 )
 
                 if response.status_code == 200:
@@ -194,7 +312,6 @@ def register_rag_tools(mcp: FastMCP):
                         {
                             "success": True,
                             "results": result.get("results", []),
-                            "reranked": result.get("reranked", False),
                             "error": None,
                         },
                         indent=2,
@@ -211,7 +328,7 @@ def register_rag_tools(mcp: FastMCP):
                     )
 
         except Exception as e:
-            logger.error(f"Error searching code examples: {e}")
+            logger.error(f"Error performing batch RAG search: {e}")
             return json.dumps({"success": False, "results": [], "error": str(e)}, indent=2)
 
     @mcp.tool()
@@ -243,9 +360,9 @@ def register_rag_tools(mcp: FastMCP):
         """
         try:
             api_url = get_api_url()
-            timeout = httpx.Timeout(30.0, connect=5.0)
+            timeout = get_default_timeout()
 
-            async with httpx.AsyncClient(timeout=timeout) as client:
+            async with get_http_client(timeout=timeout) as client:
                 params = {"source_id": source_id}
                 if section:
                     params["section"] = section
@@ -295,15 +412,25 @@ def register_rag_tools(mcp: FastMCP):
 
     @mcp.tool()
     async def rag_read_full_page(
-        ctx: Context, page_id: str | None = None, url: str | None = None
+        ctx: Context,
+        page_id: str | None = None,
+        url: str | None = None,
+        section: int | None = None,
+        token_budget: int = DEFAULT_PAGE_READ_TOKENS,
     ) -> str:
         """
         Retrieve full page content from knowledge base.
         Use this to get complete page content after RAG search.
 
+        Long pages are read in sections, starting at `section` (default 0), until
+        token_budget is used up; progress is reported after each section. If the
+        page continues, call again with section=next_section.
+
         Args:
             page_id: Page UUID from search results (e.g., "550e8400-e29b-41d4-a716-446655440000")
             url: Page URL (e.g., "https://docs.example.com/getting-started")
+            section: First section to read (0-based, default 0)
+            token_budget: Max tokens of page content to return (default: 5000)
 
         Note: Provide EITHER page_id OR url, not both.
 
@@ -311,6 +438,9 @@ def register_rag_tools(mcp: FastMCP):
             JSON string with structure:
             - success: bool
             - page: dict with full_content, title, url, metadata
+            - sections_read: list[int] - Sections included in full_content
+            - total_sections: int
+            - next_section: int|null - Section to continue from, null at the end
             - error: str|null
         """
         try:
@@ -321,37 +451,58 @@ def register_rag_tools(mcp: FastMCP):
                 )
 
             api_url = get_api_url()
-            timeout = httpx.Timeout(30.0, connect=5.0)
-
-            async with httpx.AsyncClient(timeout=timeout) as client:
-                if page_id:
-                    response = await client.get(urljoin(api_url, f"/api/pages/{page_id}"))
-                else:
+            timeout = get_default_timeout()
+            if page_id:
+                endpoint, base_params = urljoin(api_url, f"/api/pages/{page_id}"), {}
+            else:
+                endpoint, base_params = urljoin(api_url, "/api/pages/by-url"), {"url": url}
+            section_tokens = max(MIN_PAGE_SECTION_TOKENS, min(token_budget, PAGE_SECTION_TOKENS))
+
+            page_data = None
+            contents: list[str] = []
+            sections_read: list[int] = []
+            current = section or 0
+            total_sections = current + 1
+            async with get_http_client(timeout=timeout) as client:
+                while current < total_sections:
                     response = await client.get(
-                        urljoin(api_url, "/api/pages/by-url"),
-                        params={"url": url}
+                        endpoint,
+                        params={**base_params, "section": current, "section_tokens": section_tokens},
                     )
+                    if response.status_code != 200:
+                        error_detail = response.text
+                        return json.dumps(
+                            {
+                                "success": False,
+                                "page": None,
+                                "error": f"HTTP {response.status_code}: {error_detail}",
+                            },
+                            indent=2,
+                        )
 
-                if response.status_code == 200:
                     page_data = response.json()
-                    return json.dumps(
-                        {
-                            "success": True,
-                            "page": page_data,
-                            "error": None,
-                        },
-                        indent=2,
-                    )
-                else:
-                    error_detail = response.text
-                    return json.dumps(
-                        {
-                            "success": False,
-                            "page": None,
-                            "error": f"HTTP {response.status_code}: {error_detail}",
-                        },
-                        indent=2,
-                    )
+                    total_sections = page_data.get("total_sections") or 1
+                    contents.append(page_data.get("full_content", ""))
+                    sections_read.append(current)
+                    current += 1
+                    await ctx.report_progress(current, total_sections)
+
+                    # Stop before the next section would exceed the budget
+                    if (len(sections_read) + 1) * section_tokens > token_budget:
+                        break
+
+            page_data["full_content"] = "\n\n".join(part.strip("\n") for part in contents)
+            return json.dumps(
+                {
+                    "success": True,
+                    "page": page_data,
+                    "sections_read": sections_read,
+                    "total_sections": total_sections,
+                    "next_section": current if current < total_sections else None,
+                    "error": None,
+                },
+                indent=2,
+            )
 
         except Exception as e:
             logger.error(f"Error reading page: {e}")
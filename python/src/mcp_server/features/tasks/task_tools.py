@@ -13,6 +13,7 @@ import httpx
 from mcp.server.fastmcp import Context, FastMCP
 
 from src.mcp_server.utils.error_handling import MCPErrorFormatter
+from src.mcp_server.utils.http_client import get_http_client
 from src.mcp_server.utils.timeout_config import get_default_timeout
 from src.server.config.service_discovery import get_api_url
 
@@ -62,6 +63,7 @@ def register_task_tools(mcp: FastMCP):
         include_closed: bool = True,
         page: int = 1,
         per_page: int = DEFAULT_PAGE_SIZE,  # Use optimized default
+        cursor: str | None = None,
     ) -> str:
         """
         Find and search tasks (consolidated: list + search + get).
@@ -75,6 +77,7 @@ def register_task_tools(mcp: FastMCP):
             include_closed: Include done tasks in results
             page: Page number for pagination
             per_page: Items per page (default: 10)
+            cursor: next_cursor from a previous result (faster than page for deep pages)
         
         Returns:
             JSON array of tasks or single task (optimized payloads for lists)
@@ -91,7 +94,7 @@ def register_task_tools(mcp: FastMCP):
 
             # Single task get mode
             if task_id:
-                async with httpx.AsyncClient(timeout=timeout) as client:
+                async with get_http_client(timeout=timeout) as client:
                     response = await client.get(urljoin(api_url, f"/api/tasks/{task_id}"))
 
                     if response.status_code == 200:
@@ -118,6 +121,8 @@ def register_task_tools(mcp: FastMCP):
             # Add search query if provided
             if query:
                 params["q"] = query
+            if cursor:
+                params["cursor"] = cursor
 
             if filter_by == "project" and filter_value:
                 # Use project-specific endpoint for project filtering
@@ -147,20 +152,23 @@ def register_task_tools(mcp: FastMCP):
                 url = urljoin(api_url, "/api/tasks")
                 params["include_closed"] = include_closed
 
-            async with httpx.AsyncClient(timeout=timeout) as client:
+            async with get_http_client(timeout=timeout) as client:
                 response = await client.get(url, params=params)
                 response.raise_for_status()
 
                 result = response.json()
 
                 # Normalize response format
+                pagination = result.get("pagination", {}) if isinstance(result, dict) else {}
                 if isinstance(result, list):
                     tasks = result
                     total_count = len(result)
                 elif isinstance(result, dict):
                     if "tasks" in result:
                         tasks = result["tasks"]
-                        total_count = result.get("total_count", len(tasks))
+                        total_count = result.get("total_count")
+                        if total_count is None:
+                            total_count = pagination.get("total", len(tasks))
                     elif "data" in result:
                         tasks = result["data"]
                         total_count = result.get("total", len(tasks))
@@ -186,6 +194,8 @@ def register_task_tools(mcp: FastMCP):
                     "total_count": total_count,
                     "count": len(optimized_tasks),
                     "query": query,  # Include search query in response
+                    "has_more": pagination.get("has_more", False),
+                    "next_cursor": pagination.get("next_cursor"),
                 })
 
         except httpx.RequestError as e:
@@ -245,7 +255,7 @@ def register_task_tools(mcp: FastMCP):
             api_url = get_api_url()
             timeout = get_default_timeout()
 
-            async with httpx.AsyncClient(timeout=timeout) as client:
+            async with get_http_client(timeout=timeout) as client:
                 if action == "create":
                     if not project_id or not title:
                         return MCPErrorFormatter.format_error(
@@ -12,6 +12,9 @@ Modules:
 
 Note: Crawling and document upload operations are handled directly by the
 API service and frontend, not through MCP tools.
+
+When co-located with the API server, ARCHON_MCP_IN_PROCESS=true makes the
+tools call the server's service layer in-process (see utils/in_process.py).
 """
 
 import json
@@ -54,6 +57,9 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Import in-process service loading (API services called without HTTP)
+from src.mcp_server.utils.in_process import in_process_enabled, start_in_process_services
+
 # Import Logfire configuration
 from src.server.config.logfire_config import mcp_logger, setup_logfire
 
@@ -164,6 +170,12 @@ async def lifespan(server: FastMCP) -> AsyncIterator[ArchonContext]:
             service_client = get_mcp_service_client()
             logger.info("✓ Service client initialized")
 
+            # Load the API server's services when tools call them in-process
+            if in_process_enabled():
+                logger.info("⚡ Starting in-process API services...")
+                await start_in_process_services()
+                logger.info("✓ In-process API services ready")
+
             # Create context
             context = ArchonContext(service_client=service_client)
 
@@ -228,6 +240,7 @@ IMPORTANT: Always use source_id (not URLs or domain names) for filtering!
 4. **Research phase**:
    - `rag_search_knowledge_base(query="...", match_count=5)`
    - `rag_search_code_examples(query="...", match_count=3)`
+   - Several searches at once: `rag_batch_search(queries=[{"query": "..."}, {"query": "...", "search_type": "code_examples"}])`
 5. **Implementation**: Code based on research findings
 6. **Mark for review**: `manage_task("update", task_id="...", status="review")`
 7. **Get next task**: `list_tasks(filter_by="status", filter_value="todo")`
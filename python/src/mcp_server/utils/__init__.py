@@ -3,7 +3,8 @@ Utility modules for MCP Server.
 """
 
 from .error_handling import MCPErrorFormatter
-from .http_client import get_http_client
+from .http_client import close_pooled_clients, get_http_client, get_pooled_client
+from .in_process import in_process_enabled
 from .timeout_config import (
     get_default_timeout,
     get_max_polling_attempts,
@@ -14,6 +15,9 @@ from .timeout_config import (
 __all__ = [
     "MCPErrorFormatter",
     "get_http_client",
+    "get_pooled_client",
+    "close_pooled_clients",
+    "in_process_enabled",
     "get_default_timeout",
     "get_polling_timeout",
     "get_max_polling_attempts",
@@ -2,29 +2,123 @@
 HTTP client utilities for MCP Server.
 
 Provides consistent HTTP client configuration.
+
+MCP tools share one pooled, keep-alive client per upstream service for the
+life of the process, so a tool call costs only its request instead of a new
+TCP connection. HTTP/2 is negotiated where the h2 package is installed and
+the upstream speaks it over TLS; plain-HTTP upstreams use HTTP/1.1
+keep-alive. In in-process mode the API pool is an ASGI transport into
+the API application (see in_process.py). Pool limits and the default
+timeout are shared with the server's clients (server/config/http_client_config.py).
 """
 
 from collections.abc import AsyncIterator
 from contextlib import asynccontextmanager
+from typing import Any
 
 import httpx
 
+try:
+    import h2  # noqa: F401
+
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+from src.server.config.http_client_config import get_connection_limits
+
+from .in_process import in_process_enabled, in_process_transport, start_in_process_services
 from .timeout_config import get_default_timeout, get_polling_timeout
 
+# The API server; in in-process mode its requests never leave the process
+DEFAULT_SERVICE = "api"
+
+_pooled_clients: dict[str, httpx.AsyncClient] = {}
+
+
+def get_pooled_client(service: str = DEFAULT_SERVICE) -> httpx.AsyncClient:
+    """
+    Get the shared client for an upstream service, creating it on first use.
+
+    Args:
+        service: Upstream service name (one connection pool per service)
+
+    Returns:
+        Pooled httpx.AsyncClient
+    """
+    client = _pooled_clients.get(service)
+    if client is None or client.is_closed:
+        if service == DEFAULT_SERVICE and in_process_enabled():
+            client = httpx.AsyncClient(timeout=get_default_timeout(), transport=in_process_transport())
+        else:
+            client = httpx.AsyncClient(
+                timeout=get_default_timeout(),
+                limits=get_connection_limits(),
+                http2=HTTP2_AVAILABLE,
+            )
+        _pooled_clients[service] = client
+    return client
+
+
+async def close_pooled_clients() -> None:
+    """Close all pooled clients (on shutdown)."""
+    clients = list(_pooled_clients.values())
+    _pooled_clients.clear()
+    for client in clients:
+        await client.aclose()
+
+
+class PooledClientSession:
+    """
+    A pooled client with a per-call timeout.
+
+    Offers the request methods of httpx.AsyncClient; the timeout applies to
+    requests that don't pass their own.
+    """
+
+    def __init__(self, client: httpx.AsyncClient, timeout: httpx.Timeout):
+        self.client = client
+        self.timeout = timeout
+
+    async def request(self, method: str, url: str, **kwargs: Any) -> httpx.Response:
+        kwargs.setdefault("timeout", self.timeout)
+        return await self.client.request(method, url, **kwargs)
+
+    async def get(self, url: str, **kwargs: Any) -> httpx.Response:
+        return await self.request("GET", url, **kwargs)
+
+    async def post(self, url: str, **kwargs: Any) -> httpx.Response:
+        return await self.request("POST", url, **kwargs)
+
+    async def put(self, url: str, **kwargs: Any) -> httpx.Response:
+        return await self.request("PUT", url, **kwargs)
+
+    async def patch(self, url: str, **kwargs: Any) -> httpx.Response:
+        return await self.request("PATCH", url, **kwargs)
+
+    async def delete(self, url: str, **kwargs: Any) -> httpx.Response:
+        return await self.request("DELETE", url, **kwargs)
+
 
 @asynccontextmanager
 async def get_http_client(
-    timeout: httpx.Timeout | None = None, for_polling: bool = False
-) -> AsyncIterator[httpx.AsyncClient]:
+    timeout: httpx.Timeout | None = None,
+    for_polling: bool = False,
+    service: str = DEFAULT_SERVICE,
+) -> AsyncIterator[PooledClientSession]:
     """
-    Create an HTTP client with consistent configuration.
+    Get an HTTP client with consistent configuration.
+
+    The client is backed by the service's shared connection pool; leaving
+    the context does not close any connections.
 
     Args:
         timeout: Optional custom timeout. If not provided, uses defaults.
         for_polling: If True, uses polling-specific timeout configuration.
+        service: Upstream service name (one connection pool per service)
 
     Yields:
-        Configured httpx.AsyncClient
+        Client with the request methods of httpx.AsyncClient
 
     Example:
         async with get_http_client() as client:
@@ -32,7 +126,7 @@ async def get_http_client(
     """
     if timeout is None:
         timeout = get_polling_timeout() if for_polling else get_default_timeout()
+    if service == DEFAULT_SERVICE and in_process_enabled():
+        await start_in_process_services()
 
-    # Future: Could add retry logic, custom headers, etc. here
-    async with httpx.AsyncClient(timeout=timeout) as client:
-        yield client
+    yield PooledClientSession(get_pooled_client(service), timeout)
@@ -0,0 +1,121 @@
+"""
+In-process mode for MCP Server.
+
+When the MCP server runs in the same container as the API server (with
+the server's dependencies installed), setting ARCHON_MCP_IN_PROCESS=true
+lets tools use the server's code directly instead of calling it over HTTP:
+
+- RAG searches call RAGService directly, skipping the HTTP hop and the
+  JSON round trip of their (large) results.
+- All other tool requests are served by the API application through an
+  in-process ASGI transport: same endpoints and validation, no network.
+
+Split deployments leave the variable unset and keep the HTTP path.
+"""
+
+import asyncio
+import os
+from typing import Any
+
+import httpx
+
+IN_PROCESS_ENV = "ARCHON_MCP_IN_PROCESS"
+
+_started = False
+_start_lock = asyncio.Lock()
+
+
+def in_process_enabled() -> bool:
+    """Whether tools call the API server's code in-process."""
+    return os.getenv(IN_PROCESS_ENV, "false").lower() in ("true", "1", "yes")
+
+
+def get_api_app():
+    """The API server's ASGI application (imported on first use)."""
+    from src.server.main import app
+
+    return app
+
+
+def in_process_transport() -> httpx.AsyncBaseTransport:
+    """Transport delivering requests straight to the API application."""
+    return httpx.ASGITransport(app=get_api_app())
+
+
+async def start_in_process_services() -> None:
+    """
+    Load what the API's services need to run in this process.
+
+    Runs the parts of the API server's startup that requests depend on
+    (configuration check, credentials, prompts) once per process. Crawling
+    and background workers stay with the API server.
+    """
+    global _started
+    if _started:
+        return
+    async with _start_lock:
+        if _started:
+            return
+
+        from src.server.config.config import get_config
+        from src.server.services.credential_service import initialize_credentials
+
+        get_config()
+        await initialize_credentials()
+
+        from src.server.services.prompt_service import prompt_service
+
+        await prompt_service.load_prompts()
+        _started = True
+
+
+async def perform_rag_query(
+    query: str,
+    source: str | None,
+    match_count: int,
+    return_mode: str,
+    token_budget: int | None = None,
+) -> tuple[bool, dict[str, Any]]:
+    """
+    Search the knowledge base with RAGService.
+
+    Returns:
+        Tuple of (success, result) shaped like the /api/rag/query response
+    """
+    from src.server.services.client_manager import get_supabase_client
+    from src.server.services.search.rag_service import RAGService
+
+    await start_in_process_services()
+    if not query.strip():
+        return False, {"error": "Query cannot be empty"}
+    return await RAGService(get_supabase_client()).perform_rag_query(
+        query=query,
+        source=source,
+        match_count=match_count,
+        return_mode=return_mode,
+        token_budget=token_budget,
+    )
+
+
+async def search_code_examples(
+    query: str, source_id: str | None, match_count: int
+) -> tuple[bool, dict[str, Any]]:
+    """
+    Search code examples with RAGService.
+
+    Returns:
+        Tuple of (success, result) shaped like the /api/rag/code-examples response
+    """
+    from src.server.services.client_manager import get_supabase_client
+    from src.server.services.search.rag_service import RAGService
+
+    await start_in_process_services()
+    success, result = await RAGService(get_supabase_client()).search_code_examples_service(
+        query=query, source_id=source_id, match_count=match_count
+    )
+    if not success:
+        return False, result
+    return True, {
+        "results": result.get("results", []),
+        "reranked": result.get("reranking_applied", False),
+    }
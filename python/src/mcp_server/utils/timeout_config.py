@@ -8,6 +8,8 @@ import os
 
 import httpx
 
+from src.server.config.http_client_config import get_request_timeout
+
 
 def get_default_timeout() -> httpx.Timeout:
     """
@@ -22,12 +24,7 @@ def get_default_timeout() -> httpx.Timeout:
     Returns:
         Configured httpx.Timeout object
     """
-    return httpx.Timeout(
-        timeout=float(os.getenv("MCP_REQUEST_TIMEOUT", "30.0")),
-        connect=float(os.getenv("MCP_CONNECT_TIMEOUT", "5.0")),
-        read=float(os.getenv("MCP_READ_TIMEOUT", "20.0")),
-        write=float(os.getenv("MCP_WRITE_TIMEOUT", "10.0")),
-    )
+    return get_request_timeout()
 
 
 def get_polling_timeout() -> httpx.Timeout:
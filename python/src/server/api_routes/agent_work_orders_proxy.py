@@ -9,11 +9,37 @@ import logging
 import httpx
 from fastapi import APIRouter, HTTPException, Request, Response
 
+from ..config.http_client_config import get_connection_limits, get_request_timeout
 from ..config.service_discovery import get_agent_work_orders_url
 
 logger = logging.getLogger(__name__)
 router = APIRouter(prefix="/api/agent-work-orders", tags=["agent-work-orders"])
 
+# Read timeout for proxied requests
+PROXY_READ_TIMEOUT = 30.0
+
+# Pooled keep-alive client shared by all proxied requests (closed at shutdown)
+_client: httpx.AsyncClient | None = None
+
+
+def get_proxy_client() -> httpx.AsyncClient:
+    """Get the pooled client for the agent work orders service, creating it on first use."""
+    global _client
+    if _client is None or _client.is_closed:
+        _client = httpx.AsyncClient(
+            timeout=get_request_timeout(read=PROXY_READ_TIMEOUT),
+            limits=get_connection_limits(),
+        )
+    return _client
+
+
+async def close_proxy_client() -> None:
+    """Close the pooled client (on application shutdown)."""
+    global _client
+    if _client is not None:
+        await _client.aclose()
+        _client = None
+
 
 @router.api_route(
     "/{path:path}",
@@ -71,13 +97,12 @@ async def proxy_to_agent_work_orders(request: Request, path: str = "") -> Respon
         )
 
         # Forward request to agent work orders service
-        async with httpx.AsyncClient(timeout=30.0) as client:
-            response = await client.request(
-                method=request.method,
-                url=target_url,
-                content=body if body else None,
-                headers=headers,
-            )
+        response = await get_proxy_client().request(
+            method=request.method,
+            url=target_url,
+            content=body if body else None,
+            headers=headers,
+        )
 
         logger.debug(
             f"Proxy response: {response.status_code}",
@@ -0,0 +1,87 @@
+"""
+Diagnostics API endpoints.
+
+Admin endpoints for diagnosing a live API process: a time-bounded
+sampling profile (wall and CPU stacks, flamegraph-compatible), a dump of
+the running asyncio tasks, and the callbacks that blocked the event
+loop. Like the internal API they live under /internal, which the UI's
+dev proxy does not forward, and only answer requests from localhost or
+the Docker network, since stacks expose code paths and arguments.
+"""
+
+import logging
+from typing import Any, Literal
+
+from fastapi import APIRouter, HTTPException, Query, Request, Response
+
+from ..services.diagnostics_service import (
+    MAX_PROFILE_SECONDS,
+    ProfileInProgressError,
+    cpu_profiling_supported,
+    dump_tasks,
+    get_loop_lag_monitor,
+    get_profiler,
+)
+from .internal_api import is_internal_request
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter(prefix="/internal/diagnostics", tags=["diagnostics"])
+
+
+def _require_admin(request: Request) -> None:
+    if not is_internal_request(request):
+        host = request.client.host if request.client else "unknown"
+        logger.warning(f"Unauthorized access to diagnostics from {host}")
+        raise HTTPException(status_code=403, detail="Access forbidden")
+
+
+@router.post("/profile")
+async def profile(
+    request: Request,
+    seconds: float = Query(10.0, gt=0, le=MAX_PROFILE_SECONDS, description="Profile duration"),
+    interval_ms: float = Query(10.0, ge=1, le=1000, description="Time between samples"),
+    mode: Literal["wall", "cpu"] = Query("wall", description="Stacks weighted by samples or by CPU time"),
+    format: Literal["folded", "json"] = Query("folded", description="Folded stacks, or JSON with both profiles"),
+) -> Any:
+    """
+    Sample the stacks of every thread of this process for a while.
+
+    The folded format ("frame;frame;frame weight" per line) loads into
+    flamegraph.pl, speedscope or inferno. JSON returns the wall and CPU
+    profiles together with the asyncio tasks at the end of the run.
+    """
+    _require_admin(request)
+    if mode == "cpu" and not cpu_profiling_supported():
+        raise HTTPException(status_code=400, detail="CPU profiles need per-thread CPU clocks (Linux)")
+
+    try:
+        result = await get_profiler().profile(seconds, interval_ms / 1000)
+    except ProfileInProgressError as e:
+        raise HTTPException(status_code=409, detail=str(e)) from e
+
+    if format == "json":
+        return {**result.as_dict(), "tasks": dump_tasks()}
+    return Response(
+        content=result.folded(mode),
+        media_type="text/plain; charset=utf-8",
+        headers={"Content-Disposition": f'inline; filename="archon-{mode}.folded"'},
+    )
+
+
+@router.get("/tasks")
+async def tasks(request: Request, limit: int = Query(20, ge=1, le=200)) -> dict[str, Any]:
+    """The running asyncio tasks and their stacks."""
+    _require_admin(request)
+    task_list = dump_tasks(limit)
+    return {"count": len(task_list), "tasks": task_list}
+
+
+@router.get("/loop-lag")
+async def loop_lag(request: Request) -> dict[str, Any]:
+    """Recent callbacks that blocked the event loop, with their stacks."""
+    _require_admin(request)
+    monitor = get_loop_lag_monitor()
+    if monitor is None:
+        return {"running": False, "events": []}
+    return {**monitor.get_stats(), "events": [event.as_dict() for event in reversed(monitor.events)]}
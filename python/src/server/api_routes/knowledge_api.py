@@ -11,26 +11,41 @@ This module handles all knowledge base operations including:
 
 import asyncio
 import json
+import os
+import tempfile
 import uuid
 from datetime import datetime
-from urllib.parse import urlparse
+from typing import Literal
 
-from fastapi import APIRouter, File, Form, HTTPException, UploadFile
-from pydantic import BaseModel
+from fastapi import APIRouter, File, Form, Header, HTTPException, Response, UploadFile
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel, Field
 
 # Basic validation - simplified inline version
 
 # Import unified logging
 from ..config.logfire_config import get_logger, safe_logfire_error, safe_logfire_info
+from ..services.change_version_service import SOURCES, change_versions
 from ..services.crawler_manager import get_crawler
 from ..services.crawling import CrawlingService
 from ..services.credential_service import credential_service
 from ..services.embeddings.provider_error_adapters import ProviderErrorFactory
-from ..services.knowledge import DatabaseMetricsService, KnowledgeItemService, KnowledgeSummaryService
-from ..services.search.rag_service import RAGService
+from ..services.knowledge import (
+    ChunkListingService,
+    DatabaseMetricsService,
+    InvalidChunkCursorError,
+    InvalidSourceArchiveError,
+    KnowledgeItemService,
+    KnowledgeSummaryService,
+    SourceAlreadyExistsError,
+    SourceTransferService,
+)
+from ..services.search.rag_service import MAX_BATCH_QUERIES, RAGService
 from ..services.storage import DocumentStorageService
 from ..utils import get_supabase_client
-from ..utils.document_processing import extract_text_from_document
+from ..utils.document_processing import extract_text_from_document_file
+from ..utils.etag_utils import check_etag, generate_etag
+from ..utils.json_response import FastJSONResponse, parse_fields
 
 # Get logger for this module
 logger = get_logger(__name__)
@@ -56,6 +71,9 @@ crawl_semaphore = asyncio.Semaphore(CONCURRENT_CRAWL_LIMIT)
 # Track active async crawl tasks for cancellation support
 active_crawl_tasks: dict[str, asyncio.Task] = {}
 
+# Uploads are streamed to a temp file in chunks of this size instead of read whole
+UPLOAD_READ_CHUNK_SIZE = 1024 * 1024
+
 
 
 
@@ -178,6 +196,20 @@ class RagQueryRequest(BaseModel):
     source: str | None = None
     match_count: int = 5
     return_mode: str = "chunks"  # "chunks" or "pages"
+    token_budget: int | None = Field(default=None, ge=1)  # Pack results into this many tokens
+
+
+class BatchRagQueryItem(BaseModel):
+    query: str
+    search_type: str = "documents"  # "documents" or "code_examples"
+    source: str | None = None
+    match_count: int = 5
+    return_mode: str = "chunks"  # "chunks" or "pages", documents only
+    token_budget: int | None = Field(default=None, ge=1)  # Documents only
+
+
+class BatchRagQueryRequest(BaseModel):
+    queries: list[BatchRagQueryItem]
 
 
 @router.get("/crawl-progress/{progress_id}")
@@ -257,7 +289,12 @@ async def get_knowledge_items(
 
 @router.get("/knowledge-items/summary")
 async def get_knowledge_items_summary(
-    page: int = 1, per_page: int = 20, knowledge_type: str | None = None, search: str | None = None
+    response: Response,
+    page: int = 1,
+    per_page: int = 20,
+    knowledge_type: str | None = None,
+    search: str | None = None,
+    if_none_match: str | None = Header(None),
 ):
     """
     Get lightweight summaries of knowledge items.
@@ -267,16 +304,39 @@ async def get_knowledge_items_summary(
     - Basic metadata for display
     - Efficient batch queries
     
-    Use this endpoint for card displays and frequent polling.
+    Use this endpoint for card displays and frequent polling. Supports ETags;
+    unchanged polls are answered with 304 without querying the database.
     """
     try:
         # Input guards
         page = max(1, page)
         per_page = min(100, max(1, per_page))
+
+        # Answer unchanged polls from the change-version registry without querying
+        cache_key = f"{SOURCES}:summary:{page}:{per_page}:{knowledge_type}:{search}"
+        cached_etag = change_versions.cached_etag(cache_key)
+        if cached_etag and check_etag(if_none_match, cached_etag):
+            response.status_code = 304
+            response.headers["ETag"] = cached_etag
+            response.headers["Cache-Control"] = "no-cache, must-revalidate"
+            return None
+        version = change_versions.version(SOURCES)
+
         service = KnowledgeSummaryService(get_supabase_client())
         result = await service.get_summaries(
             page=page, per_page=per_page, knowledge_type=knowledge_type, search=search
         )
+
+        current_etag = generate_etag(result)
+        change_versions.remember_etag(cache_key, SOURCES, version, current_etag)
+        if check_etag(if_none_match, current_etag):
+            response.status_code = 304
+            response.headers["ETag"] = current_etag
+            response.headers["Cache-Control"] = "no-cache, must-revalidate"
+            return None
+
+        response.headers["ETag"] = current_etag
+        response.headers["Cache-Control"] = "no-cache, must-revalidate"
         return result
 
     except Exception as e:
@@ -365,7 +425,11 @@ async def get_knowledge_item_chunks(
     source_id: str,
     domain_filter: str | None = None,
     limit: int = 20,
-    offset: int = 0
+    offset: int = 0,
+    fields: str | None = None,
+    cursor: str | None = None,
+    count: Literal["exact", "estimated", "none"] = "exact",
+    max_content_length: int | None = None
 ):
     """
     Get document chunks for a specific knowledge item with pagination.
@@ -374,144 +438,46 @@ async def get_knowledge_item_chunks(
         source_id: The source ID
         domain_filter: Optional domain filter for URLs
         limit: Maximum number of chunks to return (default 20, max 100)
-        offset: Number of chunks to skip (for pagination)
+        offset: Number of chunks to skip (for pagination without a cursor)
+        fields: Optional comma-separated chunk fields to return (``id`` is always included),
+                e.g. ``fields=id,title,url`` to list chunks without their content
+        cursor: ``next_cursor`` of the previous page; continues in (url, chunk_number)
+                order without an offset scan
+        count: ``exact`` (default), ``estimated`` (planner estimate) or ``none`` (total is null)
+        max_content_length: Truncate each chunk's content to this many characters
     
     Returns:
         Paginated chunks with metadata
     """
     try:
-        # Validate pagination parameters
-        limit = min(limit, 100)  # Cap at 100 to prevent excessive data transfer
-        limit = max(limit, 1)    # At least 1
-        offset = max(offset, 0)   # Can't be negative
-
         safe_logfire_info(
             f"Fetching chunks | source_id={source_id} | domain_filter={domain_filter} | "
-            f"limit={limit} | offset={offset}"
+            f"limit={limit} | offset={offset} | cursor={cursor} | count={count}"
         )
 
-        supabase = get_supabase_client()
-
-        # First get total count
-        count_query = supabase.from_("archon_crawled_pages").select(
-            "id", count="exact", head=True
-        )
-        count_query = count_query.eq("source_id", source_id)
-
-        if domain_filter:
-            count_query = count_query.ilike("url", f"%{domain_filter}%")
-
-        count_result = count_query.execute()
-        total = count_result.count if hasattr(count_result, "count") else 0
-
-        # Build the main query with pagination
-        query = supabase.from_("archon_crawled_pages").select(
-            "id, source_id, content, metadata, url"
+        listing_service = ChunkListingService(get_supabase_client())
+        page = listing_service.list_chunks(
+            source_id,
+            limit=limit,
+            offset=offset,
+            cursor=cursor,
+            domain_filter=domain_filter,
+            count=count,
+            fields=parse_fields(fields),
+            max_content_length=max_content_length,
         )
-        query = query.eq("source_id", source_id)
 
-        # Apply domain filtering if provided
-        if domain_filter:
-            query = query.ilike("url", f"%{domain_filter}%")
-
-        # Deterministic ordering (URL then id)
-        query = query.order("url", desc=False).order("id", desc=False)
-
-        # Apply pagination
-        query = query.range(offset, offset + limit - 1)
-
-        result = query.execute()
-        # Check for error more explicitly to work with mocks
-        if hasattr(result, "error") and result.error is not None:
-            safe_logfire_error(
-                f"Supabase query error | source_id={source_id} | error={result.error}"
-            )
-            raise HTTPException(status_code=500, detail={"error": str(result.error)})
-
-        chunks = result.data if result.data else []
-
-        # Extract useful fields from metadata to top level for frontend
-        # This ensures the API response matches the TypeScript DocumentChunk interface
-        for chunk in chunks:
-            metadata = chunk.get("metadata", {}) or {}
-
-            # Generate meaningful titles from available data
-            title = None
-
-            # Try to get title from various metadata fields
-            if metadata.get("filename"):
-                title = metadata.get("filename")
-            elif metadata.get("headers"):
-                title = metadata.get("headers").split(";")[0].strip("# ")
-            elif metadata.get("title") and metadata.get("title").strip():
-                title = metadata.get("title").strip()
-            else:
-                # Try to extract from content first for more specific titles
-                if chunk.get("content"):
-                    content = chunk.get("content", "").strip()
-                    # Look for markdown headers at the start
-                    lines = content.split("\n")[:5]
-                    for line in lines:
-                        line = line.strip()
-                        if line.startswith("# "):
-                            title = line[2:].strip()
-                            break
-                        elif line.startswith("## "):
-                            title = line[3:].strip()
-                            break
-                        elif line.startswith("### "):
-                            title = line[4:].strip()
-                            break
-
-                    # Fallback: use first meaningful line that looks like a title
-                    if not title:
-                        for line in lines:
-                            line = line.strip()
-                            # Skip code blocks, empty lines, and very short lines
-                            if (line and not line.startswith("```") and not line.startswith("Source:")
-                                and len(line) > 15 and len(line) < 80
-                                and not line.startswith("from ") and not line.startswith("import ")
-                                and "=" not in line and "{" not in line):
-                                title = line
-                                break
-
-                # If no content-based title found, generate from URL
-                if not title:
-                    url = chunk.get("url", "")
-                    if url:
-                        # Extract meaningful part from URL
-                        if url.endswith(".txt"):
-                            title = url.split("/")[-1].replace(".txt", "").replace("-", " ").title()
-                        else:
-                            # Get domain and path info
-                            parsed = urlparse(url)
-                            if parsed.path and parsed.path != "/":
-                                title = parsed.path.strip("/").replace("-", " ").replace("_", " ").title()
-                            else:
-                                title = parsed.netloc.replace("www.", "").title()
-
-            chunk["title"] = title or ""
-            chunk["section"] = metadata.get("headers", "").replace(";", " > ") if metadata.get("headers") else None
-            chunk["source_type"] = metadata.get("source_type")
-            chunk["knowledge_type"] = metadata.get("knowledge_type")
-
-        safe_logfire_info(
-            f"Fetched {len(chunks)} chunks for {source_id} | total={total}"
-        )
-
-        return {
+        return FastJSONResponse({
             "success": True,
             "source_id": source_id,
             "domain_filter": domain_filter,
-            "chunks": chunks,
-            "total": total,
-            "limit": limit,
-            "offset": offset,
-            "has_more": offset + limit < total,
-        }
+            **page,
+        })
 
     except HTTPException:
         raise
+    except InvalidChunkCursorError as e:
+        raise HTTPException(status_code=400, detail={"error": str(e)}) from e
     except Exception as e:
         safe_logfire_error(
             f"Failed to fetch chunks | error={str(e)} | source_id={source_id}"
@@ -523,7 +489,11 @@ async def get_knowledge_item_chunks(
 async def get_knowledge_item_code_examples(
     source_id: str,
     limit: int = 20,
-    offset: int = 0
+    offset: int = 0,
+    fields: str | None = None,
+    cursor: str | None = None,
+    count: Literal["exact", "estimated", "none"] = "exact",
+    max_content_length: int | None = None
 ):
     """
     Get code examples for a specific knowledge item with pagination.
@@ -531,77 +501,42 @@ async def get_knowledge_item_code_examples(
     Args:
         source_id: The source ID
         limit: Maximum number of examples to return (default 20, max 100)
-        offset: Number of examples to skip (for pagination)
+        offset: Number of examples to skip (for pagination without a cursor)
+        fields: Optional comma-separated example fields to return (``id`` is always included)
+        cursor: ``next_cursor`` of the previous page
+        count: ``exact`` (default), ``estimated`` or ``none``
+        max_content_length: Truncate each example's content to this many characters
     
     Returns:
         Paginated code examples with metadata
     """
     try:
-        # Validate pagination parameters
-        limit = min(limit, 100)  # Cap at 100 to prevent excessive data transfer
-        limit = max(limit, 1)    # At least 1
-        offset = max(offset, 0)   # Can't be negative
-
         safe_logfire_info(
-            f"Fetching code examples | source_id={source_id} | limit={limit} | offset={offset}"
+            f"Fetching code examples | source_id={source_id} | limit={limit} | offset={offset} | "
+            f"cursor={cursor} | count={count}"
         )
 
-        supabase = get_supabase_client()
-
-        # First get total count
-        count_result = (
-            supabase.from_("archon_code_examples")
-            .select("id", count="exact", head=True)
-            .eq("source_id", source_id)
-            .execute()
-        )
-        total = count_result.count if hasattr(count_result, "count") else 0
-
-        # Get paginated code examples
-        result = (
-            supabase.from_("archon_code_examples")
-            .select("id, source_id, content, summary, metadata")
-            .eq("source_id", source_id)
-            .order("id", desc=False)  # Deterministic ordering
-            .range(offset, offset + limit - 1)
-            .execute()
-        )
-
-        # Check for error to match chunks endpoint pattern
-        if hasattr(result, "error") and result.error is not None:
-            safe_logfire_error(
-                f"Supabase query error (code examples) | source_id={source_id} | error={result.error}"
-            )
-            raise HTTPException(status_code=500, detail={"error": str(result.error)})
-
-        code_examples = result.data if result.data else []
-
-        # Extract title and example_name from metadata to top level for frontend
-        # This ensures the API response matches the TypeScript CodeExample interface
-        for example in code_examples:
-            metadata = example.get("metadata", {}) or {}
-            # Extract fields to match frontend TypeScript types
-            example["title"] = metadata.get("title")  # AI-generated title
-            example["example_name"] = metadata.get("example_name")  # Same as title for compatibility
-            example["language"] = metadata.get("language")  # Programming language
-            example["file_path"] = metadata.get("file_path")  # Original file path if available
-            # Note: content field is already at top level from database
-            # Note: summary field is already at top level from database
-
-        safe_logfire_info(
-            f"Fetched {len(code_examples)} code examples for {source_id} | total={total}"
+        listing_service = ChunkListingService(get_supabase_client())
+        page = listing_service.list_code_examples(
+            source_id,
+            limit=limit,
+            offset=offset,
+            cursor=cursor,
+            count=count,
+            fields=parse_fields(fields),
+            max_content_length=max_content_length,
         )
 
-        return {
+        return FastJSONResponse({
             "success": True,
             "source_id": source_id,
-            "code_examples": code_examples,
-            "total": total,
-            "limit": limit,
-            "offset": offset,
-            "has_more": offset + limit < total,
-        }
+            **page,
+        })
 
+    except HTTPException:
+        raise
+    except InvalidChunkCursorError as e:
+        raise HTTPException(status_code=400, detail={"error": str(e)}) from e
     except Exception as e:
         safe_logfire_error(
             f"Failed to fetch code examples | error={str(e)} | source_id={source_id}"
@@ -609,6 +544,77 @@ async def get_knowledge_item_code_examples(
         raise HTTPException(status_code=500, detail={"error": str(e)})
 
 
+@router.get("/knowledge-items/{source_id}/export")
+async def export_knowledge_item(source_id: str, compress: bool = True):
+    """
+    Export a knowledge item with its pages, chunks and code examples as NDJSON.
+
+    Embeddings are included, so the export can be imported into another
+    environment without re-crawling or re-embedding.
+
+    Args:
+        source_id: The source ID to export
+        compress: Gzip the export (default True)
+    """
+    try:
+        transfer_service = SourceTransferService(get_supabase_client())
+        if not await transfer_service.source_exists(source_id):
+            raise HTTPException(status_code=404, detail={"error": f"Source {source_id} not found"})
+
+        safe_logfire_info(f"Exporting knowledge item | source_id={source_id} | compress={compress}")
+        filename = f"{source_id}.ndjson.gz" if compress else f"{source_id}.ndjson"
+        return StreamingResponse(
+            transfer_service.iter_export(source_id, compress=compress),
+            media_type="application/gzip" if compress else "application/x-ndjson",
+            headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+        )
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        safe_logfire_error(f"Failed to export knowledge item | error={str(e)} | source_id={source_id}")
+        raise HTTPException(status_code=500, detail={"error": str(e)})
+
+
+@router.post("/knowledge-items/import")
+async def import_knowledge_item(
+    file: UploadFile = File(...),
+    replace: bool = Form(False),
+):
+    """
+    Import a knowledge item from a file produced by the export endpoint.
+
+    Args:
+        file: Export file (gzip-compressed or plain NDJSON)
+        replace: Replace an existing source with the same ID
+    """
+
+    async def read_upload():
+        while chunk := await file.read(UPLOAD_READ_CHUNK_SIZE):
+            yield chunk
+
+    try:
+        safe_logfire_info(f"Importing knowledge item | filename={file.filename} | replace={replace}")
+        transfer_service = SourceTransferService(get_supabase_client())
+        success, result = await transfer_service.import_source(read_upload(), replace=replace)
+
+        if not success:
+            raise HTTPException(status_code=500, detail={"error": result.get("error", "Import failed")})
+
+        change_versions.bump(SOURCES)
+        return {"success": True, **result}
+
+    except HTTPException:
+        raise
+    except SourceAlreadyExistsError as e:
+        raise HTTPException(status_code=409, detail={"error": str(e)}) from e
+    except InvalidSourceArchiveError as e:
+        raise HTTPException(status_code=400, detail={"error": str(e)}) from e
+    except Exception as e:
+        safe_logfire_error(f"Failed to import knowledge item | error={str(e)} | filename={file.filename}")
+        raise HTTPException(status_code=500, detail={"error": str(e)})
+
+
 @router.post("/knowledge-items/{source_id}/refresh")
 async def refresh_knowledge_item(source_id: str):
     """Refresh a knowledge item by re-crawling its URL with the same metadata."""
@@ -906,7 +912,8 @@ async def upload_document(
     provider = provider_config.get("provider", "openai")
     await _validate_provider_api_key(provider)
     logger.info("✅ API key validation completed successfully for upload")
-    
+
+    file_path = None
     try:
         # DETAILED LOGGING: Track knowledge_type parameter flow
         safe_logfire_info(
@@ -929,12 +936,12 @@ async def upload_document(
         except json.JSONDecodeError as ex:
             raise HTTPException(status_code=422, detail={"error": f"Invalid tags JSON: {str(ex)}"})
 
-        # Read file content immediately to avoid closed file issues
-        file_content = await file.read()
+        # Stream the upload to a temp file now, before the request's file is closed
+        file_path, file_size = await _stream_upload_to_temp_file(file)
         file_metadata = {
             "filename": file.filename,
             "content_type": file.content_type,
-            "size": len(file_content),
+            "size": file_size,
         }
 
         # Initialize progress tracker IMMEDIATELY so it's available for polling
@@ -950,9 +957,11 @@ async def upload_document(
         # Upload tasks can be tracked directly since they don't spawn sub-tasks
         upload_task = asyncio.create_task(
             _perform_upload_with_progress(
-                progress_id, file_content, file_metadata, tag_list, knowledge_type, extract_code_examples, tracker
+                progress_id, file_path, file_metadata, tag_list, knowledge_type, extract_code_examples, tracker
             )
         )
+        # The upload task now owns (and removes) the temp file
+        file_path = None
         # Track the task for cancellation support
         active_crawl_tasks[progress_id] = upload_task
         safe_logfire_info(
@@ -966,22 +975,43 @@ async def upload_document(
         }
 
     except Exception as e:
+        if file_path:
+            os.unlink(file_path)
         safe_logfire_error(
             f"Failed to start document upload | error={str(e)} | filename={file.filename} | error_type={type(e).__name__}"
         )
         raise HTTPException(status_code=500, detail={"error": str(e)})
 
 
+async def _stream_upload_to_temp_file(file: UploadFile) -> tuple[str, int]:
+    """Copy an uploaded file to a temp file chunk by chunk, returning (path, size)."""
+    suffix = os.path.splitext(file.filename or "")[1]
+    fd, file_path = tempfile.mkstemp(prefix="archon_upload_", suffix=suffix)
+    file_size = 0
+    try:
+        with os.fdopen(fd, "wb") as temp_file:
+            while chunk := await file.read(UPLOAD_READ_CHUNK_SIZE):
+                temp_file.write(chunk)
+                file_size += len(chunk)
+    except Exception:
+        os.unlink(file_path)
+        raise
+    return file_path, file_size
+
+
 async def _perform_upload_with_progress(
     progress_id: str,
-    file_content: bytes,
+    file_path: str,
     file_metadata: dict,
     tag_list: list[str],
     knowledge_type: str,
     extract_code_examples: bool,
     tracker: "ProgressTracker",
 ):
-    """Perform document upload with progress tracking using service layer."""
+    """Perform document upload with progress tracking using service layer.
+
+    The temp file at file_path is owned by this task and removed when it finishes.
+    """
     # Create cancellation check function for document uploads
     def check_upload_cancellation():
         """Check if upload task has been cancelled."""
@@ -1004,15 +1034,29 @@ async def _perform_upload_with_progress(
 
 
         # Extract text from document with progress - use mapper for consistent progress
-        mapped_progress = progress_mapper.map_progress("processing", 50)
+        mapped_progress = progress_mapper.map_progress("text_extraction", 0)
         await tracker.update(
             status="processing",
             progress=mapped_progress,
             log=f"Extracting text from {filename}"
         )
 
+        async def extraction_progress_callback(pages_processed: int, total_pages: int):
+            """Report per-page extraction progress for paged documents (PDF)"""
+            check_upload_cancellation()
+            percentage = (pages_processed / total_pages * 100) if total_pages else 100
+            await tracker.update(
+                status="processing",
+                progress=progress_mapper.map_progress("text_extraction", percentage),
+                log=f"Extracted text from {pages_processed}/{total_pages} pages of {filename}",
+                pages_processed=pages_processed,
+                total_pages=total_pages,
+            )
+
         try:
-            extracted_text = extract_text_from_document(file_content, filename, content_type)
+            extracted_text = await extract_text_from_document_file(
+                file_path, filename, content_type, progress_callback=extraction_progress_callback
+            )
             safe_logfire_info(
                 f"Document text extracted | filename={filename} | extracted_length={len(extracted_text)} | content_type={content_type}"
             )
@@ -1086,6 +1130,12 @@ async def _perform_upload_with_progress(
             f"Document upload failed | progress_id={progress_id} | filename={file_metadata.get('filename', 'unknown')} | error={str(e)}"
         )
     finally:
+        # Remove the streamed upload
+        try:
+            os.unlink(file_path)
+        except OSError:
+            pass
+
         # Clean up task from registry when done (success or failure)
         if progress_id in active_crawl_tasks:
             del active_crawl_tasks[progress_id]
@@ -1123,7 +1173,8 @@ async def perform_rag_query(request: RagQueryRequest):
             query=request.query,
             source=request.source,
             match_count=request.match_count,
-            return_mode=request.return_mode
+            return_mode=request.return_mode,
+            token_budget=request.token_budget,
         )
 
         if success:
@@ -1143,6 +1194,68 @@ async def perform_rag_query(request: RagQueryRequest):
         raise HTTPException(status_code=500, detail={"error": f"RAG query failed: {str(e)}"})
 
 
+@router.post("/rag/batch-query")
+async def perform_batch_rag_query(request: BatchRagQueryRequest):
+    """Perform several RAG queries in one request, embedding all queries together."""
+    # Validate queries
+    if not request.queries:
+        raise HTTPException(status_code=422, detail="At least one query is required")
+
+    if len(request.queries) > MAX_BATCH_QUERIES:
+        raise HTTPException(
+            status_code=422, detail=f"Too many queries (maximum {MAX_BATCH_QUERIES})"
+        )
+
+    for item in request.queries:
+        if not item.query or not item.query.strip():
+            raise HTTPException(status_code=422, detail="Query cannot be empty")
+        if item.search_type not in ("documents", "code_examples"):
+            raise HTTPException(
+                status_code=422,
+                detail="search_type must be 'documents' or 'code_examples'",
+            )
+
+    try:
+        search_service = RAGService(get_supabase_client())
+        success, result = await search_service.perform_batch_rag_query(
+            [item.model_dump() for item in request.queries]
+        )
+
+        if not success:
+            raise HTTPException(
+                status_code=500, detail={"error": result.get("error", "Batch RAG query failed")}
+            )
+
+        # Shape code example results like the single /rag/code-examples endpoint
+        results = []
+        for item_result in result["results"]:
+            if item_result["search_type"] == "code_examples":
+                results.append({
+                    "search_type": "code_examples",
+                    "query": item_result.get("query"),
+                    "success": item_result["success"],
+                    "results": item_result.get("results", []),
+                    "reranked": item_result.get("reranking_applied", False),
+                    "error": item_result.get("error"),
+                })
+            else:
+                results.append(item_result)
+
+        return {
+            "success": True,
+            "results": results,
+            "total_queries": result["total_queries"],
+            "failed_queries": result["failed_queries"],
+        }
+    except HTTPException:
+        raise
+    except Exception as e:
+        safe_logfire_error(
+            f"Batch RAG query failed | error={str(e)} | query_count={len(request.queries)}"
+        )
+        raise HTTPException(status_code=500, detail={"error": f"Batch RAG query failed: {str(e)}"})
+
+
 @router.post("/rag/code-examples")
 async def search_code_examples(request: RagQueryRequest):
     """Search for code examples relevant to the query using dedicated code examples service."""
@@ -1281,54 +1394,74 @@ async def knowledge_health():
 
 
 
+async def stop_local_operation(progress_id: str) -> bool:
+    """
+    Stop a crawl or upload running in this worker process.
+
+    Also used by the progress backend for stop requests received by
+    another worker.
+
+    Returns:
+        True if a running operation was found and cancelled
+    """
+    from ..services.crawling import get_active_orchestration, unregister_orchestration
+
+    found = False
+    # Step 1: Cancel the orchestration service
+    orchestration = await get_active_orchestration(progress_id)
+    if orchestration:
+        orchestration.cancel()
+        found = True
+
+    # Step 2: Cancel the asyncio task
+    if progress_id in active_crawl_tasks:
+        task = active_crawl_tasks[progress_id]
+        if not task.done():
+            task.cancel()
+            try:
+                await asyncio.wait_for(task, timeout=2.0)
+            except (TimeoutError, asyncio.CancelledError):
+                pass
+        del active_crawl_tasks[progress_id]
+        found = True
+
+    # Step 3: Remove from active orchestrations registry
+    await unregister_orchestration(progress_id)
+
+    # Step 4: Update progress tracker to reflect cancellation (only if we found and cancelled something)
+    if found:
+        try:
+            from ..utils.progress.progress_tracker import ProgressTracker
+            # Get current progress from existing tracker, default to 0 if not found
+            current_state = ProgressTracker.get_progress(progress_id)
+            current_progress = current_state.get("progress", 0) if current_state else 0
+
+            tracker = ProgressTracker(progress_id, operation_type="crawl")
+            await tracker.update(
+                status="cancelled",
+                progress=current_progress,
+                log="Crawl cancelled by user"
+            )
+        except Exception:
+            # Best effort - don't fail the cancellation if tracker update fails
+            pass
+
+    return found
+
+
 @router.post("/knowledge-items/stop/{progress_id}")
 async def stop_crawl_task(progress_id: str):
     """Stop a running crawl task."""
     try:
-        from ..services.crawling import get_active_orchestration, unregister_orchestration
-
+        from ..utils.progress import get_progress_backend
 
         safe_logfire_info(f"Stop crawl requested | progress_id={progress_id}")
 
-        found = False
-        # Step 1: Cancel the orchestration service
-        orchestration = await get_active_orchestration(progress_id)
-        if orchestration:
-            orchestration.cancel()
-            found = True
+        found = await stop_local_operation(progress_id)
 
-        # Step 2: Cancel the asyncio task
-        if progress_id in active_crawl_tasks:
-            task = active_crawl_tasks[progress_id]
-            if not task.done():
-                task.cancel()
-                try:
-                    await asyncio.wait_for(task, timeout=2.0)
-                except (TimeoutError, asyncio.CancelledError):
-                    pass
-            del active_crawl_tasks[progress_id]
-            found = True
-
-        # Step 3: Remove from active orchestrations registry
-        await unregister_orchestration(progress_id)
-
-        # Step 4: Update progress tracker to reflect cancellation (only if we found and cancelled something)
-        if found:
-            try:
-                from ..utils.progress.progress_tracker import ProgressTracker
-                # Get current progress from existing tracker, default to 0 if not found
-                current_state = ProgressTracker.get_progress(progress_id)
-                current_progress = current_state.get("progress", 0) if current_state else 0
-
-                tracker = ProgressTracker(progress_id, operation_type="crawl")
-                await tracker.update(
-                    status="cancelled",
-                    progress=current_progress,
-                    log="Crawl cancelled by user"
-                )
-            except Exception:
-                # Best effort - don't fail the cancellation if tracker update fails
-                pass
+        # The operation may be running in another worker process
+        if not found:
+            found = await get_progress_backend().request_cancel(progress_id)
 
         if not found:
             raise HTTPException(status_code=404, detail={"error": "No active task for given progress_id"})
@@ -0,0 +1,22 @@
+"""
+Metrics API endpoint.
+
+Exposes the server's in-process metrics (crawl stage timings, provider
+and database request latency, rate-limit waits) in the Prometheus text
+format for scraping.
+"""
+
+from fastapi import APIRouter, Response
+
+from ..services.metrics_service import get_metrics_registry
+
+# Content type of the Prometheus text exposition format
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+router = APIRouter(tags=["metrics"])
+
+
+@router.get("/metrics")
+async def metrics() -> Response:
+    """Current metrics in the Prometheus text format."""
+    return Response(content=get_metrics_registry().render(), media_type=PROMETHEUS_CONTENT_TYPE)
@@ -5,13 +5,18 @@ This module handles page retrieval operations for RAG:
 - List pages for a source
 - Get page by ID
 - Get page by URL
+
+Single-page reads can return one section of a long page at a time
+(``section`` / ``section_tokens``), so agents read large pages piecewise.
 """
 
 from fastapi import APIRouter, HTTPException, Query
 from pydantic import BaseModel
 
 from ..config.logfire_config import get_logger, safe_logfire_error
+from ..services.search.context_budget import DEFAULT_SECTION_TOKENS, split_sections
 from ..utils import get_supabase_client
+from ..utils.json_response import FastJSONResponse, parse_fields
 
 # Get logger for this module
 logger = get_logger(__name__)
@@ -22,6 +27,9 @@ router = APIRouter(prefix="/api", tags=["pages"])
 # Maximum character count for returning full page content
 MAX_PAGE_CHARS = 20_000
 
+# Smallest section size accepted for sectioned reads
+MIN_SECTION_TOKENS = 100
+
 
 class PageSummary(BaseModel):
     """Summary model for page listings (no content)"""
@@ -50,6 +58,8 @@ class PageResponse(BaseModel):
     metadata: dict
     created_at: str
     updated_at: str
+    section_index: int | None = None  # Set for sectioned reads
+    total_sections: int | None = None
 
 
 class PageListResponse(BaseModel):
@@ -60,6 +70,10 @@ class PageListResponse(BaseModel):
     source_id: str
 
 
+# Columns selected for page listings, in PageSummary order
+PAGE_SUMMARY_FIELDS = tuple(PageSummary.model_fields)
+
+
 def _handle_large_page_content(page_data: dict) -> dict:
     """
     Replace full_content with a helpful message if page is too large for LLM context.
@@ -76,8 +90,8 @@ def _handle_large_page_content(page_data: dict) -> dict:
         page_data["full_content"] = (
             f"[Page too large for context - {char_count:,} characters]\n\n"
             f"This page exceeds the {MAX_PAGE_CHARS:,} character limit for retrieval.\n\n"
-            f"To access content from this page, use a RAG search with return_mode='chunks' instead of 'pages'.\n"
-            f"This will retrieve specific relevant sections rather than the entire page.\n\n"
+            f"To access content from this page, read it in sections (section=0, 1, ...) or use a\n"
+            f"RAG search with return_mode='chunks' to retrieve the relevant passages.\n\n"
             f"Page details:\n"
             f"- URL: {page_data.get('url', 'N/A')}\n"
             f"- Section: {page_data.get('section_title', 'N/A')}\n"
@@ -89,17 +103,44 @@ def _handle_large_page_content(page_data: dict) -> dict:
     return page_data
 
 
-@router.get("/pages")
+def _page_response(page_data: dict, section: int | None, section_tokens: int | None) -> PageResponse:
+    """
+    Build the response for a page read, whole or as one section.
+
+    Raises:
+        HTTPException: 400 if the section does not exist
+    """
+    if section is None and section_tokens is None:
+        return PageResponse(**_handle_large_page_content(page_data))
+
+    sections = split_sections(page_data.get("full_content") or "", section_tokens or DEFAULT_SECTION_TOKENS)
+    index = section or 0
+    if index >= len(sections):
+        raise HTTPException(
+            status_code=400, detail=f"Section {index} out of range (page has {len(sections)} sections)"
+        )
+    page_data["full_content"] = sections[index]
+    page_data["section_index"] = index
+    page_data["total_sections"] = len(sections)
+    return PageResponse(**page_data)
+
+
+@router.get("/pages", response_model=PageListResponse)
 async def list_pages(
     source_id: str = Query(..., description="Source ID to filter pages"),
     section: str | None = Query(None, description="Filter by section title (for llms-full.txt)"),
+    fields: str | None = Query(None, description="Comma-separated page fields to return"),
 ):
     """
     List all pages for a given source.
 
+    Rows are returned as selected (no per-row model construction) and
+    rendered with the fast JSON encoder; PageListResponse documents the shape.
+
     Args:
         source_id: The source ID to filter pages
         section: Optional H1 section title for llms-full.txt sources
+        fields: Optional projection of PageSummary fields (``id`` is always included)
 
     Returns:
         PageListResponse with list of pages and metadata
@@ -107,10 +148,16 @@ async def list_pages(
     try:
         client = get_supabase_client()
 
+        requested_fields = parse_fields(fields)
+        columns = [
+            name for name in PAGE_SUMMARY_FIELDS
+            if requested_fields is None or name == "id" or name in requested_fields
+        ]
+
         # Build query - select only summary fields (no full_content)
-        query = client.table("archon_page_metadata").select(
-            "id, url, section_title, section_order, word_count, char_count, chunk_count"
-        ).eq("source_id", source_id)
+        query = client.table("archon_page_metadata").select(", ".join(columns)).eq(
+            "source_id", source_id
+        )
 
         # Add section filter if provided
         if section:
@@ -122,10 +169,9 @@ async def list_pages(
         # Execute query
         result = query.execute()
 
-        # Use PageSummary (no content handling needed)
-        pages = [PageSummary(**page) for page in result.data]
+        pages = result.data or []
 
-        return PageListResponse(pages=pages, total=len(pages), source_id=source_id)
+        return FastJSONResponse({"pages": pages, "total": len(pages), "source_id": source_id})
 
     except Exception as e:
         logger.error(f"Error listing pages for source {source_id}: {e}", exc_info=True)
@@ -134,7 +180,11 @@ async def list_pages(
 
 
 @router.get("/pages/by-url")
-async def get_page_by_url(url: str = Query(..., description="The URL of the page to retrieve")):
+async def get_page_by_url(
+    url: str = Query(..., description="The URL of the page to retrieve"),
+    section: int | None = Query(None, ge=0, description="Section to return (0-based)"),
+    section_tokens: int | None = Query(None, ge=MIN_SECTION_TOKENS, description="Section size in tokens"),
+):
     """
     Get a single page by its URL.
 
@@ -142,9 +192,11 @@ async def get_page_by_url(url: str = Query(..., description="The URL of the page
 
     Args:
         url: The complete URL of the page (including anchors for llms-full.txt sections)
+        section: Return only this section of the page
+        section_tokens: Section size (default DEFAULT_SECTION_TOKENS)
 
     Returns:
-        PageResponse with complete page data
+        PageResponse with complete page data, or one section of it
     """
     try:
         client = get_supabase_client()
@@ -155,9 +207,7 @@ async def get_page_by_url(url: str = Query(..., description="The URL of the page
         if not result.data:
             raise HTTPException(status_code=404, detail=f"Page not found for URL: {url}")
 
-        # Handle large pages
-        page_data = _handle_large_page_content(result.data.copy())
-        return PageResponse(**page_data)
+        return _page_response(result.data.copy(), section, section_tokens)
 
     except HTTPException:
         raise
@@ -168,15 +218,21 @@ async def get_page_by_url(url: str = Query(..., description="The URL of the page
 
 
 @router.get("/pages/{page_id}")
-async def get_page_by_id(page_id: str):
+async def get_page_by_id(
+    page_id: str,
+    section: int | None = Query(None, ge=0, description="Section to return (0-based)"),
+    section_tokens: int | None = Query(None, ge=MIN_SECTION_TOKENS, description="Section size in tokens"),
+):
     """
     Get a single page by its ID.
 
     Args:
         page_id: The UUID of the page
+        section: Return only this section of the page
+        section_tokens: Section size (default DEFAULT_SECTION_TOKENS)
 
     Returns:
-        PageResponse with complete page data
+        PageResponse with complete page data, or one section of it
     """
     try:
         client = get_supabase_client()
@@ -187,9 +243,7 @@ async def get_page_by_id(page_id: str):
         if not result.data:
             raise HTTPException(status_code=404, detail=f"Page not found: {page_id}")
 
-        # Handle large pages
-        page_data = _handle_large_page_content(result.data.copy())
-        return PageResponse(**page_data)
+        return _page_response(result.data.copy(), section, section_tokens)
 
     except HTTPException:
         raise
@@ -1,15 +1,21 @@
-"""Progress API endpoints for polling operation status."""
+"""Progress API endpoints for polling and streaming operation status."""
 
+import asyncio
+import json
+from collections.abc import AsyncIterator
 from datetime import datetime
 from email.utils import formatdate
+from typing import Any
 
 from fastapi import APIRouter, Header, HTTPException, Response
 from fastapi import status as http_status
+from sse_starlette.sse import EventSourceResponse
 
 from ..config.logfire_config import get_logger, logfire
 from ..models.progress_models import create_progress_response
+from ..services.change_version_service import change_versions, progress_of
 from ..utils.etag_utils import check_etag, generate_etag
-from ..utils.progress import ProgressTracker
+from ..utils.progress import ProgressSubscription, ProgressTracker
 
 logger = get_logger(__name__)
 
@@ -18,6 +24,55 @@ router = APIRouter(prefix="/api/progress", tags=["progress"])
 # Terminal states that don't require further polling
 TERMINAL_STATES = {"completed", "failed", "error", "cancelled"}
 
+# Minimum spacing between streamed events; updates in between are coalesced
+PROGRESS_STREAM_MIN_INTERVAL = 0.25
+
+# How long a stream waits for an update before checking the operation still exists
+PROGRESS_STREAM_IDLE_TIMEOUT = 15.0
+
+
+def _build_progress_payload(operation_id: str, operation: dict[str, Any]) -> dict[str, Any]:
+    """Convert a tracker state into the camelCase API progress response."""
+    # Ensure we have the progress_id in the response without mutating shared state
+    operation_with_id = {**operation, "progress_id": operation_id}
+
+    # Create standardized response using Pydantic model
+    progress_response = create_progress_response(operation.get("type", "crawl"), operation_with_id)
+    return progress_response.model_dump(by_alias=True, exclude_none=True)
+
+
+async def _progress_events(
+    operation_id: str, subscription: ProgressSubscription
+) -> AsyncIterator[dict[str, str]]:
+    """
+    Yield SSE events for an operation until it reaches a terminal state.
+
+    Starts with the current state, then sends at most one event per
+    PROGRESS_STREAM_MIN_INTERVAL; a slow client only ever receives the
+    latest state.
+    """
+    try:
+        operation = ProgressTracker.get_progress(operation_id)
+        while operation is not None:
+            payload = _build_progress_payload(operation_id, operation)
+            yield {"event": "progress", "data": json.dumps(payload, default=str)}
+            if operation.get("status") in TERMINAL_STATES:
+                return
+
+            await asyncio.sleep(PROGRESS_STREAM_MIN_INTERVAL)
+            operation = await subscription.next_state(PROGRESS_STREAM_IDLE_TIMEOUT)
+            while operation is None and not subscription.closed:
+                # Idle: keep waiting while the operation is still tracked
+                if ProgressTracker.get_progress(operation_id) is None:
+                    return
+                operation = await subscription.next_state(PROGRESS_STREAM_IDLE_TIMEOUT)
+    finally:
+        ProgressTracker.unsubscribe(subscription)
+        if subscription.coalesced_updates:
+            logfire.info(
+                f"Progress stream closed | operation_id={operation_id} | coalesced_updates={subscription.coalesced_updates}"
+            )
+
 
 @router.get("/{operation_id}")
 async def get_progress(
@@ -34,8 +89,12 @@ async def get_progress(
     try:
         logfire.info(f"Getting progress for operation | operation_id={operation_id}")
 
-        # Get operation progress from ProgressTracker
+        # Get operation progress from ProgressTracker, falling back to
+        # operations running in another worker process
         operation = ProgressTracker.get_progress(operation_id)
+        is_local = operation is not None
+        if not is_local:
+            operation = await ProgressTracker.get_shared_progress(operation_id)
 
         if not operation:
             logfire.warning(f"Operation not found | operation_id={operation_id}")
@@ -44,19 +103,20 @@ async def get_progress(
                 detail={"error": f"Operation {operation_id} not found"}
             )
 
-
-        # Ensure we have the progress_id in the response without mutating shared state
-        operation_with_id = {**operation, "progress_id": operation_id}
-
-        # Get operation type for proper model selection
-        operation_type = operation.get("type", "crawl")
-
-        # Create standardized response using Pydantic model
-        progress_response = create_progress_response(operation_type, operation_with_id)
-
+        # Answer unchanged polls without rebuilding the response model
+        # (change versions only track operations of this process)
+        resource = progress_of(operation_id)
+        cached_etag = change_versions.cached_etag(resource) if is_local else None
+        if cached_etag and check_etag(if_none_match, cached_etag):
+            return Response(
+                status_code=http_status.HTTP_304_NOT_MODIFIED,
+                headers={"ETag": cached_etag, "Cache-Control": "no-cache, must-revalidate"},
+            )
+        version = change_versions.version(resource)
 
         # Convert to dict with camelCase fields for API response
-        response_data = progress_response.model_dump(by_alias=True, exclude_none=True)
+        response_data = _build_progress_payload(operation_id, operation)
+        operation_type = operation.get("type", "crawl")
 
         # Debug logging for code extraction fields
         if operation_type == "crawl" and operation.get("status") == "code_extraction":
@@ -65,6 +125,8 @@ async def get_progress(
         # Generate ETag from stable data (excluding timestamp)
         etag_data = {k: v for k, v in response_data.items() if k != "timestamp"}
         current_etag = generate_etag(etag_data)
+        if is_local:
+            change_versions.remember_etag(resource, resource, version, current_etag)
 
         # Check if client's ETag matches
         if check_etag(if_none_match, current_etag):
@@ -97,6 +159,32 @@ async def get_progress(
         raise HTTPException(status_code=500, detail={"error": str(e)}) from e
 
 
+@router.get("/{operation_id}/stream")
+async def stream_progress(operation_id: str):
+    """
+    Stream progress for an operation as Server-Sent Events.
+
+    Each "progress" event carries the same payload as the polling endpoint.
+    The stream ends after a terminal status or once the operation is
+    cleaned up. Only the worker running the operation can stream it;
+    elsewhere this returns 404 and clients fall back to polling.
+    """
+    if not ProgressTracker.get_progress(operation_id):
+        logfire.warning(f"Operation not found for stream | operation_id={operation_id}")
+        raise HTTPException(
+            status_code=404,
+            detail={"error": f"Operation {operation_id} not found"}
+        )
+
+    # Subscribe before reading the initial state so no update is missed
+    subscription = ProgressTracker.subscribe(operation_id)
+    logfire.info(f"Progress stream opened | operation_id={operation_id}")
+    return EventSourceResponse(
+        _progress_events(operation_id, subscription),
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
 @router.get("/")
 async def list_active_operations():
     """
@@ -110,9 +198,9 @@ async def list_active_operations():
         # Get all active operations from ProgressTracker
         active_operations = []
 
-        # Get active operations from ProgressTracker
+        # Get active operations of every worker from ProgressTracker
         # Include all non-completed statuses
-        for op_id, operation in ProgressTracker.list_active().items():
+        for op_id, operation in (await ProgressTracker.list_all_active()).items():
             status = operation.get("status", "unknown")
             # Include all operations that aren't in terminal states
             if status not in TERMINAL_STATES:
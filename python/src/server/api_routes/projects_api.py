@@ -22,11 +22,19 @@ from pydantic import BaseModel
 from ..config.logfire_config import get_logger, logfire
 from ..utils import get_supabase_client
 from ..utils.etag_utils import check_etag, generate_etag
+from ..utils.json_response import FastJSONResponse, parse_fields, project_fields
 
 logger = get_logger(__name__)
 
 # Service imports
+from ..services.change_version_service import (
+    PROJECTS,
+    TASKS,
+    change_versions,
+    tasks_of,
+)
 from ..services.projects import (
+    InvalidTaskCursorError,
     ProjectCreationService,
     ProjectService,
     SourceLinkingService,
@@ -79,6 +87,7 @@ class CreateTaskRequest(BaseModel):
 async def list_projects(
     response: Response,
     include_content: bool = True,
+    fields: str | None = None,
     if_none_match: str | None = Header(None)
 ):
     """
@@ -87,9 +96,24 @@ async def list_projects(
     Args:
         include_content: If True (default), returns full project content.
                         If False, returns lightweight metadata with statistics.
+        fields: Optional comma-separated list of project fields to return
+                (``id`` is always included), e.g. ``fields=id,title,pinned``
     """
     try:
-        logfire.debug(f"Listing all projects | include_content={include_content}")
+        logfire.debug(f"Listing all projects | include_content={include_content} | fields={fields}")
+        requested_fields = parse_fields(fields)
+
+        # Answer unchanged polls from the change-version registry without querying
+        cache_key = f"{PROJECTS}:include_content={include_content}"
+        if requested_fields:
+            cache_key += f":fields={','.join(sorted(requested_fields))}"
+        cached_etag = change_versions.cached_etag(cache_key)
+        if cached_etag and check_etag(if_none_match, cached_etag):
+            response.status_code = http_status.HTTP_304_NOT_MODIFIED
+            response.headers["ETag"] = cached_etag
+            response.headers["Cache-Control"] = "no-cache, must-revalidate"
+            return None
+        version = change_versions.version(PROJECTS)
 
         # Use ProjectService to get projects with include_content parameter
         project_service = ProjectService()
@@ -107,22 +131,7 @@ async def list_projects(
             # Lightweight response doesn't need source formatting
             formatted_projects = result["projects"]
 
-        # Monitor response size for optimization validation
-        response_json = json.dumps(formatted_projects)
-        response_size = len(response_json)
-
-        # Log response metrics
-        logfire.debug(
-            f"Projects listed successfully | count={len(formatted_projects)} | "
-            f"size_bytes={response_size} | include_content={include_content}"
-        )
-
-        # Log large responses at debug level (>100KB is worth noting, but normal for project data)
-        if response_size > 100000:
-            logfire.debug(
-                f"Large response size | size_bytes={response_size} | "
-                f"include_content={include_content} | project_count={len(formatted_projects)}"
-            )
+        formatted_projects = project_fields(formatted_projects, requested_fields)
 
         # Generate ETag from stable data (excluding timestamp)
         etag_data = {
@@ -130,6 +139,7 @@ async def list_projects(
             "count": len(formatted_projects)
         }
         current_etag = generate_etag(etag_data)
+        change_versions.remember_etag(cache_key, PROJECTS, version, current_etag)
 
         # Generate response with timestamp for polling
         response_data = {
@@ -145,12 +155,31 @@ async def list_projects(
             response.headers["Cache-Control"] = "no-cache, must-revalidate"
             return None
 
-        # Set headers
-        response.headers["ETag"] = current_etag
-        response.headers["Last-Modified"] = datetime.utcnow().isoformat()
-        response.headers["Cache-Control"] = "no-cache, must-revalidate"
+        # Render once with the fast encoder; the rendered body also gives the size metric
+        json_response = FastJSONResponse(
+            response_data,
+            headers={
+                "ETag": current_etag,
+                "Last-Modified": datetime.utcnow().isoformat(),
+                "Cache-Control": "no-cache, must-revalidate",
+            },
+        )
+        response_size = len(json_response.body)
 
-        return response_data
+        # Log response metrics
+        logfire.debug(
+            f"Projects listed successfully | count={len(formatted_projects)} | "
+            f"size_bytes={response_size} | include_content={include_content}"
+        )
+
+        # Log large responses at debug level (>100KB is worth noting, but normal for project data)
+        if response_size > 100000:
+            logfire.debug(
+                f"Large response size | size_bytes={response_size} | "
+                f"include_content={include_content} | project_count={len(formatted_projects)}"
+            )
+
+        return json_response
 
     except HTTPException:
         raise
@@ -292,6 +321,16 @@ async def get_all_task_counts(
 
         logfire.debug(f"Getting task counts for all projects | etag={if_none_match}")
 
+        # Answer unchanged polls from the change-version registry without querying
+        cache_key = f"{TASKS}:counts"
+        cached_etag = change_versions.cached_etag(cache_key)
+        if cached_etag and check_etag(if_none_match, cached_etag):
+            response.status_code = 304
+            response.headers["ETag"] = cached_etag
+            response.headers["Cache-Control"] = "no-cache, must-revalidate"
+            return None
+        version = change_versions.version(TASKS)
+
         # Use TaskService to get batch task counts
         # Get client explicitly to ensure mocking works in tests
         supabase_client = get_supabase_client()
@@ -308,6 +347,7 @@ async def get_all_task_counts(
             "count": len(result)
         }
         current_etag = generate_etag(etag_data)
+        change_versions.remember_etag(cache_key, TASKS, version, current_etag)
 
         # Check if client's ETag matches (304 Not Modified)
         if check_etag(if_none_match, current_etag):
@@ -565,6 +605,18 @@ async def list_project_tasks(
             f"Listing project tasks | project_id={project_id} | include_archived={include_archived} | exclude_large_fields={exclude_large_fields} | etag={if_none_match}"
         )
 
+        # Answer unchanged polls from the change-version registry without querying
+        resource = tasks_of(project_id)
+        cache_key = f"{resource}:archived={include_archived}:exclude_large={exclude_large_fields}"
+        cached_etag = change_versions.cached_etag(cache_key)
+        if cached_etag and check_etag(if_none_match, cached_etag):
+            response.status_code = 304
+            response.headers["ETag"] = cached_etag
+            response.headers["Cache-Control"] = "no-cache, must-revalidate"
+            logfire.debug(f"Tasks unchanged since last poll, returning 304 | project_id={project_id}")
+            return None
+        version = change_versions.version(resource)
+
         # Use TaskService to list tasks
         task_service = TaskService()
         success, result = task_service.list_tasks(
@@ -619,6 +671,7 @@ async def list_project_tasks(
 
         etag_data = {"tasks": etag_tasks, "project_id": project_id, "count": len(tasks)}
         current_etag = generate_etag(etag_data)
+        change_versions.remember_etag(cache_key, resource, version, current_etag)
 
         # Check if client's ETag matches (304 Not Modified)
         if check_etag(if_none_match, current_etag):
@@ -697,14 +750,21 @@ async def list_tasks(
     per_page: int = 10,
     exclude_large_fields: bool = False,
     q: str | None = None,  # Search query parameter
+    cursor: str | None = None,
 ):
-    """List tasks with optional filters including status, project, and keyword search."""
+    """
+    List tasks with optional filters including status, project, and keyword search.
+
+    Pages are read from the database in (task_order, created_at, id) order.
+    Pass the returned next_cursor as cursor to fetch the following page
+    without an offset scan; page is only used when no cursor is given.
+    """
     try:
         logfire.info(
-            f"Listing tasks | status={status} | project_id={project_id} | include_closed={include_closed} | page={page} | per_page={per_page} | q={q}"
+            f"Listing tasks | status={status} | project_id={project_id} | include_closed={include_closed} | page={page} | per_page={per_page} | q={q} | cursor={cursor}"
         )
 
-        # Use TaskService to list tasks
+        # Use TaskService to list one page of tasks
         task_service = TaskService()
         success, result = task_service.list_tasks(
             project_id=project_id,
@@ -712,6 +772,9 @@ async def list_tasks(
             include_closed=include_closed,
             exclude_large_fields=exclude_large_fields,
             search_query=q,  # Pass search query to service
+            limit=per_page,
+            offset=(max(page, 1) - 1) * per_page,
+            cursor=cursor,
         )
 
         if not success:
@@ -727,20 +790,23 @@ async def list_tasks(
                 task.pop("code_examples", None)
                 task.pop("messages", None)
 
-        # Apply pagination
-        start_idx = (page - 1) * per_page
-        end_idx = start_idx + per_page
-        paginated_tasks = tasks[start_idx:end_idx]
+        paginated_tasks = tasks
+        total = result.get("total_count")
 
-        # Prepare response
+        # Prepare response (keyset pages don't know the total)
+        pagination = {
+            "page": page,
+            "per_page": per_page,
+            "has_more": result.get("has_more", False),
+            "next_cursor": result.get("next_cursor"),
+        }
+        if total is not None:
+            pagination["total"] = total
+            pagination["pages"] = (total + per_page - 1) // per_page
         response = {
             "tasks": paginated_tasks,
-            "pagination": {
-                "total": len(tasks),
-                "page": page,
-                "per_page": per_page,
-                "pages": (len(tasks) + per_page - 1) // per_page,
-            },
+            "total_count": total,
+            "pagination": pagination,
         }
 
         # Monitor response size for optimization validation
@@ -764,6 +830,8 @@ async def list_tasks(
 
     except HTTPException:
         raise
+    except InvalidTaskCursorError as e:
+        raise HTTPException(status_code=400, detail={"error": str(e)}) from e
     except Exception as e:
         logfire.error(f"Failed to list tasks | error={str(e)}")
         raise HTTPException(status_code=500, detail={"error": str(e)})
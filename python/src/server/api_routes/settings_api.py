@@ -338,7 +338,11 @@ async def database_metrics():
 async def settings_health():
     """Health check for settings API."""
     logfire.info("Settings health check requested")
-    result = {"status": "healthy", "service": "settings"}
+    result = {
+        "status": "healthy",
+        "service": "settings",
+        "credential_crypto": credential_service.get_crypto_stats(),
+    }
 
     return result
 
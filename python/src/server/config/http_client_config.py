@@ -0,0 +1,56 @@
+"""
+HTTP client settings shared by Archon's service-to-service clients.
+
+The MCP tools' pooled clients, MCPServiceClient and the agent work orders
+proxy build their connection pools and timeouts from here, so one set of
+environment variables sizes and times out every pool. This module is also
+copied into the MCP container.
+"""
+
+import os
+
+import httpx
+
+
+def get_connection_limits() -> httpx.Limits:
+    """
+    Get connection pool limits from environment or defaults.
+
+    Environment variables:
+    - MCP_HTTP_MAX_CONNECTIONS: Maximum open connections per service (default: 100)
+    - MCP_HTTP_MAX_KEEPALIVE: Idle connections kept open per service (default: 20)
+    - MCP_HTTP_KEEPALIVE_EXPIRY: Seconds an idle connection is kept (default: 30)
+
+    Returns:
+        Configured httpx.Limits object
+    """
+    return httpx.Limits(
+        max_connections=int(os.getenv("MCP_HTTP_MAX_CONNECTIONS", "100")),
+        max_keepalive_connections=int(os.getenv("MCP_HTTP_MAX_KEEPALIVE", "20")),
+        keepalive_expiry=float(os.getenv("MCP_HTTP_KEEPALIVE_EXPIRY", "30.0")),
+    )
+
+
+def get_request_timeout(read: float | None = None) -> httpx.Timeout:
+    """
+    Get the request timeout from environment or defaults.
+
+    Environment variables:
+    - MCP_REQUEST_TIMEOUT: Total request timeout in seconds (default: 30)
+    - MCP_CONNECT_TIMEOUT: Connection timeout in seconds (default: 5)
+    - MCP_READ_TIMEOUT: Read timeout in seconds (default: 20)
+    - MCP_WRITE_TIMEOUT: Write timeout in seconds (default: 10)
+
+    Args:
+        read: Read timeout for endpoints with long-running responses
+              (overrides MCP_READ_TIMEOUT)
+
+    Returns:
+        Configured httpx.Timeout object
+    """
+    return httpx.Timeout(
+        timeout=float(os.getenv("MCP_REQUEST_TIMEOUT", "30.0")),
+        connect=float(os.getenv("MCP_CONNECT_TIMEOUT", "5.0")),
+        read=read if read is not None else float(os.getenv("MCP_READ_TIMEOUT", "20.0")),
+        write=float(os.getenv("MCP_WRITE_TIMEOUT", "10.0")),
+    )
@@ -21,9 +21,11 @@ from fastapi.middleware.cors import CORSMiddleware
 from .api_routes.agent_chat_api import router as agent_chat_router
 from .api_routes.agent_work_orders_proxy import router as agent_work_orders_router
 from .api_routes.bug_report_api import router as bug_report_router
+from .api_routes.diagnostics_api import router as diagnostics_router
 from .api_routes.internal_api import router as internal_router
 from .api_routes.knowledge_api import router as knowledge_router
 from .api_routes.mcp_api import router as mcp_router
+from .api_routes.metrics_api import router as metrics_router
 from .api_routes.migration_api import router as migration_router
 from .api_routes.ollama_api import router as ollama_router
 from .api_routes.pages_api import router as pages_router
@@ -37,6 +39,7 @@ from .api_routes.settings_api import router as settings_router
 
 # Import Logfire configuration
 from .config.logfire_config import api_logger, setup_logfire
+from .middleware.compression_middleware import DEFAULT_MINIMUM_SIZE, CompressionMiddleware
 from .services.crawler_manager import cleanup_crawler, initialize_crawler
 
 # Import utilities and core classes
@@ -102,6 +105,35 @@ async def lifespan(app: FastAPI):
 
         api_logger.info("✅ Using polling for real-time updates")
 
+        # Start the progress backend (shares progress between worker processes)
+        try:
+            from .api_routes.knowledge_api import stop_local_operation
+            from .utils.progress import get_progress_backend
+
+            await get_progress_backend().start(cancel_handler=stop_local_operation)
+        except ValueError:
+            # Invalid PROGRESS_BACKEND setting - fail startup rather than run unshared
+            raise
+        except Exception as e:
+            api_logger.warning(f"Could not start progress backend: {e}")
+
+        # Start the threading service (tokenizers, warm CPU worker processes)
+        try:
+            from .services.threading_service import start_threading_service
+
+            await start_threading_service()
+            api_logger.info("✅ Threading service started")
+        except Exception as e:
+            api_logger.warning(f"Could not start threading service: {e}")
+
+        # Record the stacks of callbacks that block the event loop
+        try:
+            from .services.diagnostics_service import start_loop_lag_monitor
+
+            start_loop_lag_monitor()
+        except Exception as e:
+            api_logger.warning(f"Could not start event loop lag monitor: {e}")
+
         # Initialize prompt service
         try:
             from .services.prompt_service import prompt_service
@@ -138,6 +170,38 @@ async def lifespan(app: FastAPI):
         except Exception as e:
             api_logger.warning("Could not cleanup crawling context: %s", e, exc_info=True)
 
+        # Flush shared progress and stop watching for stop requests
+        try:
+            from .utils.progress import get_progress_backend
+
+            await get_progress_backend().stop()
+        except Exception as e:
+            api_logger.warning("Could not stop progress backend: %s", e, exc_info=True)
+
+        # Stop the threading service and its CPU worker processes
+        try:
+            from .services.threading_service import stop_threading_service
+
+            await stop_threading_service()
+        except Exception as e:
+            api_logger.warning("Could not stop threading service: %s", e, exc_info=True)
+
+        # Stop the event loop lag monitor
+        try:
+            from .services.diagnostics_service import stop_loop_lag_monitor
+
+            stop_loop_lag_monitor()
+        except Exception as e:
+            api_logger.warning("Could not stop event loop lag monitor: %s", e, exc_info=True)
+
+        # Close pooled service-to-service HTTP clients
+        try:
+            from .api_routes.agent_work_orders_proxy import close_proxy_client
+
+            await close_proxy_client()
+        except Exception as e:
+            api_logger.warning("Could not close proxy HTTP client: %s", e, exc_info=True)
+
 
         api_logger.info("✅ Cleanup completed")
 
@@ -153,6 +217,12 @@ app = FastAPI(
     lifespan=lifespan,
 )
 
+# Compress large JSON responses (project, page and chunk listings)
+app.add_middleware(
+    CompressionMiddleware,
+    minimum_size=int(os.getenv("RESPONSE_COMPRESSION_MIN_SIZE", str(DEFAULT_MINIMUM_SIZE))),
+)
+
 # Configure CORS
 app.add_middleware(
     CORSMiddleware,
@@ -166,8 +236,8 @@ app.add_middleware(
 # Add middleware to skip logging for health checks
 @app.middleware("http")
 async def skip_health_check_logs(request, call_next):
-    # Skip logging for health check endpoints
-    if request.url.path in ["/health", "/api/health"]:
+    # Skip logging for health check and metrics scrape endpoints
+    if request.url.path in ["/health", "/api/health", "/metrics"]:
         # Temporarily suppress the log
         import logging
 
@@ -196,6 +266,8 @@ app.include_router(bug_report_router)
 app.include_router(providers_router)
 app.include_router(version_router)
 app.include_router(migration_router)
+app.include_router(metrics_router)
+app.include_router(diagnostics_router)
 
 
 # Root endpoint
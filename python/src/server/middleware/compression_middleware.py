@@ -0,0 +1,168 @@
+"""
+Response Compression Middleware
+
+Compresses buffered responses with the best encoding the client accepts
+(brotli, zstd or gzip). brotli and zstd are used only when their Python
+packages are importable; gzip is always available.
+
+Only complete, single-message bodies above a size threshold are
+compressed. Streaming responses (SSE progress streams, file downloads)
+and responses that already carry a Content-Encoding pass through
+untouched, so long-lived streams are never buffered.
+"""
+
+import gzip
+from collections.abc import Callable
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+try:
+    import brotli
+
+    BROTLI_AVAILABLE = True
+except ImportError:
+    brotli = None
+    BROTLI_AVAILABLE = False
+
+try:
+    import zstandard
+
+    ZSTD_AVAILABLE = True
+except ImportError:
+    zstandard = None
+    ZSTD_AVAILABLE = False
+
+DEFAULT_MINIMUM_SIZE = 1024
+
+# Server preference when the client weights several encodings equally
+ENCODING_PREFERENCE = ("br", "zstd", "gzip")
+
+SKIP_CONTENT_TYPES = ("text/event-stream",)
+
+
+def available_encodings() -> tuple[str, ...]:
+    """Encodings this process can produce, in preference order."""
+    available = {"gzip": True, "br": BROTLI_AVAILABLE, "zstd": ZSTD_AVAILABLE}
+    return tuple(encoding for encoding in ENCODING_PREFERENCE if available[encoding])
+
+
+def negotiate_encoding(accept_encoding: str | None) -> str | None:
+    """
+    Pick the encoding to use for an Accept-Encoding header.
+
+    Args:
+        accept_encoding: Raw Accept-Encoding header value
+
+    Returns:
+        "br", "zstd" or "gzip", or None if the client accepts none of them
+    """
+    if not accept_encoding:
+        return None
+
+    weights: dict[str, float] = {}
+    for part in accept_encoding.split(","):
+        name, _, params = part.strip().partition(";")
+        name = name.strip().lower()
+        if not name:
+            continue
+        weight = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                weight = float(params[2:])
+            except ValueError:
+                weight = 0.0
+        weights[name] = weight
+
+    best = None
+    best_weight = 0.0
+    for encoding in available_encodings():
+        weight = weights.get(encoding, weights.get("*", 0.0))
+        if weight > best_weight:
+            best, best_weight = encoding, weight
+    return best
+
+
+def _compressor(encoding: str) -> Callable[[bytes], bytes]:
+    if encoding == "br":
+        return lambda body: brotli.compress(body, quality=4)
+    if encoding == "zstd":
+        return lambda body: zstandard.ZstdCompressor(level=3).compress(body)
+    return lambda body: gzip.compress(body, compresslevel=6)
+
+
+class CompressionMiddleware:
+    """
+    ASGI middleware negotiating gzip/brotli/zstd compression.
+
+    Args:
+        app: ASGI application to wrap
+        minimum_size: Bodies smaller than this many bytes are sent uncompressed
+    """
+
+    def __init__(self, app: ASGIApp, minimum_size: int = DEFAULT_MINIMUM_SIZE):
+        self.app = app
+        self.minimum_size = minimum_size
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        encoding = negotiate_encoding(Headers(scope=scope).get("accept-encoding"))
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        responder = _CompressingResponder(send, encoding, self.minimum_size)
+        await self.app(scope, receive, responder)
+
+
+class _CompressingResponder:
+    """Send wrapper that holds back the response start until the body is known."""
+
+    def __init__(self, send: Send, encoding: str, minimum_size: int):
+        self.send = send
+        self.encoding = encoding
+        self.minimum_size = minimum_size
+        self.start_message: Message | None = None
+        self.passthrough = False
+
+    async def __call__(self, message: Message) -> None:
+        if message["type"] == "http.response.start":
+            self.start_message = message
+            return
+
+        if message["type"] != "http.response.body" or self.start_message is None:
+            await self.send(message)
+            return
+
+        if self.passthrough:
+            await self.send(message)
+            return
+
+        start, self.start_message = self.start_message, None
+        headers = MutableHeaders(scope=start)
+        body = message.get("body", b"")
+
+        if (
+            message.get("more_body", False)
+            or "content-encoding" in headers
+            or headers.get("content-type", "").startswith(SKIP_CONTENT_TYPES)
+        ):
+            # Streaming or already encoded: forward everything as-is
+            self.passthrough = True
+            await self.send(start)
+            await self.send(message)
+            return
+
+        headers.add_vary_header("Accept-Encoding")
+        if len(body) >= self.minimum_size:
+            body = _compressor(self.encoding)(body)
+            headers["Content-Encoding"] = self.encoding
+            headers["Content-Length"] = str(len(body))
+            message = {**message, "body": body}
+
+        await self.send(start)
+        await self.send(message)
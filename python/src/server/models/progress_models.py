@@ -103,6 +103,8 @@ class CrawlProgressResponse(BaseProgressResponse):
     word_count: int | None = Field(None, alias="wordCount")
     source_id: str | None = Field(None, alias="sourceId")
     duration: str | None = None
+    # Time and calls per pipeline stage (see metrics_service.CrawlMetrics)
+    stage_metrics: dict[str, Any] | None = Field(None, alias="stageMetrics")
 
     @field_validator("duration", mode="before")
     @classmethod
@@ -0,0 +1,109 @@
+"""
+Change Version Service
+
+Keeps a monotonic change counter per resource family (projects, tasks of a
+project, knowledge sources, progress operations). Services bump the counter
+whenever they write; polling endpoints remember the ETag they computed at a
+given version and answer later If-None-Match requests with 304 straight from
+memory while the version is unchanged, without querying the database.
+
+Remembered ETags expire after ETAG_MAX_AGE_SECONDS, so writes made outside
+this process (agents, direct database edits) are still picked up by the
+next full query.
+"""
+
+import threading
+import time
+
+# How long a remembered ETag is trusted without re-running the query
+ETAG_MAX_AGE_SECONDS = 30.0
+
+# Upper bound on remembered ETags (cache keys include query parameters)
+MAX_REMEMBERED_ETAGS = 1024
+
+PROJECTS = "projects"
+TASKS = "tasks"
+SOURCES = "sources"
+
+
+def tasks_of(project_id: str) -> str:
+    """Resource key for the tasks of one project."""
+    return f"{TASKS}:{project_id}"
+
+
+def progress_of(progress_id: str) -> str:
+    """Resource key for one progress operation."""
+    return f"progress:{progress_id}"
+
+
+class ChangeVersionRegistry:
+    """Per-resource change counters with the ETags computed at each version."""
+
+    def __init__(self, max_age: float = ETAG_MAX_AGE_SECONDS):
+        self.max_age = max_age
+        self._versions: dict[str, int] = {}
+        self._etags: dict[str, tuple[str, int, str, float]] = {}
+        self._lock = threading.Lock()
+
+    def bump(self, *resources: str) -> None:
+        """Record a write to each of the given resources."""
+        with self._lock:
+            for resource in resources:
+                self._versions[resource] = self._versions.get(resource, 0) + 1
+
+    def version(self, resource: str) -> int:
+        """Current change version of a resource (0 if never written)."""
+        with self._lock:
+            return self._versions.get(resource, 0)
+
+    def remember_etag(self, cache_key: str, resource: str, version: int, etag: str) -> None:
+        """
+        Remember the ETag of a response built at the given resource version.
+
+        Read the version before running the query, so a write that lands
+        while the response is being built invalidates it.
+        """
+        with self._lock:
+            self._etags.pop(cache_key, None)
+            if len(self._etags) >= MAX_REMEMBERED_ETAGS:
+                # Evict the oldest entry (dicts keep insertion order)
+                del self._etags[next(iter(self._etags))]
+            self._etags[cache_key] = (resource, version, etag, time.monotonic())
+
+    def cached_etag(self, cache_key: str) -> str | None:
+        """
+        ETag of the last response for cache_key if its resource is unchanged.
+
+        Returns None when nothing is remembered, the resource was written
+        since, or the entry is older than max_age.
+        """
+        with self._lock:
+            entry = self._etags.get(cache_key)
+            if entry is None:
+                return None
+            resource, version, etag, remembered_at = entry
+            if (
+                self._versions.get(resource, 0) != version
+                or time.monotonic() - remembered_at > self.max_age
+            ):
+                del self._etags[cache_key]
+                return None
+            return etag
+
+    def forget(self, resource: str) -> None:
+        """Drop the counter and remembered ETags of a resource that no longer exists."""
+        with self._lock:
+            self._versions.pop(resource, None)
+            stale = [key for key, entry in self._etags.items() if entry[0] == resource]
+            for key in stale:
+                del self._etags[key]
+
+    def clear(self) -> None:
+        """Reset all counters and remembered ETags."""
+        with self._lock:
+            self._versions.clear()
+            self._etags.clear()
+
+
+# Global instance shared by services and API routes
+change_versions = ChangeVersionRegistry()
@@ -10,6 +10,7 @@ import re
 from supabase import Client, create_client
 
 from ..config.logfire_config import search_logger
+from .metrics_service import instrument_supabase_client
 
 
 def get_supabase_client() -> Client:
@@ -30,6 +31,7 @@ def get_supabase_client() -> Client:
     try:
         # Let Supabase handle connection pooling internally
         client = create_client(url, key)
+        instrument_supabase_client(client)
 
         # Extract project ID from URL for logging purposes only
         match = re.match(r"https://([^.]+)\.supabase\.co", url)
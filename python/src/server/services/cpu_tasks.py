@@ -0,0 +1,55 @@
+"""
+CPU Tasks
+
+Picklable entry points for the CPU-bound ingestion stages, run in the
+CPU process pool (see process_pool.py). Each is a module-level function
+with plain arguments and results; workers import this module once at
+start-up.
+
+Functions that read settings take the caller's setting values, because a
+worker process has its own (default) settings snapshot.
+"""
+
+from collections.abc import Mapping
+from typing import Any
+
+from .crawling.helpers.llms_full_parser import LLMsFullSection
+from .crawling.helpers.llms_full_parser import (
+    parse_llms_full_sections as _parse_llms_full_sections,
+)
+from .settings_snapshot import get_settings, publish_settings
+from .storage.base_storage_service import chunk_text as _chunk_text
+from .storage.code_storage_service import extract_code_blocks as _extract_code_blocks
+
+
+def _use_settings(values: Mapping[str, str] | None) -> None:
+    """Publish the caller's settings in this worker if they differ."""
+    if values is not None and dict(get_settings().values) != dict(values):
+        publish_settings(values)
+
+
+def chunk_text(text: str, chunk_size: int = 5000) -> list[str]:
+    """Split text into chunks (see base_storage_service.chunk_text)."""
+    return _chunk_text(text, chunk_size)
+
+
+def extract_code_blocks(
+    markdown_content: str,
+    min_length: int | None = None,
+    settings_values: Mapping[str, str] | None = None,
+) -> list[dict[str, Any]]:
+    """
+    Extract code blocks from markdown (see code_storage_service.extract_code_blocks).
+
+    Args:
+        markdown_content: Markdown to extract code blocks from
+        min_length: Minimum code block length (default: from settings)
+        settings_values: The caller's setting values (get_settings().values)
+    """
+    _use_settings(settings_values)
+    return _extract_code_blocks(markdown_content, min_length=min_length)
+
+
+def parse_llms_full_sections(content: str, base_url: str) -> list[LLMsFullSection]:
+    """Split llms-full.txt content into H1 sections (see llms_full_parser)."""
+    return _parse_llms_full_sections(content, base_url)
@@ -10,11 +10,13 @@ from collections.abc import Callable
 from typing import Any
 
 from ...config.logfire_config import safe_logfire_error, safe_logfire_info
-from ...services.credential_service import credential_service
+from ..metrics_service import stage_timer
+from ..settings_snapshot import get_settings
 from ..storage.code_storage_service import (
     add_code_examples_to_supabase,
     generate_code_summaries_batch,
 )
+from ..threading_service import get_threading_service
 
 
 class CodeExtractionService:
@@ -64,73 +66,6 @@ class CodeExtractionService:
             supabase_client: The Supabase client for database operations
         """
         self.supabase_client = supabase_client
-        self._settings_cache = {}
-
-    async def _get_setting(self, key: str, default: Any) -> Any:
-        """Get a setting from credential service with caching."""
-        if key in self._settings_cache:
-            return self._settings_cache[key]
-
-        try:
-            value = await credential_service.get_credential(key, default)
-            # Convert string values to appropriate types
-            if isinstance(default, bool):
-                value = str(value).lower() == "true" if value is not None else default
-            elif isinstance(default, int):
-                value = int(value) if value is not None else default
-            elif isinstance(default, float):
-                value = float(value) if value is not None else default
-            self._settings_cache[key] = value
-            return value
-        except Exception as e:
-            safe_logfire_error(f"Error getting setting {key}: {e}, using default: {default}")
-            # Make sure we return the default value with correct type
-            self._settings_cache[key] = default
-            return default
-
-    async def _get_min_code_length(self) -> int:
-        """Get minimum code block length setting."""
-        return await self._get_setting("MIN_CODE_BLOCK_LENGTH", 250)
-
-    async def _get_max_code_length(self) -> int:
-        """Get maximum code block length setting."""
-        return await self._get_setting("MAX_CODE_BLOCK_LENGTH", 5000)
-
-    async def _is_complete_block_detection_enabled(self) -> bool:
-        """Check if complete block detection is enabled."""
-        return await self._get_setting("ENABLE_COMPLETE_BLOCK_DETECTION", True)
-
-    async def _is_language_patterns_enabled(self) -> bool:
-        """Check if language-specific patterns are enabled."""
-        return await self._get_setting("ENABLE_LANGUAGE_SPECIFIC_PATTERNS", True)
-
-    async def _is_prose_filtering_enabled(self) -> bool:
-        """Check if prose filtering is enabled."""
-        return await self._get_setting("ENABLE_PROSE_FILTERING", True)
-
-    async def _get_max_prose_ratio(self) -> float:
-        """Get maximum allowed prose ratio."""
-        return await self._get_setting("MAX_PROSE_RATIO", 0.15)
-
-    async def _get_min_code_indicators(self) -> int:
-        """Get minimum required code indicators."""
-        return await self._get_setting("MIN_CODE_INDICATORS", 3)
-
-    async def _is_diagram_filtering_enabled(self) -> bool:
-        """Check if diagram filtering is enabled."""
-        return await self._get_setting("ENABLE_DIAGRAM_FILTERING", True)
-
-    async def _is_contextual_length_enabled(self) -> bool:
-        """Check if contextual length adjustment is enabled."""
-        return await self._get_setting("ENABLE_CONTEXTUAL_LENGTH", True)
-
-    async def _get_context_window_size(self) -> int:
-        """Get context window size for code blocks."""
-        return await self._get_setting("CONTEXT_WINDOW_SIZE", 1000)
-
-    async def _is_code_summaries_enabled(self) -> bool:
-        """Check if code summaries generation is enabled."""
-        return await self._get_setting("ENABLE_CODE_SUMMARIES", True)
 
     async def extract_and_store_code_examples(
         self,
@@ -176,9 +111,10 @@ class CodeExtractionService:
             extraction_callback = extraction_progress
 
         # Extract code blocks from all documents
-        all_code_blocks = await self._extract_code_blocks_from_documents(
-            crawl_results, source_id, extraction_callback, cancellation_check
-        )
+        with stage_timer("code_extraction"):
+            all_code_blocks = await self._extract_code_blocks_from_documents(
+                crawl_results, source_id, extraction_callback, cancellation_check
+            )
 
         if not all_code_blocks:
             safe_logfire_info("No code examples found in any crawled documents")
@@ -221,9 +157,10 @@ class CodeExtractionService:
             summary_callback = summary_progress
 
         # Generate summaries for code blocks
-        summary_results = await self._generate_code_summaries(
-            all_code_blocks, summary_callback, cancellation_check, provider
-        )
+        with stage_timer("code_summaries"):
+            summary_results = await self._generate_code_summaries(
+                all_code_blocks, summary_callback, cancellation_check, provider
+            )
 
         # Prepare code examples for storage
         storage_data = self._prepare_code_examples_for_storage(all_code_blocks, summary_results)
@@ -247,13 +184,14 @@ class CodeExtractionService:
             storage_callback = storage_progress
 
         # Store code examples in database
-        return await self._store_code_examples(
-            storage_data,
-            url_to_full_document,
-            storage_callback,
-            provider,
-            embedding_provider,
-        )
+        with stage_timer("code_storage"):
+            return await self._store_code_examples(
+                storage_data,
+                url_to_full_document,
+                storage_callback,
+                provider,
+                embedding_provider,
+            )
 
     async def _extract_code_blocks_from_documents(
         self,
@@ -384,11 +322,16 @@ class CodeExtractionService:
                     safe_logfire_info(
                         f"No code blocks from HTML, trying markdown extraction | url={source_url}"
                     )
-                    from ..storage.code_storage_service import extract_code_blocks
+                    from .. import cpu_tasks
 
                     # Use dynamic minimum for markdown extraction
                     base_min_length = 250  # Default for markdown
-                    code_blocks = extract_code_blocks(md, min_length=base_min_length)
+                    code_blocks = await get_threading_service().run_cpu_intensive(
+                        cpu_tasks.extract_code_blocks,
+                        md,
+                        base_min_length,
+                        dict(get_settings().values),
+                    )
                     safe_logfire_info(
                         f"Found {len(code_blocks)} code blocks from markdown | url={source_url}"
                     )
@@ -913,7 +856,7 @@ class CodeExtractionService:
                     threshold = (
                         min_length
                         if min_length is not None
-                        else await self._get_min_code_length()
+                        else get_settings().min_code_block_length
                     )
                     if len(block_text) < threshold:
                         current_block = []
@@ -982,7 +925,7 @@ class CodeExtractionService:
         safe_logfire_info(f"🔍 PDF CODE EXTRACTION START | url={url} | content_length={len(content)}")
         
         code_blocks = []
-        min_length = await self._get_min_code_length()
+        min_length = get_settings().min_code_block_length
         
         # Split content into paragraphs/sections
         # Use double newlines and page breaks as natural boundaries
@@ -1214,7 +1157,7 @@ class CodeExtractionService:
 
             # Cap at maximum length
             if max_length is None:
-                max_length = await self._get_max_code_length()
+                max_length = get_settings().max_code_block_length
             if extended_pos - start_pos > max_length:
                 break
 
@@ -1232,11 +1175,11 @@ class CodeExtractionService:
         Returns:
             Calculated minimum length
         """
-        # Base lengths by language
+        settings = get_settings()
         # Check if contextual length adjustment is enabled
-        if not await self._is_contextual_length_enabled():
+        if not settings.enable_contextual_length:
             # Return default minimum length
-            return await self._get_min_code_length()
+            return settings.min_code_block_length
 
         # Base lengths by language
         base_lengths = {
@@ -1258,7 +1201,7 @@ class CodeExtractionService:
         }
 
         # Get default minimum from settings
-        default_min = await self._get_min_code_length()
+        default_min = settings.min_code_block_length
         min_length = base_lengths.get(language.lower(), default_min)
 
         # Adjust based on context clues
@@ -1420,7 +1363,7 @@ class CodeExtractionService:
             return False
 
         # Skip diagram languages if filtering is enabled
-        if await self._is_diagram_filtering_enabled():
+        if get_settings().enable_diagram_filtering:
             if language.lower() in ["mermaid", "plantuml", "graphviz", "dot", "diagram"]:
                 safe_logfire_info(f"Skipping diagram language: {language}")
                 return False
@@ -1466,7 +1409,7 @@ class CodeExtractionService:
                 indicator_details.append(name)
 
         # Require minimum code indicators
-        min_indicators = await self._get_min_code_indicators()
+        min_indicators = get_settings().min_code_indicators
         if indicator_count < min_indicators:
             safe_logfire_info(
                 f"Code has insufficient indicators: {indicator_count} found ({', '.join(indicator_details)})"
@@ -1544,8 +1487,9 @@ class CodeExtractionService:
             prose_score += matches
 
         # Check prose filtering
-        if await self._is_prose_filtering_enabled():
-            max_prose_ratio = await self._get_max_prose_ratio()
+        settings = get_settings()
+        if settings.enable_prose_filtering:
+            max_prose_ratio = settings.max_prose_ratio
             if word_count > 0 and prose_score / word_count > max_prose_ratio:
                 safe_logfire_info(
                     f"Code appears to be prose: prose_score={prose_score}, word_count={word_count}"
@@ -1572,7 +1516,7 @@ class CodeExtractionService:
             List of summary results
         """
         # Check if code summaries are enabled
-        if not await self._is_code_summaries_enabled():
+        if not get_settings().enable_code_summaries:
             safe_logfire_info("Code summaries generation is disabled, returning default summaries")
             # Return default summaries for all code blocks
             default_summaries = []
@@ -17,6 +17,7 @@ from ...config.logfire_config import get_logger, safe_logfire_error, safe_logfir
 from ...utils import get_supabase_client
 from ...utils.progress.progress_tracker import ProgressTracker
 from ..credential_service import credential_service
+from ..metrics_service import CRAWLS_TOTAL, record_crawl_items, stage_timer, track_crawl
 
 # Import strategies
 # Import operations
@@ -324,6 +325,8 @@ class CrawlingService:
         """
         last_heartbeat = asyncio.get_event_loop().time()
         heartbeat_interval = 30.0  # Send heartbeat every 30 seconds
+        # Per-stage timings of this crawl, reported in the completion payload
+        crawl_metrics = track_crawl()
 
         async def send_heartbeat_if_needed():
             """Send heartbeat to keep connection alive"""
@@ -406,7 +409,8 @@ class CrawlingService:
                 )
                 try:
                     # Offload potential sync I/O to avoid blocking the event loop
-                    discovered_file = await asyncio.to_thread(self.discovery_service.discover_files, url)
+                    with stage_timer("discovery"):
+                        discovered_file = await asyncio.to_thread(self.discovery_service.discover_files, url)
 
                     # Add the single best discovered file to crawl list
                     if discovered_file:
@@ -468,7 +472,8 @@ class CrawlingService:
                 discovery_request["is_discovery_target"] = True
                 discovery_request["original_domain"] = self.url_handler.get_base_url(discovered_url)
 
-                crawl_results, crawl_type = await self._crawl_by_url_type(discovered_url, discovery_request)
+                with stage_timer("crawl"):
+                    crawl_results, crawl_type = await self._crawl_by_url_type(discovered_url, discovery_request)
 
             else:
                 # No discovery - crawl the main URL normally
@@ -481,7 +486,8 @@ class CrawlingService:
 
                 # Crawl the main URL
                 safe_logfire_info(f"No discovery file found, crawling main URL: {url}")
-                crawl_results, crawl_type = await self._crawl_by_url_type(url, request)
+                with stage_timer("crawl"):
+                    crawl_results, crawl_type = await self._crawl_by_url_type(url, request)
 
             # Update progress tracker with crawl type
             if self.progress_tracker and crawl_type:
@@ -502,6 +508,7 @@ class CrawlingService:
 
             if not crawl_results:
                 raise ValueError("No content was crawled from the provided URL")
+            record_crawl_items("pages", len(crawl_results))
 
             # Processing stage
             await update_mapped_progress("processing", 50, "Processing crawled content")
@@ -548,17 +555,18 @@ class CrawlingService:
                         **kwargs
                     )
 
-            storage_results = await self.doc_storage_ops.process_and_store_documents(
-                crawl_results,
-                request,
-                crawl_type,
-                original_source_id,
-                doc_storage_callback,
-                self._check_cancellation,
-                source_url=url,
-                source_display_name=source_display_name,
-                url_to_page_id=None,  # Will be populated after page storage
-            )
+            with stage_timer("document_storage"):
+                storage_results = await self.doc_storage_ops.process_and_store_documents(
+                    crawl_results,
+                    request,
+                    crawl_type,
+                    original_source_id,
+                    doc_storage_callback,
+                    self._check_cancellation,
+                    source_url=url,
+                    source_display_name=source_display_name,
+                    url_to_page_id=None,  # Will be populated after page storage
+                )
 
             # Update progress tracker with source_id now that it's created
             if self.progress_tracker and storage_results.get("source_id"):
@@ -590,6 +598,7 @@ class CrawlingService:
                 )
                 safe_logfire_error(error_msg)
                 raise ValueError(error_msg)
+            record_crawl_items("chunks", actual_chunks_stored)
 
             # Extract code examples if requested
             code_examples_count = 0
@@ -639,15 +648,17 @@ class CrawlingService:
                         )
                         embedding_provider = None
 
-                    code_examples_count = await self.doc_storage_ops.extract_and_store_code_examples(
-                        crawl_results,
-                        storage_results["url_to_full_document"],
-                        storage_results["source_id"],
-                        code_progress_callback,
-                        self._check_cancellation,
-                        provider,
-                        embedding_provider,
-                    )
+                    with stage_timer("code_examples"):
+                        code_examples_count = await self.doc_storage_ops.extract_and_store_code_examples(
+                            crawl_results,
+                            storage_results["url_to_full_document"],
+                            storage_results["source_id"],
+                            code_progress_callback,
+                            self._check_cancellation,
+                            provider,
+                            embedding_provider,
+                        )
+                    record_crawl_items("code_examples", code_examples_count)
                 except RuntimeError as e:
                     # Code extraction failed, continue crawl with warning
                     logger.error("Code extraction failed, continuing crawl without code examples", exc_info=True)
@@ -690,6 +701,9 @@ class CrawlingService:
             )
 
             # Mark crawl as completed
+            CRAWLS_TOTAL.inc(status="completed")
+            stage_metrics = crawl_metrics.as_dict()
+            safe_logfire_info(f"Crawl stage metrics | progress_id={self.progress_id} | {stage_metrics}")
             if self.progress_tracker:
                 await self.progress_tracker.complete({
                     "chunks_stored": actual_chunks_stored,
@@ -698,6 +712,7 @@ class CrawlingService:
                     "total_pages": len(crawl_results),
                     "sourceId": storage_results.get("source_id", ""),
                     "log": "Crawl completed successfully!",
+                    "stage_metrics": stage_metrics,
                 })
 
             # Unregister after successful completion
@@ -708,6 +723,7 @@ class CrawlingService:
                 )
 
         except asyncio.CancelledError:
+            CRAWLS_TOTAL.inc(status="cancelled")
             safe_logfire_info(f"Crawl operation cancelled | progress_id={self.progress_id}")
             # Use ProgressMapper to get proper progress value for cancelled state
             cancelled_progress = self.progress_mapper.map_progress("cancelled", 0)
@@ -726,6 +742,7 @@ class CrawlingService:
                     f"Unregistered orchestration service on cancellation | progress_id={self.progress_id}"
                 )
         except Exception as e:
+            CRAWLS_TOTAL.inc(status="failed")
             # Log full stack trace for debugging
             logger.error("Async crawl orchestration failed", exc_info=True)
             safe_logfire_error(f"Async crawl orchestration failed | error={str(e)}")
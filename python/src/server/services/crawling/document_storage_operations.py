@@ -10,6 +10,7 @@ from collections.abc import Callable
 from typing import Any
 
 from ...config.logfire_config import get_logger, safe_logfire_error, safe_logfire_info
+from ..metrics_service import stage_timer
 from ..source_management_service import extract_source_summary, update_source_info
 from ..storage.document_storage_service import add_documents_to_supabase
 from ..storage.storage_services import DocumentStorageService
@@ -74,7 +75,8 @@ class DocumentStorageOperations:
         url_to_full_document = {}
         processed_docs = 0
 
-        # Process and chunk each document
+        # Documents with content, chunked concurrently below
+        documents = []
         for doc_index, doc in enumerate(crawl_results):
             # Check for cancellation during document processing
             if cancellation_check:
@@ -102,10 +104,16 @@ class DocumentStorageOperations:
 
             # Store full document for code extraction context
             url_to_full_document[doc_url] = markdown_content
+            documents.append((doc_index, doc, doc_url, markdown_content))
 
-            # CHUNK THE CONTENT
-            chunks = await storage_service.smart_chunk_text_async(markdown_content, chunk_size=5000)
+        # CHUNK THE CONTENT - large documents are chunked in parallel worker processes
+        with stage_timer("chunking"):
+            chunked_documents = await asyncio.gather(*(
+                storage_service.smart_chunk_text_async(markdown_content, chunk_size=5000)
+                for _, _, _, markdown_content in documents
+            ))
 
+        for (doc_index, doc, doc_url, _), chunks in zip(documents, chunked_documents, strict=True):
             # Use the original source_id for all documents
             source_id = original_source_id
             safe_logfire_info(f"Using original source_id '{source_id}' for URL '{doc_url}'")
@@ -159,10 +167,11 @@ class DocumentStorageOperations:
 
         # Create/update source record FIRST (required for FK constraints on pages and chunks)
         if all_contents and all_metadatas:
-            await self._create_source_records(
-                all_metadatas, all_contents, source_word_counts, request,
-                source_url, source_display_name
-            )
+            with stage_timer("source_creation"):
+                await self._create_source_records(
+                    all_metadatas, all_contents, source_word_counts, request,
+                    source_url, source_display_name
+                )
 
         # Store pages AFTER source is created but BEFORE chunks (FK constraint requirement)
         from .page_storage_operations import PageStorageOperations
@@ -180,17 +189,23 @@ class DocumentStorageOperations:
             content = url_to_full_document[base_url]
 
             # Store section pages
-            url_to_page_id = await page_storage_ops.store_llms_full_sections(
-                base_url,
-                content,
-                original_source_id,
-                request,
-                crawl_type="llms_full",
-            )
+            with stage_timer("page_storage"):
+                url_to_page_id = await page_storage_ops.store_llms_full_sections(
+                    base_url,
+                    content,
+                    original_source_id,
+                    request,
+                    crawl_type="llms_full",
+                )
 
             # Parse sections and re-chunk each section
-            from .helpers.llms_full_parser import parse_llms_full_sections
-            sections = parse_llms_full_sections(content, base_url)
+            from .. import cpu_tasks
+            from ..threading_service import get_threading_service
+
+            with stage_timer("chunking"):
+                sections = await get_threading_service().run_cpu_intensive(
+                    cpu_tasks.parse_llms_full_sections, content, base_url
+                )
 
             # Clear existing chunks and re-create from sections
             all_urls.clear()
@@ -199,13 +214,15 @@ class DocumentStorageOperations:
             all_metadatas.clear()
             url_to_full_document.clear()
 
-            # Chunk each section separately
-            for section in sections:
+            # Chunk each section separately (in parallel)
+            with stage_timer("chunking"):
+                chunked_sections = await asyncio.gather(*(
+                    storage_service.smart_chunk_text_async(section.content, chunk_size=5000)
+                    for section in sections
+                ))
+            for section, section_chunks in zip(sections, chunked_sections, strict=True):
                 # Update url_to_full_document with section content
                 url_to_full_document[section.url] = section.content
-                section_chunks = await storage_service.smart_chunk_text_async(
-                    section.content, chunk_size=5000
-                )
 
                 for i, chunk in enumerate(section_chunks):
                     all_urls.append(section.url)
@@ -237,12 +254,13 @@ class DocumentStorageOperations:
                 })
 
             if reconstructed_crawl_results:
-                url_to_page_id = await page_storage_ops.store_pages(
-                    reconstructed_crawl_results,
-                    original_source_id,
-                    request,
-                    crawl_type,
-                )
+                with stage_timer("page_storage"):
+                    url_to_page_id = await page_storage_ops.store_pages(
+                        reconstructed_crawl_results,
+                        original_source_id,
+                        request,
+                        crawl_type,
+                    )
             else:
                 url_to_page_id = {}
 
@@ -10,7 +10,8 @@ from typing import Any
 from postgrest.exceptions import APIError
 
 from ...config.logfire_config import get_logger, safe_logfire_error, safe_logfire_info
-from .helpers.llms_full_parser import parse_llms_full_sections
+from .. import cpu_tasks
+from ..threading_service import get_threading_service
 
 logger = get_logger(__name__)
 
@@ -149,8 +150,10 @@ class PageStorageOperations:
         """
         url_to_page_id: dict[str, str] = {}
 
-        # Parse sections from content
-        sections = parse_llms_full_sections(content, base_url)
+        # Parse sections from content (in a worker process)
+        sections = await get_threading_service().run_cpu_intensive(
+            cpu_tasks.parse_llms_full_sections, content, base_url
+        )
 
         if not sections:
             logger.warning(f"No sections found in llms-full.txt file: {base_url}")
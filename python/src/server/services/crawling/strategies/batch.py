@@ -11,7 +11,7 @@ from typing import Any
 from crawl4ai import CacheMode, CrawlerRunConfig, MemoryAdaptiveDispatcher
 
 from ....config.logfire_config import get_logger
-from ...credential_service import credential_service
+from ...settings_snapshot import get_settings
 
 logger = get_logger(__name__)
 
@@ -61,45 +61,30 @@ class BatchCrawlStrategy:
                 await progress_callback("error", 0, "Crawler not available")
             return []
 
-        # Load settings from database - fail fast on configuration errors
-        try:
-            settings = await credential_service.get_credentials_by_category("rag_strategy")
-
-            # Clamp batch_size to prevent zero step in range()
-            raw_batch_size = int(settings.get("CRAWL_BATCH_SIZE", "50"))
-            batch_size = max(1, raw_batch_size)
-            if batch_size != raw_batch_size:
-                logger.warning(f"Invalid CRAWL_BATCH_SIZE={raw_batch_size}, clamped to {batch_size}")
-
-            if max_concurrent is None:
-                # CRAWL_MAX_CONCURRENT: Pages to crawl in parallel within this single crawl operation
-                # (Different from server-level CONCURRENT_CRAWL_LIMIT which limits total crawl operations)
-                raw_max_concurrent = int(settings.get("CRAWL_MAX_CONCURRENT", "10"))
-                max_concurrent = max(1, raw_max_concurrent)
-                if max_concurrent != raw_max_concurrent:
-                    logger.warning(f"Invalid CRAWL_MAX_CONCURRENT={raw_max_concurrent}, clamped to {max_concurrent}")
-
-            # Clamp memory threshold to sane bounds for dispatcher
-            raw_memory_threshold = float(settings.get("MEMORY_THRESHOLD_PERCENT", "80"))
-            memory_threshold = min(99.0, max(10.0, raw_memory_threshold))
-            if memory_threshold != raw_memory_threshold:
-                logger.warning(f"Invalid MEMORY_THRESHOLD_PERCENT={raw_memory_threshold}, clamped to {memory_threshold}")
-            check_interval = float(settings.get("DISPATCHER_CHECK_INTERVAL", "0.5"))
-        except (ValueError, KeyError, TypeError) as e:
-            # Critical configuration errors should fail fast
-            logger.error(f"Invalid crawl settings format: {e}", exc_info=True)
-            raise ValueError(f"Failed to load crawler configuration: {e}") from e
-        except Exception as e:
-            # For non-critical errors (e.g., network issues), use defaults but log prominently
-            logger.error(
-                f"Failed to load crawl settings from database: {e}, using defaults", exc_info=True
+        # One settings snapshot for the whole crawl, clamped to safe bounds
+        settings = get_settings()
+
+        # Clamp batch_size to prevent zero step in range()
+        batch_size = max(1, settings.crawl_batch_size)
+        if batch_size != settings.crawl_batch_size:
+            logger.warning(f"Invalid CRAWL_BATCH_SIZE={settings.crawl_batch_size}, clamped to {batch_size}")
+
+        if max_concurrent is None:
+            # CRAWL_MAX_CONCURRENT: Pages to crawl in parallel within this single crawl operation
+            # (Different from server-level CONCURRENT_CRAWL_LIMIT which limits total crawl operations)
+            max_concurrent = max(1, settings.crawl_max_concurrent)
+            if max_concurrent != settings.crawl_max_concurrent:
+                logger.warning(
+                    f"Invalid CRAWL_MAX_CONCURRENT={settings.crawl_max_concurrent}, clamped to {max_concurrent}"
+                )
+
+        # Clamp memory threshold to sane bounds for dispatcher
+        memory_threshold = min(99.0, max(10.0, settings.memory_threshold_percent))
+        if memory_threshold != settings.memory_threshold_percent:
+            logger.warning(
+                f"Invalid MEMORY_THRESHOLD_PERCENT={settings.memory_threshold_percent}, clamped to {memory_threshold}"
             )
-            batch_size = 50
-            if max_concurrent is None:
-                max_concurrent = 10  # Safe default to prevent memory issues
-            memory_threshold = 80.0
-            check_interval = 0.5
-            settings = {}  # Empty dict for defaults
+        check_interval = settings.dispatcher_check_interval
 
         # Check if any URLs are documentation sites
         has_doc_sites = any(is_documentation_site_func(url) for url in urls)
@@ -6,6 +6,7 @@ Credentials include API keys, service credentials, and application configuration
 """
 
 import base64
+import hashlib
 import os
 import re
 import time
@@ -20,6 +21,8 @@ from cryptography.hazmat.primitives.kdf.pbkdf2 import PBKDF2HMAC
 from supabase import Client, create_client
 
 from ..config.logfire_config import get_logger
+from .metrics_service import instrument_supabase_client
+from .settings_snapshot import publish_settings
 
 logger = get_logger(__name__)
 
@@ -36,6 +39,28 @@ class CredentialItem:
     description: str | None = None
 
 
+@dataclass
+class CryptoStats:
+    """CPU spent on and saved by the encryption key and decrypted value caches."""
+
+    key_derivations: int = 0
+    key_cache_hits: int = 0
+    decrypt_cache_hits: int = 0
+    decrypt_cache_misses: int = 0
+    key_derivation_cpu_seconds: float = 0.0  # Last PBKDF2 derivation
+    decrypt_cpu_seconds: float = 0.0  # All uncached decryptions
+
+    def as_dict(self) -> dict[str, Any]:
+        avg_decrypt = self.decrypt_cpu_seconds / self.decrypt_cache_misses if self.decrypt_cache_misses else 0.0
+        saved = self.key_cache_hits * self.key_derivation_cpu_seconds + self.decrypt_cache_hits * avg_decrypt
+        return {
+            "key_derivations": self.key_derivations,
+            "key_cache_hits": self.key_cache_hits,
+            "decrypt_cache_hits": self.decrypt_cache_hits,
+            "decrypt_cache_misses": self.decrypt_cache_misses,
+            "key_derivation_cpu_ms": round(self.key_derivation_cpu_seconds * 1000, 3),
+            "estimated_cpu_ms_saved": round(saved * 1000, 3),
+        }
 
 
 class CredentialService:
@@ -48,6 +73,12 @@ class CredentialService:
         self._rag_settings_cache: dict[str, Any] | None = None
         self._rag_cache_timestamp: float | None = None
         self._rag_cache_ttl = 300  # 5 minutes TTL for RAG settings cache
+        # Derived once per service key; a changed SUPABASE_SERVICE_KEY re-derives
+        self._fernet: Fernet | None = None
+        self._key_fingerprint: str | None = None
+        # Decrypted values by ciphertext; never logged or returned in bulk
+        self._decrypted_cache: dict[str, str] = {}
+        self.crypto_stats = CryptoStats()
 
     def _get_supabase_client(self) -> Client:
         """
@@ -66,6 +97,7 @@ class CredentialService:
             try:
                 # Initialize with standard Supabase client - no need for custom headers
                 self._supabase = create_client(url, key)
+                instrument_supabase_client(self._supabase)
 
                 # Extract project ID from URL for logging purposes only
                 match = re.match(r"https://([^.]+)\.supabase\.co", url)
@@ -82,7 +114,12 @@ class CredentialService:
         return self._supabase
 
     def _get_encryption_key(self) -> bytes:
-        """Generate encryption key from environment variables."""
+        """
+        Generate encryption key from environment variables.
+
+        PBKDF2 is deliberately slow (100,000 iterations), so callers go
+        through _get_fernet(), which derives the key once per service key.
+        """
         # Use Supabase service key as the basis for encryption key
         service_key = os.getenv("SUPABASE_SERVICE_KEY", "default-key-for-development")
 
@@ -96,13 +133,42 @@ class CredentialService:
         key = base64.urlsafe_b64encode(kdf.derive(service_key.encode()))
         return key
 
+    def _get_fernet(self) -> Fernet:
+        """Get the Fernet instance, deriving the key on first use or after key rotation."""
+        service_key = os.getenv("SUPABASE_SERVICE_KEY", "default-key-for-development")
+        fingerprint = hashlib.sha256(service_key.encode()).hexdigest()
+        if self._fernet is not None and fingerprint == self._key_fingerprint:
+            self.crypto_stats.key_cache_hits += 1
+            return self._fernet
+
+        if self._key_fingerprint is not None:
+            logger.info("Service key changed, re-deriving credential encryption key")
+            self._decrypted_cache.clear()
+
+        started = time.process_time()
+        self._fernet = Fernet(self._get_encryption_key())
+        self._key_fingerprint = fingerprint
+        self.crypto_stats.key_derivations += 1
+        self.crypto_stats.key_derivation_cpu_seconds = time.process_time() - started
+        return self._fernet
+
+    def _forget_decrypted(self, key: str) -> None:
+        """Drop the cached decrypted value of a credential."""
+        value = self._cache.get(key)
+        if isinstance(value, dict) and value.get("encrypted_value"):
+            self._decrypted_cache.pop(value["encrypted_value"], None)
+
+    def get_crypto_stats(self) -> dict[str, Any]:
+        """Get encryption cache statistics, including the estimated CPU time saved."""
+        return {**self.crypto_stats.as_dict(), "cached_values": len(self._decrypted_cache)}
+
     def _encrypt_value(self, value: str) -> str:
         """Encrypt a sensitive value using Fernet encryption."""
         if not value:
             return ""
 
         try:
-            fernet = Fernet(self._get_encryption_key())
+            fernet = self._get_fernet()
             encrypted_bytes = fernet.encrypt(value.encode("utf-8"))
             return base64.urlsafe_b64encode(encrypted_bytes).decode("utf-8")
         except Exception as e:
@@ -110,15 +176,24 @@ class CredentialService:
             raise
 
     def _decrypt_value(self, encrypted_value: str) -> str:
-        """Decrypt a sensitive value using Fernet encryption."""
+        """Decrypt a sensitive value using Fernet encryption (cached per ciphertext)."""
         if not encrypted_value:
             return ""
 
         try:
-            fernet = Fernet(self._get_encryption_key())
+            fernet = self._get_fernet()
+            cached = self._decrypted_cache.get(encrypted_value)
+            if cached is not None:
+                self.crypto_stats.decrypt_cache_hits += 1
+                return cached
+
+            started = time.process_time()
             encrypted_bytes = base64.urlsafe_b64decode(encrypted_value.encode("utf-8"))
-            decrypted_bytes = fernet.decrypt(encrypted_bytes)
-            return decrypted_bytes.decode("utf-8")
+            decrypted = fernet.decrypt(encrypted_bytes).decode("utf-8")
+            self.crypto_stats.decrypt_cpu_seconds += time.process_time() - started
+            self.crypto_stats.decrypt_cache_misses += 1
+            self._decrypted_cache[encrypted_value] = decrypted
+            return decrypted
         except Exception as e:
             logger.error(f"Error decrypting value: {e}")
             raise
@@ -149,6 +224,8 @@ class CredentialService:
 
             self._cache = credentials
             self._cache_initialized = True
+            self._decrypted_cache.clear()
+            publish_settings(credentials)
             logger.info(f"Loaded {len(credentials)} credentials from database")
 
             return credentials
@@ -198,9 +275,11 @@ class CredentialService:
         """Set a credential value."""
         try:
             supabase = self._get_supabase_client()
+            self._forget_decrypted(key)
 
             if is_encrypted:
                 encrypted_value = self._encrypt_value(value)
+                self._decrypted_cache[encrypted_value] = value
                 data = {
                     "key": key,
                     "encrypted_value": encrypted_value,
@@ -241,27 +320,8 @@ class CredentialService:
                 self._rag_cache_timestamp = None
                 logger.debug(f"Invalidated RAG settings cache due to update of {key}")
 
-                # Also invalidate provider service cache to ensure immediate effect
-                try:
-                    from .llm_provider_service import clear_provider_cache
-                    clear_provider_cache()
-                    logger.debug("Also cleared LLM provider service cache")
-                except Exception as e:
-                    logger.warning(f"Failed to clear provider service cache: {e}")
-
-                # Also invalidate LLM provider service cache for provider config
-                try:
-                    from . import llm_provider_service
-                    # Clear the provider config caches that depend on RAG settings
-                    cache_keys_to_clear = ["provider_config_llm", "provider_config_embedding", "rag_strategy_settings"]
-                    for cache_key in cache_keys_to_clear:
-                        if cache_key in llm_provider_service._settings_cache:
-                            del llm_provider_service._settings_cache[cache_key]
-                            logger.debug(f"Invalidated LLM provider service cache key: {cache_key}")
-                except ImportError:
-                    logger.warning("Could not import llm_provider_service to invalidate cache")
-                except Exception as e:
-                    logger.error(f"Error invalidating LLM provider service cache: {e}")
+            # Subscribers (e.g. the LLM provider cache) pick up the change
+            publish_settings(self._cache)
 
             logger.info(
                 f"Successfully {'encrypted and ' if is_encrypted else ''}stored credential: {key}"
@@ -281,6 +341,7 @@ class CredentialService:
             supabase.table("archon_settings").delete().eq("key", key).execute()
 
             # Remove from cache
+            self._forget_decrypted(key)
             if key in self._cache:
                 del self._cache[key]
 
@@ -291,27 +352,7 @@ class CredentialService:
                 self._rag_cache_timestamp = None
                 logger.debug(f"Invalidated RAG settings cache due to deletion of {key}")
 
-                # Also invalidate provider service cache to ensure immediate effect
-                try:
-                    from .llm_provider_service import clear_provider_cache
-                    clear_provider_cache()
-                    logger.debug("Also cleared LLM provider service cache")
-                except Exception as e:
-                    logger.warning(f"Failed to clear provider service cache: {e}")
-
-                # Also invalidate LLM provider service cache for provider config
-                try:
-                    from . import llm_provider_service
-                    # Clear the provider config caches that depend on RAG settings
-                    cache_keys_to_clear = ["provider_config_llm", "provider_config_embedding", "rag_strategy_settings"]
-                    for cache_key in cache_keys_to_clear:
-                        if cache_key in llm_provider_service._settings_cache:
-                            del llm_provider_service._settings_cache[cache_key]
-                            logger.debug(f"Invalidated LLM provider service cache key: {cache_key}")
-                except ImportError:
-                    logger.warning("Could not import llm_provider_service to invalidate cache")
-                except Exception as e:
-                    logger.error(f"Error invalidating LLM provider service cache: {e}")
+            publish_settings(self._cache)
 
             logger.info(f"Successfully deleted credential: {key}")
             return True
@@ -0,0 +1,31 @@
+"""
+Database Errors
+
+Recognizes the PostgREST / PostgreSQL errors raised when a migration has
+not been applied yet, so callers can fall back to the pre-migration path
+for exactly that case and let every other error propagate.
+"""
+
+# PostgREST: function not in the schema cache; PostgreSQL: undefined function
+MISSING_FUNCTION_CODES = frozenset({"PGRST202", "42883"})
+
+# PostgREST: column not in the schema cache; PostgreSQL: undefined column
+MISSING_COLUMN_CODES = frozenset({"PGRST204", "42703"})
+
+# PostgREST: table not in the schema cache; PostgreSQL: undefined table
+MISSING_TABLE_CODES = frozenset({"PGRST205", "42P01"})
+
+
+def _error_code(error: Exception) -> str | None:
+    code = getattr(error, "code", None)
+    return str(code) if code else None
+
+
+def is_missing_function_error(error: Exception) -> bool:
+    """True if the error says an RPC function does not exist."""
+    return _error_code(error) in MISSING_FUNCTION_CODES
+
+
+def is_missing_schema_error(error: Exception) -> bool:
+    """True if the error says an RPC function, a table or a column does not exist."""
+    return _error_code(error) in MISSING_FUNCTION_CODES | MISSING_TABLE_CODES | MISSING_COLUMN_CODES
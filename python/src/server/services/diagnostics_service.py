@@ -0,0 +1,353 @@
+"""
+Diagnostics Service
+
+Live diagnosis of a stalled or slow API process without redeploying:
+
+- SamplingProfiler: samples the stacks of every thread at a fixed
+  interval for a bounded time. The wall profile counts samples per stack.
+  The CPU profile weights each stack by the CPU time its thread used
+  since the previous sample (microseconds), so idle and blocked threads
+  drop out. Both are returned in the folded-stack format
+  ("frame;frame;frame count") read by flamegraph.pl, speedscope and
+  inferno.
+- dump_tasks: the asyncio tasks of the running loop with their stacks.
+- LoopLagMonitor: a heartbeat callback on the event loop plus a watchdog
+  thread. When the heartbeat is late by more than the threshold, the
+  watchdog captures the loop thread's stack while it is still blocked,
+  so the event names the callback that blocked the loop (a sync
+  .execute(), a regex, a model predict call, ...).
+"""
+
+import asyncio
+import os
+import sys
+import threading
+import time
+import traceback
+from collections import deque
+from dataclasses import dataclass, field
+from datetime import UTC, datetime
+from types import FrameType
+from typing import Any
+
+from ..config.logfire_config import get_logger
+from .metrics_service import get_metrics_registry
+
+logger = get_logger(__name__)
+
+# Longest profile a single request may run (seconds)
+MAX_PROFILE_SECONDS = 60.0
+
+# Shortest sampling interval (seconds); shorter ones cost more than they show
+MIN_SAMPLE_INTERVAL = 0.001
+
+# Loop heartbeat interval (seconds)
+LOOP_HEARTBEAT_INTERVAL = 0.05
+
+# Blocking events kept for /internal/diagnostics/loop-lag
+MAX_LOOP_LAG_EVENTS = 100
+
+LOOP_LAG_SECONDS = get_metrics_registry().histogram(
+    "archon_event_loop_lag_seconds",
+    "How late event loop heartbeats ran",
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0),
+)
+
+
+def default_lag_threshold_ms() -> float:
+    """Loop lag that counts as blocking: LOOP_LAG_THRESHOLD_MS, or 100 ms (0 disables the monitor)."""
+    return max(0.0, float(os.getenv("LOOP_LAG_THRESHOLD_MS", "100")))
+
+
+def _frame_label(frame: FrameType) -> str:
+    code = frame.f_code
+    return f"{code.co_name} ({os.path.basename(code.co_filename)}:{frame.f_lineno})"
+
+
+def _folded_stack(thread_name: str, frame: FrameType) -> str:
+    """Root-first, semicolon-separated stack of a frame, prefixed with its thread."""
+    labels = []
+    while frame is not None:
+        labels.append(_frame_label(frame).replace(";", ":"))
+        frame = frame.f_back
+    labels.append(thread_name.replace(";", ":").replace(" ", "_"))
+    return ";".join(reversed(labels))
+
+
+def _thread_cpu_time(ident: int) -> float | None:
+    """CPU time of a thread in seconds, where the platform exposes it."""
+    try:
+        return time.clock_gettime(time.pthread_getcpuclockid(ident))
+    except (AttributeError, OSError, ValueError):
+        return None
+
+
+def cpu_profiling_supported() -> bool:
+    return _thread_cpu_time(threading.get_ident()) is not None
+
+
+class ProfileInProgressError(RuntimeError):
+    """Raised when a profile is requested while another one is running"""
+
+
+@dataclass
+class Profile:
+    """Result of a sampling run; wall and cpu map folded stacks to weights"""
+
+    started_at: str
+    duration: float
+    interval: float
+    samples: int = 0
+    wall: dict[str, int] = field(default_factory=dict)
+    cpu: dict[str, int] = field(default_factory=dict)
+
+    def folded(self, mode: str = "wall") -> str:
+        """The profile in the folded-stack format, heaviest stacks first"""
+        stacks = self.cpu if mode == "cpu" else self.wall
+        ordered = sorted(stacks.items(), key=lambda item: item[1], reverse=True)
+        return "".join(f"{stack} {weight}\n" for stack, weight in ordered)
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "started_at": self.started_at,
+            "duration": round(self.duration, 3),
+            "interval": self.interval,
+            "samples": self.samples,
+            "cpu_supported": cpu_profiling_supported(),
+            "wall": self.folded("wall"),
+            "cpu": self.folded("cpu"),
+        }
+
+
+class SamplingProfiler:
+    """
+    Samples the stacks of all threads of this process from a background
+    thread. Only one profile runs at a time.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._running = False
+
+    @property
+    def running(self) -> bool:
+        return self._running
+
+    def _sample_loop(self, profile: Profile, stop: threading.Event) -> None:
+        own_ident = threading.get_ident()
+        last_cpu: dict[int, float] = {}
+        started = time.perf_counter()
+        while not stop.wait(profile.interval):
+            names = {thread.ident: thread.name for thread in threading.enumerate()}
+            for ident, frame in sys._current_frames().items():
+                if ident == own_ident:
+                    continue
+                stack = _folded_stack(names.get(ident, f"thread-{ident}"), frame)
+                profile.wall[stack] = profile.wall.get(stack, 0) + 1
+
+                cpu = _thread_cpu_time(ident)
+                if cpu is None:
+                    continue
+                previous = last_cpu.get(ident)
+                last_cpu[ident] = cpu
+                used_us = int((cpu - previous) * 1_000_000) if previous is not None else 0
+                if used_us > 0:
+                    profile.cpu[stack] = profile.cpu.get(stack, 0) + used_us
+            profile.samples += 1
+        profile.duration = time.perf_counter() - started
+
+    async def profile(self, seconds: float, interval: float = 0.01) -> Profile:
+        """
+        Sample all threads for the given time without blocking the event loop.
+
+        Args:
+            seconds: Profile duration, capped at MAX_PROFILE_SECONDS
+            interval: Time between samples, at least MIN_SAMPLE_INTERVAL
+
+        Raises:
+            ProfileInProgressError: If another profile is running
+        """
+        with self._lock:
+            if self._running:
+                raise ProfileInProgressError("A profile is already running")
+            self._running = True
+
+        seconds = min(max(seconds, 0.0), MAX_PROFILE_SECONDS)
+        profile = Profile(
+            started_at=datetime.now(UTC).isoformat(),
+            duration=0.0,
+            interval=max(interval, MIN_SAMPLE_INTERVAL),
+        )
+        stop = threading.Event()
+        sampler = threading.Thread(
+            target=self._sample_loop, args=(profile, stop), name="archon-profiler", daemon=True
+        )
+        try:
+            sampler.start()
+            await asyncio.sleep(seconds)
+        finally:
+            stop.set()
+            await asyncio.to_thread(sampler.join)
+            self._running = False
+        logger.info(f"Sampling profile finished | duration={profile.duration:.1f}s | samples={profile.samples}")
+        return profile
+
+
+def dump_tasks(limit: int = 20) -> list[dict[str, Any]]:
+    """
+    The asyncio tasks of the running loop with their current stacks.
+
+    Args:
+        limit: Frames shown per task (innermost last)
+    """
+    tasks = []
+    for task in asyncio.all_tasks():
+        frames = task.get_stack(limit=limit)
+        tasks.append({
+            "name": task.get_name(),
+            "coroutine": getattr(task.get_coro(), "__qualname__", repr(task.get_coro())),
+            "done": task.done(),
+            "cancelling": task.cancelling(),
+            "stack": [_frame_label(frame) for frame in frames],
+        })
+    return sorted(tasks, key=lambda task: task["name"])
+
+
+@dataclass
+class LoopLagEvent:
+    timestamp: str
+    lag_ms: float
+    stack: list[str]
+
+    def as_dict(self) -> dict[str, Any]:
+        return {"timestamp": self.timestamp, "lag_ms": round(self.lag_ms, 1), "stack": self.stack}
+
+
+class LoopLagMonitor:
+    """
+    Records the stack of callbacks that block the event loop for longer
+    than threshold_ms.
+
+    A heartbeat callback scheduled every LOOP_HEARTBEAT_INTERVAL measures
+    how late it runs. A watchdog thread checks the heartbeat at half the
+    threshold; once it is overdue it captures the loop thread's stack,
+    which is still inside the blocking callback. The event is recorded
+    with the full lag when the heartbeat finally runs.
+    """
+
+    def __init__(self, threshold_ms: float, interval: float = LOOP_HEARTBEAT_INTERVAL):
+        self.threshold = threshold_ms / 1000
+        self.interval = interval
+        self.events: deque[LoopLagEvent] = deque(maxlen=MAX_LOOP_LAG_EVENTS)
+        self.beats = 0
+        self.max_lag = 0.0
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._loop_thread: int | None = None
+        self._expected = 0.0
+        self._pending_stack: list[str] | None = None
+        self._handle: asyncio.TimerHandle | None = None
+        self._stop = threading.Event()
+        self._watchdog: threading.Thread | None = None
+        self._lock = threading.Lock()
+
+    @property
+    def running(self) -> bool:
+        return self._loop is not None
+
+    def start(self, loop: asyncio.AbstractEventLoop | None = None) -> None:
+        """Start monitoring; must be called from the loop's thread"""
+        if self.running:
+            return
+        self._loop = loop or asyncio.get_running_loop()
+        self._loop_thread = threading.get_ident()
+        self._expected = time.monotonic() + self.interval
+        self._handle = self._loop.call_later(self.interval, self._beat)
+        self._stop.clear()
+        self._watchdog = threading.Thread(target=self._watch, name="archon-loop-watchdog", daemon=True)
+        self._watchdog.start()
+        logger.info(f"Event loop lag monitor started | threshold={self.threshold * 1000:.0f}ms")
+
+    def stop(self) -> None:
+        if not self.running:
+            return
+        self._stop.set()
+        if self._handle is not None:
+            self._handle.cancel()
+        if self._watchdog is not None:
+            self._watchdog.join(timeout=1)
+        self._loop = None
+
+    def _beat(self) -> None:
+        now = time.monotonic()
+        lag = max(0.0, now - self._expected)
+        self.beats += 1
+        self.max_lag = max(self.max_lag, lag)
+        LOOP_LAG_SECONDS.observe(lag)
+
+        with self._lock:
+            stack, self._pending_stack = self._pending_stack, None
+            self._expected = now + self.interval
+        if lag > self.threshold:
+            event = LoopLagEvent(datetime.now(UTC).isoformat(), lag * 1000, stack or [])
+            self.events.append(event)
+            blocker = stack[-1] if stack else "unknown (shorter than the watchdog interval)"
+            logger.warning(f"Event loop blocked for {event.lag_ms:.0f}ms | in {blocker}")
+
+        if self._loop is not None and not self._stop.is_set():
+            self._handle = self._loop.call_later(self.interval, self._beat)
+
+    def _watch(self) -> None:
+        check_interval = max(self.threshold / 2, 0.005)
+        while not self._stop.wait(check_interval):
+            with self._lock:
+                overdue = time.monotonic() - self._expected > self.threshold
+                if not overdue or self._pending_stack is not None:
+                    continue
+                frame = sys._current_frames().get(self._loop_thread)
+                if frame is not None:
+                    self._pending_stack = [
+                        f"{entry.name} ({os.path.basename(entry.filename)}:{entry.lineno})"
+                        for entry in traceback.extract_stack(frame)
+                    ]
+
+    def get_stats(self) -> dict[str, Any]:
+        return {
+            "running": self.running,
+            "threshold_ms": self.threshold * 1000,
+            "heartbeats": self.beats,
+            "max_lag_ms": round(self.max_lag * 1000, 1),
+            "blocking_events": len(self.events),
+        }
+
+
+_profiler = SamplingProfiler()
+_loop_lag_monitor: LoopLagMonitor | None = None
+
+
+def get_profiler() -> SamplingProfiler:
+    """Get the process-wide sampling profiler"""
+    return _profiler
+
+
+def get_loop_lag_monitor() -> LoopLagMonitor | None:
+    """Get the running loop lag monitor, if started"""
+    return _loop_lag_monitor
+
+
+def start_loop_lag_monitor(threshold_ms: float | None = None) -> LoopLagMonitor | None:
+    """Start the loop lag monitor on the running loop (None if disabled by LOOP_LAG_THRESHOLD_MS=0)"""
+    global _loop_lag_monitor
+    threshold_ms = default_lag_threshold_ms() if threshold_ms is None else threshold_ms
+    if threshold_ms <= 0:
+        return None
+    if _loop_lag_monitor is None:
+        _loop_lag_monitor = LoopLagMonitor(threshold_ms)
+    _loop_lag_monitor.start()
+    return _loop_lag_monitor
+
+
+def stop_loop_lag_monitor() -> None:
+    global _loop_lag_monitor
+    if _loop_lag_monitor is not None:
+        _loop_lag_monitor.stop()
+        _loop_lag_monitor = None
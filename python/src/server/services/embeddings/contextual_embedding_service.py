@@ -3,9 +3,17 @@ Contextual Embedding Service
 
 Handles generation of contextual embeddings for improved RAG retrieval.
 Includes proper rate limiting for OpenAI API calls.
+
+Chunks are grouped by document so each LLM request carries the document text
+once, followed by several chunks. The document block is sent first and
+byte-identical across requests, so providers with prompt caching can reuse it.
+Generated contexts are cached by (document hash, chunk hash, model).
 """
 
-import os
+import asyncio
+import hashlib
+import re
+from collections import OrderedDict
 
 import openai
 
@@ -17,14 +25,190 @@ from ..llm_provider_service import (
     prepare_chat_completion_params,
     requires_max_completion_tokens,
 )
+from ..settings_snapshot import get_settings
 from ..threading_service import get_threading_service
+from ..token_counter import count_tokens_async
+from .embedding_exceptions import EmbeddingQuotaExhaustedError
+
+# Characters of the source document sent as shared context for its chunks
+DOCUMENT_CONTEXT_CHARS = 8000
+
+# Characters of each chunk included in a contextualization request
+CHUNK_PREVIEW_CHARS = 1000
+
+# Chunks of one document contextualized in a single request
+CHUNKS_PER_CONTEXT_REQUEST = 20
+
+# Maximum number of cached contexts kept in memory
+CONTEXT_CACHE_MAX_ENTRIES = 20000
+
+_CHUNK_LINE_PATTERN = re.compile(r"^\s*CHUNK\s+(\d+)\s*:\s*(.*)$")
+
+# (document hash, chunk hash, model) -> generated context, in LRU order
+_context_cache: OrderedDict[tuple[str, str, str], str] = OrderedDict()
+_context_cache_stats = {"hits": 0, "misses": 0}
+
+
+def _hash_text(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8", errors="ignore")).hexdigest()
+
+
+def _get_cached_context(key: tuple[str, str, str]) -> str | None:
+    context = _context_cache.get(key)
+    if context is None:
+        _context_cache_stats["misses"] += 1
+        return None
+    _context_cache.move_to_end(key)
+    _context_cache_stats["hits"] += 1
+    return context
+
+
+def _set_cached_context(key: tuple[str, str, str], context: str) -> None:
+    _context_cache[key] = context
+    _context_cache.move_to_end(key)
+    while len(_context_cache) > CONTEXT_CACHE_MAX_ENTRIES:
+        _context_cache.popitem(last=False)
+
+
+def clear_contextual_cache() -> None:
+    """Clear cached chunk contexts (e.g. after changing the contextualization model)."""
+    _context_cache.clear()
+    _context_cache_stats["hits"] = 0
+    _context_cache_stats["misses"] = 0
+
+
+def get_contextual_cache_stats() -> dict[str, int]:
+    """Get hit/miss counters and size of the chunk context cache."""
+    return {**_context_cache_stats, "size": len(_context_cache)}
+
+
+def _combine_context(context: str, chunk: str) -> str:
+    return f"{context}\n\n{chunk}"
+
+
+def _supports_explicit_prompt_cache(provider_name: str, model: str) -> bool:
+    """Whether the document block should carry an explicit cache_control marker.
+
+    OpenAI-style providers cache identical prompt prefixes automatically;
+    Anthropic models routed through OpenRouter need the block marked.
+    """
+    model_lower = model.lower()
+    return provider_name == "openrouter" and ("anthropic/" in model_lower or "claude" in model_lower)
+
+
+def _build_context_messages(
+    document: str, chunks: list[str], use_cache_control: bool
+) -> list[dict]:
+    """Build a request with the document first (cacheable prefix) and the chunks after it."""
+    document_block = f"<document>\n{document}\n</document>"
+
+    chunk_blocks = []
+    for i, chunk in enumerate(chunks):
+        chunk_blocks.append(f"CHUNK {i + 1}:\n<chunk>\n{chunk[:CHUNK_PREVIEW_CHARS]}\n</chunk>")
+    instructions = (
+        "\n\n".join(chunk_blocks)
+        + "\n\nFor each chunk above, give a short succinct context to situate it within the "
+        "overall document for the purposes of improving search retrieval of the chunk. "
+        "Format your response as:\nCHUNK 1: [context]\nCHUNK 2: [context]\netc."
+    )
+
+    if use_cache_control:
+        user_content = [
+            {"type": "text", "text": document_block, "cache_control": {"type": "ephemeral"}},
+            {"type": "text", "text": instructions},
+        ]
+    else:
+        user_content = f"{document_block}\n\n{instructions}"
+
+    return [
+        {
+            "role": "system",
+            "content": "You are a helpful assistant that generates contextual information for document chunks.",
+        },
+        {"role": "user", "content": user_content},
+    ]
+
+
+def _message_text(message: dict) -> str:
+    """Text of a chat message whose content is a string or a list of text parts."""
+    content = message["content"]
+    if isinstance(content, str):
+        return content
+    return "\n".join(part.get("text", "") for part in content)
+
+
+def _parse_chunk_contexts(response_text: str, chunk_count: int) -> dict[int, str]:
+    """Parse "CHUNK n: context" lines into a 0-based index -> context map."""
+    contexts = {}
+    for line in response_text.strip().split("\n"):
+        match = _CHUNK_LINE_PATTERN.match(line)
+        if not match:
+            continue
+        index = int(match.group(1)) - 1
+        context = match.group(2).strip()
+        if 0 <= index < chunk_count and context:
+            contexts[index] = context
+    return contexts
+
+
+async def _get_llm_provider_name(provider: str | None) -> str:
+    if provider:
+        return provider
+    try:
+        provider_config = await credential_service.get_active_provider("llm")
+        return provider_config.get("provider", "openai")
+    except Exception:
+        return "openai"
+
+
+def _get_max_concurrent_documents() -> int:
+    return max(1, get_settings().contextual_embeddings_max_workers)
+
+
+async def _contextualize_document_chunks(
+    client,
+    model: str,
+    document: str,
+    chunks: list[str],
+    use_cache_control: bool,
+    provider: str | None = None,
+) -> dict[int, str]:
+    """Generate contexts for chunks of one document in a single rate-limited request."""
+    threading_service = get_threading_service()
+
+    messages = _build_context_messages(document, chunks, use_cache_control)
+    # Prompt tokens plus the expected output
+    estimated_tokens = (
+        await count_tokens_async([_message_text(message) for message in messages], model)
+        + 100 * len(chunks)
+    )
+
+    async with threading_service.rate_limited_operation(
+        estimated_tokens, provider=provider, model=model, kind="chat"
+    ):
+        params = {
+            "model": model,
+            "messages": messages,
+            "temperature": 0,
+            "max_tokens": (600 if requires_max_completion_tokens(model) else 100) * len(chunks),  # Much more tokens for reasoning models (GPT-5 needs extra reasoning space)
+        }
+        final_params = prepare_chat_completion_params(model, params)
+        response = await client.chat.completions.create(**final_params)
+
+    choice = response.choices[0] if response.choices else None
+    response_text, _, _ = extract_message_text(choice)
+    if not response_text:
+        search_logger.error("Empty response from LLM when generating contextual embeddings")
+        return {}
+
+    return _parse_chunk_contexts(response_text, len(chunks))
 
 
 async def generate_contextual_embedding(
     full_document: str, chunk: str, provider: str = None
 ) -> tuple[str, bool]:
     """
-    Generate contextual information for a chunk with proper rate limiting.
+    Generate contextual information for a single chunk.
 
     Args:
         full_document: The complete document text
@@ -36,68 +220,8 @@ async def generate_contextual_embedding(
         - The contextual text that situates the chunk within the document
         - Boolean indicating if contextual embedding was performed
     """
-    # Model choice is a RAG setting, get from credential service
-    try:
-        model_choice = await credential_service.get_credential("MODEL_CHOICE", "gpt-4.1-nano")
-    except Exception as e:
-        # Fallback to environment variable or default
-        search_logger.warning(
-            f"Failed to get MODEL_CHOICE from credential service: {e}, using fallback"
-        )
-        model_choice = os.getenv("MODEL_CHOICE", "gpt-4.1-nano")
-
-    search_logger.debug(f"Using MODEL_CHOICE: {model_choice}")
-
-    threading_service = get_threading_service()
-
-    # Estimate tokens: document preview (5000 chars ≈ 1250 tokens) + chunk + prompt
-    estimated_tokens = 1250 + len(chunk.split()) + 100  # Rough estimate
-
-    try:
-        # Use rate limiting before making the API call
-        async with threading_service.rate_limited_operation(estimated_tokens):
-            async with get_llm_client(provider=provider) as client:
-                prompt = f"""<document>
-{full_document[:5000]}
-</document>
-Here is the chunk we want to situate within the whole document
-<chunk>
-{chunk}
-</chunk>
-Please give a short succinct context to situate this chunk within the overall document for the purposes of improving search retrieval of the chunk. Answer only with the succinct context and nothing else."""
-
-                # Get model from provider configuration
-                model = await _get_model_choice(provider)
-
-                # Prepare parameters and convert max_tokens for GPT-5/reasoning models
-                params = {
-                    "model": model,
-                    "messages": [
-                        {
-                            "role": "system",
-                            "content": "You are a helpful assistant that provides concise contextual information.",
-                        },
-                        {"role": "user", "content": prompt},
-                    ],
-                    "temperature": 0.3,
-                    "max_tokens": 1200 if requires_max_completion_tokens(model) else 200,  # Much more tokens for reasoning models (GPT-5 needs extra for reasoning process)
-                }
-                final_params = prepare_chat_completion_params(model, params)
-                response = await client.chat.completions.create(**final_params)
-
-                choice = response.choices[0] if response.choices else None
-                context, _, _ = extract_message_text(choice)
-                context = context.strip()
-                contextual_text = f"{context}\n---\n{chunk}"
-
-                return contextual_text, True
-
-    except Exception as e:
-        if "rate_limit_exceeded" in str(e) or "429" in str(e):
-            search_logger.warning(f"Rate limit hit in contextual embedding: {e}")
-        else:
-            search_logger.error(f"Error generating contextual embedding: {e}")
-        return chunk, False
+    results = await generate_contextual_embeddings_batch([full_document], [chunk], provider=provider)
+    return results[0]
 
 
 async def process_chunk_with_context(
@@ -167,13 +291,16 @@ async def generate_contextual_embeddings_batch(
     full_documents: list[str], chunks: list[str], provider: str = None
 ) -> list[tuple[str, bool]]:
     """
-    Generate contextual information for multiple chunks in a single API call to avoid rate limiting.
+    Generate contextual information for multiple chunks.
 
-    This processes ALL chunks passed to it in a single API call.
-    The caller should batch appropriately (e.g., 10 chunks at a time).
+    Chunks are grouped by document and each group is contextualized in requests
+    of up to CHUNKS_PER_CONTEXT_REQUEST chunks sharing one document prefix.
+    Document groups run concurrently (bounded by CONTEXTUAL_EMBEDDINGS_MAX_WORKERS)
+    under the shared rate limiter, and previously generated contexts are served
+    from the cache.
 
     Args:
-        full_documents: List of complete document texts
+        full_documents: List of complete document texts, parallel to chunks
         chunks: List of specific chunks to generate context for
         provider: Optional provider override
 
@@ -181,92 +308,101 @@ async def generate_contextual_embeddings_batch(
         List of tuples containing:
         - The contextual text that situates the chunk within the document
         - Boolean indicating if contextual embedding was performed
+
+    Raises:
+        EmbeddingQuotaExhaustedError: When the LLM quota is exhausted; the
+            remaining document groups are cancelled
     """
+    results: list[tuple[str, bool]] = [(chunk, False) for chunk in chunks]
+    if not chunks:
+        return results
+
     try:
-        async with get_llm_client(provider=provider) as client:
-            # Get model choice from credential service (RAG setting)
-            model_choice = await _get_model_choice(provider)
-
-            # Build batch prompt for ALL chunks at once
-            batch_prompt = "Process the following chunks and provide contextual information for each:\n\n"
-
-            for i, (doc, chunk) in enumerate(zip(full_documents, chunks, strict=False)):
-                # Use only 2000 chars of document context to save tokens
-                doc_preview = doc[:2000] if len(doc) > 2000 else doc
-                batch_prompt += f"CHUNK {i + 1}:\n"
-                batch_prompt += f"<document_preview>\n{doc_preview}\n</document_preview>\n"
-                batch_prompt += f"<chunk>\n{chunk[:500]}\n</chunk>\n\n"  # Limit chunk preview
-
-            batch_prompt += (
-                "For each chunk, provide a short succinct context to situate it within the overall document for improving search retrieval. "
-                "Format your response as:\nCHUNK 1: [context]\nCHUNK 2: [context]\netc."
-            )
-
-            # Make single API call for ALL chunks
-            # Prepare parameters and convert max_tokens for GPT-5/reasoning models
-            batch_params = {
-                "model": model_choice,
-                "messages": [
-                    {
-                        "role": "system",
-                        "content": "You are a helpful assistant that generates contextual information for document chunks.",
-                    },
-                    {"role": "user", "content": batch_prompt},
-                ],
-                "temperature": 0,
-                "max_tokens": (600 if requires_max_completion_tokens(model_choice) else 100) * len(chunks),  # Much more tokens for reasoning models (GPT-5 needs extra reasoning space)
-            }
-            final_batch_params = prepare_chat_completion_params(model_choice, batch_params)
-            response = await client.chat.completions.create(**final_batch_params)
-
-            # Parse response
-            choice = response.choices[0] if response.choices else None
-            response_text, _, _ = extract_message_text(choice)
-            if not response_text:
-                search_logger.error(
-                    "Empty response from LLM when generating contextual embeddings batch"
-                )
-                return [(chunk, False) for chunk in chunks]
-
-            # Extract contexts from response
-            lines = response_text.strip().split("\n")
-            chunk_contexts = {}
-
-            for line in lines:
-                if line.strip().startswith("CHUNK"):
-                    parts = line.split(":", 1)
-                    if len(parts) == 2:
-                        chunk_num = int(parts[0].strip().split()[1]) - 1
-                        context = parts[1].strip()
-                        chunk_contexts[chunk_num] = context
-
-            # Build results
-            results = []
-            for i, chunk in enumerate(chunks):
-                if i in chunk_contexts:
-                    # Combine context with full chunk (not truncated)
-                    contextual_text = chunk_contexts[i] + "\\n\\n" + chunk
-                    results.append((contextual_text, True))
-                else:
-                    results.append((chunk, False))
+        model_choice = await _get_model_choice(provider)
+    except Exception as e:
+        search_logger.error(f"Error getting model for contextual embeddings: {e}")
+        return results
 
-            return results
+    # Serve cached contexts and group the rest by document
+    documents: dict[str, str] = {}
+    pending_by_document: dict[str, list[int]] = {}
+    cache_keys: dict[int, tuple[str, str, str]] = {}
 
-    except openai.RateLimitError as e:
-        if "insufficient_quota" in str(e):
-            search_logger.warning(f"⚠️ QUOTA EXHAUSTED in contextual embeddings: {e}")
-            search_logger.warning(
-                "OpenAI quota exhausted - proceeding without contextual embeddings"
-            )
-        else:
-            search_logger.warning(f"Rate limit hit in contextual embeddings batch: {e}")
-            search_logger.warning(
-                "Rate limit hit - proceeding without contextual embeddings for this batch"
-            )
-        # Return non-contextual for all chunks
-        return [(chunk, False) for chunk in chunks]
+    for i, (full_document, chunk) in enumerate(zip(full_documents, chunks, strict=False)):
+        document = (full_document or "")[:DOCUMENT_CONTEXT_CHARS]
+        document_hash = _hash_text(document)
+        cache_key = (document_hash, _hash_text(chunk), model_choice)
+        cache_keys[i] = cache_key
+
+        cached_context = _get_cached_context(cache_key)
+        if cached_context is not None:
+            results[i] = (_combine_context(cached_context, chunk), True)
+            continue
+
+        documents[document_hash] = document
+        pending_by_document.setdefault(document_hash, []).append(i)
 
+    if not pending_by_document:
+        return results
+
+    provider_name = await _get_llm_provider_name(provider)
+    use_cache_control = _supports_explicit_prompt_cache(provider_name, model_choice)
+    document_semaphore = asyncio.Semaphore(_get_max_concurrent_documents())
+
+    try:
+        async with get_llm_client(provider=provider) as client:
+
+            async def contextualize_document(document_hash: str, indices: list[int]) -> None:
+                async with document_semaphore:
+                    for start in range(0, len(indices), CHUNKS_PER_CONTEXT_REQUEST):
+                        request_indices = indices[start : start + CHUNKS_PER_CONTEXT_REQUEST]
+                        request_chunks = [chunks[i] for i in request_indices]
+                        try:
+                            contexts = await _contextualize_document_chunks(
+                                client,
+                                model_choice,
+                                documents[document_hash],
+                                request_chunks,
+                                use_cache_control,
+                                provider_name,
+                            )
+                        except openai.RateLimitError as e:
+                            if "insufficient_quota" in str(e):
+                                search_logger.warning(f"⚠️ QUOTA EXHAUSTED in contextual embeddings: {e}")
+                                raise EmbeddingQuotaExhaustedError(
+                                    f"LLM quota exhausted during contextual embeddings: {e}"
+                                ) from e
+                            search_logger.warning(f"Rate limit hit in contextual embeddings batch: {e}")
+                            search_logger.warning(
+                                "Rate limit hit - proceeding without contextual embeddings for this batch"
+                            )
+                            continue
+                        except Exception as e:
+                            search_logger.error(f"Error in contextual embedding batch: {e}")
+                            continue
+
+                        for position, i in enumerate(request_indices):
+                            context = contexts.get(position)
+                            if context:
+                                _set_cached_context(cache_keys[i], context)
+                                results[i] = (_combine_context(context, chunks[i]), True)
+
+            tasks = [
+                asyncio.create_task(contextualize_document(document_hash, indices))
+                for document_hash, indices in pending_by_document.items()
+            ]
+            try:
+                await asyncio.gather(*tasks)
+            except BaseException:
+                # Quota errors and cancellation stop every document group
+                for task in tasks:
+                    task.cancel()
+                await asyncio.gather(*tasks, return_exceptions=True)
+                raise
+
+    except EmbeddingQuotaExhaustedError:
+        raise
     except Exception as e:
         search_logger.error(f"Error in contextual embedding batch: {e}")
-        # Return non-contextual for all chunks
-        return [(chunk, False) for chunk in chunks]
+
+    return results
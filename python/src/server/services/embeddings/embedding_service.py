@@ -18,7 +18,9 @@ import openai
 from ...config.logfire_config import safe_span, search_logger
 from ..credential_service import credential_service
 from ..llm_provider_service import get_embedding_model, get_llm_client
+from ..settings_snapshot import get_settings
 from ..threading_service import get_threading_service
+from ..token_counter import count_tokens_async
 from .embedding_exceptions import (
     EmbeddingAPIError,
     EmbeddingError,
@@ -365,29 +367,23 @@ async def create_embeddings_batch(
 
             search_logger.info(f"Using embedding provider: '{embedding_provider}' (from EMBEDDING_PROVIDER setting)")
             async with get_llm_client(provider=embedding_provider, use_embedding_provider=True) as client:
-                # Load batch size and dimensions from settings
-                try:
-                    rag_settings = await _maybe_await(
-                        credential_service.get_credentials_by_category("rag_strategy")
-                    )
-                    batch_size = int(rag_settings.get("EMBEDDING_BATCH_SIZE", "100"))
-                    embedding_dimensions = int(rag_settings.get("EMBEDDING_DIMENSIONS", "1536"))
-                except Exception as e:
-                    search_logger.warning(f"Failed to load embedding settings: {e}, using defaults")
-                    batch_size = 100
-                    embedding_dimensions = 1536
+                # Batch size and dimensions from the settings snapshot
+                settings = get_settings()
+                batch_size = max(1, settings.embedding_batch_size)
+                embedding_dimensions = settings.embedding_dimensions
 
                 total_tokens_used = 0
                 adapter = _get_embedding_adapter(embedding_provider, client)
                 dimensions_to_use = embedding_dimensions if embedding_dimensions > 0 else None
+                embedding_model = await get_embedding_model(provider=embedding_provider)
 
                 for i in range(0, len(texts), batch_size):
                     batch = texts[i : i + batch_size]
                     batch_index = i // batch_size
 
                     try:
-                        # Estimate tokens for this batch
-                        batch_tokens = sum(len(text.split()) for text in batch) * 1.3
+                        # Count tokens for this batch with the model's tokenizer
+                        batch_tokens = await count_tokens_async(batch, embedding_model)
                         total_tokens_used += batch_tokens
 
                         # Create rate limit progress callback if we have a progress callback
@@ -400,14 +396,19 @@ async def create_embeddings_batch(
                                 await progress_callback(message, (processed / len(texts)) * 100)
 
                         # Rate limit each batch
-                        async with threading_service.rate_limited_operation(batch_tokens, rate_limit_callback):
+                        async with threading_service.rate_limited_operation(
+                            batch_tokens,
+                            rate_limit_callback,
+                            provider=embedding_provider,
+                            model=embedding_model,
+                            kind="embeddings",
+                        ):
                             retry_count = 0
                             max_retries = 3
 
                             while retry_count < max_retries:
                                 try:
                                     # Create embeddings for this batch
-                                    embedding_model = await get_embedding_model(provider=embedding_provider)
                                     embeddings = await adapter.create_embeddings(
                                         batch,
                                         embedding_model,
@@ -7,9 +7,11 @@ various embedding models from OpenAI, Google, Ollama, and other providers.
 This service works with the tested database schema that has been validated.
 """
 
+import math
 from typing import Any
 
 from ...config.logfire_config import get_logger
+from ..llm_provider_service import supports_matryoshka_embeddings
 
 logger = get_logger(__name__)
 
@@ -22,6 +24,9 @@ SUPPORTED_DIMENSIONS = {
     3072: []   # OpenAI large models (text-embedding-3-large)
 }
 
+# Dimension of the truncated copy stored in embedding_coarse for two-stage search
+COARSE_EMBEDDING_DIMENSION = 256
+
 class MultiDimensionalEmbeddingService:
     """Service for managing embeddings with multiple dimensions."""
     
@@ -72,5 +77,29 @@ class MultiDimensionalEmbeddingService:
         """Check if a dimension is supported by the database schema."""
         return dimension in SUPPORTED_DIMENSIONS
 
+    def truncate_embedding(
+        self, embedding: list[float], dimension: int = COARSE_EMBEDDING_DIMENSION
+    ) -> list[float]:
+        """Truncate an embedding to its leading components and renormalize to unit length."""
+        truncated = [float(value) for value in embedding[:dimension]]
+        norm = math.sqrt(sum(value * value for value in truncated))
+        if norm == 0:
+            return truncated
+        return [value / norm for value in truncated]
+
+    def get_coarse_embedding(self, embedding: list[float], model_name: str) -> list[float] | None:
+        """
+        Get the coarse search vector for an embedding produced by model_name.
+
+        Returns None when the model is not Matryoshka-trained (a prefix of its
+        embedding carries no meaning on its own) or the embedding is already no
+        larger than the coarse dimension.
+        """
+        if not supports_matryoshka_embeddings(model_name):
+            return None
+        if len(embedding) <= COARSE_EMBEDDING_DIMENSION:
+            return None
+        return self.truncate_embedding(embedding, COARSE_EMBEDDING_DIMENSION)
+
 # Global instance
 multi_dimensional_embedding_service = MultiDimensionalEmbeddingService()
\ No newline at end of file
@@ -3,12 +3,25 @@ Knowledge Services Package
 
 Contains services for knowledge management operations.
 """
+from .chunk_listing_service import ChunkListingService, InvalidChunkCursorError
 from .database_metrics_service import DatabaseMetricsService
 from .knowledge_item_service import KnowledgeItemService
 from .knowledge_summary_service import KnowledgeSummaryService
+from .source_stats_service import SourceStatsService
+from .source_transfer_service import (
+    InvalidSourceArchiveError,
+    SourceAlreadyExistsError,
+    SourceTransferService,
+)
 
 __all__ = [
+    'ChunkListingService',
+    'InvalidChunkCursorError',
+    'InvalidSourceArchiveError',
     'KnowledgeItemService',
     'DatabaseMetricsService',
-    'KnowledgeSummaryService'
+    'KnowledgeSummaryService',
+    'SourceAlreadyExistsError',
+    'SourceStatsService',
+    'SourceTransferService'
 ]
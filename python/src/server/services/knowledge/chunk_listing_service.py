@@ -0,0 +1,354 @@
+"""
+Chunk Listing Service
+
+Pages through a source's document chunks and code examples for the
+knowledge item browser.
+
+Pages are ordered by (url, chunk_number), the source's unique key, so a
+cursor continues after the last row of the previous page with an index
+seek instead of an offset scan: the last page of a large source costs the
+same as the first. Offset pages remain supported. Counting is optional -
+exact, the planner's estimate, or skipped - and the selected columns
+follow the requested fields so listings can leave out chunk content (a
+chunk title only needs content when its metadata has none).
+"""
+
+import base64
+import json
+from typing import Any
+from urllib.parse import urlparse
+
+from ...config.logfire_config import safe_logfire_info
+from ...utils.json_response import project_fields
+
+MAX_CHUNK_PAGE_SIZE = 100
+
+COUNT_MODES = ("exact", "estimated", "none")
+
+CHUNK_COLUMNS = ("id", "source_id", "url", "chunk_number", "content", "metadata")
+CODE_EXAMPLE_COLUMNS = ("id", "source_id", "url", "chunk_number", "content", "summary", "metadata")
+
+# Fields derived from metadata (and, for some chunk titles, content) after the query
+DERIVED_CHUNK_FIELDS = frozenset({"title", "section", "source_type", "knowledge_type"})
+DERIVED_CODE_EXAMPLE_FIELDS = frozenset({"title", "example_name", "language", "file_path"})
+
+# Columns every page needs for its cursor
+_KEY_COLUMNS = frozenset({"id", "url", "chunk_number"})
+
+
+class InvalidChunkCursorError(ValueError):
+    """Raised when a chunk listing cursor cannot be decoded"""
+
+
+def encode_chunk_cursor(row: dict[str, Any]) -> str:
+    """Encode the keyset position (url, chunk_number) after a chunk or code example."""
+    position = [row["url"], row["chunk_number"]]
+    return base64.urlsafe_b64encode(json.dumps(position).encode()).decode().rstrip("=")
+
+
+def decode_chunk_cursor(cursor: str) -> tuple[str, int]:
+    """
+    Decode a cursor produced by encode_chunk_cursor.
+
+    Raises:
+        InvalidChunkCursorError: If the cursor is malformed
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        url, chunk_number = json.loads(base64.urlsafe_b64decode(padded))
+        if not isinstance(url, str):
+            raise TypeError("cursor url must be a string")
+        return url, int(chunk_number)
+    except Exception as e:
+        raise InvalidChunkCursorError(f"Invalid cursor: {cursor}") from e
+
+
+def _quote(value: str) -> str:
+    """Quote a value for a PostgREST or_() filter."""
+    return '"' + value.replace("\\", "\\\\").replace('"', '\\"') + '"'
+
+
+def _select_columns(
+    all_columns: tuple[str, ...], fields: set[str] | None, derived: dict[str, set[str]]
+) -> str:
+    """Columns to select for the requested fields (all of them without a projection)."""
+    if fields is None:
+        return ", ".join(all_columns)
+    wanted = set(_KEY_COLUMNS) | (fields & set(all_columns))
+    for field in fields:
+        wanted |= derived.get(field, set())
+    return ", ".join(column for column in all_columns if column in wanted)
+
+
+def _truncate_content(rows: list[dict[str, Any]], max_content_length: int) -> None:
+    for row in rows:
+        content = row.get("content")
+        if content is None:
+            continue
+        row["content_truncated"] = len(content) > max_content_length
+        if row["content_truncated"]:
+            row["content"] = content[:max_content_length]
+
+
+def _metadata_title(metadata: dict[str, Any]) -> str | None:
+    """Title of a chunk taken from its metadata alone (None if metadata has none)."""
+    if metadata.get("filename"):
+        return metadata.get("filename")
+    if metadata.get("headers"):
+        return metadata.get("headers").split(";")[0].strip("# ")
+    if metadata.get("title") and metadata.get("title").strip():
+        return metadata.get("title").strip()
+    return None
+
+
+def chunk_title(chunk: dict[str, Any], metadata: dict[str, Any]) -> str | None:
+    """Generate a meaningful title for a chunk from its metadata, content or URL."""
+    # Try to get title from various metadata fields
+    title = _metadata_title(metadata)
+    if title is not None:
+        return title
+
+    # Try to extract from content first for more specific titles
+    if chunk.get("content"):
+        content = chunk.get("content", "").strip()
+        # Look for markdown headers at the start
+        lines = content.split("\n")[:5]
+        for line in lines:
+            line = line.strip()
+            if line.startswith("# "):
+                title = line[2:].strip()
+                break
+            elif line.startswith("## "):
+                title = line[3:].strip()
+                break
+            elif line.startswith("### "):
+                title = line[4:].strip()
+                break
+
+        # Fallback: use first meaningful line that looks like a title
+        if not title:
+            for line in lines:
+                line = line.strip()
+                # Skip code blocks, empty lines, and very short lines
+                if (line and not line.startswith("```") and not line.startswith("Source:")
+                    and len(line) > 15 and len(line) < 80
+                    and not line.startswith("from ") and not line.startswith("import ")
+                    and "=" not in line and "{" not in line):
+                    title = line
+                    break
+
+    # If no content-based title found, generate from URL
+    if not title:
+        url = chunk.get("url", "")
+        if url:
+            # Extract meaningful part from URL
+            if url.endswith(".txt"):
+                title = url.split("/")[-1].replace(".txt", "").replace("-", " ").title()
+            else:
+                # Get domain and path info
+                parsed = urlparse(url)
+                if parsed.path and parsed.path != "/":
+                    title = parsed.path.strip("/").replace("-", " ").replace("_", " ").title()
+                else:
+                    title = parsed.netloc.replace("www.", "").title()
+    return title
+
+
+def _add_chunk_fields(chunks: list[dict[str, Any]]) -> None:
+    # Extract useful fields from metadata to top level for frontend
+    # This ensures the API response matches the TypeScript DocumentChunk interface
+    for chunk in chunks:
+        metadata = chunk.get("metadata", {}) or {}
+        chunk["title"] = chunk_title(chunk, metadata) or ""
+        chunk["section"] = metadata.get("headers", "").replace(";", " > ") if metadata.get("headers") else None
+        chunk["source_type"] = metadata.get("source_type")
+        chunk["knowledge_type"] = metadata.get("knowledge_type")
+
+
+def _add_code_example_fields(examples: list[dict[str, Any]]) -> None:
+    # Extract fields to match the frontend CodeExample TypeScript interface
+    for example in examples:
+        metadata = example.get("metadata", {}) or {}
+        example["title"] = metadata.get("title")  # AI-generated title
+        example["example_name"] = metadata.get("example_name")  # Same as title for compatibility
+        example["language"] = metadata.get("language")  # Programming language
+        example["file_path"] = metadata.get("file_path")  # Original file path if available
+
+
+class ChunkListingService:
+    """
+    Service for paging through a source's chunks and code examples.
+    """
+
+    def __init__(self, supabase_client):
+        """
+        Initialize the chunk listing service.
+
+        Args:
+            supabase_client: The Supabase client for database operations
+        """
+        self.supabase = supabase_client
+
+    def list_chunks(
+        self,
+        source_id: str,
+        limit: int = 20,
+        offset: int = 0,
+        cursor: str | None = None,
+        domain_filter: str | None = None,
+        count: str = "exact",
+        fields: set[str] | None = None,
+        max_content_length: int | None = None,
+    ) -> dict[str, Any]:
+        """
+        Get one page of a source's document chunks.
+
+        Args:
+            source_id: The source ID
+            limit: Page size (capped at MAX_CHUNK_PAGE_SIZE)
+            offset: Rows to skip when no cursor is given
+            cursor: next_cursor of the previous page
+            domain_filter: Optional substring filter on chunk URLs
+            count: "exact", "estimated" or "none" (total is None)
+            fields: Fields to return (``id`` always included); None returns all
+            max_content_length: Truncate content to this many characters
+
+        Returns:
+            Dict with chunks, total, limit, offset, has_more and next_cursor
+
+        Raises:
+            InvalidChunkCursorError: If the cursor is malformed
+            ValueError: If the count mode is invalid
+        """
+        derived = {name: {"metadata"} for name in DERIVED_CHUNK_FIELDS}
+        page = self._list_page(
+            "archon_crawled_pages",
+            _select_columns(CHUNK_COLUMNS, fields, derived),
+            source_id, limit, offset, cursor, domain_filter, count,
+        )
+        # Content was not selected, but titles without metadata are taken from it
+        title_needs_content = fields is not None and "title" in fields and "content" not in fields
+        if title_needs_content:
+            self._load_title_content(page["rows"])
+        _add_chunk_fields(page["rows"])
+        if title_needs_content:
+            for row in page["rows"]:
+                row.pop("content", None)
+        return self._finish_page(page, "chunks", fields, max_content_length)
+
+    def list_code_examples(
+        self,
+        source_id: str,
+        limit: int = 20,
+        offset: int = 0,
+        cursor: str | None = None,
+        count: str = "exact",
+        fields: set[str] | None = None,
+        max_content_length: int | None = None,
+    ) -> dict[str, Any]:
+        """
+        Get one page of a source's code examples.
+
+        Args and Raises are as for list_chunks (without domain_filter).
+
+        Returns:
+            Dict with code_examples, total, limit, offset, has_more and next_cursor
+        """
+        derived = {name: {"metadata"} for name in DERIVED_CODE_EXAMPLE_FIELDS}
+        page = self._list_page(
+            "archon_code_examples",
+            _select_columns(CODE_EXAMPLE_COLUMNS, fields, derived),
+            source_id, limit, offset, cursor, None, count,
+        )
+        _add_code_example_fields(page["rows"])
+        return self._finish_page(page, "code_examples", fields, max_content_length)
+
+    def _load_title_content(self, rows: list[dict[str, Any]]) -> None:
+        """Read content only for the chunks whose title cannot come from metadata."""
+        ids = [row["id"] for row in rows if _metadata_title(row.get("metadata") or {}) is None]
+        if not ids:
+            return
+        result = (
+            self.supabase.from_("archon_crawled_pages").select("id, content").in_("id", ids).execute()
+        )
+        content_by_id = {row["id"]: row.get("content") for row in result.data or []}
+        for row in rows:
+            if row["id"] in content_by_id:
+                row["content"] = content_by_id[row["id"]]
+
+    def _list_page(
+        self,
+        table: str,
+        columns: str,
+        source_id: str,
+        limit: int,
+        offset: int,
+        cursor: str | None,
+        domain_filter: str | None,
+        count: str,
+    ) -> dict[str, Any]:
+        if count not in COUNT_MODES:
+            raise ValueError(f"Invalid count mode: {count}")
+        keyset = decode_chunk_cursor(cursor) if cursor else None
+        limit = max(1, min(limit, MAX_CHUNK_PAGE_SIZE))
+        offset = 0 if keyset is not None else max(offset, 0)
+
+        total = None
+        if count != "none":
+            count_query = self.supabase.from_(table).select("id", count=count, head=True)
+            count_query = count_query.eq("source_id", source_id)
+            if domain_filter:
+                count_query = count_query.ilike("url", f"%{domain_filter}%")
+            count_result = count_query.execute()
+            total = getattr(count_result, "count", None)
+
+        query = self.supabase.from_(table).select(columns).eq("source_id", source_id)
+        if domain_filter:
+            query = query.ilike("url", f"%{domain_filter}%")
+        if keyset is not None:
+            # Rows strictly after the cursor in (url, chunk_number) order
+            url, chunk_number = keyset
+            query = query.or_(
+                f"url.gt.{_quote(url)},and(url.eq.{_quote(url)},chunk_number.gt.{chunk_number})"
+            )
+
+        # Fetch one extra row to learn whether another page follows
+        query = query.order("url", desc=False).order("chunk_number", desc=False)
+        result = query.range(offset, offset + limit).execute()
+        if getattr(result, "error", None) is not None:
+            raise RuntimeError(str(result.error))
+
+        rows = result.data or []
+        if keyset is None and total is not None:
+            has_more = offset + limit < total
+        else:
+            has_more = len(rows) > limit
+        rows = rows[:limit]
+
+        safe_logfire_info(
+            f"Listed {table} page | source_id={source_id} | rows={len(rows)} | total={total} | "
+            f"cursor={'yes' if keyset else 'no'}"
+        )
+        return {
+            "rows": rows,
+            "total": total,
+            "limit": limit,
+            "offset": offset,
+            "has_more": has_more,
+            "next_cursor": encode_chunk_cursor(rows[-1]) if has_more and rows else None,
+        }
+
+    @staticmethod
+    def _finish_page(
+        page: dict[str, Any],
+        key: str,
+        fields: set[str] | None,
+        max_content_length: int | None,
+    ) -> dict[str, Any]:
+        rows = page.pop("rows")
+        if max_content_length is not None:
+            _truncate_content(rows, max(max_content_length, 0))
+            if fields is not None:
+                fields = fields | {"content_truncated"}
+        page[key] = project_fields(rows, fields)
+        return page
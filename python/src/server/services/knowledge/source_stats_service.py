@@ -0,0 +1,139 @@
+"""
+Source Stats Service
+
+Reads the materialized per-source statistics in archon_source_stats.
+The table is kept current by triggers on the knowledge tables, so listing
+a page of sources needs one primary-key lookup instead of counting chunks
+and code examples per source.
+"""
+
+from typing import Any
+
+from ...config.logfire_config import safe_logfire_error, safe_logfire_info
+from ..database_errors import is_missing_schema_error
+
+STATS_COLUMNS = (
+    "source_id, chunk_count, code_example_count, page_count, first_url, total_bytes, last_crawled_at"
+)
+
+
+def empty_source_stats(source_id: str) -> dict[str, Any]:
+    """Stats for a source that has no stored chunks or code examples yet."""
+    return {
+        "source_id": source_id,
+        "chunk_count": 0,
+        "code_example_count": 0,
+        "page_count": 0,
+        "first_url": None,
+        "total_bytes": 0,
+        "last_crawled_at": None,
+    }
+
+
+class SourceStatsService:
+    """
+    Service for reading per-source chunk, page and code example statistics.
+    """
+
+    def __init__(self, supabase_client):
+        """
+        Initialize the source stats service.
+
+        Args:
+            supabase_client: The Supabase client for database operations
+        """
+        self.supabase = supabase_client
+
+    async def get_stats_batch(self, source_ids: list[str]) -> dict[str, dict[str, Any]]:
+        """
+        Get statistics for several sources in a single query.
+
+        Sources without a stats row (nothing stored yet) get zeroed stats.
+        If the stats table does not exist (migration not applied), falls back
+        to counting the knowledge tables per source; other errors propagate.
+
+        Args:
+            source_ids: List of source IDs
+
+        Returns:
+            Dict mapping source_id to its stats
+        """
+        if not source_ids:
+            return {}
+
+        try:
+            result = (
+                self.supabase.from_("archon_source_stats")
+                .select(STATS_COLUMNS)
+                .in_("source_id", source_ids)
+                .execute()
+            )
+        except Exception as e:
+            if not is_missing_schema_error(e):
+                raise
+            safe_logfire_info(
+                f"Source stats table unavailable, counting per source | error={str(e)}"
+            )
+            return await self._count_stats_batch(source_ids)
+
+        stats = {source_id: empty_source_stats(source_id) for source_id in source_ids}
+        for row in result.data or []:
+            stats[row["source_id"]] = {**empty_source_stats(row["source_id"]), **row}
+        return stats
+
+    async def get_stats(self, source_id: str) -> dict[str, Any]:
+        """
+        Get statistics for a single source.
+
+        Args:
+            source_id: The source ID
+
+        Returns:
+            Stats dict for the source
+        """
+        stats = await self.get_stats_batch([source_id])
+        return stats[source_id]
+
+    async def _count_stats_batch(self, source_ids: list[str]) -> dict[str, dict[str, Any]]:
+        """
+        Count chunks and code examples directly, one query per source and table.
+
+        Only used when archon_source_stats does not exist yet. Page count,
+        bytes and crawl time are not derived here and stay at their defaults.
+        """
+        stats = {}
+        for source_id in source_ids:
+            source_stats = empty_source_stats(source_id)
+            try:
+                chunks = (
+                    self.supabase.from_("archon_crawled_pages")
+                    .select("id", count="exact", head=True)
+                    .eq("source_id", source_id)
+                    .execute()
+                )
+                source_stats["chunk_count"] = chunks.count or 0
+
+                code_examples = (
+                    self.supabase.from_("archon_code_examples")
+                    .select("id", count="exact", head=True)
+                    .eq("source_id", source_id)
+                    .execute()
+                )
+                source_stats["code_example_count"] = code_examples.count or 0
+
+                first_page = (
+                    self.supabase.from_("archon_crawled_pages")
+                    .select("url")
+                    .eq("source_id", source_id)
+                    .order("id")
+                    .limit(1)
+                    .execute()
+                )
+                if first_page.data:
+                    source_stats["first_url"] = first_page.data[0]["url"]
+            except Exception as e:
+                safe_logfire_error(
+                    f"Failed to count source stats | error={str(e)} | source_id={source_id}"
+                )
+            stats[source_id] = source_stats
+        return stats
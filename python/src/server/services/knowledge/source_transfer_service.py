@@ -0,0 +1,353 @@
+"""
+Source Transfer Service
+
+Exports a knowledge source - its archon_sources row, pages, chunks and code
+examples, embeddings included - as a gzip-compressed NDJSON stream, and
+imports such a stream into another database. Moving a source this way
+avoids re-crawling and re-embedding it.
+
+Format (one JSON object per line):
+    {"format": "archon-source-export", "version": 1, "source_id": ..., "exported_at": ...}
+    {"table": "archon_sources", "row": {...}}
+    {"table": "archon_page_metadata", "row": {...}}
+    ...
+    {"end": true, "counts": {"archon_sources": 1, "archon_page_metadata": ..., ...}}
+
+Rows are read in keyset-paginated batches and written in batched inserts,
+so memory use stays flat regardless of the size of the source. An import
+first reads the whole stream into a temporary file, checking every row
+and the end line's counts, and only then deletes a source it replaces and
+writes the rows; a truncated or malformed file leaves the database
+untouched. A write that fails removes the partially imported source.
+"""
+
+import asyncio
+import json
+import tempfile
+import zlib
+from collections.abc import AsyncIterator
+from datetime import UTC, datetime
+from typing import Any
+
+from ...config.logfire_config import safe_logfire_error, safe_logfire_info
+from ...utils.json_response import dumps_json
+from ..source_management_service import SourceManagementService
+
+EXPORT_FORMAT = "archon-source-export"
+EXPORT_FORMAT_VERSION = 1
+
+# Tables in dependency order, with the key used to paginate each one
+TRANSFER_TABLES = (
+    ("archon_sources", "source_id"),
+    ("archon_page_metadata", "id"),
+    ("archon_crawled_pages", "id"),
+    ("archon_code_examples", "id"),
+)
+
+# Columns the target database fills in itself: serial ids (chunks are
+# identified by source_id, url and chunk_number) and generated columns
+SKIPPED_COLUMNS = {
+    "archon_crawled_pages": frozenset({"id", "content_search_vector"}),
+    "archon_code_examples": frozenset({"id", "content_search_vector"}),
+}
+
+EXPORT_BATCH_SIZE = 250
+IMPORT_BATCH_SIZE = 250
+
+_GZIP_MAGIC = b"\x1f\x8b"
+_GZIP_WBITS = 16 + zlib.MAX_WBITS
+
+
+class SourceTransferError(ValueError):
+    """Base class for errors that reject a source import."""
+
+
+class SourceAlreadyExistsError(SourceTransferError):
+    """Raised when the imported source exists and replace was not requested."""
+
+
+class InvalidSourceArchiveError(SourceTransferError):
+    """Raised when an import stream is malformed or does not match its header."""
+
+
+class SourceTransferService:
+    """
+    Service for exporting and importing complete knowledge sources.
+    """
+
+    def __init__(self, supabase_client):
+        """
+        Initialize the source transfer service.
+
+        Args:
+            supabase_client: The Supabase client for database operations
+        """
+        self.supabase = supabase_client
+
+    async def source_exists(self, source_id: str) -> bool:
+        """Check whether a source row exists."""
+        query = (
+            self.supabase.table("archon_sources")
+            .select("source_id")
+            .eq("source_id", source_id)
+            .limit(1)
+        )
+        result = await asyncio.to_thread(query.execute)
+        return bool(result.data)
+
+    async def iter_export(self, source_id: str, compress: bool = True) -> AsyncIterator[bytes]:
+        """
+        Stream a source as NDJSON.
+
+        Args:
+            source_id: The source to export
+            compress: Gzip the stream (default) or emit plain NDJSON
+
+        Yields:
+            Chunks of the (compressed) export
+        """
+        compressor = zlib.compressobj(6, zlib.DEFLATED, _GZIP_WBITS) if compress else None
+
+        def encode(data: bytes) -> bytes:
+            return compressor.compress(data) if compressor else data
+
+        header = {
+            "format": EXPORT_FORMAT,
+            "version": EXPORT_FORMAT_VERSION,
+            "source_id": source_id,
+            "exported_at": datetime.now(UTC).isoformat(),
+        }
+        yield encode(dumps_json(header) + b"\n")
+
+        counts: dict[str, int] = {}
+        for table, key in TRANSFER_TABLES:
+            counts[table] = 0
+            skipped = SKIPPED_COLUMNS.get(table, frozenset())
+            async for batch in self._iter_batches(table, key, source_id):
+                counts[table] += len(batch)
+                lines = b"".join(
+                    dumps_json({
+                        "table": table,
+                        "row": {k: v for k, v in row.items() if k not in skipped},
+                    })
+                    + b"\n"
+                    for row in batch
+                )
+                chunk = encode(lines)
+                if chunk:
+                    yield chunk
+
+        yield encode(dumps_json({"end": True, "counts": counts}) + b"\n")
+        if compressor:
+            yield compressor.flush()
+
+        safe_logfire_info(f"Exported source | source_id={source_id} | counts={counts}")
+
+    async def _iter_batches(
+        self, table: str, key: str, source_id: str
+    ) -> AsyncIterator[list[dict[str, Any]]]:
+        """Read a source's rows of one table in keyset-paginated batches."""
+        last_key = None
+        while True:
+            query = self.supabase.table(table).select("*").eq("source_id", source_id)
+            if last_key is not None:
+                query = query.gt(key, last_key)
+            query = query.order(key).limit(EXPORT_BATCH_SIZE)
+
+            result = await asyncio.to_thread(query.execute)
+            rows = result.data or []
+            if rows:
+                yield rows
+            if len(rows) < EXPORT_BATCH_SIZE:
+                return
+            last_key = rows[-1][key]
+
+    async def import_source(
+        self, chunks: AsyncIterator[bytes], replace: bool = False
+    ) -> tuple[bool, dict[str, Any]]:
+        """
+        Import a source from an export stream (gzip or plain NDJSON).
+
+        The stream is validated completely before anything is written, so
+        an existing source is only replaced by a verified export.
+
+        Args:
+            chunks: Raw bytes of the export file
+            replace: Replace an existing source with the same ID
+
+        Returns:
+            Tuple of (success, result_dict) with per-table row counts
+
+        Raises:
+            SourceAlreadyExistsError: If the source exists and replace is False
+            InvalidSourceArchiveError: If the export is malformed or incomplete
+        """
+        validator = _SourceImporter(self, replace, dry_run=True)
+        importer = _SourceImporter(self, replace)
+        with tempfile.TemporaryFile() as spool:
+            try:
+                async for line in _iter_lines(chunks):
+                    await validator.handle_line(line)
+                    spool.write(line + b"\n")
+                await validator.finish()
+
+                spool.seek(0)
+                for line in spool:
+                    await importer.handle_line(line)
+                await importer.finish()
+            except SourceTransferError:
+                await importer.rollback()
+                raise
+            except Exception as e:
+                safe_logfire_error(
+                    f"Source import failed | source_id={validator.source_id} | error={str(e)}"
+                )
+                await importer.rollback()
+                return False, {"error": f"Error importing source: {str(e)}"}
+
+        safe_logfire_info(
+            f"Imported source | source_id={importer.source_id} | counts={importer.counts}"
+        )
+        return True, {"source_id": importer.source_id, "counts": importer.counts}
+
+
+class _SourceImporter:
+    """Validates export lines and writes their rows in batches (only counts them when dry_run)."""
+
+    def __init__(self, service: SourceTransferService, replace: bool, dry_run: bool = False):
+        self.service = service
+        self.supabase = service.supabase
+        self.replace = replace
+        self.dry_run = dry_run
+        self.source_id: str | None = None
+        self.counts: dict[str, int] = {}
+        self.expected_counts: dict[str, int] | None = None
+        self._table_order = [table for table, _ in TRANSFER_TABLES]
+        self._current_table: str | None = None
+        self._pending: list[dict[str, Any]] = []
+        self._wrote_rows = False
+
+    async def handle_line(self, line: bytes) -> None:
+        if not line.strip():
+            return
+        try:
+            record = json.loads(line)
+        except ValueError as e:
+            raise InvalidSourceArchiveError(f"Invalid export line: {e}") from e
+
+        if self.source_id is None:
+            await self._start(record)
+        elif self.expected_counts is not None:
+            raise InvalidSourceArchiveError("Unexpected data after the end of the export")
+        elif record.get("end"):
+            self.expected_counts = record.get("counts") or {}
+        else:
+            await self._add_row(record)
+
+    async def _start(self, header: dict[str, Any]) -> None:
+        if header.get("format") != EXPORT_FORMAT:
+            raise InvalidSourceArchiveError("Not an Archon source export")
+        if header.get("version") != EXPORT_FORMAT_VERSION:
+            raise InvalidSourceArchiveError(f"Unsupported export version: {header.get('version')}")
+        source_id = header.get("source_id")
+        if not source_id:
+            raise InvalidSourceArchiveError("Export header has no source_id")
+
+        exists = await self.service.source_exists(source_id)
+        if exists and not self.replace:
+            raise SourceAlreadyExistsError(f"Source {source_id} already exists")
+        if exists and not self.dry_run:
+            success, result = await asyncio.to_thread(
+                SourceManagementService(self.supabase).delete_source, source_id
+            )
+            if not success:
+                raise RuntimeError(result.get("error", f"Could not replace source {source_id}"))
+
+        self.source_id = source_id
+
+    async def _add_row(self, record: dict[str, Any]) -> None:
+        table = record.get("table")
+        row = record.get("row")
+        if table not in self._table_order or not isinstance(row, dict):
+            raise InvalidSourceArchiveError(f"Unknown export record for table {table!r}")
+        if row.get("source_id") != self.source_id:
+            raise InvalidSourceArchiveError(f"Row in {table} belongs to another source")
+
+        if table != self._current_table:
+            if self._current_table and self._table_order.index(table) < self._table_order.index(
+                self._current_table
+            ):
+                raise InvalidSourceArchiveError(f"Rows for {table} are out of order")
+            await self._flush()
+            self._current_table = table
+            self.counts.setdefault(table, 0)
+
+        skipped = SKIPPED_COLUMNS.get(table, frozenset())
+        self._pending.append({k: v for k, v in row.items() if k not in skipped})
+        if len(self._pending) >= IMPORT_BATCH_SIZE:
+            await self._flush()
+
+    async def _flush(self) -> None:
+        if not self._pending:
+            return
+        rows, self._pending = self._pending, []
+        if not self.dry_run:
+            await asyncio.to_thread(self.supabase.table(self._current_table).insert(rows).execute)
+            self._wrote_rows = True
+        self.counts[self._current_table] += len(rows)
+
+    async def finish(self) -> None:
+        if self.source_id is None:
+            raise InvalidSourceArchiveError("Export file is empty")
+        if self.expected_counts is None:
+            raise InvalidSourceArchiveError("Export file is truncated (no end record)")
+        await self._flush()
+        for table, _ in TRANSFER_TABLES:
+            expected = self.expected_counts.get(table, 0)
+            if self.counts.get(table, 0) != expected:
+                raise InvalidSourceArchiveError(
+                    f"Export file is incomplete: {table} has {self.counts.get(table, 0)} of {expected} rows"
+                )
+
+    async def rollback(self) -> None:
+        """Remove whatever part of the source was written."""
+        if not self._wrote_rows:
+            return
+        try:
+            await asyncio.to_thread(
+                SourceManagementService(self.supabase).delete_source, self.source_id
+            )
+        except Exception as e:
+            safe_logfire_error(
+                f"Failed to roll back source import | source_id={self.source_id} | error={str(e)}"
+            )
+
+
+async def _iter_lines(chunks: AsyncIterator[bytes]) -> AsyncIterator[bytes]:
+    """Split a (possibly gzip-compressed) byte stream into lines."""
+    decompressor = None
+    detected = False
+    buffer = b""
+    async for chunk in chunks:
+        if not detected:
+            buffer += chunk
+            if len(buffer) < len(_GZIP_MAGIC):
+                continue
+            detected = True
+            if buffer.startswith(_GZIP_MAGIC):
+                decompressor = zlib.decompressobj(_GZIP_WBITS)
+            chunk, buffer = buffer, b""
+
+        try:
+            data = decompressor.decompress(chunk) if decompressor else chunk
+        except zlib.error as e:
+            raise InvalidSourceArchiveError(f"Corrupt gzip data: {e}") from e
+        buffer += data
+        *lines, buffer = buffer.split(b"\n")
+        for line in lines:
+            yield line
+
+    if decompressor:
+        buffer += decompressor.flush()
+    for line in buffer.split(b"\n"):
+        yield line
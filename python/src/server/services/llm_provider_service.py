@@ -14,6 +14,9 @@ import openai
 
 from ..config.logfire_config import get_logger
 from .credential_service import credential_service
+from .metrics_service import provider_event_hooks
+from .settings_snapshot import SettingsSnapshot, subscribe
+from .threading_service import record_rate_limit_headers
 
 logger = get_logger(__name__)
 
@@ -157,6 +160,14 @@ def clear_provider_cache() -> None:
     logger.debug(f"Provider configuration cache cleared ({cache_size_before} entries removed)")
 
 
+def _on_settings_changed(_snapshot: SettingsSnapshot) -> None:
+    """Drop provider configurations built from the previous settings."""
+    clear_provider_cache()
+
+
+subscribe(_on_settings_changed)
+
+
 def invalidate_provider_cache(provider: str = None) -> None:
     """
     Invalidate specific provider cache entries or all cache entries.
@@ -309,6 +320,18 @@ def get_cache_security_report() -> dict[str, Any]:
         report["recommendations"].append(f"Multiple invalid configuration attempts ({invalid_configs}) - validate data sources")
 
     return report
+
+
+def _rate_limited_http_client(provider: str):
+    """
+    HTTP client that reports provider rate-limit headers to the active
+    rate limiter and records request metrics for the provider.
+    """
+    hooks = provider_event_hooks(provider)
+    hooks["response"].append(record_rate_limit_headers)
+    return openai.DefaultAsyncHttpxClient(event_hooks=hooks)
+
+
 @asynccontextmanager
 async def get_llm_client(
     provider: str | None = None,
@@ -398,7 +421,7 @@ async def get_llm_client(
 
         if provider_name == "openai":
             if api_key:
-                client = openai.AsyncOpenAI(api_key=api_key)
+                client = openai.AsyncOpenAI(api_key=api_key, http_client=_rate_limited_http_client("openai"))
                 logger.info("OpenAI client created successfully")
             else:
                 logger.warning("OpenAI API key not found, attempting Ollama fallback")
@@ -415,6 +438,7 @@ async def get_llm_client(
                     client = openai.AsyncOpenAI(
                         api_key="ollama",
                         base_url=ollama_base_url,
+                        http_client=_rate_limited_http_client("ollama"),
                     )
                     logger.info(
                         f"Ollama fallback client created successfully with base URL: {ollama_base_url}"
@@ -439,6 +463,7 @@ async def get_llm_client(
             client = openai.AsyncOpenAI(
                 api_key="ollama",  # Required but unused by Ollama
                 base_url=ollama_base_url,
+                http_client=_rate_limited_http_client("ollama"),
             )
             logger.info(f"Ollama client created successfully with base URL: {ollama_base_url}")
 
@@ -449,6 +474,7 @@ async def get_llm_client(
             client = openai.AsyncOpenAI(
                 api_key=api_key,
                 base_url=base_url or "https://generativelanguage.googleapis.com/v1beta/openai/",
+                http_client=_rate_limited_http_client("google"),
             )
             logger.info("Google Gemini client created successfully")
 
@@ -459,6 +485,7 @@ async def get_llm_client(
             client = openai.AsyncOpenAI(
                 api_key=api_key,
                 base_url=base_url or "https://openrouter.ai/api/v1",
+                http_client=_rate_limited_http_client("openrouter"),
             )
             logger.info("OpenRouter client created successfully")
 
@@ -469,6 +496,7 @@ async def get_llm_client(
             client = openai.AsyncOpenAI(
                 api_key=api_key,
                 base_url=base_url or "https://api.anthropic.com/v1",
+                http_client=_rate_limited_http_client("anthropic"),
             )
             logger.info("Anthropic client created successfully")
 
@@ -493,6 +521,7 @@ async def get_llm_client(
             client = openai.AsyncOpenAI(
                 api_key=api_key,
                 base_url=base_url or "https://api.x.ai/v1",
+                http_client=_rate_limited_http_client("grok"),
             )
             logger.info("Grok client created successfully")
 
@@ -720,6 +749,43 @@ def is_google_embedding_model(model: str) -> bool:
     return any(pattern in model_lower for pattern in google_patterns)
 
 
+def supports_matryoshka_embeddings(model: str) -> bool:
+    """
+    Check if an embedding model was trained with Matryoshka representation learning.
+
+    Leading components of these embeddings form a usable lower-dimension embedding
+    once renormalized, so a truncated copy can serve as a coarse search vector.
+
+    Args:
+        model: The embedding model name
+
+    Returns:
+        bool: True if truncated embeddings from the model are meaningful
+    """
+    if not model:
+        return False
+
+    model_lower = model.strip().lower()
+
+    # text-embedding-ada-002 predates the dimensions parameter and is not Matryoshka-trained
+    if "text-embedding-ada" in model_lower:
+        return False
+
+    matryoshka_patterns = [
+        "text-embedding-3-small",
+        "text-embedding-3-large",
+        "gemini-embedding-001",
+        "text-embedding-004",
+        "text-embedding-005",
+        "text-multilingual-embedding-002",
+        "nomic-embed-text",
+        "mxbai-embed-large",
+        "snowflake-arctic-embed",
+    ]
+
+    return any(pattern in model_lower for pattern in matryoshka_patterns)
+
+
 def is_valid_embedding_model_for_provider(model: str, provider: str) -> bool:
     """
     Validate if an embedding model is compatible with a provider.
@@ -0,0 +1,384 @@
+"""
+Metrics Service
+
+In-process counters and histograms for the ingestion pipeline, rendered
+in the Prometheus text format by the /metrics endpoint:
+
+- crawl stages: time spent in each stage of a crawl (discovery, crawl,
+  chunking, contextual embedding, embedding, chunk insert, code
+  summaries, ...)
+- provider requests: latency per provider, endpoint and outcome,
+  recorded by an httpx hook on the LLM clients
+- rate-limit waits: time spent waiting for a rate limiter slot
+- database requests: latency per table or RPC, recorded by an httpx hook
+  on the Supabase client
+
+Everything recorded while a crawl runs is also added to that crawl's
+CrawlMetrics (see track_crawl), which is reported in the crawl's final
+progress payload.
+"""
+
+import threading
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any
+
+# Histogram bucket upper bounds, in seconds
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0)
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(labels: dict[str, str]) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in labels.items()) + "}"
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+
+class _Metric:
+    type_name = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: tuple[str, ...] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = labelnames
+        self._lock = threading.Lock()
+
+    def _key(self, labels: dict[str, Any]) -> tuple[str, ...]:
+        if set(labels) != set(self.labelnames):
+            raise ValueError(f"{self.name} expects labels {self.labelnames}, got {tuple(labels)}")
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def _labels(self, key: tuple[str, ...]) -> dict[str, str]:
+        return dict(zip(self.labelnames, key, strict=True))
+
+    def render(self) -> list[str]:
+        return [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.type_name}"]
+
+
+class Counter(_Metric):
+    """Monotonically increasing count per label set"""
+
+    type_name = "counter"
+
+    def __init__(self, name: str, documentation: str, labelnames: tuple[str, ...] = ()):
+        super().__init__(name, documentation, labelnames)
+        self._values: dict[tuple[str, ...], float] = {}
+
+    def inc(self, amount: float = 1.0, **labels: Any) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def value(self, **labels: Any) -> float:
+        return self._values.get(self._key(labels), 0.0)
+
+    def render(self) -> list[str]:
+        lines = super().render()
+        with self._lock:
+            values = list(self._values.items())
+        for key, value in values:
+            lines.append(f"{self.name}{_format_labels(self._labels(key))} {_format_value(value)}")
+        return lines
+
+
+class Histogram(_Metric):
+    """Distribution of observed values (bucket counts, sum, count) per label set"""
+
+    type_name = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: tuple[str, ...] = (),
+        buckets: tuple[float, ...] = DEFAULT_BUCKETS,
+    ):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # Per label set: [count per bucket (non-cumulative, last is +Inf), sum]
+        self._series: dict[tuple[str, ...], tuple[list[int], list[float]]] = {}
+
+    def observe(self, value: float, **labels: Any) -> None:
+        key = self._key(labels)
+        index = next((i for i, bound in enumerate(self.buckets) if value <= bound), len(self.buckets))
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = ([0] * (len(self.buckets) + 1), [0.0])
+                self._series[key] = series
+            series[0][index] += 1
+            series[1][0] += value
+
+    def count(self, **labels: Any) -> int:
+        series = self._series.get(self._key(labels))
+        return sum(series[0]) if series else 0
+
+    def sum(self, **labels: Any) -> float:
+        series = self._series.get(self._key(labels))
+        return series[1][0] if series else 0.0
+
+    def render(self) -> list[str]:
+        lines = super().render()
+        with self._lock:
+            series = [(key, list(counts), total[0]) for key, (counts, total) in self._series.items()]
+        for key, counts, total in series:
+            labels = self._labels(key)
+            cumulative = 0
+            for bound, count in zip((*self.buckets, float("inf")), counts, strict=True):
+                cumulative += count
+                bucket_labels = _format_labels({**labels, "le": _format_value(bound)})
+                lines.append(f"{self.name}_bucket{bucket_labels} {cumulative}")
+            lines.append(f"{self.name}_sum{_format_labels(labels)} {_format_value(total)}")
+            lines.append(f"{self.name}_count{_format_labels(labels)} {cumulative}")
+        return lines
+
+
+class MetricsRegistry:
+    """Named metrics of this process, rendered together for /metrics"""
+
+    def __init__(self):
+        self._metrics: dict[str, _Metric] = {}
+        self._lock = threading.Lock()
+
+    def _register(self, metric: _Metric) -> Any:
+        with self._lock:
+            existing = self._metrics.get(metric.name)
+            if existing is not None:
+                if type(existing) is not type(metric) or existing.labelnames != metric.labelnames:
+                    raise ValueError(f"Metric {metric.name} is already registered differently")
+                return existing
+            self._metrics[metric.name] = metric
+            return metric
+
+    def counter(self, name: str, documentation: str, labelnames: tuple[str, ...] = ()) -> Counter:
+        return self._register(Counter(name, documentation, labelnames))
+
+    def histogram(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: tuple[str, ...] = (),
+        buckets: tuple[float, ...] = DEFAULT_BUCKETS,
+    ) -> Histogram:
+        return self._register(Histogram(name, documentation, labelnames, buckets))
+
+    def render(self) -> str:
+        """All metrics in the Prometheus text exposition format (version 0.0.4)"""
+        with self._lock:
+            metrics = list(self._metrics.values())
+        lines = []
+        for metric in metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+_registry = MetricsRegistry()
+
+
+def get_metrics_registry() -> MetricsRegistry:
+    """Get the process-wide metrics registry"""
+    return _registry
+
+
+CRAWL_STAGE_SECONDS = _registry.histogram(
+    "archon_crawl_stage_seconds", "Time spent in each crawl pipeline stage", ("stage",)
+)
+CRAWL_ITEMS_TOTAL = _registry.counter(
+    "archon_crawl_items_total", "Items produced by crawls (pages, chunks, code examples)", ("item",)
+)
+CRAWLS_TOTAL = _registry.counter("archon_crawls_total", "Finished crawls by outcome", ("status",))
+PROVIDER_REQUEST_SECONDS = _registry.histogram(
+    "archon_provider_request_seconds",
+    "LLM and embedding provider request latency until response headers",
+    ("provider", "endpoint", "status"),
+)
+RATE_LIMIT_WAIT_SECONDS = _registry.histogram(
+    "archon_rate_limit_wait_seconds", "Time spent waiting for a rate limiter slot", ("limiter",)
+)
+DATABASE_REQUEST_SECONDS = _registry.histogram(
+    "archon_database_request_seconds",
+    "Database request latency per table or RPC",
+    ("target", "operation", "status"),
+)
+
+
+class CrawlMetrics:
+    """
+    Breakdown of one crawl: time and call counts per stage, provider
+    endpoint, rate limiter and database target.
+
+    Stage and call times are summed over concurrent work, so they can
+    exceed the crawl's wall time.
+    """
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self._groups: dict[str, dict[str, list[float]]] = {}
+        self._items: dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def add(self, group: str, name: str, seconds: float) -> None:
+        with self._lock:
+            totals = self._groups.setdefault(group, {}).setdefault(name, [0, 0.0])
+            totals[0] += 1
+            totals[1] += seconds
+
+    def count_items(self, item: str, count: int) -> None:
+        with self._lock:
+            self._items[item] = self._items.get(item, 0) + count
+
+    def as_dict(self) -> dict[str, Any]:
+        wall = time.perf_counter() - self.started
+        with self._lock:
+            result: dict[str, Any] = {
+                group: {
+                    name: {"count": int(count), "seconds": round(seconds, 3)}
+                    for name, (count, seconds) in totals.items()
+                }
+                for group, totals in self._groups.items()
+            }
+            items = dict(self._items)
+        result["wall_seconds"] = round(wall, 3)
+        result["items"] = items
+        result["throughput"] = {f"{item}_per_sec": round(count / wall, 2) if wall > 0 else 0.0 for item, count in items.items()}
+        return result
+
+
+# Breakdown of the crawl running in the current task (None outside crawls)
+_current_crawl: ContextVar[CrawlMetrics | None] = ContextVar("current_crawl_metrics", default=None)
+
+
+def track_crawl() -> CrawlMetrics:
+    """
+    Start a breakdown for the crawl running in the current task.
+
+    Metrics recorded from this task, and from tasks and threads it
+    starts afterwards, are added to the returned CrawlMetrics.
+    """
+    crawl = CrawlMetrics()
+    _current_crawl.set(crawl)
+    return crawl
+
+
+def current_crawl() -> CrawlMetrics | None:
+    return _current_crawl.get()
+
+
+@contextmanager
+def stage_timer(stage: str) -> Iterator[None]:
+    """Time a block as a crawl pipeline stage (also when it raises)"""
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - started
+        CRAWL_STAGE_SECONDS.observe(elapsed, stage=stage)
+        crawl = _current_crawl.get()
+        if crawl is not None:
+            crawl.add("stages", stage, elapsed)
+
+
+def record_crawl_items(item: str, count: int) -> None:
+    """Count pages, chunks or code examples produced by the current crawl"""
+    if count <= 0:
+        return
+    CRAWL_ITEMS_TOTAL.inc(count, item=item)
+    crawl = _current_crawl.get()
+    if crawl is not None:
+        crawl.count_items(item, count)
+
+
+def record_rate_limit_wait(limiter: str, seconds: float) -> None:
+    RATE_LIMIT_WAIT_SECONDS.observe(seconds, limiter=limiter)
+    crawl = _current_crawl.get()
+    if crawl is not None:
+        crawl.add("rate_limit_waits", limiter, seconds)
+
+
+def _status(status_code: int) -> str:
+    if status_code == 429:
+        return "rate_limited"
+    return "ok" if status_code < 400 else "error"
+
+
+def _provider_endpoint(path: str) -> str:
+    if path.endswith("/embeddings"):
+        return "embeddings"
+    if path.endswith("/chat/completions"):
+        return "chat"
+    return path.rstrip("/").rsplit("/", 1)[-1] or "unknown"
+
+
+def provider_event_hooks(provider: str) -> dict[str, list]:
+    """httpx event hooks (async client) recording provider request metrics"""
+
+    async def mark_start(request) -> None:
+        request.extensions["archon_started"] = time.perf_counter()
+
+    async def record(response) -> None:
+        started = response.request.extensions.get("archon_started")
+        if started is None:
+            return
+        elapsed = time.perf_counter() - started
+        endpoint = _provider_endpoint(response.request.url.path)
+        PROVIDER_REQUEST_SECONDS.observe(
+            elapsed, provider=provider, endpoint=endpoint, status=_status(response.status_code)
+        )
+        crawl = _current_crawl.get()
+        if crawl is not None:
+            crawl.add("provider_requests", f"{provider}/{endpoint}", elapsed)
+
+    return {"request": [mark_start], "response": [record]}
+
+
+def _database_operation(request) -> tuple[str, str]:
+    """(table or function, operation) of a PostgREST request"""
+    path = request.url.path.rstrip("/")
+    target = path.rsplit("/", 1)[-1]
+    if "/rpc/" in path:
+        return target, "rpc"
+    method = request.method
+    if method == "POST":
+        return target, "upsert" if "resolution=" in request.headers.get("prefer", "") else "insert"
+    operation = {"GET": "select", "HEAD": "count", "PATCH": "update", "DELETE": "delete"}.get(method, method.lower())
+    return target, operation
+
+
+def _mark_database_start(request) -> None:
+    request.extensions["archon_started"] = time.perf_counter()
+
+
+def _record_database_response(response) -> None:
+    started = response.request.extensions.get("archon_started")
+    if started is None:
+        return
+    # Include the body transfer; the client reads the body right after anyway
+    response.read()
+    elapsed = time.perf_counter() - started
+    target, operation = _database_operation(response.request)
+    DATABASE_REQUEST_SECONDS.observe(
+        elapsed, target=target, operation=operation, status=_status(response.status_code)
+    )
+    crawl = _current_crawl.get()
+    if crawl is not None:
+        crawl.add("database", f"{operation} {target}", elapsed)
+
+
+def instrument_supabase_client(client) -> None:
+    """Record the latency of the Supabase client's PostgREST requests"""
+    session = client.postgrest.session
+    hooks = session.event_hooks
+    hooks["request"].append(_mark_database_start)
+    hooks["response"].append(_record_database_response)
+    session.event_hooks = hooks
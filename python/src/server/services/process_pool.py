@@ -0,0 +1,265 @@
+"""
+CPU Process Pool for Archon
+
+Pure-Python CPU work (chunking, regex code extraction, llms-full parsing,
+PDF parsing) gets no parallelism from threads because it holds the GIL.
+CpuProcessPool runs such work in worker processes:
+
+- spawn start method: forking a process that runs an event loop and
+  thread pools is unsafe
+- warm workers: start() launches every worker up front, and each worker
+  imports the task modules once, so tasks don't pay for process start-up
+  and imports. Each worker holds its own copy of those modules, so the
+  default is a small pool (CPU_PROCESS_WORKERS raises it)
+- bounded queue: at most workers + queue size tasks are submitted at
+  once, and later callers wait. Under memory pressure the limit drops
+  to the worker count.
+- per-task timing: queue wait, worker wall time and worker CPU time per
+  task name (see get_stats)
+
+Tasks must be picklable: module-level functions with picklable arguments
+and results (see cpu_tasks.py). The call is pickled once, when it is
+submitted; run() raises UnpicklableTaskError if that fails.
+"""
+
+import asyncio
+import importlib
+import multiprocessing
+import os
+import pickle
+import time
+from collections.abc import Callable
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass
+from typing import Any
+
+from ..config.logfire_config import get_logger
+
+logger = get_logger(__name__)
+
+# Modules each worker imports at start-up (the task functions and their dependencies)
+WARM_MODULES = ("src.server.services.cpu_tasks",)
+
+# Workers started without CPU_PROCESS_WORKERS (fewer on machines with fewer cores)
+DEFAULT_PROCESS_WORKERS = 2
+
+
+class UnpicklableTaskError(TypeError):
+    """Raised when a task's function or arguments cannot be sent to a worker process"""
+
+
+def default_process_workers() -> int:
+    """Worker processes: CPU_PROCESS_WORKERS, or DEFAULT_PROCESS_WORKERS capped at the core count."""
+    default = min(DEFAULT_PROCESS_WORKERS, os.cpu_count() or 1)
+    return max(1, int(os.getenv("CPU_PROCESS_WORKERS", str(default))))
+
+
+def default_queue_size(workers: int) -> int:
+    """Tasks allowed to wait for a worker: CPU_PROCESS_QUEUE_SIZE, or two per worker."""
+    return max(0, int(os.getenv("CPU_PROCESS_QUEUE_SIZE", str(workers * 2))))
+
+
+def _init_worker(modules: tuple[str, ...]) -> None:
+    for name in modules:
+        try:
+            importlib.import_module(name)
+        except Exception:
+            # The task itself will raise the import error with context
+            pass
+
+
+def _worker_pid() -> int:
+    return os.getpid()
+
+
+def _timed_call(payload: bytes) -> tuple[Any, float, float]:
+    """Run a pickled call in the worker and measure its wall and CPU time."""
+    func, args, kwargs = pickle.loads(payload)
+    wall_start = time.perf_counter()
+    cpu_start = time.process_time()
+    result = func(*args, **kwargs)
+    return result, time.perf_counter() - wall_start, time.process_time() - cpu_start
+
+
+@dataclass
+class TaskTiming:
+    """Accumulated timing of one task type"""
+
+    count: int = 0
+    failures: int = 0
+    queue_seconds: float = 0.0
+    wall_seconds: float = 0.0
+    cpu_seconds: float = 0.0
+    max_wall_seconds: float = 0.0
+
+    def record(self, queue_seconds: float, wall_seconds: float, cpu_seconds: float):
+        self.count += 1
+        self.queue_seconds += queue_seconds
+        self.wall_seconds += wall_seconds
+        self.cpu_seconds += cpu_seconds
+        self.max_wall_seconds = max(self.max_wall_seconds, wall_seconds)
+
+    def as_dict(self) -> dict[str, Any]:
+        runs = max(self.count, 1)
+        return {
+            "count": self.count,
+            "failures": self.failures,
+            "avg_queue_ms": round(self.queue_seconds / runs * 1000, 3),
+            "avg_wall_ms": round(self.wall_seconds / runs * 1000, 3),
+            "avg_cpu_ms": round(self.cpu_seconds / runs * 1000, 3),
+            "max_wall_ms": round(self.max_wall_seconds * 1000, 3),
+        }
+
+
+class CpuProcessPool:
+    """Shared pool of worker processes for CPU-bound tasks"""
+
+    def __init__(
+        self,
+        max_workers: int | None = None,
+        max_queued: int | None = None,
+        memory_pressure: Callable[[], bool] | None = None,
+        warm_modules: tuple[str, ...] = WARM_MODULES,
+    ):
+        self.max_workers = max(1, max_workers or default_process_workers())
+        self.max_queued = default_queue_size(self.max_workers) if max_queued is None else max_queued
+        self.warm_modules = warm_modules
+        # Returns True while memory is constrained (see MemoryAdaptiveDispatcher)
+        self.memory_pressure = memory_pressure
+        self._executor: ProcessPoolExecutor | None = None
+        self._in_flight = 0
+        self._condition: asyncio.Condition | None = None
+        self._condition_loop: asyncio.AbstractEventLoop | None = None
+        self.timings: dict[str, TaskTiming] = {}
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.max_workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_worker,
+                initargs=(self.warm_modules,),
+            )
+        return self._executor
+
+    def _get_condition(self) -> asyncio.Condition:
+        loop = asyncio.get_running_loop()
+        if self._condition is None or self._condition_loop is not loop:
+            self._condition = asyncio.Condition()
+            self._condition_loop = loop
+            self._in_flight = 0
+        return self._condition
+
+    def admission_limit(self) -> int:
+        """Tasks that may be submitted at once (workers only under memory pressure)."""
+        if self.memory_pressure is not None and self.memory_pressure():
+            return self.max_workers
+        return self.max_workers + self.max_queued
+
+    async def start(self):
+        """Start all workers now instead of on first use."""
+        loop = asyncio.get_running_loop()
+        executor = self._get_executor()
+        started = time.perf_counter()
+        pids = await asyncio.gather(
+            *(loop.run_in_executor(executor, _worker_pid) for _ in range(self.max_workers))
+        )
+        logger.info(
+            "CPU process pool started",
+            extra={
+                "workers": len(set(pids)),
+                "max_workers": self.max_workers,
+                "startup_ms": round((time.perf_counter() - started) * 1000),
+            },
+        )
+
+    async def run(self, func: Callable, *args, task_name: str | None = None, **kwargs) -> Any:
+        """
+        Run func(*args, **kwargs) in a worker process.
+
+        Waits for a slot when the queue is full.
+
+        Args:
+            func: Picklable (module-level) function
+            task_name: Name the timing is recorded under (default: the function's name)
+
+        Returns:
+            The function's result
+
+        Raises:
+            UnpicklableTaskError: If the function or its arguments cannot be pickled
+            BrokenProcessPool: If a worker died; the pool is replaced for later tasks
+        """
+        name = task_name or getattr(func, "__qualname__", repr(func))
+        try:
+            payload = pickle.dumps((func, args, kwargs), protocol=pickle.HIGHEST_PROTOCOL)
+        except Exception as e:
+            raise UnpicklableTaskError(f"Cannot send {name} to a worker process: {e}") from e
+
+        condition = self._get_condition()
+        requested = time.perf_counter()
+        async with condition:
+            await condition.wait_for(lambda: self._in_flight < self.admission_limit())
+            self._in_flight += 1
+
+        timing = self.timings.setdefault(name, TaskTiming())
+        try:
+            loop = asyncio.get_running_loop()
+            executor = self._get_executor()
+            result, wall, cpu = await loop.run_in_executor(executor, _timed_call, payload)
+        except BrokenProcessPool:
+            timing.failures += 1
+            logger.error("CPU process pool broken, replacing it", extra={"task": name})
+            self._discard_executor(executor)
+            raise
+        except BaseException:
+            timing.failures += 1
+            raise
+        finally:
+            async with condition:
+                self._in_flight -= 1
+                condition.notify_all()
+
+        elapsed = time.perf_counter() - requested
+        timing.record(max(0.0, elapsed - wall), wall, cpu)
+        return result
+
+    def _discard_executor(self, executor: ProcessPoolExecutor):
+        if self._executor is executor:
+            self._executor = None
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    def shutdown(self, wait: bool = False):
+        """Stop the workers; the pool starts again on next use."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=wait, cancel_futures=True)
+            self._executor = None
+
+    def get_stats(self) -> dict[str, Any]:
+        """Pool size, queue state and per-task timing"""
+        return {
+            "max_workers": self.max_workers,
+            "max_queued": self.max_queued,
+            "in_flight": self._in_flight,
+            "admission_limit": self.admission_limit(),
+            "tasks": {name: timing.as_dict() for name, timing in self.timings.items()},
+        }
+
+
+# Global CPU process pool instance
+_cpu_process_pool: CpuProcessPool | None = None
+
+
+def get_cpu_process_pool() -> CpuProcessPool:
+    """Get the global CPU process pool (workers start on first use or start())"""
+    global _cpu_process_pool
+    if _cpu_process_pool is None:
+        _cpu_process_pool = CpuProcessPool()
+    return _cpu_process_pool
+
+
+def shutdown_cpu_process_pool():
+    """Stop the global pool's workers, if they were started"""
+    if _cpu_process_pool is not None:
+        _cpu_process_pool.shutdown()
@@ -10,12 +10,13 @@ from .document_service import DocumentService
 from .project_creation_service import ProjectCreationService
 from .project_service import ProjectService
 from .source_linking_service import SourceLinkingService
-from .task_service import TaskService
+from .task_service import InvalidTaskCursorError, TaskService
 from .versioning_service import VersioningService
 
 __all__ = [
     "ProjectService",
     "TaskService",
+    "InvalidTaskCursorError",
     "DocumentService",
     "VersioningService",
     "ProjectCreationService",
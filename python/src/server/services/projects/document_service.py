@@ -3,6 +3,11 @@ Document Service Module for Archon
 
 This module provides core business logic for document operations within projects
 that can be shared between MCP tools and FastAPI endpoints.
+
+Documents are rows of archon_project_documents, so adding, updating or
+deleting one document is a single-row operation. The archon_projects_with_docs
+view still exposes the old docs JSONB array for external readers. Each
+document is versioned on its own under the field name "docs:<document id>".
 """
 
 import uuid
@@ -14,9 +19,109 @@ from typing import Any
 from src.server.utils import get_supabase_client
 
 from ...config.logfire_config import get_logger
+from ..change_version_service import PROJECTS, change_versions
+from ..database_errors import is_missing_function_error
 
 logger = get_logger(__name__)
 
+DOCUMENTS_TABLE = "archon_project_documents"
+
+# Document keys stored in their own columns (anything else goes to extra)
+DOCUMENT_COLUMNS = (
+    "id",
+    "document_type",
+    "title",
+    "content",
+    "tags",
+    "status",
+    "version",
+    "author",
+    "created_at",
+    "updated_at",
+)
+
+# Columns of document listings (content_size is generated from content by the database)
+DOCUMENT_METADATA_COLUMNS = (
+    "id, project_id, position, document_type, title, tags, status, version, author, "
+    "extra, content_size, created_at, updated_at"
+)
+
+UPDATABLE_DOCUMENT_FIELDS = ("title", "content", "status", "tags", "author", "version")
+
+# Rows read per request; PostgREST caps a response at its max-rows setting (1000 by default)
+DOCUMENT_PAGE_SIZE = 1000
+
+# Version field names of single documents start with this prefix
+DOCUMENT_VERSION_FIELD_PREFIX = "docs:"
+
+
+def document_version_field(doc_id: str) -> str:
+    """Version field name of one document."""
+    return f"{DOCUMENT_VERSION_FIELD_PREFIX}{doc_id}"
+
+
+def document_id_from_version_field(field_name: str) -> str | None:
+    """Document ID of a single-document version field (None for other fields)."""
+    if field_name.startswith(DOCUMENT_VERSION_FIELD_PREFIX):
+        return field_name[len(DOCUMENT_VERSION_FIELD_PREFIX) :] or None
+    return None
+
+
+def document_from_row(row: dict[str, Any]) -> dict[str, Any]:
+    """Convert an archon_project_documents row to the document layout clients expect."""
+    document = dict(row.get("extra") or {})
+    for key in DOCUMENT_COLUMNS:
+        if key in row:
+            document[key] = row[key]
+    if document.get("author") is None:
+        document.pop("author", None)
+    return document
+
+
+def document_to_row(
+    project_id: str, document: dict[str, Any], position: int | None = None
+) -> dict[str, Any]:
+    """
+    Convert a document from the docs JSONB layout to an archon_project_documents row.
+
+    Without a position the row has no position column; the database then
+    places a new document after the project's last one.
+    """
+    row = {
+        "id": str(document.get("id") or uuid.uuid4()),
+        "project_id": project_id,
+        "document_type": document.get("document_type"),
+        "title": document.get("title"),
+        "content": document.get("content") or {},
+        "tags": document.get("tags") or [],
+        "status": document.get("status") or "draft",
+        "version": document.get("version") or "1.0",
+        "author": document.get("author"),
+        "extra": {key: value for key, value in document.items() if key not in DOCUMENT_COLUMNS},
+    }
+    if position is not None:
+        row["position"] = position
+    for key in ("created_at", "updated_at"):
+        if document.get(key):
+            row[key] = document[key]
+    return row
+
+
+def document_metadata(row: dict[str, Any]) -> dict[str, Any]:
+    """Metadata view of a document listing row (no content)."""
+    return {
+        "id": row.get("id"),
+        "document_type": row.get("document_type"),
+        "title": row.get("title"),
+        "status": row.get("status"),
+        "version": row.get("version"),
+        "tags": row.get("tags") or [],
+        "author": row.get("author"),
+        "created_at": row.get("created_at"),
+        "updated_at": row.get("updated_at"),
+        "stats": {"content_size": row.get("content_size") or 0},
+    }
+
 
 class DocumentService:
     """Service class for document operations within projects"""
@@ -35,25 +140,12 @@ class DocumentService:
         author: str = None,
     ) -> tuple[bool, dict[str, Any]]:
         """
-        Add a new document to a project's docs JSONB field.
+        Add a new document to a project.
 
         Returns:
             Tuple of (success, result_dict)
         """
         try:
-            # Get current project
-            project_response = (
-                self.supabase_client.table("archon_projects")
-                .select("docs")
-                .eq("id", project_id)
-                .execute()
-            )
-            if not project_response.data:
-                return False, {"error": f"Project with ID {project_id} not found"}
-
-            current_docs = project_response.data[0].get("docs", [])
-
-            # Create new document entry
             new_doc = {
                 "id": str(uuid.uuid4()),
                 "document_type": document_type,
@@ -62,21 +154,15 @@ class DocumentService:
                 "tags": tags or [],
                 "status": "draft",
                 "version": "1.0",
+                "author": author,
             }
 
-            if author:
-                new_doc["author"] = author
-
-            # Add to docs array
-            updated_docs = current_docs + [new_doc]
-
-            # Update project
             response = (
-                self.supabase_client.table("archon_projects")
-                .update({"docs": updated_docs})
-                .eq("id", project_id)
+                self.supabase_client.table(DOCUMENTS_TABLE)
+                .insert(document_to_row(project_id, new_doc))
                 .execute()
             )
+            change_versions.bump(PROJECTS)
 
             if response.data:
                 return True, {
@@ -93,12 +179,14 @@ class DocumentService:
                 return False, {"error": "Failed to add document to project"}
 
         except Exception as e:
+            if _is_missing_project_error(e):
+                return False, {"error": f"Project with ID {project_id} not found"}
             logger.error(f"Error adding document: {e}")
             return False, {"error": f"Error adding document: {str(e)}"}
 
     def list_documents(self, project_id: str, include_content: bool = False) -> tuple[bool, dict[str, Any]]:
         """
-        List all documents in a project's docs JSONB field.
+        List all documents of a project.
 
         Args:
             project_id: The project ID
@@ -109,40 +197,15 @@ class DocumentService:
             Tuple of (success, result_dict)
         """
         try:
-            response = (
-                self.supabase_client.table("archon_projects")
-                .select("docs")
-                .eq("id", project_id)
-                .execute()
-            )
+            rows = self._select_documents(project_id, include_content)
 
-            if not response.data:
+            if not rows and not self._project_exists(project_id):
                 return False, {"error": f"Project with ID {project_id} not found"}
 
-            docs = response.data[0].get("docs", [])
-
-            # Format documents for response
-            documents = []
-            for doc in docs:
-                if include_content:
-                    # Return full document
-                    documents.append(doc)
-                else:
-                    # Return metadata only
-                    documents.append({
-                        "id": doc.get("id"),
-                        "document_type": doc.get("document_type"),
-                        "title": doc.get("title"),
-                        "status": doc.get("status"),
-                        "version": doc.get("version"),
-                        "tags": doc.get("tags", []),
-                        "author": doc.get("author"),
-                        "created_at": doc.get("created_at"),
-                        "updated_at": doc.get("updated_at"),
-                        "stats": {
-                            "content_size": len(str(doc.get("content", {})))
-                        }
-                    })
+            if include_content:
+                documents = [document_from_row(row) for row in rows]
+            else:
+                documents = [document_metadata(row) for row in rows]
 
             return True, {
                 "project_id": project_id,
@@ -154,39 +217,84 @@ class DocumentService:
             logger.error(f"Error listing documents: {e}")
             return False, {"error": f"Error listing documents: {str(e)}"}
 
+    def get_documents_for_projects(
+        self, project_ids: list[str], include_content: bool = False
+    ) -> dict[str, list[dict[str, Any]]]:
+        """
+        Get the documents of several projects in one query.
+
+        Returns:
+            Mapping of project ID to its documents in order (projects without documents map to [])
+        """
+        documents: dict[str, list[dict[str, Any]]] = {project_id: [] for project_id in project_ids}
+        if not project_ids:
+            return documents
+
+        rows = self._select_pages(
+            lambda: self.supabase_client.table(DOCUMENTS_TABLE)
+            .select("*" if include_content else DOCUMENT_METADATA_COLUMNS)
+            .in_("project_id", project_ids)
+            .order("project_id")
+        )
+        for row in rows:
+            document = document_from_row(row) if include_content else document_metadata(row)
+            documents.setdefault(row["project_id"], []).append(document)
+        return documents
+
+    def count_documents_for_projects(self, project_ids: list[str]) -> dict[str, int]:
+        """
+        Count the documents of several projects.
+
+        The database groups and counts them (count_project_documents); without
+        that function each project is counted separately.
+        """
+        counts: dict[str, int] = dict.fromkeys(project_ids, 0)
+        if not project_ids:
+            return counts
+
+        try:
+            response = self.supabase_client.rpc(
+                "count_project_documents", {"p_project_ids": project_ids}
+            ).execute()
+        except Exception as e:
+            if not is_missing_function_error(e):
+                raise
+            for project_id in project_ids:
+                response = (
+                    self.supabase_client.table(DOCUMENTS_TABLE)
+                    .select("id", count="exact", head=True)
+                    .eq("project_id", project_id)
+                    .execute()
+                )
+                counts[project_id] = response.count or 0
+            return counts
+
+        for row in response.data or []:
+            counts[row["project_id"]] = row["document_count"]
+        return counts
+
     def get_document(self, project_id: str, doc_id: str) -> tuple[bool, dict[str, Any]]:
         """
-        Get a specific document from a project's docs JSONB field.
+        Get a specific document of a project.
 
         Returns:
             Tuple of (success, result_dict)
         """
         try:
             response = (
-                self.supabase_client.table("archon_projects")
-                .select("docs")
-                .eq("id", project_id)
+                self.supabase_client.table(DOCUMENTS_TABLE)
+                .select("*")
+                .eq("project_id", project_id)
+                .eq("id", doc_id)
                 .execute()
             )
 
-            if not response.data:
-                return False, {"error": f"Project with ID {project_id} not found"}
-
-            docs = response.data[0].get("docs", [])
-
-            # Find the specific document
-            document = None
-            for doc in docs:
-                if doc.get("id") == doc_id:
-                    document = doc
-                    break
+            if response.data:
+                return True, {"document": document_from_row(response.data[0])}
 
-            if document:
-                return True, {"document": document}
-            else:
-                return False, {
-                    "error": f"Document with ID {doc_id} not found in project {project_id}"
-                }
+            if not self._project_exists(project_id):
+                return False, {"error": f"Project with ID {project_id} not found"}
+            return False, {"error": f"Document with ID {doc_id} not found in project {project_id}"}
 
         except Exception as e:
             logger.error(f"Error getting document: {e}")
@@ -200,26 +308,29 @@ class DocumentService:
         create_version: bool = True,
     ) -> tuple[bool, dict[str, Any]]:
         """
-        Update a document in a project's docs JSONB field.
+        Update a document of a project.
+
+        With create_version, the document as it was before the update is
+        stored as a version of its own field (document_version_field).
 
         Returns:
             Tuple of (success, result_dict)
         """
         try:
-            # Get current project docs
-            project_response = (
-                self.supabase_client.table("archon_projects")
-                .select("docs")
-                .eq("id", project_id)
-                .execute()
-            )
-            if not project_response.data:
-                return False, {"error": f"Project with ID {project_id} not found"}
-
-            current_docs = project_response.data[0].get("docs", [])
+            # Create version snapshot of this document only
+            if create_version:
+                response = (
+                    self.supabase_client.table(DOCUMENTS_TABLE)
+                    .select("*")
+                    .eq("project_id", project_id)
+                    .eq("id", doc_id)
+                    .execute()
+                )
+                if not response.data:
+                    return False, {
+                        "error": f"Document with ID {doc_id} not found in project {project_id}"
+                    }
 
-            # Create version snapshot if requested
-            if create_version and current_docs:
                 try:
                     from .versioning_service import VersioningService
 
@@ -228,8 +339,8 @@ class DocumentService:
                     change_summary = self._build_change_summary(doc_id, update_fields)
                     versioning.create_version(
                         project_id=project_id,
-                        field_name="docs",
-                        content=current_docs,
+                        field_name=document_version_field(doc_id),
+                        content=document_from_row(response.data[0]),
                         change_summary=change_summary,
                         change_type="update",
                         document_id=doc_id,
@@ -240,55 +351,28 @@ class DocumentService:
                         f"Version creation failed for document {doc_id}: {version_error}"
                     )
 
-            # Make a copy to modify
-            docs = current_docs.copy()
-
-            # Find and update the document
-            updated = False
-            for i, doc in enumerate(docs):
-                if doc.get("id") == doc_id:
-                    # Update allowed fields
-                    if "title" in update_fields:
-                        docs[i]["title"] = update_fields["title"]
-                    if "content" in update_fields:
-                        docs[i]["content"] = update_fields["content"]
-                    if "status" in update_fields:
-                        docs[i]["status"] = update_fields["status"]
-                    if "tags" in update_fields:
-                        docs[i]["tags"] = update_fields["tags"]
-                    if "author" in update_fields:
-                        docs[i]["author"] = update_fields["author"]
-                    if "version" in update_fields:
-                        docs[i]["version"] = update_fields["version"]
-
-                    docs[i]["updated_at"] = datetime.now().isoformat()
-                    updated = True
-                    break
-
-            if not updated:
-                return False, {
-                    "error": f"Document with ID {doc_id} not found in project {project_id}"
-                }
+            update_data = {
+                field: update_fields[field]
+                for field in UPDATABLE_DOCUMENT_FIELDS
+                if field in update_fields
+            }
+            update_data["updated_at"] = datetime.now().isoformat()
 
-            # Update the project
             response = (
-                self.supabase_client.table("archon_projects")
-                .update({"docs": docs, "updated_at": datetime.now().isoformat()})
-                .eq("id", project_id)
+                self.supabase_client.table(DOCUMENTS_TABLE)
+                .update(update_data)
+                .eq("project_id", project_id)
+                .eq("id", doc_id)
                 .execute()
             )
 
-            if response.data:
-                # Find the updated document to return
-                updated_doc = None
-                for doc in docs:
-                    if doc.get("id") == doc_id:
-                        updated_doc = doc
-                        break
-
-                return True, {"document": updated_doc}
-            else:
-                return False, {"error": "Failed to update document"}
+            if not response.data:
+                return False, {
+                    "error": f"Document with ID {doc_id} not found in project {project_id}"
+                }
+
+            change_versions.bump(PROJECTS)
+            return True, {"document": document_from_row(response.data[0])}
 
         except Exception as e:
             logger.error(f"Error updating document: {e}")
@@ -296,50 +380,120 @@ class DocumentService:
 
     def delete_document(self, project_id: str, doc_id: str) -> tuple[bool, dict[str, Any]]:
         """
-        Delete a document from a project's docs JSONB field.
+        Delete a document from a project.
 
         Returns:
             Tuple of (success, result_dict)
         """
         try:
-            # Get current project docs
-            project_response = (
-                self.supabase_client.table("archon_projects")
-                .select("docs")
-                .eq("id", project_id)
+            response = (
+                self.supabase_client.table(DOCUMENTS_TABLE)
+                .delete()
+                .eq("project_id", project_id)
+                .eq("id", doc_id)
                 .execute()
             )
-            if not project_response.data:
-                return False, {"error": f"Project with ID {project_id} not found"}
-
-            docs = project_response.data[0].get("docs", [])
 
-            # Remove the document
-            original_length = len(docs)
-            docs = [doc for doc in docs if doc.get("id") != doc_id]
-
-            if len(docs) == original_length:
+            if not response.data:
                 return False, {
                     "error": f"Document with ID {doc_id} not found in project {project_id}"
                 }
 
-            # Update the project
-            response = (
-                self.supabase_client.table("archon_projects")
-                .update({"docs": docs, "updated_at": datetime.now().isoformat()})
-                .eq("id", project_id)
-                .execute()
-            )
-
-            if response.data:
-                return True, {"project_id": project_id, "doc_id": doc_id}
-            else:
-                return False, {"error": "Failed to delete document"}
+            change_versions.bump(PROJECTS)
+            return True, {"project_id": project_id, "doc_id": doc_id}
 
         except Exception as e:
             logger.error(f"Error deleting document: {e}")
             return False, {"error": f"Error deleting document: {str(e)}"}
 
+    def replace_documents(
+        self, project_id: str, documents: list[dict[str, Any]]
+    ) -> list[dict[str, Any]]:
+        """
+        Replace all documents of a project with the given docs array.
+
+        Used where the whole docs field is written at once (project updates
+        and version restores). Documents keep their IDs; those missing from
+        the array are deleted.
+
+        Returns:
+            The stored documents in order
+        """
+        rows = [
+            document_to_row(project_id, document, position)
+            for position, document in enumerate(documents or [])
+            if isinstance(document, dict)
+        ]
+        if rows:
+            # Columns a document does not set keep their stored value (or the
+            # column default) instead of being written as NULL
+            self.supabase_client.table(DOCUMENTS_TABLE).upsert(
+                rows, on_conflict="project_id,id", default_to_null=False
+            ).execute()
+
+        delete_query = self.supabase_client.table(DOCUMENTS_TABLE).delete().eq("project_id", project_id)
+        if rows:
+            delete_query = delete_query.not_.in_("id", [row["id"] for row in rows])
+        delete_query.execute()
+
+        change_versions.bump(PROJECTS)
+        return [document_from_row(row) for row in rows]
+
+    def restore_document(self, project_id: str, document: dict[str, Any]) -> dict[str, Any]:
+        """
+        Write one document back from a version snapshot.
+
+        The document keeps its position; one deleted since the snapshot is
+        added again after the project's last document.
+
+        Returns:
+            The stored document
+        """
+        response = (
+            self.supabase_client.table(DOCUMENTS_TABLE)
+            .upsert(
+                document_to_row(project_id, document),
+                on_conflict="project_id,id",
+                default_to_null=False,
+            )
+            .execute()
+        )
+        change_versions.bump(PROJECTS)
+        return document_from_row(response.data[0]) if response.data else document
+
+    def _select_documents(self, project_id: str, include_content: bool) -> list[dict[str, Any]]:
+        return self._select_pages(
+            lambda: self.supabase_client.table(DOCUMENTS_TABLE)
+            .select("*" if include_content else DOCUMENT_METADATA_COLUMNS)
+            .eq("project_id", project_id)
+        )
+
+    def _select_pages(self, build_query) -> list[dict[str, Any]]:
+        """Read all rows of a document query in document order, DOCUMENT_PAGE_SIZE rows at a time."""
+        rows: list[dict[str, Any]] = []
+        while True:
+            response = (
+                build_query()
+                .order("position")
+                .order("created_at")
+                .order("id")
+                .range(len(rows), len(rows) + DOCUMENT_PAGE_SIZE - 1)
+                .execute()
+            )
+            page = response.data or []
+            rows.extend(page)
+            if len(page) < DOCUMENT_PAGE_SIZE:
+                return rows
+
+    def _project_exists(self, project_id: str) -> bool:
+        response = (
+            self.supabase_client.table("archon_projects")
+            .select("id")
+            .eq("id", project_id)
+            .execute()
+        )
+        return bool(response.data)
+
     def _build_change_summary(self, doc_id: str, update_fields: dict[str, Any]) -> str:
         """Build a human-readable change summary"""
         changes = []
@@ -354,3 +508,9 @@ class DocumentService:
             return f"Updated document '{doc_id}': {', '.join(changes)}"
         else:
             return f"Updated document '{doc_id}'"
+
+
+def _is_missing_project_error(error: Exception) -> bool:
+    """Whether an insert failed on the project foreign key (the project does not exist)."""
+    message = str(error)
+    return "23503" in message or "foreign key" in message.lower()
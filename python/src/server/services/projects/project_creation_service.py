@@ -12,6 +12,8 @@ from typing import Any
 from src.server.utils import get_supabase_client
 
 from ...config.logfire_config import get_logger
+from ..change_version_service import PROJECTS, change_versions
+from .document_service import DocumentService
 
 logger = get_logger(__name__)
 
@@ -57,7 +59,6 @@ class ProjectCreationService:
                 "github_repo": github_repo,
                 "created_at": datetime.now(UTC).isoformat(),
                 "updated_at": datetime.now(UTC).isoformat(),
-                "docs": [],  # Empty docs array to start - PRD will be added here by DocumentAgent
                 "features": kwargs.get("features", {}),
                 "data": kwargs.get("data", {}),
             }
@@ -75,6 +76,7 @@ class ProjectCreationService:
                 raise RuntimeError(f"Insert returned no data for project '{title}'")
 
             project_id = response.data[0]["id"]
+            change_versions.bump(PROJECTS)
             logger.info(f"Created project {project_id} in database")
 
             # AI processing step
@@ -83,6 +85,8 @@ class ProjectCreationService:
             ai_success = await self._generate_ai_documentation(
                 progress_id, project_id, title, description, github_repo
             )
+            # The documentation agent writes the generated docs to the project
+            change_versions.bump(PROJECTS)
 
             # Final success - fetch complete project data
             final_project_response = (
@@ -102,7 +106,9 @@ class ProjectCreationService:
                     "github_repo": final_project.get("github_repo"),
                     "created_at": final_project["created_at"],
                     "updated_at": final_project["updated_at"],
-                    "docs": final_project.get("docs", []),  # PRD documents will be here
+                    "docs": DocumentService(self.supabase_client).get_documents_for_projects(
+                        [project_id], include_content=True
+                    )[project_id],  # PRD documents will be here
                     "features": final_project.get("features", {}),
                     "data": final_project.get("data", {}),
                     "pinned": final_project.get("pinned", False),
@@ -13,9 +13,14 @@ from typing import Any
 from src.server.utils import get_supabase_client
 
 from ...config.logfire_config import get_logger
+from ..change_version_service import PROJECTS, TASKS, change_versions, tasks_of
+from .document_service import DocumentService
 
 logger = get_logger(__name__)
 
+# Project columns read by listings (docs are read from archon_project_documents)
+PROJECT_LIST_COLUMNS = "id, title, description, github_repo, pinned, features, data, created_at, updated_at"
+
 
 class ProjectService:
     """Service class for project operations"""
@@ -39,7 +44,6 @@ class ProjectService:
             # Create project data
             project_data = {
                 "title": title.strip(),
-                "docs": [],  # Will add PRD document after creation
                 "features": [],
                 "data": [],
                 "created_at": datetime.now().isoformat(),
@@ -58,6 +62,7 @@ class ProjectService:
 
             project = response.data[0]
             project_id = project["id"]
+            change_versions.bump(PROJECTS)
             logger.info(f"Project created successfully with ID: {project_id}")
 
             return True, {
@@ -78,21 +83,25 @@ class ProjectService:
         List all projects.
 
         Args:
-            include_content: If True (default), includes docs, features, data fields.
+            include_content: If True (default), includes features and data fields and
+                           document metadata (document bodies are never listed).
                            If False, returns lightweight metadata only with counts.
 
         Returns:
             Tuple of (success, result_dict)
         """
         try:
+            response = (
+                self.supabase_client.table("archon_projects")
+                .select(PROJECT_LIST_COLUMNS)
+                .order("created_at", desc=True)
+                .execute()
+            )
+            project_ids = [project["id"] for project in response.data]
+            document_service = DocumentService(self.supabase_client)
+
             if include_content:
-                # Current behavior - maintain backward compatibility
-                response = (
-                    self.supabase_client.table("archon_projects")
-                    .select("*")
-                    .order("created_at", desc=True)
-                    .execute()
-                )
+                docs_by_project = document_service.get_documents_for_projects(project_ids)
 
                 projects = []
                 for project in response.data:
@@ -104,24 +113,18 @@ class ProjectService:
                         "updated_at": project["updated_at"],
                         "pinned": project.get("pinned", False),
                         "description": project.get("description", ""),
-                        "docs": project.get("docs", []),
+                        "docs": docs_by_project.get(project["id"], []),
                         "features": project.get("features", []),
                         "data": project.get("data", []),
                     })
             else:
-                # Lightweight response for MCP - fetch all data but only return metadata + stats
-                # FIXED: N+1 query problem - now using single query
-                response = (
-                    self.supabase_client.table("archon_projects")
-                    .select("*")  # Fetch all fields in single query
-                    .order("created_at", desc=True)
-                    .execute()
-                )
+                # Lightweight response for MCP - only metadata + stats
+                docs_counts = document_service.count_documents_for_projects(project_ids)
 
                 projects = []
                 for project in response.data:
                     # Calculate counts from fetched data (no additional queries)
-                    docs_count = len(project.get("docs", []))
+                    docs_count = docs_counts.get(project["id"], 0)
                     features_count = len(project.get("features", []))
                     has_data = bool(project.get("data", []))
 
@@ -164,6 +167,9 @@ class ProjectService:
 
             if response.data:
                 project = response.data[0]
+                project["docs"] = DocumentService(
+                    self.supabase_client
+                ).get_documents_for_projects([project["id"]], include_content=True)[project["id"]]
 
                 # Get linked sources
                 technical_sources = []
@@ -259,6 +265,9 @@ class ProjectService:
                 .execute()
             )
 
+            change_versions.bump(PROJECTS, TASKS)
+            change_versions.forget(tasks_of(project_id))
+
             # For DELETE operations, success is indicated by no error, not by response.data content
             # response.data will be empty list [] even on successful deletion
             return True, {
@@ -327,12 +336,11 @@ class ProjectService:
             # Build update data
             update_data = {"updated_at": datetime.now().isoformat()}
 
-            # Add allowed fields
+            # Add allowed fields (docs are stored in archon_project_documents)
             allowed_fields = [
                 "title",
                 "description",
                 "github_repo",
-                "docs",
                 "features",
                 "data",
                 "technical_sources",
@@ -363,10 +371,10 @@ class ProjectService:
                 .eq("id", project_id)
                 .execute()
             )
+            change_versions.bump(PROJECTS)
 
             if response.data and len(response.data) > 0:
                 project = response.data[0]
-                return True, {"project": project, "message": "Project updated successfully"}
             else:
                 # If update didn't return data, fetch the project to ensure it exists and get current state
                 get_response = (
@@ -375,11 +383,15 @@ class ProjectService:
                     .eq("id", project_id)
                     .execute()
                 )
-                if get_response.data and len(get_response.data) > 0:
-                    project = get_response.data[0]
-                    return True, {"project": project, "message": "Project updated successfully"}
-                else:
+                if not get_response.data:
                     return False, {"error": f"Project with ID {project_id} not found"}
+                project = get_response.data[0]
+
+            if "docs" in update_fields:
+                project["docs"] = DocumentService(self.supabase_client).replace_documents(
+                    project_id, update_fields["docs"] or []
+                )
+            return True, {"project": project, "message": "Project updated successfully"}
 
         except Exception as e:
             logger.error(f"Error updating project: {e}")
@@ -11,6 +11,7 @@ from typing import Any
 from src.server.utils import get_supabase_client
 
 from ...config.logfire_config import get_logger
+from ..change_version_service import PROJECTS, change_versions
 
 logger = get_logger(__name__)
 
@@ -118,6 +119,8 @@ class SourceLinkingService:
                         result["business_failed"] += 1
                         logger.warning(f"Failed to link business source {source_id}: {e}")
 
+            change_versions.bump(PROJECTS)
+
             # Overall success if no critical failures
             total_failed = result["technical_failed"] + result["business_failed"]
 
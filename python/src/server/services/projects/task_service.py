@@ -6,17 +6,64 @@ shared between MCP tools and FastAPI endpoints.
 """
 
 # Removed direct logging import - using unified config
+import base64
+import json
+import uuid
 from datetime import datetime
 from typing import Any
 
 from src.server.utils import get_supabase_client
 
 from ...config.logfire_config import get_logger
+from ..change_version_service import TASKS, change_versions, tasks_of
+from ..database_errors import is_missing_function_error
 
 logger = get_logger(__name__)
 
 # Task updates are handled via polling - no broadcasting needed
 
+# Upper bound on tasks returned by one page
+MAX_TASK_PAGE_SIZE = 200
+
+
+class InvalidTaskCursorError(ValueError):
+    """Raised when a task listing cursor cannot be decoded"""
+
+
+def encode_task_cursor(task: dict[str, Any]) -> str:
+    """Encode the keyset position (task_order, created_at, id) after a task."""
+    position = [task["task_order"], task["created_at"], task["id"]]
+    return base64.urlsafe_b64encode(json.dumps(position).encode()).decode().rstrip("=")
+
+
+def decode_task_cursor(cursor: str) -> tuple[int, str, str]:
+    """
+    Decode a cursor produced by encode_task_cursor.
+
+    The values end up inside a PostgREST filter, so created_at must be an ISO
+    timestamp and id a UUID; anything else is rejected.
+
+    Raises:
+        InvalidTaskCursorError: If the cursor is malformed
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        task_order, created_at, task_id = json.loads(base64.urlsafe_b64decode(padded))
+        datetime.fromisoformat(created_at)
+        return int(task_order), created_at, str(uuid.UUID(task_id))
+    except Exception as e:
+        raise InvalidTaskCursorError(f"Invalid cursor: {cursor}") from e
+
+
+def _search_terms(search_query: str) -> list[str]:
+    """Lowercased search terms without characters that break PostgREST filters."""
+    terms = []
+    for term in search_query.lower().split():
+        term = "".join(ch for ch in term if ch not in ',()"\\*%')
+        if term:
+            terms.append(term)
+    return terms
+
 
 class TaskService:
     """Service class for task operations"""
@@ -131,6 +178,7 @@ class TaskService:
                 task_data["feature"] = feature
 
             response = self.supabase_client.table("archon_tasks").insert(task_data).execute()
+            change_versions.bump(TASKS, tasks_of(project_id))
 
             if response.data:
                 task = response.data[0]
@@ -163,11 +211,19 @@ class TaskService:
         include_closed: bool = False,
         exclude_large_fields: bool = False,
         include_archived: bool = False,
-        search_query: str = None
+        search_query: str = None,
+        limit: int | None = None,
+        offset: int = 0,
+        cursor: str | None = None,
     ) -> tuple[bool, dict[str, Any]]:
         """
         List tasks with various filters.
 
+        Without a limit all matching tasks are returned. With a limit one page
+        is returned, ordered by (task_order, created_at, id): either after the
+        position encoded in cursor (keyset pagination) or, without a cursor,
+        at offset together with the exact total.
+
         Args:
             project_id: Filter by project
             status: Filter by status
@@ -175,11 +231,25 @@ class TaskService:
             exclude_large_fields: If True, excludes sources and code_examples fields
             include_archived: If True, includes archived tasks
             search_query: Keyword search in title, description, and feature fields
+                (every term must match one of the fields)
+            limit: Page size (capped at MAX_TASK_PAGE_SIZE)
+            offset: Rows to skip when no cursor is given
+            cursor: next_cursor of the previous page
 
         Returns:
-            Tuple of (success, result_dict)
+            Tuple of (success, result_dict); paged results include
+            next_cursor and has_more
+
+        Raises:
+            InvalidTaskCursorError: If cursor is malformed
         """
+        keyset = decode_task_cursor(cursor) if cursor else None
+
         try:
+            paginated = limit is not None
+            # The exact total is only needed for offset pages
+            count_option = {"count": "exact"} if paginated and keyset is None else {}
+
             # Start with base query
             if exclude_large_fields:
                 # Select all fields except large JSONB ones
@@ -187,10 +257,11 @@ class TaskService:
                     "id, project_id, parent_task_id, title, description, "
                     "status, assignee, task_order, priority, feature, archived, "
                     "archived_at, archived_by, created_at, updated_at, "
-                    "sources, code_examples"  # Still fetch for counting, but will process differently
+                    "sources, code_examples",  # Still fetch for counting, but will process differently
+                    **count_option,
                 )
             else:
-                query = self.supabase_client.table("archon_tasks").select("*")
+                query = self.supabase_client.table("archon_tasks").select("*", **count_option)
 
             # Track filters for debugging
             filters_applied = []
@@ -216,29 +287,15 @@ class TaskService:
 
             # Apply keyword search if provided
             if search_query:
-                # Split search query into terms
-                search_terms = search_query.lower().split()
-                
-                # Build the filter expression for AND-of-ORs
-                # Each term must match in at least one field (OR), and all terms must match (AND)
-                if len(search_terms) == 1:
-                    # Single term: simple OR across fields
-                    term = search_terms[0]
+                # Each term must match in at least one field (OR), and all terms must
+                # match (separate or filters are ANDed). The trigram indexes on title,
+                # description and feature serve these ilike filters.
+                for term in _search_terms(search_query):
                     query = query.or_(
                         f"title.ilike.%{term}%,"
                         f"description.ilike.%{term}%,"
                         f"feature.ilike.%{term}%"
                     )
-                else:
-                    # Multiple terms: use text search for proper AND logic
-                    # Note: This requires full-text search columns to be set up in the database
-                    # For now, we'll search for the full phrase in any field
-                    full_query = search_query.lower()
-                    query = query.or_(
-                        f"title.ilike.%{full_query}%,"
-                        f"description.ilike.%{full_query}%,"
-                        f"feature.ilike.%{full_query}%"
-                    )
                 filters_applied.append(f"search={search_query}")
 
             # Filter out archived tasks only if not including them
@@ -250,17 +307,36 @@ class TaskService:
 
             logger.debug(f"Listing tasks with filters: {', '.join(filters_applied)}")
 
+            if keyset is not None:
+                # Rows strictly after the cursor in (task_order, created_at, id) order
+                task_order, created_at, task_id = keyset
+                query = query.or_(
+                    f"task_order.gt.{task_order},"
+                    f'and(task_order.eq.{task_order},created_at.gt."{created_at}"),'
+                    f'and(task_order.eq.{task_order},created_at.eq."{created_at}",id.gt.{task_id})'
+                )
+
             # Execute query and get raw response
-            response = (
-                query.order("task_order", desc=False).order("created_at", desc=False).execute()
-            )
+            query = query.order("task_order", desc=False).order("created_at", desc=False)
+            page_size = 0
+            if paginated:
+                page_size = max(1, min(limit, MAX_TASK_PAGE_SIZE))
+                # Fetch one extra row to learn whether another page follows
+                start = 0 if keyset is not None else max(offset, 0)
+                query = query.order("id", desc=False).range(start, start + page_size)
+            response = query.execute()
+
+            rows = response.data or []
+            has_more = paginated and len(rows) > page_size
+            if has_more:
+                rows = rows[:page_size]
 
             # Debug: Log task status distribution and filter effectiveness
-            if response.data:
+            if rows:
                 status_counts = {}
                 archived_counts = {"null": 0, "true": 0, "false": 0}
 
-                for task in response.data:
+                for task in rows:
                     task_status = task.get("status", "unknown")
                     status_counts[task_status] = status_counts.get(task_status, 0) + 1
 
@@ -274,13 +350,13 @@ class TaskService:
                         archived_counts["false"] += 1
 
                 logger.debug(
-                    f"Retrieved {len(response.data)} tasks. Status distribution: {status_counts}"
+                    f"Retrieved {len(rows)} tasks. Status distribution: {status_counts}"
                 )
                 logger.debug(f"Archived field distribution: {archived_counts}")
 
                 # If we're filtering by status and getting wrong results, log sample
-                if status and len(response.data) > 0:
-                    first_task = response.data[0]
+                if status and len(rows) > 0:
+                    first_task = rows[0]
                     logger.warning(
                         f"Status filter: {status}, First task status: {first_task.get('status')}, archived: {first_task.get('archived')}"
                     )
@@ -288,7 +364,7 @@ class TaskService:
                 logger.debug("No tasks found with current filters")
 
             tasks = []
-            for task in response.data:
+            for task in rows:
                 task_data = {
                     "id": task["id"],
                     "project_id": task["project_id"],
@@ -325,12 +401,18 @@ class TaskService:
             if not include_closed:
                 filter_info.append("excluding closed tasks")
 
-            return True, {
+            result = {
                 "tasks": tasks,
                 "total_count": len(tasks),
                 "filters_applied": ", ".join(filter_info) if filter_info else "none",
                 "include_closed": include_closed,
             }
+            if paginated:
+                # Keyset pages don't know the total (None); offset pages count exactly
+                result["total_count"] = getattr(response, "count", None) if keyset is None else None
+                result["has_more"] = has_more
+                result["next_cursor"] = encode_task_cursor(rows[-1]) if has_more else None
+            return True, result
 
         except Exception as e:
             logger.error(f"Error listing tasks: {e}")
@@ -412,7 +494,7 @@ class TaskService:
 
             if response.data:
                 task = response.data[0]
-
+                change_versions.bump(TASKS, tasks_of(task["project_id"]))
 
                 return True, {"task": task, "message": "Task updated successfully"}
             else:
@@ -460,6 +542,7 @@ class TaskService:
             )
 
             if response.data:
+                change_versions.bump(TASKS, tasks_of(task["project_id"]))
 
                 return True, {"task_id": task_id, "message": "Task archived successfully"}
             else:
@@ -473,7 +556,9 @@ class TaskService:
         """
         Get task counts for all projects in a single optimized query.
         
-        Returns task counts grouped by project_id and status.
+        Counts are aggregated in the database by the get_task_counts_by_project
+        RPC (one row per project and status). If the RPC does not exist
+        (migration not applied), falls back to counting task rows here.
         
         Returns:
             Tuple of (success, counts_dict) where counts_dict is:
@@ -482,24 +567,32 @@ class TaskService:
         try:
             logger.debug("Fetching task counts for all projects in batch")
 
-            # Query all non-archived tasks grouped by project_id and status
-            response = (
-                self.supabase_client.table("archon_tasks")
-                .select("project_id, status")
-                .or_("archived.is.null,archived.is.false")
-                .execute()
-            )
+            try:
+                response = self.supabase_client.rpc("get_task_counts_by_project", {}).execute()
+                count_rows = response.data or []
+            except Exception as e:
+                if not is_missing_function_error(e):
+                    raise
+                logger.info(f"Task count RPC unavailable, counting rows | error={e}")
+                # Query all non-archived tasks and count one per row
+                response = (
+                    self.supabase_client.table("archon_tasks")
+                    .select("project_id, status")
+                    .or_("archived.is.null,archived.is.false")
+                    .execute()
+                )
+                count_rows = [{**task, "task_count": 1} for task in response.data or []]
 
-            if not response.data:
+            if not count_rows:
                 logger.debug("No tasks found")
                 return True, {}
 
             # Process results into counts by project and status
             counts_by_project = {}
 
-            for task in response.data:
-                project_id = task.get("project_id")
-                status = task.get("status")
+            for row in count_rows:
+                project_id = row.get("project_id")
+                status = row.get("status")
 
                 if not project_id or not status:
                     continue
@@ -515,7 +608,7 @@ class TaskService:
 
                 # Count all statuses separately
                 if status in ["todo", "doing", "review", "done"]:
-                    counts_by_project[project_id][status] += 1
+                    counts_by_project[project_id][status] += row.get("task_count", 0)
 
             logger.debug(f"Task counts fetched for {len(counts_by_project)} projects")
 
@@ -3,18 +3,45 @@ Versioning Service Module for Archon
 
 This module provides core business logic for document versioning operations
 that can be shared between MCP tools and FastAPI endpoints.
+
+Versions are delta-encoded: every KEYFRAME_INTERVAL versions (and whenever a
+delta would not be smaller) the full content is stored as a keyframe, and the
+versions in between store a JSON patch against their predecessor. Reading a
+version replays at most KEYFRAME_INTERVAL - 1 patches onto the nearest
+keyframe. Databases without the delta columns keep full snapshots.
 """
 
 # Removed direct logging import - using unified config
+import json
 from datetime import datetime
 from typing import Any
 
 from src.server.utils import get_supabase_client
 
 from ...config.logfire_config import get_logger
+from ...utils.json_patch import apply_patch, make_patch
+from ..change_version_service import PROJECTS, change_versions
+from ..database_errors import is_missing_schema_error
+from .document_service import DocumentService, document_id_from_version_field
 
 logger = get_logger(__name__)
 
+# A full snapshot is stored at least once every KEYFRAME_INTERVAL versions
+KEYFRAME_INTERVAL = 20
+
+# Retries when another writer creates a version of the same field concurrently
+MAX_VERSION_CONFLICT_RETRIES = 3
+
+# Columns returned by version listings (content is only served per version)
+VERSION_LIST_COLUMNS = (
+    "id, project_id, field_name, version_number, change_summary, change_type, "
+    "document_id, created_by, created_at"
+)
+
+
+class VersionConflictError(Exception):
+    """Raised when the field gained a version after its delta was computed."""
+
 
 class VersioningService:
     """Service class for document versioning operations"""
@@ -39,21 +66,122 @@ class VersioningService:
         Returns:
             Tuple of (success, result_dict)
         """
+        change_summary = change_summary or f"{change_type.capitalize()} {field_name}"
         try:
-            # Get current highest version number for this project/field
-            existing_versions = (
-                self.supabase_client.table("archon_document_versions")
-                .select("version_number")
-                .eq("project_id", project_id)
-                .eq("field_name", field_name)
-                .order("version_number", desc=True)
-                .limit(1)
-                .execute()
+            for _ in range(MAX_VERSION_CONFLICT_RETRIES):
+                try:
+                    version = self._create_delta_version(
+                        project_id,
+                        field_name,
+                        content,
+                        change_summary,
+                        change_type,
+                        document_id,
+                        created_by,
+                    )
+                    break
+                except VersionConflictError:
+                    continue
+            else:
+                return False, {"error": "Failed to create version snapshot: concurrent updates"}
+        except Exception as e:
+            if not is_missing_schema_error(e):
+                logger.error(f"Error creating version: {e}")
+                return False, {"error": f"Error creating version: {str(e)}"}
+            logger.warning(
+                f"Delta versioning unavailable, storing full snapshot (run migration 017): {e}"
             )
+            return self._create_snapshot_version(
+                project_id,
+                field_name,
+                content,
+                change_summary,
+                change_type,
+                document_id,
+                created_by,
+            )
+
+        return True, {
+            "version": version,
+            "project_id": project_id,
+            "field_name": field_name,
+            "version_number": version["version_number"],
+        }
 
-            next_version = 1
-            if existing_versions.data:
-                next_version = existing_versions.data[0]["version_number"] + 1
+    def _create_delta_version(
+        self,
+        project_id: str,
+        field_name: str,
+        content: Any,
+        change_summary: str,
+        change_type: str,
+        document_id: str | None,
+        created_by: str,
+    ) -> dict[str, Any]:
+        """
+        Store content as a delta against the latest version (or as a keyframe).
+
+        Version numbering happens in the database: create_document_version()
+        locks the field, checks the latest version is still base_version and
+        assigns base_version + 1.
+
+        Raises:
+            VersionConflictError: If another version was created since base_version
+        """
+        latest = self._latest_version_number(project_id, field_name)
+
+        is_keyframe = True
+        delta = None
+        if latest is not None:
+            keyframe_number, previous = self._load_version(project_id, field_name, latest)
+            if previous is not None and latest + 1 - keyframe_number < KEYFRAME_INTERVAL:
+                delta = make_patch(previous["content"], content)
+                # Keep a keyframe when the delta would not save space
+                is_keyframe = _json_size(delta) >= _json_size(content)
+
+        result = self.supabase_client.rpc(
+            "create_document_version",
+            {
+                "p_project_id": project_id,
+                "p_field_name": field_name,
+                "p_base_version": latest,
+                "p_is_keyframe": is_keyframe,
+                "p_content": content if is_keyframe else None,
+                "p_delta": None if is_keyframe else delta,
+                "p_change_summary": change_summary,
+                "p_change_type": change_type,
+                "p_document_id": document_id,
+                "p_created_by": created_by,
+            },
+        )
+        try:
+            response = result.execute()
+        except Exception as e:
+            if "version conflict" in str(e).lower():
+                raise VersionConflictError(str(e)) from e
+            raise
+
+        rows = response.data if isinstance(response.data, list) else [response.data]
+        if not rows or not rows[0]:
+            raise RuntimeError("create_document_version returned no row")
+        version = dict(rows[0])
+        version["content"] = content
+        version.pop("delta", None)
+        return version
+
+    def _create_snapshot_version(
+        self,
+        project_id: str,
+        field_name: str,
+        content: Any,
+        change_summary: str,
+        change_type: str,
+        document_id: str | None,
+        created_by: str,
+    ) -> tuple[bool, dict[str, Any]]:
+        """Store a full snapshot (databases without the delta columns)."""
+        try:
+            next_version = (self._latest_version_number(project_id, field_name) or 0) + 1
 
             # Create new version record
             version_data = {
@@ -61,7 +189,7 @@ class VersioningService:
                 "field_name": field_name,
                 "version_number": next_version,
                 "content": content,
-                "change_summary": change_summary or f"{change_type.capitalize()} {field_name}",
+                "change_summary": change_summary,
                 "change_type": change_type,
                 "document_id": document_id,
                 "created_by": created_by,
@@ -88,6 +216,109 @@ class VersioningService:
             logger.error(f"Error creating version: {e}")
             return False, {"error": f"Error creating version: {str(e)}"}
 
+    def _latest_version_number(self, project_id: str, field_name: str) -> int | None:
+        """Get the highest version number of a field (None if it has no versions)."""
+        result = (
+            self.supabase_client.table("archon_document_versions")
+            .select("version_number")
+            .eq("project_id", project_id)
+            .eq("field_name", field_name)
+            .order("version_number", desc=True)
+            .limit(1)
+            .execute()
+        )
+        if result.data:
+            return result.data[0]["version_number"]
+        return None
+
+    def _reconstruct(
+        self, project_id: str, field_name: str, version_number: int
+    ) -> dict[str, Any] | None:
+        """
+        Rebuild a version from its nearest keyframe and the deltas after it.
+
+        Falls back to reading full snapshots only when the delta columns do
+        not exist; any other error is raised.
+
+        Returns:
+            The version row with its full content, or None if it does not exist
+        """
+        try:
+            _, version = self._load_version(project_id, field_name, version_number)
+        except Exception as e:
+            if not is_missing_schema_error(e):
+                raise
+            logger.warning(f"Delta versioning unavailable, reading full snapshot: {e}")
+            return self._get_snapshot(project_id, field_name, version_number)
+        return version
+
+    def _load_version(
+        self, project_id: str, field_name: str, version_number: int
+    ) -> tuple[int | None, dict[str, Any] | None]:
+        """
+        Read the nearest keyframe at or below a version and replay the deltas after it.
+
+        Returns:
+            Tuple of (keyframe version number, version row with full content),
+            with None for whatever does not exist
+        """
+        keyframe_result = (
+            self.supabase_client.table("archon_document_versions")
+            .select("*")
+            .eq("project_id", project_id)
+            .eq("field_name", field_name)
+            .eq("is_keyframe", True)
+            .lte("version_number", version_number)
+            .order("version_number", desc=True)
+            .limit(1)
+            .execute()
+        )
+
+        if not keyframe_result.data:
+            return None, None
+        keyframe = keyframe_result.data[0]
+        keyframe_number = keyframe["version_number"]
+        if keyframe_number == version_number:
+            return keyframe_number, keyframe
+
+        deltas_result = (
+            self.supabase_client.table("archon_document_versions")
+            .select("*")
+            .eq("project_id", project_id)
+            .eq("field_name", field_name)
+            .gt("version_number", keyframe_number)
+            .lte("version_number", version_number)
+            .order("version_number", desc=False)
+            .execute()
+        )
+        rows = deltas_result.data or []
+        if not rows or rows[-1]["version_number"] != version_number:
+            return keyframe_number, None
+
+        content = keyframe["content"]
+        for row in rows:
+            if row.get("is_keyframe"):
+                content = row["content"]
+            else:
+                content = apply_patch(content, row.get("delta") or [])
+
+        version = dict(rows[-1])
+        version["content"] = content
+        return keyframe_number, version
+
+    def _get_snapshot(
+        self, project_id: str, field_name: str, version_number: int
+    ) -> dict[str, Any] | None:
+        result = (
+            self.supabase_client.table("archon_document_versions")
+            .select("*")
+            .eq("project_id", project_id)
+            .eq("field_name", field_name)
+            .eq("version_number", version_number)
+            .execute()
+        )
+        return result.data[0] if result.data else None
+
     def list_versions(self, project_id: str, field_name: str = None) -> tuple[bool, dict[str, Any]]:
         """
         Get version history for project JSONB fields.
@@ -99,7 +330,7 @@ class VersioningService:
             # Build query
             query = (
                 self.supabase_client.table("archon_document_versions")
-                .select("*")
+                .select(VERSION_LIST_COLUMNS)
                 .eq("project_id", project_id)
             )
 
@@ -133,18 +364,10 @@ class VersioningService:
             Tuple of (success, result_dict)
         """
         try:
-            # Query for specific version
-            result = (
-                self.supabase_client.table("archon_document_versions")
-                .select("*")
-                .eq("project_id", project_id)
-                .eq("field_name", field_name)
-                .eq("version_number", version_number)
-                .execute()
-            )
+            version = self._reconstruct(project_id, field_name, version_number)
 
-            if result.data:
-                version = result.data[0]
+            if version:
+                version.pop("delta", None)
                 return True, {
                     "version": version,
                     "content": version["content"],
@@ -162,55 +385,66 @@ class VersioningService:
         self, project_id: str, field_name: str, version_number: int, restored_by: str = "system"
     ) -> tuple[bool, dict[str, Any]]:
         """
-        Restore a project JSONB field to a specific version.
+        Restore a project JSONB field (or a single document) to a specific version.
 
         Returns:
             Tuple of (success, result_dict)
         """
         try:
             # Get the version to restore
-            version_result = (
-                self.supabase_client.table("archon_document_versions")
-                .select("*")
-                .eq("project_id", project_id)
-                .eq("field_name", field_name)
-                .eq("version_number", version_number)
-                .execute()
-            )
+            version_to_restore = self._reconstruct(project_id, field_name, version_number)
 
-            if not version_result.data:
+            if not version_to_restore:
                 return False, {
                     "error": f"Version {version_number} not found for {field_name} in project {project_id}"
                 }
 
-            version_to_restore = version_result.data[0]
             content_to_restore = version_to_restore["content"]
 
-            # Get current content to create backup
+            # Get current content to create backup (docs live in their own table)
+            is_docs = field_name == "docs"
+            document_id = document_id_from_version_field(field_name)
+            in_documents_table = is_docs or document_id is not None
             current_project = (
                 self.supabase_client.table("archon_projects")
-                .select(field_name)
+                .select("id" if in_documents_table else field_name)
                 .eq("id", project_id)
                 .execute()
             )
             if current_project.data:
-                current_content = current_project.data[0].get(field_name, {})
-
-                # Create backup version before restore
-                backup_result = self.create_version(
-                    project_id=project_id,
-                    field_name=field_name,
-                    content=current_content,
-                    change_summary=f"Backup before restoring to version {version_number}",
-                    change_type="backup",
-                    created_by=restored_by,
-                )
-
-                if not backup_result[0]:
-                    logger.warning(f"Failed to create backup version: {backup_result[1]}")
+                if is_docs:
+                    _, documents = DocumentService(self.supabase_client).list_documents(
+                        project_id, include_content=True
+                    )
+                    current_content = documents.get("documents", [])
+                elif document_id is not None:
+                    # A document deleted since the version has nothing to back up
+                    _, document = DocumentService(self.supabase_client).get_document(
+                        project_id, document_id
+                    )
+                    current_content = document.get("document")
+                else:
+                    current_content = current_project.data[0].get(field_name, {})
+
+                if current_content is not None:
+                    # Create backup version before restore
+                    backup_result = self.create_version(
+                        project_id=project_id,
+                        field_name=field_name,
+                        content=current_content,
+                        change_summary=f"Backup before restoring to version {version_number}",
+                        change_type="backup",
+                        document_id=document_id,
+                        created_by=restored_by,
+                    )
+
+                    if not backup_result[0]:
+                        logger.warning(f"Failed to create backup version: {backup_result[1]}")
 
             # Restore the content to project
-            update_data = {field_name: content_to_restore, "updated_at": datetime.now().isoformat()}
+            update_data = {"updated_at": datetime.now().isoformat()}
+            if not in_documents_table:
+                update_data[field_name] = content_to_restore
 
             restore_result = (
                 self.supabase_client.table("archon_projects")
@@ -218,8 +452,18 @@ class VersioningService:
                 .eq("id", project_id)
                 .execute()
             )
+            change_versions.bump(PROJECTS)
 
             if restore_result.data:
+                if is_docs:
+                    DocumentService(self.supabase_client).replace_documents(
+                        project_id, content_to_restore or []
+                    )
+                elif document_id is not None:
+                    DocumentService(self.supabase_client).restore_document(
+                        project_id, {**content_to_restore, "id": document_id}
+                    )
+
                 # Create restore version record
                 restore_version_result = self.create_version(
                     project_id=project_id,
@@ -227,6 +471,7 @@ class VersioningService:
                     content=content_to_restore,
                     change_summary=f"Restored to version {version_number}",
                     change_type="restore",
+                    document_id=document_id,
                     created_by=restored_by,
                 )
 
@@ -242,3 +487,7 @@ class VersioningService:
         except Exception as e:
             logger.error(f"Error restoring version: {e}")
             return False, {"error": f"Error restoring version: {str(e)}"}
+
+
+def _json_size(value: Any) -> int:
+    return len(json.dumps(value, separators=(",", ":"), default=str))
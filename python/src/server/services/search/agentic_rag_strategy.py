@@ -18,6 +18,7 @@ from supabase import Client
 
 from ...config.logfire_config import get_logger, safe_span
 from ..embeddings.embedding_service import create_embedding
+from ..settings_snapshot import get_settings
 
 logger = get_logger(__name__)
 
@@ -38,32 +39,7 @@ class AgenticRAGStrategy:
 
     def is_enabled(self) -> bool:
         """Check if agentic RAG is enabled via configuration."""
-        try:
-            from ..credential_service import credential_service
-
-            if hasattr(credential_service, "_cache") and credential_service._cache_initialized:
-                cached_value = credential_service._cache.get("USE_AGENTIC_RAG")
-                if cached_value:
-                    # Handle both direct values and encrypted values
-                    if isinstance(cached_value, dict) and cached_value.get("is_encrypted"):
-                        encrypted_value = cached_value.get("encrypted_value")
-                        if encrypted_value:
-                            try:
-                                value = credential_service._decrypt_value(encrypted_value)
-                            except Exception:
-                                return False
-                        else:
-                            return False
-                    else:
-                        value = str(cached_value)
-
-                    return value.lower() in ("true", "1", "yes", "on")
-
-            # Default to false if not found in settings
-            return False
-        except Exception:
-            # Default to false on any error
-            return False
+        return get_settings().use_agentic_rag
 
     async def search_code_examples(
         self,
@@ -71,6 +47,7 @@ class AgenticRAGStrategy:
         match_count: int = 10,
         filter_metadata: dict[str, Any] | None = None,
         source_id: str | None = None,
+        query_embedding: list[float] | None = None,
     ) -> list[dict[str, Any]]:
         """
         Search for code examples using vector similarity.
@@ -80,6 +57,7 @@ class AgenticRAGStrategy:
             match_count: Maximum number of results to return
             filter_metadata: Optional metadata filter
             source_id: Optional source ID to filter results
+            query_embedding: Optional pre-computed embedding for the query
 
         Returns:
             List of matching code examples
@@ -88,8 +66,9 @@ class AgenticRAGStrategy:
             "agentic_code_search", query_length=len(query), match_count=match_count
         ) as span:
             try:
-                # Create embedding for the query (no enhancement)
-                query_embedding = await create_embedding(query)
+                # Create embedding for the query (no enhancement) unless one was provided
+                if query_embedding is None:
+                    query_embedding = await create_embedding(query)
 
                 if not query_embedding:
                     logger.error("Failed to create embedding for code example query")
@@ -5,17 +5,27 @@ Implements the foundational vector similarity search that all other strategies b
 This is the core semantic search functionality.
 """
 
+import asyncio
 from typing import Any
 
 from supabase import Client
 
 from ...config.logfire_config import get_logger, safe_span
+from ..database_errors import is_missing_function_error
+from ..embeddings.multi_dimensional_embedding_service import multi_dimensional_embedding_service
+from ..llm_provider_service import get_embedding_model
+from ..settings_snapshot import get_settings
 
 logger = get_logger(__name__)
 
 # Fixed similarity threshold for vector results
 SIMILARITY_THRESHOLD = 0.05
 
+# Two-stage search: coarse candidates fetched per requested result, with a floor
+# so small match counts still rescore a useful pool
+COARSE_CANDIDATE_MULTIPLIER = 10
+COARSE_MIN_CANDIDATES = 50
+
 
 class BaseSearchStrategy:
     """Base strategy implementing fundamental vector similarity search"""
@@ -24,6 +34,28 @@ class BaseSearchStrategy:
         """Initialize with database client"""
         self.supabase_client = supabase_client
 
+    def is_coarse_search_enabled(self) -> bool:
+        """Check if two-stage coarse embedding search is enabled via configuration."""
+        return get_settings().use_coarse_embedding_search
+
+    async def get_coarse_query_embedding(self, query_embedding: list[float]) -> list[float] | None:
+        """
+        Get the truncated query vector for two-stage search.
+
+        Returns None when coarse search is disabled or the configured embedding
+        model is not Matryoshka-capable, in which case search uses the full vector.
+        """
+        if not self.is_coarse_search_enabled():
+            return None
+
+        try:
+            embedding_model = await get_embedding_model()
+        except Exception as e:
+            logger.debug(f"Could not resolve embedding model for coarse search: {e}")
+            return None
+
+        return multi_dimensional_embedding_service.get_coarse_embedding(query_embedding, embedding_model)
+
     async def vector_search(
         self,
         query_embedding: list[float],
@@ -34,7 +66,10 @@ class BaseSearchStrategy:
         """
         Perform basic vector similarity search.
 
-        This is the foundational semantic search that all strategies use.
+        This is the foundational semantic search that all strategies use. When
+        coarse search is enabled for a Matryoshka-capable model, candidates come
+        from the truncated embedding index and are rescored on the full vector
+        by the matching ``*_coarse`` RPC.
 
         Args:
             query_embedding: The embedding vector for the query
@@ -60,8 +95,36 @@ class BaseSearchStrategy:
                 else:
                     rpc_params["filter"] = {}
 
-                # Execute search
-                response = self.supabase_client.rpc(table_rpc, rpc_params).execute()
+                response = None
+
+                # Two-stage search over the coarse index when the model supports it
+                coarse_embedding = await self.get_coarse_query_embedding(query_embedding)
+                if coarse_embedding is not None:
+                    coarse_params = {
+                        **rpc_params,
+                        "query_embedding_coarse": coarse_embedding,
+                        "candidate_count": max(
+                            match_count * COARSE_CANDIDATE_MULTIPLIER, COARSE_MIN_CANDIDATES
+                        ),
+                    }
+                    try:
+                        response = await asyncio.to_thread(
+                            self.supabase_client.rpc(f"{table_rpc}_coarse", coarse_params).execute
+                        )
+                        span.set_attribute("search_mode", "coarse_rescore")
+                    except Exception as e:
+                        # Database without the coarse search functions - use the full vector;
+                        # any other error (e.g. a timeout) would only repeat on the full vector
+                        if not is_missing_function_error(e):
+                            raise
+                        logger.warning(f"Coarse search unavailable, falling back to full vector search: {e}")
+                        response = None
+
+                if response is None:
+                    # Execute search in a worker thread so concurrent searches overlap
+                    response = await asyncio.to_thread(
+                        self.supabase_client.rpc(table_rpc, rpc_params).execute
+                    )
 
                 # Filter by similarity threshold
                 filtered_results = []
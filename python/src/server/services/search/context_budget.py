@@ -0,0 +1,225 @@
+"""
+Context Budget
+
+Fits search results and page content into an agent's token budget.
+
+Results are packed greedily in score order: a result keeps its full
+content while it fits the remaining budget, and otherwise gets a snippet
+window centred on the densest cluster of query-term matches rather than
+the first characters of the chunk. Long pages are split into sections at
+markdown headings so they can be read a section at a time.
+"""
+
+import re
+from typing import Any
+
+from ..token_counter import count_tokens
+from .keyword_extractor import extract_keywords
+
+# Content length without a budget (previously a blind content[:1000])
+DEFAULT_SNIPPET_CHARS = 1000
+
+# Smallest snippet worth returning when a result does not fit whole
+MIN_SNIPPET_TOKENS = 64
+
+# Metadata, URL and JSON structure of one result
+RESULT_OVERHEAD_TOKENS = 40
+
+# Default section size for page reads
+DEFAULT_SECTION_TOKENS = 2000
+
+ELLIPSIS = "…"
+
+_SCORE_KEYS = ("rerank_score", "aggregate_similarity", "similarity_score", "similarity")
+_HEADING = re.compile(r"^#{1,6} ", re.MULTILINE)
+_BOUNDARY_SLACK = 40
+
+
+def _score(result: dict[str, Any]) -> float:
+    for key in _SCORE_KEYS:
+        if result.get(key) is not None:
+            return float(result[key])
+    return 0.0
+
+
+def match_spans(text: str, terms: list[str]) -> list[tuple[int, int]]:
+    """Positions of case-insensitive occurrences of any of the terms."""
+    if not terms:
+        return []
+    alternatives = sorted({re.escape(term) for term in terms if term}, key=len, reverse=True)
+    pattern = re.compile("|".join(alternatives), re.IGNORECASE)
+    return [match.span() for match in pattern.finditer(text)]
+
+
+def _densest_window(text: str, spans: list[tuple[int, int]], max_chars: int) -> int:
+    """Start of the window covering the most distinct terms (then most matches)."""
+    best = (-1, -1)
+    best_range = (0, 1)
+    end_index = 0
+    for i, (start, _) in enumerate(spans):
+        end_index = max(end_index, i + 1)
+        while end_index < len(spans) and spans[end_index][1] <= start + max_chars:
+            end_index += 1
+        window = spans[i:end_index]
+        score = (len({text[a:b].lower() for a, b in window}), len(window))
+        if score > best:
+            best, best_range = score, (i, end_index)
+
+    first = spans[best_range[0]][0]
+    last = spans[best_range[1] - 1][1]
+    # Centre the matched cluster in the window
+    start = (first + last) // 2 - max_chars // 2
+    return max(0, min(start, len(text) - max_chars))
+
+
+def snippet_window(text: str, query: str, max_chars: int) -> tuple[str, bool]:
+    """
+    Cut text to max_chars around the query's matches.
+
+    Args:
+        text: Content to shorten
+        query: Search query whose keywords locate the window
+        max_chars: Maximum snippet length (excluding ellipses)
+
+    Returns:
+        Tuple of (snippet, truncated); cut ends are marked with an ellipsis
+    """
+    if len(text) <= max_chars:
+        return text, False
+    max_chars = max(max_chars, 1)
+
+    spans = match_spans(text, extract_keywords(query))
+    start = _densest_window(text, spans, max_chars) if spans else 0
+    end = start + max_chars
+
+    # Snap cut ends to word boundaries
+    if start > 0:
+        space = text.find(" ", start, start + _BOUNDARY_SLACK)
+        if space != -1:
+            start = space + 1
+    if end < len(text):
+        space = text.rfind(" ", end - _BOUNDARY_SLACK, end)
+        if space > start:
+            end = space
+
+    snippet = text[start:end].strip()
+    prefix = ELLIPSIS if start > 0 else ""
+    suffix = ELLIPSIS if end < len(text) else ""
+    return f"{prefix}{snippet}{suffix}", True
+
+
+def _fit_snippet(text: str, query: str, max_tokens: int) -> str:
+    """Snippet of at most max_tokens tokens, sized from the text's own chars per token."""
+    chars_per_token = len(text) / max(count_tokens(text), 1)
+    max_chars = int(max_tokens * chars_per_token)
+    snippet, _ = snippet_window(text, query, max_chars)
+    for _ in range(3):
+        if count_tokens(snippet) <= max_tokens:
+            break
+        max_chars = int(max_chars * 0.85)
+        snippet, _ = snippet_window(text, query, max_chars)
+    return snippet
+
+
+def pack_results(
+    results: list[dict[str, Any]],
+    query: str,
+    token_budget: int,
+    content_key: str = "content",
+) -> tuple[list[dict[str, Any]], dict[str, int]]:
+    """
+    Pack results into a token budget, best scores first.
+
+    A result that does not fit whole is reduced to a snippet around the
+    query's matches when at least MIN_SNIPPET_TOKENS remain; otherwise it
+    is left out, and smaller lower-ranked results may still fit.
+
+    Args:
+        results: Search results with scores and content
+        query: The search query
+        token_budget: Tokens available for all results
+        content_key: Key of the text to fit
+
+    Returns:
+        Tuple of (packed results in score order, packing statistics)
+    """
+    ranked = sorted(results, key=_score, reverse=True)
+    remaining = token_budget
+    packed: list[dict[str, Any]] = []
+    truncated = 0
+
+    for result in ranked:
+        content = result.get(content_key) or ""
+        tokens = count_tokens(content) + RESULT_OVERHEAD_TOKENS
+        if tokens <= remaining:
+            packed.append(result)
+            remaining -= tokens
+            continue
+
+        available = remaining - RESULT_OVERHEAD_TOKENS
+        if content and available >= MIN_SNIPPET_TOKENS:
+            snippet = _fit_snippet(content, query, available)
+            packed.append({**result, content_key: snippet, "content_truncated": True})
+            remaining -= count_tokens(snippet) + RESULT_OVERHEAD_TOKENS
+            truncated += 1
+
+    return packed, {
+        "token_budget": token_budget,
+        "tokens_used": token_budget - remaining,
+        "truncated_results": truncated,
+        "omitted_results": len(results) - len(packed),
+    }
+
+
+def _split_oversized(block: str, max_tokens: int) -> list[str]:
+    """Split a block at paragraphs, then at a character limit."""
+    if count_tokens(block) <= max_tokens:
+        return [block]
+    pieces: list[str] = []
+    current = ""
+    for paragraph in block.split("\n\n"):
+        candidate = f"{current}\n\n{paragraph}" if current else paragraph
+        if count_tokens(candidate) <= max_tokens:
+            current = candidate
+            continue
+        if current:
+            pieces.append(current)
+        if count_tokens(paragraph) <= max_tokens:
+            current = paragraph
+        else:
+            chars = max(int(max_tokens * len(paragraph) / max(count_tokens(paragraph), 1)), 1)
+            pieces.extend(paragraph[i : i + chars] for i in range(0, len(paragraph), chars))
+            current = ""
+    if current:
+        pieces.append(current)
+    return pieces
+
+
+def split_sections(text: str, max_tokens: int = DEFAULT_SECTION_TOKENS) -> list[str]:
+    """
+    Split page content into sections of at most max_tokens tokens.
+
+    Sections break at markdown headings where possible, merging short
+    neighbouring parts, and fall back to paragraph and character breaks
+    for parts longer than max_tokens.
+    """
+    if not text:
+        return [""]
+    starts = [match.start() for match in _HEADING.finditer(text)]
+    bounds = [0, *[s for s in starts if s > 0], len(text)]
+    blocks = [text[a:b] for a, b in zip(bounds, bounds[1:], strict=False) if text[a:b].strip()]
+
+    sections: list[str] = []
+    current = ""
+    for block in blocks:
+        if current and count_tokens(current + block) <= max_tokens:
+            current += block
+            continue
+        if current:
+            sections.append(current)
+        parts = _split_oversized(block, max_tokens)
+        sections.extend(parts[:-1])
+        current = parts[-1]
+    if current:
+        sections.append(current)
+    return sections or [""]
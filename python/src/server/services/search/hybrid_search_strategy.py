@@ -11,6 +11,7 @@ Strategy combines:
 3. Returns union of both result sets for maximum coverage
 """
 
+import asyncio
 from typing import Any
 
 from supabase import Client
@@ -54,17 +55,19 @@ class HybridSearchStrategy:
                 filter_json = filter_metadata or {}
                 source_filter = filter_json.pop("source", None) if "source" in filter_json else None
 
-                # Call the hybrid search PostgreSQL function
-                response = self.supabase_client.rpc(
-                    "hybrid_search_archon_crawled_pages",
-                    {
-                        "query_embedding": query_embedding,
-                        "query_text": query,
-                        "match_count": match_count,
-                        "filter": filter_json,
-                        "source_filter": source_filter,
-                    },
-                ).execute()
+                # Call the hybrid search PostgreSQL function (in a worker thread so concurrent searches overlap)
+                response = await asyncio.to_thread(
+                    self.supabase_client.rpc(
+                        "hybrid_search_archon_crawled_pages",
+                        {
+                            "query_embedding": query_embedding,
+                            "query_text": query,
+                            "match_count": match_count,
+                            "filter": filter_json,
+                            "source_filter": source_filter,
+                        },
+                    ).execute
+                )
 
                 if not response.data:
                     logger.debug("No results from hybrid search")
@@ -111,6 +114,7 @@ class HybridSearchStrategy:
         match_count: int,
         filter_metadata: dict | None = None,
         source_id: str | None = None,
+        query_embedding: list[float] | None = None,
     ) -> list[dict[str, Any]]:
         """
         Perform hybrid search on archon_code_examples table using the PostgreSQL 
@@ -121,14 +125,16 @@ class HybridSearchStrategy:
             match_count: Number of results to return
             filter_metadata: Optional metadata filter dict
             source_id: Optional source ID to filter results
+            query_embedding: Optional pre-computed embedding for the query
 
         Returns:
             List of matching code examples from both vector and text search
         """
         with safe_span("hybrid_search_code_examples") as span:
             try:
-                # Create query embedding
-                query_embedding = await create_embedding(query)
+                # Create query embedding unless one was provided
+                if query_embedding is None:
+                    query_embedding = await create_embedding(query)
 
                 if not query_embedding:
                     logger.error("Failed to create embedding for code example query")
@@ -141,17 +147,19 @@ class HybridSearchStrategy:
                 if not final_source_filter and "source" in filter_json:
                     final_source_filter = filter_json.pop("source")
 
-                # Call the hybrid search PostgreSQL function
-                response = self.supabase_client.rpc(
-                    "hybrid_search_archon_code_examples",
-                    {
-                        "query_embedding": query_embedding,
-                        "query_text": query,
-                        "match_count": match_count,
-                        "filter": filter_json,
-                        "source_filter": final_source_filter,
-                    },
-                ).execute()
+                # Call the hybrid search PostgreSQL function (in a worker thread so concurrent searches overlap)
+                response = await asyncio.to_thread(
+                    self.supabase_client.rpc(
+                        "hybrid_search_archon_code_examples",
+                        {
+                            "query_embedding": query_embedding,
+                            "query_text": query,
+                            "match_count": match_count,
+                            "filter": filter_json,
+                            "source_filter": final_source_filter,
+                        },
+                    ).execute
+                )
 
                 if not response.data:
                     logger.debug("No results from hybrid code search")
@@ -12,21 +12,30 @@ It combines multiple RAG strategies in a pipeline fashion:
 Multiple strategies can be enabled simultaneously and work together.
 """
 
+import asyncio
 import os
 from typing import Any
 
 from ...config.logfire_config import get_logger, safe_span
 from ...utils import get_supabase_client
-from ..embeddings.embedding_service import create_embedding
+from ..embeddings.embedding_service import create_embedding, create_embeddings_batch
+from ..settings_snapshot import get_settings
 from .agentic_rag_strategy import AgenticRAGStrategy
 
 # Import all strategies
 from .base_search_strategy import BaseSearchStrategy
+from .context_budget import DEFAULT_SNIPPET_CHARS, pack_results, snippet_window
 from .hybrid_search_strategy import HybridSearchStrategy
 from .reranking_strategy import RerankingStrategy
 
 logger = get_logger(__name__)
 
+# Upper bound on queries accepted by a single batch request
+MAX_BATCH_QUERIES = 20
+
+# Length of the best-matching passage shown with each page result
+PAGE_PREVIEW_CHARS = 300
+
 
 class RAGService:
     """
@@ -59,25 +68,11 @@ class RAGService:
                 self.reranking_strategy = None
 
     def get_setting(self, key: str, default: str = "false") -> str:
-        """Get a setting from the credential service or fall back to environment variable."""
-        try:
-            from ..credential_service import credential_service
-
-            if hasattr(credential_service, "_cache") and credential_service._cache_initialized:
-                cached_value = credential_service._cache.get(key)
-                if isinstance(cached_value, dict) and cached_value.get("is_encrypted"):
-                    encrypted_value = cached_value.get("encrypted_value")
-                    if encrypted_value:
-                        try:
-                            return credential_service._decrypt_value(encrypted_value)
-                        except Exception:
-                            pass
-                elif cached_value:
-                    return str(cached_value)
-            # Fallback to environment variable
-            return os.getenv(key, default)
-        except Exception:
-            return os.getenv(key, default)
+        """Get a setting from the settings snapshot or fall back to environment variable."""
+        value = get_settings().get(key)
+        if value:
+            return value
+        return os.getenv(key, default)
 
     def get_bool_setting(self, key: str, default: bool = False) -> bool:
         """Get a boolean setting from credential service."""
@@ -91,6 +86,7 @@ class RAGService:
         filter_metadata: dict | None = None,
         use_hybrid_search: bool = False,
         cached_api_key: str | None = None,
+        query_embedding: list[float] | None = None,
     ) -> list[dict[str, Any]]:
         """
         Document search with hybrid search capability.
@@ -101,6 +97,7 @@ class RAGService:
             filter_metadata: Optional metadata filter dict
             use_hybrid_search: Whether to use hybrid search
             cached_api_key: Deprecated parameter for compatibility
+            query_embedding: Optional pre-computed embedding for the query
 
         Returns:
             List of matching documents
@@ -112,8 +109,9 @@ class RAGService:
             hybrid_enabled=use_hybrid_search,
         ) as span:
             try:
-                # Create embedding for the query
-                query_embedding = await create_embedding(query)
+                # Create embedding for the query unless one was provided
+                if query_embedding is None:
+                    query_embedding = await create_embedding(query)
 
                 if not query_embedding:
                     logger.error("Failed to create embedding for query")
@@ -173,7 +171,7 @@ class RAGService:
         )
 
     async def _group_chunks_by_pages(
-        self, chunk_results: list[dict[str, Any]], match_count: int
+        self, chunk_results: list[dict[str, Any]], match_count: int, query: str = ""
     ) -> list[dict[str, Any]]:
         """Group chunk results by page_id (if available) or URL and fetch page metadata."""
         page_groups: dict[str, dict[str, Any]] = {}
@@ -233,6 +231,7 @@ class RAGService:
                     "section_title": page_info.data.get("section_title"),
                     "word_count": page_info.data.get("word_count", 0),
                     "chunk_matches": data["chunk_matches"],
+                    "preview": snippet_window(data["best_chunk_content"], query, PAGE_PREVIEW_CHARS)[0],
                     "aggregate_similarity": aggregate_score,
                     "average_similarity": avg_similarity,
                     "source_id": data["source_id"],
@@ -242,7 +241,13 @@ class RAGService:
         return page_results[:match_count]
 
     async def perform_rag_query(
-        self, query: str, source: str = None, match_count: int = 5, return_mode: str = "chunks"
+        self,
+        query: str,
+        source: str = None,
+        match_count: int = 5,
+        return_mode: str = "chunks",
+        query_embedding: list[float] | None = None,
+        token_budget: int | None = None,
     ) -> tuple[bool, dict[str, Any]]:
         """
         Unified RAG query with all strategies.
@@ -251,12 +256,16 @@ class RAGService:
         1. Vector/Hybrid Search (based on settings)
         2. Reranking (if enabled)
         3. Page Grouping (if return_mode="pages")
+        4. Packing into the token budget (if given)
 
         Args:
             query: The search query
             source: Optional source domain to filter results
             match_count: Maximum number of results to return
             return_mode: "chunks" (default) or "pages"
+            query_embedding: Optional pre-computed embedding for the query
+            token_budget: Optional token limit for all results; content is
+                packed by score with snippets around the query's matches
 
         Returns:
             Tuple of (success, result_dict)
@@ -289,6 +298,7 @@ class RAGService:
                     match_count=search_match_count,
                     filter_metadata=filter_metadata,
                     use_hybrid_search=use_hybrid_search,
+                    query_embedding=query_embedding,
                 )
 
                 span.set_attribute("raw_results_count", len(results))
@@ -298,9 +308,13 @@ class RAGService:
                 formatted_results = []
                 for i, result in enumerate(results):
                     try:
+                        content = result.get("content", "")
+                        if token_budget is None:
+                            # Without a budget, limit content to the passage around the matches
+                            content, _ = snippet_window(content, query, DEFAULT_SNIPPET_CHARS)
                         formatted_result = {
                             "id": result.get("id", f"result_{i}"),
-                            "content": result.get("content", "")[:1000],  # Limit content
+                            "content": content,
                             "metadata": result.get("metadata", {}),
                             "similarity_score": result.get("similarity", 0.0),
                         }
@@ -337,12 +351,21 @@ class RAGService:
 
                     if has_page_ids:
                         # Group by pages when page_ids exist
-                        formatted_results = await self._group_chunks_by_pages(formatted_results, match_count)
+                        formatted_results = await self._group_chunks_by_pages(
+                            formatted_results, match_count, query
+                        )
                     else:
                         # Fall back to chunks when no page_ids (pre-migration data)
                         actual_return_mode = "chunks"
                         logger.info("No page_ids found in results, returning chunks instead of pages")
 
+                packing = None
+                if token_budget is not None:
+                    content_key = "preview" if actual_return_mode == "pages" else "content"
+                    formatted_results, packing = pack_results(
+                        formatted_results, query, token_budget, content_key=content_key
+                    )
+
                 # Build response
                 response_data = {
                     "results": formatted_results,
@@ -355,6 +378,8 @@ class RAGService:
                     "reranking_applied": reranking_applied,
                     "return_mode": actual_return_mode,
                 }
+                if packing is not None:
+                    response_data["packing"] = packing
 
                 span.set_attribute("final_results_count", len(formatted_results))
                 span.set_attribute("reranking_applied", reranking_applied)
@@ -378,7 +403,11 @@ class RAGService:
                 }
 
     async def search_code_examples_service(
-        self, query: str, source_id: str | None = None, match_count: int = 5
+        self,
+        query: str,
+        source_id: str | None = None,
+        match_count: int = 5,
+        query_embedding: list[float] | None = None,
     ) -> tuple[bool, dict[str, Any]]:
         """
         Search for code examples using agentic strategy with hybrid search and reranking.
@@ -393,6 +422,7 @@ class RAGService:
             query: The search query
             source_id: Optional source ID to filter results
             match_count: Maximum number of results to return
+            query_embedding: Optional pre-computed embedding for the query
 
         Returns:
             Tuple of (success, result_dict)
@@ -431,6 +461,7 @@ class RAGService:
                         match_count=search_match_count,
                         filter_metadata=filter_metadata,
                         source_id=source_id,
+                        query_embedding=query_embedding,
                     )
                 else:
                     # Use standard agentic search
@@ -439,6 +470,7 @@ class RAGService:
                         match_count=search_match_count,
                         filter_metadata=filter_metadata,
                         source_id=source_id,
+                        query_embedding=query_embedding,
                     )
 
                 # Apply reranking if we have a strategy
@@ -489,3 +521,102 @@ class RAGService:
                 logger.error(f"Code example search failed: {e}")
                 span.set_attribute("error", str(e))
                 return False, {"query": query, "error": str(e)}
+
+    async def perform_batch_rag_query(
+        self, queries: list[dict[str, Any]]
+    ) -> tuple[bool, dict[str, Any]]:
+        """
+        Run several RAG queries in one call, embedding all query texts together.
+
+        Query texts are embedded with a single create_embeddings_batch call, then
+        each query runs through the regular document or code example pipeline
+        concurrently using its pre-computed embedding. A query whose embedding
+        failed falls back to embedding itself inside its own pipeline.
+
+        Args:
+            queries: List of query dicts with keys:
+                - query: The search query (required)
+                - search_type: "documents" (default) or "code_examples"
+                - source: Optional source ID to filter results
+                - match_count: Maximum number of results (default 5)
+                - return_mode: "chunks" (default) or "pages", documents only
+                - token_budget: Optional token limit for the results, documents only
+
+        Returns:
+            Tuple of (success, result_dict) where result_dict["results"] holds one
+            entry per query, in request order
+        """
+        with safe_span("rag_batch_query", query_count=len(queries)) as span:
+            try:
+                if len(queries) > MAX_BATCH_QUERIES:
+                    return False, {
+                        "error": f"Too many queries: {len(queries)} (maximum {MAX_BATCH_QUERIES})",
+                    }
+
+                # Embed each distinct query text once
+                unique_texts = list(dict.fromkeys(q["query"] for q in queries))
+                embeddings_by_text: dict[str, list[float]] = {}
+                if unique_texts:
+                    batch_result = await create_embeddings_batch(unique_texts)
+                    embeddings_by_text = dict(
+                        zip(batch_result.texts_processed, batch_result.embeddings, strict=False)
+                    )
+                    if batch_result.has_failures:
+                        logger.warning(
+                            f"Batch query embedding failed for {batch_result.failure_count} queries, "
+                            "falling back to per-query embedding"
+                        )
+
+                async def run_query(spec: dict[str, Any]) -> tuple[bool, dict[str, Any]]:
+                    query_embedding = embeddings_by_text.get(spec["query"])
+                    if spec.get("search_type", "documents") == "code_examples":
+                        return await self.search_code_examples_service(
+                            query=spec["query"],
+                            source_id=spec.get("source"),
+                            match_count=spec.get("match_count", 5),
+                            query_embedding=query_embedding,
+                        )
+                    return await self.perform_rag_query(
+                        query=spec["query"],
+                        source=spec.get("source"),
+                        match_count=spec.get("match_count", 5),
+                        return_mode=spec.get("return_mode", "chunks"),
+                        query_embedding=query_embedding,
+                        token_budget=spec.get("token_budget"),
+                    )
+
+                outcomes = await asyncio.gather(
+                    *(run_query(spec) for spec in queries), return_exceptions=True
+                )
+
+                results = []
+                for spec, outcome in zip(queries, outcomes, strict=True):
+                    if isinstance(outcome, BaseException):
+                        success, data = False, {"error": str(outcome), "query": spec["query"]}
+                    else:
+                        success, data = outcome
+                    results.append({
+                        "search_type": spec.get("search_type", "documents"),
+                        "success": success,
+                        **data,
+                    })
+
+                failed = sum(1 for r in results if not r["success"])
+                span.set_attribute("unique_queries", len(unique_texts))
+                span.set_attribute("failed_queries", failed)
+
+                logger.info(
+                    f"Batch RAG query completed - {len(results)} queries, "
+                    f"{len(unique_texts)} embeddings, {failed} failed"
+                )
+                return True, {
+                    "results": results,
+                    "total_queries": len(results),
+                    "failed_queries": failed,
+                    "execution_path": "rag_service_batch_pipeline",
+                }
+
+            except Exception as e:
+                logger.error(f"Batch RAG query failed: {e}")
+                span.set_attribute("error", str(e))
+                return False, {"error": str(e), "error_type": type(e).__name__}
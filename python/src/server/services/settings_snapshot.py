@@ -0,0 +1,155 @@
+"""
+Settings Snapshot
+
+Typed, immutable view of the settings read on hot paths (embedding,
+storage, crawling, code extraction, search).
+
+The snapshot is rebuilt from the credential service's cache whenever
+credentials are loaded, set or deleted, and swapped in with a single
+assignment, so a reader always sees one consistent version. Hot loops
+read plain attributes (``get_settings().embedding_batch_size``) instead of
+awaiting dict lookups and parsing strings per call. Subscribers are
+called with every new snapshot.
+"""
+
+import dataclasses
+from collections.abc import Callable, Mapping
+from dataclasses import dataclass, field
+from types import MappingProxyType
+from typing import Any
+
+from ..config.logfire_config import get_logger
+
+logger = get_logger(__name__)
+
+_TRUE_VALUES = ("true", "1", "yes", "on")
+
+
+def _setting(key: str, default: Any) -> Any:
+    return field(default=default, metadata={"key": key})
+
+
+@dataclass(frozen=True)
+class SettingsSnapshot:
+    """One consistent version of the settings; fields default when unset or invalid."""
+
+    # Providers and models
+    llm_provider: str = _setting("LLM_PROVIDER", "openai")
+    embedding_provider: str = _setting("EMBEDDING_PROVIDER", "")
+    model_choice: str = _setting("MODEL_CHOICE", "")
+    embedding_model: str = _setting("EMBEDDING_MODEL", "")
+
+    # Search
+    use_hybrid_search: bool = _setting("USE_HYBRID_SEARCH", False)
+    use_agentic_rag: bool = _setting("USE_AGENTIC_RAG", False)
+    use_reranking: bool = _setting("USE_RERANKING", False)
+
+    # Embeddings and document storage
+    use_contextual_embeddings: bool = _setting("USE_CONTEXTUAL_EMBEDDINGS", False)
+    contextual_embeddings_max_workers: int = _setting("CONTEXTUAL_EMBEDDINGS_MAX_WORKERS", 4)
+    use_coarse_embedding_search: bool = _setting("USE_COARSE_EMBEDDING_SEARCH", False)
+    embedding_batch_size: int = _setting("EMBEDDING_BATCH_SIZE", 100)
+    embedding_dimensions: int = _setting("EMBEDDING_DIMENSIONS", 1536)
+    document_storage_batch_size: int = _setting("DOCUMENT_STORAGE_BATCH_SIZE", 50)
+    delete_batch_size: int = _setting("DELETE_BATCH_SIZE", 50)
+
+    # Crawling
+    crawl_batch_size: int = _setting("CRAWL_BATCH_SIZE", 50)
+    crawl_max_concurrent: int = _setting("CRAWL_MAX_CONCURRENT", 10)
+    memory_threshold_percent: float = _setting("MEMORY_THRESHOLD_PERCENT", 80.0)
+    dispatcher_check_interval: float = _setting("DISPATCHER_CHECK_INTERVAL", 0.5)
+
+    # Code extraction
+    min_code_block_length: int = _setting("MIN_CODE_BLOCK_LENGTH", 250)
+    max_code_block_length: int = _setting("MAX_CODE_BLOCK_LENGTH", 5000)
+    enable_complete_block_detection: bool = _setting("ENABLE_COMPLETE_BLOCK_DETECTION", True)
+    enable_language_specific_patterns: bool = _setting("ENABLE_LANGUAGE_SPECIFIC_PATTERNS", True)
+    enable_prose_filtering: bool = _setting("ENABLE_PROSE_FILTERING", True)
+    max_prose_ratio: float = _setting("MAX_PROSE_RATIO", 0.15)
+    min_code_indicators: int = _setting("MIN_CODE_INDICATORS", 3)
+    enable_diagram_filtering: bool = _setting("ENABLE_DIAGRAM_FILTERING", True)
+    enable_contextual_length: bool = _setting("ENABLE_CONTEXTUAL_LENGTH", True)
+    context_window_size: int = _setting("CONTEXT_WINDOW_SIZE", 1000)
+    enable_code_summaries: bool = _setting("ENABLE_CODE_SUMMARIES", True)
+    code_summary_max_workers: int = _setting("CODE_SUMMARY_MAX_WORKERS", 3)
+
+    # All plain (unencrypted) values by key, for settings without a field
+    values: Mapping[str, str] = field(default_factory=lambda: MappingProxyType({}))
+    version: int = 0
+
+    @classmethod
+    def from_values(cls, values: Mapping[str, Any], version: int = 0) -> "SettingsSnapshot":
+        """
+        Build a snapshot from raw setting values.
+
+        Encrypted entries (dicts) are skipped; a value that cannot be parsed
+        logs a warning and keeps the field's default.
+        """
+        plain = {
+            key: str(value)
+            for key, value in values.items()
+            if value is not None and not isinstance(value, dict)
+        }
+        parsed: dict[str, Any] = {}
+        for f in dataclasses.fields(cls):
+            key = f.metadata.get("key")
+            if key is None or plain.get(key, "") == "":
+                continue
+            try:
+                parsed[f.name] = _parse(plain[key], f.type)
+            except ValueError:
+                logger.warning(f"Invalid value for setting {key}: {plain[key]!r}, using {f.default!r}")
+        return cls(**parsed, values=MappingProxyType(plain), version=version)
+
+    def get(self, key: str, default: str | None = None) -> str | None:
+        """Plain value of any setting by key."""
+        return self.values.get(key, default)
+
+
+def _parse(raw: str, kind: Any) -> Any:
+    if kind is bool:
+        return raw.strip().lower() in _TRUE_VALUES
+    if kind is int:
+        return int(float(raw))
+    if kind is float:
+        return float(raw)
+    return raw
+
+
+_snapshot = SettingsSnapshot()
+_subscribers: list[Callable[[SettingsSnapshot], None]] = []
+
+
+def get_settings() -> SettingsSnapshot:
+    """Current settings snapshot (defaults until credentials are loaded)."""
+    return _snapshot
+
+
+def subscribe(callback: Callable[[SettingsSnapshot], None]) -> Callable[[], None]:
+    """
+    Call callback with every new snapshot.
+
+    Returns:
+        Function that removes the subscription
+    """
+    _subscribers.append(callback)
+
+    def unsubscribe() -> None:
+        if callback in _subscribers:
+            _subscribers.remove(callback)
+
+    return unsubscribe
+
+
+def publish_settings(values: Mapping[str, Any]) -> SettingsSnapshot:
+    """Replace the snapshot with one built from values and notify subscribers."""
+    global _snapshot
+    snapshot = SettingsSnapshot.from_values(values, version=_snapshot.version + 1)
+    _snapshot = snapshot
+    for callback in list(_subscribers):
+        try:
+            callback(snapshot)
+        except Exception as e:
+            logger.error(f"Settings subscriber {getattr(callback, '__name__', callback)} failed: {e}")
+    logger.debug(f"Published settings snapshot v{snapshot.version}")
+    return snapshot
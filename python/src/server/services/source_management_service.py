@@ -10,8 +10,12 @@ from typing import Any
 from supabase import Client
 
 from ..config.logfire_config import get_logger, search_logger
+from .change_version_service import PROJECTS, SOURCES, change_versions
 from .client_manager import get_supabase_client
+from .database_errors import is_missing_function_error
 from .llm_provider_service import extract_message_text, get_llm_client
+from .threading_service import get_threading_service
+from .token_counter import count_tokens_async
 
 logger = get_logger(__name__)
 
@@ -60,16 +64,22 @@ The above content is from the documentation for '{source_id}'. Please provide a
             search_logger.info(f"Generating summary for {source_id} using model: {model_choice}")
 
             # Call the LLM API to generate the summary
-            response = await client.chat.completions.create(
+            async with get_threading_service().rate_limited_operation(
+                await count_tokens_async(prompt, model_choice) + max_length // 2,
+                provider=provider,
                 model=model_choice,
-                messages=[
-                    {
-                        "role": "system",
-                        "content": "You are a helpful assistant that provides concise library/tool/framework summaries.",
-                    },
-                    {"role": "user", "content": prompt},
-                ],
-            )
+                kind="chat",
+            ):
+                response = await client.chat.completions.create(
+                    model=model_choice,
+                    messages=[
+                        {
+                            "role": "system",
+                            "content": "You are a helpful assistant that provides concise library/tool/framework summaries.",
+                        },
+                        {"role": "user", "content": prompt},
+                    ],
+                )
 
             # Extract the generated summary with proper error handling
             if not response or not response.choices or len(response.choices) == 0:
@@ -177,16 +187,22 @@ Examples:
 
 Generate only the title, nothing else."""
 
-                response = await client.chat.completions.create(
+                async with get_threading_service().rate_limited_operation(
+                    await count_tokens_async(prompt, model_choice) + 50,
+                    provider=provider,
                     model=model_choice,
-                    messages=[
-                        {
-                            "role": "system",
-                            "content": "You are a helpful assistant that generates concise titles.",
-                        },
-                        {"role": "user", "content": prompt},
-                    ],
-                )
+                    kind="chat",
+                ):
+                    response = await client.chat.completions.create(
+                        model=model_choice,
+                        messages=[
+                            {
+                                "role": "system",
+                                "content": "You are a helpful assistant that generates concise titles.",
+                            },
+                            {"role": "user", "content": prompt},
+                        ],
+                    )
 
                 choice = response.choices[0]
                 generated_title, _, _ = extract_message_text(choice)
@@ -289,6 +305,7 @@ async def update_source_info(
                 upsert_data["source_display_name"] = source_display_name
 
             client.table("archon_sources").upsert(upsert_data).execute()
+            change_versions.bump(SOURCES)
 
             search_logger.info(
                 f"Updated source {source_id} while preserving title: {existing_title}"
@@ -352,6 +369,7 @@ async def update_source_info(
                 upsert_data["source_display_name"] = source_display_name
 
             client.table("archon_sources").upsert(upsert_data).execute()
+            change_versions.bump(SOURCES)
             search_logger.info(f"Created/updated source {source_id} with title: {title}")
 
     except Exception as e:
@@ -398,8 +416,11 @@ class SourceManagementService:
         """
         Delete a source from the database.
 
-        With CASCADE DELETE constraints in place (migration 009), deleting the source
-        will automatically delete all associated crawled_pages and code_examples.
+        Crawled pages and code examples are partitioned by source (migration 012),
+        so the source is deleted through archon_delete_source, which drops the
+        source's partitions instead of deleting their rows one by one. Databases
+        without that migration (the function is missing) fall back to deleting the
+        source row and relying on the CASCADE DELETE constraints (migration 009).
 
         Args:
             source_id: The source ID to delete
@@ -410,24 +431,37 @@ class SourceManagementService:
         try:
             logger.info(f"Starting delete_source for source_id: {source_id}")
 
-            # With CASCADE DELETE, we only need to delete from the sources table
-            # The database will automatically handle deleting related records
-            logger.info(f"Deleting source {source_id} (CASCADE will handle related records)")
-
-            source_response = (
-                self.supabase_client.table("archon_sources")
-                .delete()
-                .eq("source_id", source_id)
-                .execute()
-            )
+            try:
+                rpc_response = self.supabase_client.rpc(
+                    "archon_delete_source", {"p_source_id": source_id}
+                ).execute()
+                source_deleted = rpc_response.data or 0
+                deleted_via = "partition drop"
+            except Exception as rpc_error:
+                if not is_missing_function_error(rpc_error):
+                    raise
+                logger.warning(
+                    f"archon_delete_source unavailable, falling back to CASCADE delete: {rpc_error}"
+                )
 
-            source_deleted = len(source_response.data) if source_response.data else 0
+                # With CASCADE DELETE, we only need to delete from the sources table
+                # The database will automatically handle deleting related records
+                source_response = (
+                    self.supabase_client.table("archon_sources")
+                    .delete()
+                    .eq("source_id", source_id)
+                    .execute()
+                )
+                source_deleted = len(source_response.data) if source_response.data else 0
+                deleted_via = "CASCADE DELETE"
 
             if source_deleted > 0:
-                logger.info(f"Successfully deleted source {source_id} and all related data via CASCADE")
+                # Project source links are removed with the source
+                change_versions.bump(SOURCES, PROJECTS)
+                logger.info(f"Successfully deleted source {source_id} and all related data via {deleted_via}")
                 return True, {
                     "source_id": source_id,
-                    "message": "Source and all related data deleted successfully via CASCADE DELETE"
+                    "message": f"Source and all related data deleted successfully via {deleted_via}"
                 }
             else:
                 logger.warning(f"No source found with ID {source_id}")
@@ -500,6 +534,7 @@ class SourceManagementService:
             )
 
             if response.data:
+                change_versions.bump(SOURCES)
                 return True, {"source_id": source_id, "updated_fields": list(update_data.keys())}
             else:
                 return False, {"error": f"Source with ID {source_id} not found"}
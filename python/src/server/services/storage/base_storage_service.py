@@ -19,6 +19,90 @@ from ...config.logfire_config import get_logger, safe_span
 logger = get_logger(__name__)
 
 
+def chunk_text(text: str, chunk_size: int = 5000) -> list[str]:
+    """
+    Split text into chunks intelligently, preserving context.
+
+    This function implements a context-aware chunking strategy that:
+    1. Preserves code blocks (```) as complete units when possible
+    2. Prefers to break at paragraph boundaries (\\n\\n)
+    3. Falls back to sentence boundaries (. ) if needed
+    4. Only splits mid-content when absolutely necessary
+
+    Args:
+        text: Text to chunk
+        chunk_size: Maximum chunk size (default: 5000)
+
+    Returns:
+        List of text chunks
+    """
+    if not text or not isinstance(text, str):
+        logger.warning("Invalid text provided for chunking")
+        return []
+
+    chunks = []
+    start = 0
+    text_length = len(text)
+
+    while start < text_length:
+        # Determine the end of this chunk
+        end = start + chunk_size
+
+        # If we're at the end of the text, take what's left
+        if end >= text_length:
+            chunk = text[start:].strip()
+            if chunk:
+                chunks.append(chunk)
+            break
+
+        # Try to find a good break point
+        chunk = text[start:end]
+
+        # First, try to break at a code block boundary
+        code_block_pos = chunk.rfind("```")
+        if code_block_pos != -1 and code_block_pos > chunk_size * 0.3:
+            end = start + code_block_pos
+
+        # If no code block, try paragraph break
+        elif "\n\n" in chunk:
+            last_break = chunk.rfind("\n\n")
+            if last_break > chunk_size * 0.3:
+                end = start + last_break
+
+        # If no paragraph break, try sentence break
+        elif ". " in chunk:
+            last_period = chunk.rfind(". ")
+            if last_period > chunk_size * 0.3:
+                end = start + last_period + 1
+
+        # Extract chunk and clean it up
+        chunk = text[start:end].strip()
+        if chunk:
+            chunks.append(chunk)
+
+        # Move start position for next chunk
+        start = end
+
+    # Combine consecutive small chunks (<200 chars) together
+    if chunks:
+        combined_chunks: list[str] = []
+        i = 0
+        while i < len(chunks):
+            current = chunks[i]
+
+            # Keep combining while current is small and there are more chunks
+            while len(current) < 200 and i + 1 < len(chunks):
+                i += 1
+                current = current + "\n\n" + chunks[i]
+
+            combined_chunks.append(current)
+            i += 1
+
+        chunks = combined_chunks
+
+    return chunks
+
+
 class BaseStorageService(ABC):
     """Base class for all storage services with common functionality."""
 
@@ -38,13 +122,7 @@ class BaseStorageService(ABC):
 
     def smart_chunk_text(self, text: str, chunk_size: int = 5000) -> list[str]:
         """
-        Split text into chunks intelligently, preserving context.
-
-        This function implements a context-aware chunking strategy that:
-        1. Preserves code blocks (```) as complete units when possible
-        2. Prefers to break at paragraph boundaries (\\n\\n)
-        3. Falls back to sentence boundaries (. ) if needed
-        4. Only splits mid-content when absolutely necessary
+        Split text into chunks intelligently, preserving context (see chunk_text).
 
         Args:
             text: Text to chunk
@@ -53,71 +131,7 @@ class BaseStorageService(ABC):
         Returns:
             List of text chunks
         """
-        if not text or not isinstance(text, str):
-            logger.warning("Invalid text provided for chunking")
-            return []
-
-        chunks = []
-        start = 0
-        text_length = len(text)
-
-        while start < text_length:
-            # Determine the end of this chunk
-            end = start + chunk_size
-
-            # If we're at the end of the text, take what's left
-            if end >= text_length:
-                chunk = text[start:].strip()
-                if chunk:
-                    chunks.append(chunk)
-                break
-
-            # Try to find a good break point
-            chunk = text[start:end]
-
-            # First, try to break at a code block boundary
-            code_block_pos = chunk.rfind("```")
-            if code_block_pos != -1 and code_block_pos > chunk_size * 0.3:
-                end = start + code_block_pos
-
-            # If no code block, try paragraph break
-            elif "\n\n" in chunk:
-                last_break = chunk.rfind("\n\n")
-                if last_break > chunk_size * 0.3:
-                    end = start + last_break
-
-            # If no paragraph break, try sentence break
-            elif ". " in chunk:
-                last_period = chunk.rfind(". ")
-                if last_period > chunk_size * 0.3:
-                    end = start + last_period + 1
-
-            # Extract chunk and clean it up
-            chunk = text[start:end].strip()
-            if chunk:
-                chunks.append(chunk)
-
-            # Move start position for next chunk
-            start = end
-
-        # Combine consecutive small chunks (<200 chars) together
-        if chunks:
-            combined_chunks: list[str] = []
-            i = 0
-            while i < len(chunks):
-                current = chunks[i]
-
-                # Keep combining while current is small and there are more chunks
-                while len(current) < 200 and i + 1 < len(chunks):
-                    i += 1
-                    current = current + "\n\n" + chunks[i]
-
-                combined_chunks.append(current)
-                i += 1
-
-            chunks = combined_chunks
-
-        return chunks
+        return chunk_text(text, chunk_size)
 
     async def smart_chunk_text_async(
         self, text: str, chunk_size: int = 5000, progress_callback: Callable | None = None
@@ -137,10 +151,12 @@ class BaseStorageService(ABC):
             "smart_chunk_text_async", text_length=len(text), chunk_size=chunk_size
         ) as span:
             try:
-                # For large texts, run chunking in thread pool
+                # For large texts, run chunking in a worker process
                 if len(text) > 50000:  # 50KB threshold
+                    from .. import cpu_tasks
+
                     chunks = await self.threading_service.run_cpu_intensive(
-                        self.smart_chunk_text, text, chunk_size
+                        cpu_tasks.chunk_text, text, chunk_size
                     )
                 else:
                     chunks = self.smart_chunk_text(text, chunk_size)
@@ -18,9 +18,11 @@ from urllib.parse import urlparse
 from supabase import Client
 
 from ...config.logfire_config import search_logger
+from ..change_version_service import SOURCES, change_versions
 from ..credential_service import credential_service
 from ..embeddings.contextual_embedding_service import generate_contextual_embeddings_batch
 from ..embeddings.embedding_service import create_embeddings_batch
+from ..embeddings.multi_dimensional_embedding_service import multi_dimensional_embedding_service
 from ..llm_provider_service import (
     extract_json_from_reasoning,
     extract_message_text,
@@ -28,6 +30,9 @@ from ..llm_provider_service import (
     prepare_chat_completion_params,
     synthesize_json_from_reasoning,
 )
+from ..settings_snapshot import get_settings
+from ..threading_service import get_threading_service
+from ..token_counter import count_tokens_async
 
 
 def _extract_json_payload(raw_response: str, context_code: str = "", language: str = "") -> str:
@@ -251,43 +256,16 @@ def extract_code_blocks(markdown_content: str, min_length: int = None) -> list[d
     Returns:
         List of dictionaries containing code blocks and their context
     """
-    # Load all code extraction settings with direct fallback
-    try:
-        def _get_setting_fallback(key: str, default: str) -> str:
-            if credential_service._cache_initialized and key in credential_service._cache:
-                return credential_service._cache[key]
-            return os.getenv(key, default)
-
-        # Get all relevant settings with defaults
-        if min_length is None:
-            min_length = int(_get_setting_fallback("MIN_CODE_BLOCK_LENGTH", "250"))
-
-        max_length = int(_get_setting_fallback("MAX_CODE_BLOCK_LENGTH", "5000"))
-        enable_prose_filtering = (
-            _get_setting_fallback("ENABLE_PROSE_FILTERING", "true").lower() == "true"
-        )
-        max_prose_ratio = float(_get_setting_fallback("MAX_PROSE_RATIO", "0.15"))
-        min_code_indicators = int(_get_setting_fallback("MIN_CODE_INDICATORS", "3"))
-        enable_diagram_filtering = (
-            _get_setting_fallback("ENABLE_DIAGRAM_FILTERING", "true").lower() == "true"
-        )
-        enable_contextual_length = (
-            _get_setting_fallback("ENABLE_CONTEXTUAL_LENGTH", "true").lower() == "true"
-        )
-        context_window_size = int(_get_setting_fallback("CONTEXT_WINDOW_SIZE", "1000"))
-
-    except Exception as e:
-        # Fallback to defaults if settings retrieval fails
-        search_logger.warning(f"Failed to get code extraction settings: {e}, using defaults")
-        if min_length is None:
-            min_length = 250
-        max_length = 5000
-        enable_prose_filtering = True
-        max_prose_ratio = 0.15
-        min_code_indicators = 3
-        enable_diagram_filtering = True
-        enable_contextual_length = True
-        context_window_size = 1000
+    # Code extraction settings from the settings snapshot
+    settings = get_settings()
+    if min_length is None:
+        min_length = settings.min_code_block_length
+    max_length = settings.max_code_block_length
+    enable_prose_filtering = settings.enable_prose_filtering
+    max_prose_ratio = settings.max_prose_ratio
+    min_code_indicators = settings.min_code_indicators
+    enable_diagram_filtering = settings.enable_diagram_filtering
+    context_window_size = settings.context_window_size
 
     search_logger.debug(f"Extracting code blocks with minimum length: {min_length} characters")
     code_blocks = []
@@ -764,7 +742,13 @@ async def _generate_summary_with_client(
                         await asyncio.sleep(retry_delay)
 
                     final_params = prepare_chat_completion_params(model_choice, request_params)
-                    response = await llm_client.chat.completions.create(**final_params)
+                    estimated_tokens = await count_tokens_async(
+                        [message["content"] for message in final_params["messages"]], model_choice
+                    ) + (final_params.get("max_tokens") or final_params.get("max_completion_tokens") or 0)
+                    async with get_threading_service().rate_limited_operation(
+                        estimated_tokens, provider=provider, model=model_choice, kind="chat"
+                    ):
+                        response = await llm_client.chat.completions.create(**final_params)
                     last_response_obj = response
 
                     choice = response.choices[0] if response.choices else None
@@ -1033,16 +1017,7 @@ async def generate_code_summaries_batch(
 
     # Get max_workers from settings if not provided
     if max_workers is None:
-        try:
-            if (
-                credential_service._cache_initialized
-                and "CODE_SUMMARY_MAX_WORKERS" in credential_service._cache
-            ):
-                max_workers = int(credential_service._cache["CODE_SUMMARY_MAX_WORKERS"])
-            else:
-                max_workers = int(os.getenv("CODE_SUMMARY_MAX_WORKERS", "3"))
-        except:
-            max_workers = 3  # Default fallback
+        max_workers = get_settings().code_summary_max_workers
 
     search_logger.info(
         f"Generating summaries for {len(code_blocks)} code blocks with max_workers={max_workers}"
@@ -1168,26 +1143,15 @@ async def add_code_examples_to_supabase(
         except Exception as e:
             search_logger.error(f"Error deleting existing code examples for {url}: {e}")
 
-    # Check if contextual embeddings are enabled (use proper async method like document storage)
-    try:
-        raw_value = await credential_service.get_credential(
-            "USE_CONTEXTUAL_EMBEDDINGS", "false", decrypt=True
-        )
-        if isinstance(raw_value, str):
-            use_contextual_embeddings = raw_value.lower() == "true"
-        else:
-            use_contextual_embeddings = bool(raw_value)
-    except Exception as e:
-        search_logger.error(f"DEBUG: Error reading contextual embeddings: {e}")
-        # Fallback to environment variable
-        use_contextual_embeddings = (
-            os.getenv("USE_CONTEXTUAL_EMBEDDINGS", "false").lower() == "true"
-        )
+    use_contextual_embeddings = get_settings().use_contextual_embeddings
 
     search_logger.info(
         f"Using contextual embeddings for code examples: {use_contextual_embeddings}"
     )
 
+    # Truncated coarse embeddings are stored for two-stage search
+    use_coarse_embeddings = get_settings().use_coarse_embedding_search
+
     # Process in batches
     total_items = len(urls)
     for i in range(0, total_items, batch_size):
@@ -1322,7 +1286,7 @@ async def add_code_examples_to_supabase(
                 )
                 continue
 
-            batch_data.append({
+            record = {
                 "url": urls[idx],
                 "chunk_number": chunk_numbers[idx],
                 "content": code_examples[idx],
@@ -1333,7 +1297,17 @@ async def add_code_examples_to_supabase(
                 "llm_chat_model": llm_chat_model,  # Add LLM model tracking
                 "embedding_model": embedding_model_name,  # Add embedding model tracking
                 "embedding_dimension": embedding_dim,  # Add dimension tracking
-            })
+            }
+
+            # Store a truncated copy for coarse ANN search when the model supports it
+            if use_coarse_embeddings:
+                coarse_embedding = multi_dimensional_embedding_service.get_coarse_embedding(
+                    embedding, embedding_model_name
+                )
+                if coarse_embedding is not None:
+                    record["embedding_coarse"] = coarse_embedding
+
+            batch_data.append(record)
 
         if not batch_data:
             search_logger.warning("No records to insert for this batch; skipping insert.")
@@ -1346,6 +1320,7 @@ async def add_code_examples_to_supabase(
         for retry in range(max_retries):
             try:
                 client.table("archon_code_examples").insert(batch_data).execute()
+                change_versions.bump(SOURCES)
                 # Success - break out of retry loop
                 break
             except Exception as e:
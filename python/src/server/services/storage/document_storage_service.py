@@ -5,12 +5,16 @@ Handles storage of documents in Supabase with parallel processing support.
 """
 
 import asyncio
-import os
 from typing import Any
 
 from ...config.logfire_config import safe_span, search_logger
+from ..change_version_service import SOURCES, change_versions
 from ..embeddings.contextual_embedding_service import generate_contextual_embeddings_batch
+from ..embeddings.embedding_exceptions import EmbeddingQuotaExhaustedError
 from ..embeddings.embedding_service import create_embeddings_batch
+from ..embeddings.multi_dimensional_embedding_service import multi_dimensional_embedding_service
+from ..metrics_service import stage_timer
+from ..settings_snapshot import get_settings
 
 
 async def add_documents_to_supabase(
@@ -57,25 +61,13 @@ async def add_documents_to_supabase(
                 except Exception as e:
                     search_logger.warning(f"Progress callback failed: {e}. Storage continuing...")
 
-        # Load settings from database
-        try:
-            # Defensive import to handle any initialization issues
-            from ..credential_service import credential_service as cred_service
-            rag_settings = await cred_service.get_credentials_by_category("rag_strategy")
-            if batch_size is None:
-                batch_size = int(rag_settings.get("DOCUMENT_STORAGE_BATCH_SIZE", "50"))
-            # Clamp batch sizes to sane minimums to prevent crashes
-            batch_size = max(1, int(batch_size))
-            delete_batch_size = max(1, int(rag_settings.get("DELETE_BATCH_SIZE", "50")))
-            # enable_parallel = rag_settings.get("ENABLE_PARALLEL_BATCHES", "true").lower() == "true"
-        except Exception as e:
-            search_logger.warning(f"Failed to load storage settings: {e}, using defaults")
-            if batch_size is None:
-                batch_size = 50
-            # Ensure defaults are also clamped
-            batch_size = max(1, int(batch_size))
-            delete_batch_size = max(1, 50)
-            # enable_parallel = True
+        # One settings snapshot for the whole run
+        settings = get_settings()
+        if batch_size is None:
+            batch_size = settings.document_storage_batch_size
+        # Clamp batch sizes to sane minimums to prevent crashes
+        batch_size = max(1, int(batch_size))
+        delete_batch_size = max(1, settings.delete_batch_size)
 
         # Get unique URLs to delete existing records
         unique_urls = list(set(urls))
@@ -142,17 +134,9 @@ async def add_documents_to_supabase(
             if failed_urls:
                 search_logger.error(f"Failed to delete {len(failed_urls)} URLs")
 
-        # Check if contextual embeddings are enabled (use credential_service)
-
-        try:
-            use_contextual_embeddings = await credential_service.get_credential(
-                "USE_CONTEXTUAL_EMBEDDINGS", "false", decrypt=True
-            )
-            if isinstance(use_contextual_embeddings, str):
-                use_contextual_embeddings = use_contextual_embeddings.lower() == "true"
-        except Exception:
-            # Fallback to environment variable
-            use_contextual_embeddings = os.getenv("USE_CONTEXTUAL_EMBEDDINGS", "false") == "true"
+        use_contextual_embeddings = settings.use_contextual_embeddings
+        # Truncated coarse embeddings are stored for two-stage search
+        use_coarse_embeddings = settings.use_coarse_embedding_search
 
         # Initialize batch tracking for simplified progress
         completed_batches = 0
@@ -189,13 +173,7 @@ async def add_documents_to_supabase(
 
             # Get max workers setting FIRST before using it
             if use_contextual_embeddings:
-                try:
-                    max_workers = await credential_service.get_credential(
-                        "CONTEXTUAL_EMBEDDINGS_MAX_WORKERS", "4", decrypt=True
-                    )
-                    max_workers = max(1, int(max_workers))
-                except Exception:
-                    max_workers = 4
+                max_workers = max(1, settings.contextual_embeddings_max_workers)
             else:
                 max_workers = 1
 
@@ -229,55 +207,47 @@ async def add_documents_to_supabase(
                     full_document = url_to_full_document.get(url, "")
                     full_documents.append(full_document)
 
-                # Get contextual embedding batch size from settings
-                try:
-                    contextual_batch_size = max(
-                        1, int(rag_settings.get("CONTEXTUAL_EMBEDDING_BATCH_SIZE", "50"))
-                    )
-                except Exception:
-                    contextual_batch_size = 50
+                if cancellation_check:
+                    try:
+                        cancellation_check()
+                    except asyncio.CancelledError:
+                        if progress_callback:
+                            await progress_callback(
+                                "cancelled",
+                                99,
+                                "Storage cancelled during contextual embedding",
+                                current_batch=batch_num,
+                                total_batches=total_batches
+                            )
+                        raise
 
                 try:
-                    # Process in smaller sub-batches to avoid token limits
-                    contextual_contents = []
-                    successful_count = 0
-
-                    for ctx_i in range(0, len(batch_contents), contextual_batch_size):
-                        # Check for cancellation before each contextual sub-batch
-                        if cancellation_check:
-                            try:
-                                cancellation_check()
-                            except asyncio.CancelledError:
-                                if progress_callback:
-                                    await progress_callback(
-                                        "cancelled",
-                                        99,
-                                        "Storage cancelled during contextual embedding",
-                                        current_batch=batch_num,
-                                        total_batches=total_batches
-                                    )
-                                raise
-
-                        ctx_end = min(ctx_i + contextual_batch_size, len(batch_contents))
-
-                        sub_batch_contents = batch_contents[ctx_i:ctx_end]
-                        sub_batch_docs = full_documents[ctx_i:ctx_end]
-
-                        # Process sub-batch with a single API call
-                        sub_results = await generate_contextual_embeddings_batch(
-                            sub_batch_docs, sub_batch_contents
+                    # One call for the whole batch; the service bounds concurrency
+                    # by document with CONTEXTUAL_EMBEDDINGS_MAX_WORKERS
+                    with stage_timer("contextual_embedding"):
+                        contextual_results = await generate_contextual_embeddings_batch(
+                            full_documents, batch_contents
                         )
 
-                        # Extract results from this sub-batch
-                        for idx, (contextual_text, success) in enumerate(sub_results):
-                            contextual_contents.append(contextual_text)
-                            if success:
-                                original_idx = ctx_i + idx
-                                batch_metadatas[original_idx]["contextual_embedding"] = True
-                                successful_count += 1
+                    contextual_contents = []
+                    successful_count = 0
+                    for idx, (contextual_text, success) in enumerate(contextual_results):
+                        contextual_contents.append(contextual_text)
+                        if success:
+                            batch_metadatas[idx]["contextual_embedding"] = True
+                            successful_count += 1
 
                     search_logger.info(
-                        f"Batch {batch_num}: Generated {successful_count}/{len(batch_contents)} contextual embeddings using batch API (sub-batch size: {contextual_batch_size})"
+                        f"Batch {batch_num}: Generated {successful_count}/{len(batch_contents)} contextual embeddings"
+                    )
+
+                except EmbeddingQuotaExhaustedError as e:
+                    search_logger.error(f"Batch {batch_num}: {e}")
+                    # No point asking again for the remaining batches
+                    use_contextual_embeddings = False
+                    contextual_contents = batch_contents
+                    search_logger.warning(
+                        "Quota exhausted - storing remaining batches without contextual embeddings"
                     )
 
                 except Exception as e:
@@ -312,11 +282,12 @@ async def add_documents_to_supabase(
             wrapper_func = make_embedding_progress_wrapper(current_progress, batch_num)
 
             # Pass progress callback for rate limiting updates
-            result = await create_embeddings_batch(
-                contextual_contents,
-                provider=provider,
-                progress_callback=wrapper_func if progress_callback else None
-            )
+            with stage_timer("embedding"):
+                result = await create_embeddings_batch(
+                    contextual_contents,
+                    provider=provider,
+                    progress_callback=wrapper_func if progress_callback else None
+                )
 
             # Log any failures
             if result.has_failures:
@@ -415,6 +386,15 @@ async def add_documents_to_supabase(
                     "embedding_dimension": embedding_dim,  # Add dimension tracking
                     "page_id": page_id,  # Link chunk to page
                 }
+
+                # Store a truncated copy for coarse ANN search when the model supports it
+                if use_coarse_embeddings:
+                    coarse_embedding = multi_dimensional_embedding_service.get_coarse_embedding(
+                        embedding, embedding_model_name
+                    )
+                    if coarse_embedding is not None:
+                        data["embedding_coarse"] = coarse_embedding
+
                 batch_data.append(data)
 
             # Insert batch with retry logic - no progress reporting
@@ -439,8 +419,10 @@ async def add_documents_to_supabase(
                         raise
 
                 try:
-                    client.table("archon_crawled_pages").insert(batch_data).execute()
+                    with stage_timer("chunk_insert"):
+                        client.table("archon_crawled_pages").insert(batch_data).execute()
                     total_chunks_stored += len(batch_data)
+                    change_versions.bump(SOURCES)
 
                     # Increment completed batches and report simple progress
                     completed_batches += 1
@@ -497,7 +479,8 @@ async def add_documents_to_supabase(
                                     raise
 
                             try:
-                                client.table("archon_crawled_pages").insert(record).execute()
+                                with stage_timer("chunk_insert"):
+                                    client.table("archon_crawled_pages").insert(record).execute()
                                 successful_inserts += 1
                                 total_chunks_stored += 1
                             except Exception as individual_error:
@@ -9,13 +9,18 @@ Based on proven patterns from crawl4ai_mcp.py architecture.
 
 import asyncio
 import gc
+import inspect
+import re
+import sys
 import threading
 import time
 from collections import deque
-from collections.abc import Callable
+from collections.abc import Callable, Mapping
 from concurrent.futures import ThreadPoolExecutor
 from contextlib import asynccontextmanager
-from dataclasses import dataclass, field
+from contextvars import ContextVar
+from dataclasses import dataclass, field, replace
+from email.utils import parsedate_to_datetime
 
 # Removed direct logging import - using unified config
 from enum import Enum
@@ -24,11 +29,24 @@ from typing import Any
 import psutil
 
 from ..config.logfire_config import get_logger
+from .metrics_service import record_rate_limit_wait
+from .process_pool import CpuProcessPool, UnpicklableTaskError, get_cpu_process_pool
+from .token_counter import preload_encodings
 
 # Get logger for this module
 logfire_logger = get_logger("threading")
 
 
+# Fraction of a provider-reported limit to run at, leaving room for other clients
+RATE_LIMIT_HEADROOM = 0.95
+
+# Local providers have no quota; only their concurrency is limited
+UNMETERED_PROVIDERS = frozenset({"ollama"})
+
+# How long a memory reading is reused by is_memory_constrained (seconds)
+MEMORY_CHECK_INTERVAL = 1.0
+
+
 class ProcessingMode(str, Enum):
     """Processing modes for different workload types"""
 
@@ -39,7 +57,7 @@ class ProcessingMode(str, Enum):
 
 @dataclass
 class RateLimitConfig:
-    """Configuration for rate limiting"""
+    """Configuration for rate limiting (0 disables a limit)"""
 
     tokens_per_minute: int = 200_000  # OpenAI embedding limit
     requests_per_minute: int = 3000  # Request rate limit
@@ -73,12 +91,26 @@ class ThreadingConfig:
 
 
 class RateLimiter:
-    """Thread-safe rate limiter with token bucket algorithm"""
+    """
+    Sliding-window rate limiter for one (provider, model, endpoint kind).
+
+    Request and token usage over the last minute are kept with running
+    totals, so checking a request is O(1). Limits start from the static
+    RateLimitConfig and are calibrated from the provider's rate-limit
+    response headers (see update_from_headers); a limit of 0 disables
+    that check.
+    """
 
-    def __init__(self, config: RateLimitConfig):
+    def __init__(self, config: RateLimitConfig, name: str = "default"):
         self.config = config
+        self.name = name
         self.request_times = deque()
         self.token_usage = deque()
+        self._tokens_in_window = 0
+        # Server-reported state: (remaining, reset timestamp) and a retry-after block
+        self._remaining_requests: tuple[int, float] | None = None
+        self._remaining_tokens: tuple[int, float] | None = None
+        self._blocked_until = 0.0
         self.semaphore = asyncio.Semaphore(config.max_concurrent)
         self._lock = asyncio.Lock()
 
@@ -89,6 +121,7 @@ class RateLimiter:
             estimated_tokens: Estimated number of tokens for the operation
             progress_callback: Optional async callback for progress updates during wait
         """
+        estimated_tokens = int(estimated_tokens)
         while True:  # Loop instead of recursion to avoid stack overflow
             wait_time_to_sleep = None
             
@@ -99,18 +132,17 @@ class RateLimiter:
                 self._clean_old_entries(now)
 
                 # Check if we can make the request
-                if self._can_make_request(estimated_tokens):
-                    # Record the request
-                    self.request_times.append(now)
-                    self.token_usage.append((now, estimated_tokens))
+                if self._can_make_request(estimated_tokens, now):
+                    self._record(now, estimated_tokens)
                     return True
                 
                 # Calculate wait time if we can't make the request
-                wait_time = self._calculate_wait_time(estimated_tokens)
+                wait_time = self._calculate_wait_time(estimated_tokens, now)
                 if wait_time > 0:
                     logfire_logger.info(
                         f"Rate limiting: waiting {wait_time:.1f}s",
                         extra={
+                            "limiter": self.name,
                             "tokens": estimated_tokens,
                             "current_usage": self._get_current_usage(),
                         }
@@ -140,15 +172,42 @@ class RateLimiter:
                     await asyncio.sleep(wait_time_to_sleep)
                 # Continue the loop to try again
 
-    def _can_make_request(self, estimated_tokens: int) -> bool:
+    def _record(self, now: float, tokens: int):
+        self.request_times.append(now)
+        self.token_usage.append((now, tokens))
+        self._tokens_in_window += tokens
+        # Spend the server-reported budget until the next response refreshes it
+        if self._remaining_requests:
+            remaining, reset_at = self._remaining_requests
+            self._remaining_requests = (remaining - 1, reset_at)
+        if self._remaining_tokens:
+            remaining, reset_at = self._remaining_tokens
+            self._remaining_tokens = (remaining - tokens, reset_at)
+
+    def _can_make_request(self, estimated_tokens: int, now: float | None = None) -> bool:
         """Check if request can be made within limits"""
+        now = time.time() if now is None else now
+        if now < self._blocked_until:
+            return False
+
+        # Server-reported budgets until their reset
+        if self._remaining_requests and now < self._remaining_requests[1]:
+            if self._remaining_requests[0] <= 0:
+                return False
+        if self._remaining_tokens and now < self._remaining_tokens[1]:
+            if estimated_tokens > self._remaining_tokens[0]:
+                return False
+
         # Check request rate limit
-        if len(self.request_times) >= self.config.requests_per_minute:
+        if self.config.requests_per_minute and len(self.request_times) >= self.config.requests_per_minute:
             return False
 
-        # Check token usage limit
-        current_tokens = sum(tokens for _, tokens in self.token_usage)
-        if current_tokens + estimated_tokens > self.config.tokens_per_minute:
+        # Check token usage limit (a single oversized request may run alone)
+        if (
+            self.config.tokens_per_minute
+            and self.token_usage
+            and self._tokens_in_window + estimated_tokens > self.config.tokens_per_minute
+        ):
             return False
 
         return True
@@ -161,32 +220,142 @@ class RateLimiter:
             self.request_times.popleft()
 
         while self.token_usage and self.token_usage[0][0] < cutoff_time:
-            self.token_usage.popleft()
+            _, tokens = self.token_usage.popleft()
+            self._tokens_in_window -= tokens
 
-    def _calculate_wait_time(self, estimated_tokens: int) -> float:
+    def _calculate_wait_time(self, estimated_tokens: int, now: float | None = None) -> float:
         """Calculate how long to wait before retrying"""
-        if not self.request_times:
-            return 0
-
-        oldest_request = self.request_times[0]
-        time_since_oldest = time.time() - oldest_request
-
-        if time_since_oldest < 60:
-            return 60 - time_since_oldest + 0.1
+        now = time.time() if now is None else now
+        waits = [self._blocked_until - now]
+
+        if self._remaining_requests and self._remaining_requests[0] <= 0:
+            waits.append(self._remaining_requests[1] - now)
+        if self._remaining_tokens and estimated_tokens > self._remaining_tokens[0]:
+            waits.append(self._remaining_tokens[1] - now)
+
+        rpm = self.config.requests_per_minute
+        if rpm and len(self.request_times) >= rpm:
+            # Until enough of the oldest requests leave the window
+            waits.append(self.request_times[len(self.request_times) - rpm] + 60 - now)
+
+        tpm = self.config.tokens_per_minute
+        excess = self._tokens_in_window + estimated_tokens - tpm
+        if tpm and self.token_usage and excess > 0:
+            freed = 0
+            for timestamp, tokens in self.token_usage:
+                freed += tokens
+                if freed >= excess:
+                    waits.append(timestamp + 60 - now)
+                    break
+
+        wait_time = max(waits)
+        return wait_time + 0.1 if wait_time > 0 else 0
+
+    def update_from_headers(self, headers: Mapping[str, str]):
+        """
+        Calibrate the limiter from a provider response's rate-limit headers.
 
-        return 0
+        Understands the OpenAI-style ``x-ratelimit-limit-*``,
+        ``x-ratelimit-remaining-*`` and ``x-ratelimit-reset-*`` headers
+        (also sent by OpenRouter, Groq and others) and ``retry-after`` /
+        ``retry-after-ms``.
+        """
+        now = time.time()
+
+        limit_requests = _parse_int(headers.get("x-ratelimit-limit-requests"))
+        if limit_requests:
+            self.config.requests_per_minute = max(1, int(limit_requests * RATE_LIMIT_HEADROOM))
+        limit_tokens = _parse_int(headers.get("x-ratelimit-limit-tokens"))
+        if limit_tokens:
+            self.config.tokens_per_minute = max(1, int(limit_tokens * RATE_LIMIT_HEADROOM))
+
+        remaining_requests = _parse_int(headers.get("x-ratelimit-remaining-requests"))
+        if remaining_requests is not None:
+            reset = _parse_duration(headers.get("x-ratelimit-reset-requests")) or 60.0
+            self._remaining_requests = (remaining_requests, now + reset)
+        remaining_tokens = _parse_int(headers.get("x-ratelimit-remaining-tokens"))
+        if remaining_tokens is not None:
+            reset = _parse_duration(headers.get("x-ratelimit-reset-tokens")) or 60.0
+            self._remaining_tokens = (remaining_tokens, now + reset)
+
+        retry_after = _parse_retry_after(headers)
+        if retry_after:
+            self._blocked_until = max(self._blocked_until, now + retry_after)
+            logfire_logger.warning(
+                f"Provider asked to retry after {retry_after:.1f}s",
+                extra={"limiter": self.name},
+            )
 
     def _get_current_usage(self) -> dict[str, int]:
         """Get current usage statistics"""
-        current_tokens = sum(tokens for _, tokens in self.token_usage)
         return {
             "requests": len(self.request_times),
-            "tokens": current_tokens,
+            "tokens": self._tokens_in_window,
             "max_requests": self.config.requests_per_minute,
             "max_tokens": self.config.tokens_per_minute,
         }
 
 
+def _parse_int(value: str | None) -> int | None:
+    try:
+        return int(float(value)) if value is not None else None
+    except ValueError:
+        return None
+
+
+_DURATION_PART = re.compile(r"(\d+(?:\.\d+)?)(ms|h|m|s)")
+
+
+def _parse_duration(value: str | None) -> float | None:
+    """Parse reset durations like "1s", "6m0s", "20ms" or plain seconds."""
+    if not value:
+        return None
+    try:
+        return float(value)
+    except ValueError:
+        pass
+    seconds = 0.0
+    units = {"ms": 0.001, "s": 1.0, "m": 60.0, "h": 3600.0}
+    parts = _DURATION_PART.findall(value)
+    if not parts:
+        return None
+    for amount, unit in parts:
+        seconds += float(amount) * units[unit]
+    return seconds
+
+
+def _parse_retry_after(headers: Mapping[str, str]) -> float | None:
+    retry_after_ms = headers.get("retry-after-ms")
+    if retry_after_ms:
+        try:
+            return float(retry_after_ms) / 1000
+        except ValueError:
+            pass
+    retry_after = headers.get("retry-after")
+    if not retry_after:
+        return None
+    try:
+        return float(retry_after)
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(retry_after).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+# Limiter of the rate-limited operation running in the current task, read by
+# the HTTP response hook so headers calibrate the limiter that made the call
+_active_rate_limiter: ContextVar[RateLimiter | None] = ContextVar("active_rate_limiter", default=None)
+
+
+async def record_rate_limit_headers(response) -> None:
+    """httpx response hook feeding rate-limit headers to the active limiter."""
+    limiter = _active_rate_limiter.get()
+    if limiter is not None:
+        limiter.update_from_headers(response.headers)
+
+
 class MemoryAdaptiveDispatcher:
     """Dynamically adjust concurrency based on memory usage"""
 
@@ -194,6 +363,8 @@ class MemoryAdaptiveDispatcher:
         self.config = config
         self.current_workers = config.base_workers
         self.last_metrics = None
+        self._memory_checked_at = 0.0
+        self._memory_constrained = False
 
     def get_system_metrics(self) -> SystemMetrics:
         """Get current system performance metrics"""
@@ -208,6 +379,16 @@ class MemoryAdaptiveDispatcher:
             active_threads=active_threads,
         )
 
+    def is_memory_constrained(self) -> bool:
+        """Whether memory use is above the threshold (re-read at most once per second)"""
+        now = time.monotonic()
+        if now - self._memory_checked_at >= MEMORY_CHECK_INTERVAL:
+            self._memory_constrained = (
+                psutil.virtual_memory().percent > self.config.memory_threshold * 100
+            )
+            self._memory_checked_at = now
+        return self._memory_constrained
+
     def calculate_optimal_workers(self, mode: ProcessingMode = ProcessingMode.CPU_INTENSIVE) -> int:
         """Calculate optimal worker count based on system load and processing mode"""
         metrics = self.get_system_metrics()
@@ -215,7 +396,8 @@ class MemoryAdaptiveDispatcher:
 
         # Base worker count depends on processing mode
         if mode == ProcessingMode.CPU_INTENSIVE:
-            base = min(self.config.base_workers, psutil.cpu_count())
+            # One worker per core: CPU-bound work runs in worker processes
+            base = min(self.config.max_workers, psutil.cpu_count() or 1)
         elif mode == ProcessingMode.IO_BOUND:
             base = self.config.base_workers * 2
         elif mode == ProcessingMode.NETWORK_BOUND:
@@ -234,6 +416,9 @@ class MemoryAdaptiveDispatcher:
                     "workers": workers,
                 }
             )
+        elif mode == ProcessingMode.CPU_INTENSIVE:
+            # CPU-bound work is meant to keep every core busy; never more than one per core
+            workers = base
         elif metrics.cpu_percent > self.config.cpu_threshold * 100:
             # Reduce workers when CPU is high
             workers = max(1, base // 2)
@@ -261,8 +446,14 @@ class MemoryAdaptiveDispatcher:
         mode: ProcessingMode = ProcessingMode.CPU_INTENSIVE,
         progress_callback: Callable | None = None,
         enable_worker_tracking: bool = False,
+        cpu_runner: Callable | None = None,
     ) -> list[Any]:
-        """Process items with adaptive concurrency control"""
+        """Process items with adaptive concurrency control
+
+        Args:
+            cpu_runner: Async function running CPU_INTENSIVE work (e.g.
+                ThreadingService.run_cpu_intensive); default: the loop's thread pool
+        """
 
         if not items:
             return []
@@ -311,8 +502,10 @@ class MemoryAdaptiveDispatcher:
                             "message": f"Worker {worker_id} processing item {index + 1}",
                         })
 
-                    # For CPU-intensive work, run in thread pool
-                    if mode == ProcessingMode.CPU_INTENSIVE:
+                    # For CPU-intensive work, run in the CPU runner or thread pool
+                    if mode == ProcessingMode.CPU_INTENSIVE and cpu_runner is not None:
+                        result = await cpu_runner(process_func, item)
+                    elif mode == ProcessingMode.CPU_INTENSIVE:
                         loop = asyncio.get_event_loop()
                         result = await loop.run_in_executor(None, process_func, item)
                     else:
@@ -412,9 +605,17 @@ class ThreadingService:
         rate_limit_config: RateLimitConfig | None = None,
     ):
         self.config = threading_config or ThreadingConfig()
-        self.rate_limiter = RateLimiter(rate_limit_config or RateLimitConfig())
+        self.rate_limit_config = rate_limit_config or RateLimitConfig()
+        # Default limiter for callers that don't name a provider; each
+        # (provider, model, kind) gets its own limiter via get_rate_limiter
+        self.rate_limiter = RateLimiter(self.rate_limit_config)
+        self._rate_limiters: dict[tuple[str, str, str], RateLimiter] = {}
         self.memory_dispatcher = MemoryAdaptiveDispatcher(self.config)
 
+        # Worker processes for picklable CPU-bound work; admits fewer tasks under memory pressure
+        self.cpu_pool: CpuProcessPool = get_cpu_process_pool()
+        self.cpu_pool.memory_pressure = self.memory_dispatcher.is_memory_constrained
+
         # Thread pools for different workload types
         self.cpu_executor = ThreadPoolExecutor(
             max_workers=self.config.max_workers, thread_name_prefix="archon-cpu"
@@ -433,6 +634,13 @@ class ThreadingService:
 
         self._running = True
         self._health_check_task = asyncio.create_task(self._health_check_loop())
+        # Load tokenizer files off the event loop before the first count
+        await self.run_io_bound(preload_encodings)
+        # Start the CPU workers now so the first ingestion doesn't wait for them
+        try:
+            await self.cpu_pool.start()
+        except Exception as e:
+            logfire_logger.warning("Could not start CPU process pool", extra={"error": str(e)})
         logfire_logger.info("Threading service started", extra={"config": self.config.__dict__})
 
     async def stop(self):
@@ -449,39 +657,98 @@ class ThreadingService:
             except asyncio.CancelledError:
                 pass
 
-        # Shutdown thread pools
+        # Shutdown thread pools and worker processes
         self.cpu_executor.shutdown(wait=True)
         self.io_executor.shutdown(wait=True)
+        self.cpu_pool.shutdown()
 
         logfire_logger.info("Threading service stopped")
 
+    def get_rate_limiter(
+        self, provider: str | None = None, model: str | None = None, kind: str = "default"
+    ) -> RateLimiter:
+        """
+        Get the limiter for a provider, model and endpoint kind.
+
+        Limiters start from the service's RateLimitConfig and then follow
+        the limits the provider reports in its response headers. Local
+        providers (UNMETERED_PROVIDERS) are only limited in concurrency.
+
+        Args:
+            provider: LLM provider name (None for the default limiter)
+            model: Model name
+            kind: Endpoint kind, e.g. "embeddings" or "chat"
+        """
+        if not provider:
+            return self.rate_limiter
+
+        key = (provider.lower(), model or "", kind)
+        limiter = self._rate_limiters.get(key)
+        if limiter is None:
+            config = replace(self.rate_limit_config)
+            if key[0] in UNMETERED_PROVIDERS:
+                config.tokens_per_minute = 0
+                config.requests_per_minute = 0
+            limiter = RateLimiter(config, name=":".join(key))
+            self._rate_limiters[key] = limiter
+        return limiter
+
     @asynccontextmanager
-    async def rate_limited_operation(self, estimated_tokens: int = 8000, progress_callback: Callable | None = None):
+    async def rate_limited_operation(
+        self,
+        estimated_tokens: int = 8000,
+        progress_callback: Callable | None = None,
+        provider: str | None = None,
+        model: str | None = None,
+        kind: str = "default",
+    ):
         """Context manager for rate-limited operations
         
         Args:
             estimated_tokens: Estimated number of tokens for the operation
             progress_callback: Optional async callback for progress updates during wait
+            provider: Provider the operation calls (selects its limiter)
+            model: Model the operation uses
+            kind: Endpoint kind, e.g. "embeddings" or "chat"
+
+        Yields:
+            The limiter in use; rate-limit headers of API calls made inside
+            the block calibrate it (see record_rate_limit_headers)
         """
-        async with self.rate_limiter.semaphore:
-            can_proceed = await self.rate_limiter.acquire(estimated_tokens, progress_callback)
+        limiter = self.get_rate_limiter(provider, model, kind)
+        wait_started = time.perf_counter()
+        async with limiter.semaphore:
+            can_proceed = await limiter.acquire(estimated_tokens, progress_callback)
+            record_rate_limit_wait(limiter.name, time.perf_counter() - wait_started)
             if not can_proceed:
                 raise Exception("Rate limit exceeded")
 
+            token = _active_rate_limiter.set(limiter)
             start_time = time.time()
             try:
-                yield
+                yield limiter
             finally:
+                _active_rate_limiter.reset(token)
                 duration = time.time() - start_time
                 logfire_logger.debug(
                     "Rate limited operation completed",
-                    extra={"duration": duration, "tokens": estimated_tokens},
+                    extra={"duration": duration, "tokens": estimated_tokens, "limiter": limiter.name},
                 )
 
     async def run_cpu_intensive(self, func: Callable, *args, **kwargs) -> Any:
-        """Run CPU-intensive function in thread pool"""
+        """
+        Run CPU-intensive function in a worker process.
+
+        Functions that can't be sent to a worker (bound methods, closures,
+        unpicklable arguments) run in the CPU thread pool instead.
+        """
+        if _is_module_level_function(func):
+            try:
+                return await self.cpu_pool.run(func, *args, **kwargs)
+            except UnpicklableTaskError as e:
+                logfire_logger.debug("Running CPU task in a thread", extra={"reason": str(e)})
         loop = asyncio.get_event_loop()
-        return await loop.run_in_executor(self.cpu_executor, func, *args, **kwargs)
+        return await loop.run_in_executor(self.cpu_executor, lambda: func(*args, **kwargs))
 
     async def run_io_bound(self, func: Callable, *args, **kwargs) -> Any:
         """Run I/O-bound function in thread pool"""
@@ -503,6 +770,7 @@ class ThreadingService:
             mode=mode,
             progress_callback=progress_callback,
             enable_worker_tracking=enable_worker_tracking,
+            cpu_runner=self.run_cpu_intensive,
         )
 
 
@@ -558,6 +826,18 @@ class ThreadingService:
                 await asyncio.sleep(self.config.health_check_interval)
 
 
+def _is_module_level_function(func: Callable) -> bool:
+    """Whether a worker process can import func by its module and qualified name."""
+    # Functions pickle by reference, so only module-level ones resolve in a worker;
+    # a bound method would run on a copy of its instance
+    if inspect.ismethod(func):
+        return False
+    target = sys.modules.get(getattr(func, "__module__", None) or "")
+    for part in getattr(func, "__qualname__", "<unknown>").split("."):
+        target = getattr(target, part, None)
+    return target is func
+
+
 # Global threading service instance
 _threading_service: ThreadingService | None = None
 
@@ -0,0 +1,115 @@
+"""
+Token counting for rate limiting.
+
+Counts tokens with tiktoken's BPE tokenizers: exact for OpenAI models and
+a close estimate for other providers' models, far better than word counts
+for code and non-English text. When tiktoken is not installed or its
+encoding files cannot be loaded (offline containers), a character-based
+estimate of about four characters per token is used instead.
+
+Encodings are loaded once per process; call preload_encodings() from a
+worker thread at startup so the first count does not block the event loop.
+Async callers use count_tokens_async, which tokenizes large inputs in a
+worker thread.
+"""
+
+import asyncio
+import functools
+import threading
+
+try:
+    import tiktoken
+
+    TIKTOKEN_AVAILABLE = True
+except ImportError:
+    tiktoken = None
+    TIKTOKEN_AVAILABLE = False
+
+from ..config.logfire_config import get_logger
+
+logger = get_logger(__name__)
+
+CHARS_PER_TOKEN = 4
+
+# Encoding for models tiktoken does not know (other providers' models)
+DEFAULT_ENCODING = "cl100k_base"
+PRELOADED_ENCODINGS = ("cl100k_base", "o200k_base")
+
+# Inputs of at least this many characters are tokenized off the event loop
+ASYNC_TOKENIZE_MIN_CHARS = 20_000
+
+_load_failed = threading.Event()
+
+
+def estimate_tokens(text: str) -> int:
+    """Character-based token estimate used when no tokenizer is available."""
+    if not text:
+        return 0
+    return (len(text) + CHARS_PER_TOKEN - 1) // CHARS_PER_TOKEN
+
+
+@functools.lru_cache(maxsize=64)
+def _encoding_for(model: str | None):
+    if not TIKTOKEN_AVAILABLE or _load_failed.is_set():
+        return None
+    try:
+        if model:
+            try:
+                return tiktoken.encoding_for_model(model.split("/")[-1])
+            except KeyError:
+                pass
+        return tiktoken.get_encoding(DEFAULT_ENCODING)
+    except Exception as e:
+        # Encoding files are downloaded on first use; don't retry when offline
+        _load_failed.set()
+        logger.warning(f"tiktoken encodings unavailable, estimating tokens from length: {e}")
+        return None
+
+
+def preload_encodings() -> None:
+    """Load the common encodings (blocking; run in a worker thread)."""
+    if not TIKTOKEN_AVAILABLE:
+        return
+    for name in PRELOADED_ENCODINGS:
+        try:
+            tiktoken.get_encoding(name)
+        except Exception as e:
+            _load_failed.set()
+            logger.warning(f"Could not preload tiktoken encoding {name}: {e}")
+            return
+
+
+def count_tokens(texts: str | list[str], model: str | None = None) -> int:
+    """
+    Count the tokens in one or more texts.
+
+    Args:
+        texts: Text or list of texts
+        model: Model the texts are sent to (selects the tokenizer)
+
+    Returns:
+        Total token count
+    """
+    if isinstance(texts, str):
+        texts = [texts]
+    if not texts:
+        return 0
+
+    encoding = _encoding_for(model)
+    if encoding is None:
+        return sum(estimate_tokens(text) for text in texts)
+    return sum(len(tokens) for tokens in encoding.encode_ordinary_batch(texts))
+
+
+async def count_tokens_async(texts: str | list[str], model: str | None = None) -> int:
+    """
+    Count tokens like count_tokens without blocking the event loop on large inputs.
+
+    Inputs shorter than ASYNC_TOKENIZE_MIN_CHARS are counted inline; larger
+    ones are tokenized in a worker thread.
+    """
+    if isinstance(texts, str):
+        texts = [texts]
+    if sum(len(text) for text in texts) < ASYNC_TOKENIZE_MIN_CHARS:
+        return count_tokens(texts, model)
+    return await asyncio.to_thread(count_tokens, texts, model)
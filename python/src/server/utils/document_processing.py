@@ -5,7 +5,9 @@ This module provides utilities for extracting text from various document formats
 including PDF, Word documents, and plain text files.
 """
 
+import asyncio
 import io
+from collections.abc import Awaitable, Callable
 
 # Removed direct logging import - using unified config
 
@@ -32,9 +34,13 @@ except ImportError:
     DOCX_AVAILABLE = False
 
 from ..config.logfire_config import get_logger, logfire
+from ..services.process_pool import CpuProcessPool, get_cpu_process_pool, shutdown_cpu_process_pool
 
 logger = get_logger(__name__)
 
+# Pages handed to one worker per task; small enough for steady progress updates
+PDF_PAGES_PER_TASK = 16
+
 
 def _preserve_code_blocks_across_pages(text: str) -> str:
     """
@@ -342,3 +348,193 @@ def extract_text_from_docx(file_content: bytes) -> str:
 
     except Exception as e:
         raise Exception("Failed to extract text from Word document") from e
+
+
+def _is_pdf(filename: str, content_type: str) -> bool:
+    return content_type == "application/pdf" or filename.lower().endswith(".pdf")
+
+
+def get_extraction_pool() -> CpuProcessPool:
+    """
+    Get the process pool used for document extraction.
+
+    pdfminer and python-docx are pure Python, so threads would serialize on
+    the GIL; extraction shares the server's CPU process pool.
+    """
+    return get_cpu_process_pool()
+
+
+def shutdown_extraction_pool() -> None:
+    """Shut down the extraction (shared CPU) process pool, if it was started."""
+    shutdown_cpu_process_pool()
+
+
+def _count_pdf_pages(file_path: str) -> int:
+    """Count the pages of a PDF file (runs in a worker process)."""
+    if PYPDF2_AVAILABLE:
+        return len(PyPDF2.PdfReader(file_path).pages)
+    with pdfplumber.open(file_path) as pdf:
+        return len(pdf.pages)
+
+
+def _extract_pdf_pages(file_path: str, page_numbers: list[int]) -> list[tuple[int, str]]:
+    """
+    Extract text from a subset of PDF pages (runs in a worker process).
+
+    pdfplumber is tried first (better for complex layouts); pages it fails on or
+    returns no text for fall back to PyPDF2 individually.
+
+    Args:
+        file_path: Path to the PDF file
+        page_numbers: 1-based page numbers to extract
+
+    Returns:
+        (page_number, text) pairs for pages that produced text
+    """
+    page_texts: dict[int, str] = {}
+
+    if PDFPLUMBER_AVAILABLE:
+        try:
+            with pdfplumber.open(file_path, pages=page_numbers) as pdf:
+                for page in pdf.pages:
+                    try:
+                        page_text = page.extract_text()
+                    except Exception:
+                        continue
+                    if page_text and page_text.strip():
+                        page_texts[page.page_number] = page_text
+        except Exception:
+            pass
+
+    missing_pages = [n for n in page_numbers if n not in page_texts]
+    if missing_pages and PYPDF2_AVAILABLE:
+        try:
+            pdf_reader = PyPDF2.PdfReader(file_path)
+            for page_number in missing_pages:
+                try:
+                    page_text = pdf_reader.pages[page_number - 1].extract_text()
+                except Exception:
+                    continue
+                if page_text and page_text.strip():
+                    page_texts[page_number] = page_text
+        except Exception:
+            pass
+
+    return sorted(page_texts.items())
+
+
+def _extract_text_from_document_path(file_path: str, filename: str, content_type: str) -> str:
+    """Read a file and extract its text with extract_text_from_document (runs in a worker process)."""
+    with open(file_path, "rb") as f:
+        file_content = f.read()
+    return extract_text_from_document(file_content, filename, content_type)
+
+
+async def extract_text_from_pdf_file(
+    file_path: str,
+    progress_callback: Callable[[int, int], Awaitable[None]] | None = None,
+) -> str:
+    """
+    Extract text from a PDF file with its pages split across worker processes.
+
+    Args:
+        file_path: Path to the PDF file
+        progress_callback: Optional async callback receiving (pages_processed, total_pages)
+
+    Returns:
+        Extracted text content, one "--- Page N ---" section per page with text
+
+    Raises:
+        ValueError: If no text could be extracted (empty, images-only or scanned PDF)
+    """
+    if not PDFPLUMBER_AVAILABLE and not PYPDF2_AVAILABLE:
+        raise Exception(
+            "No PDF processing libraries available. Please install pdfplumber and PyPDF2."
+        )
+
+    pool = get_extraction_pool()
+
+    total_pages = await pool.run(_count_pdf_pages, file_path)
+    page_batches = [
+        list(range(start, min(start + PDF_PAGES_PER_TASK, total_pages + 1)))
+        for start in range(1, total_pages + 1, PDF_PAGES_PER_TASK)
+    ]
+
+    async def extract_batch(batch: list[int]) -> tuple[int, list[tuple[int, str]]]:
+        batch_texts = await pool.run(_extract_pdf_pages, file_path, batch)
+        return len(batch), batch_texts
+
+    tasks = [asyncio.ensure_future(extract_batch(batch)) for batch in page_batches]
+    page_texts: dict[int, str] = {}
+    pages_processed = 0
+
+    try:
+        for completed in asyncio.as_completed(tasks):
+            batch_size, batch_texts = await completed
+            page_texts.update(batch_texts)
+            pages_processed += batch_size
+            if progress_callback:
+                await progress_callback(pages_processed, total_pages)
+    except (Exception, asyncio.CancelledError):
+        # Cancelled upload or failed batch - don't leave queued pages waiting for a worker
+        for task in tasks:
+            task.cancel()
+        raise
+
+    if not page_texts:
+        raise ValueError(
+            "No text extracted from PDF: file may be empty, images-only, "
+            "or scanned document without OCR"
+        )
+
+    combined_text = "\n\n".join(
+        f"--- Page {page_number} ---\n{page_texts[page_number]}" for page_number in sorted(page_texts)
+    )
+    logger.info(f"Extracted {len(page_texts)}/{total_pages} PDF pages, total length: {len(combined_text)}")
+    return _preserve_code_blocks_across_pages(combined_text)
+
+
+async def extract_text_from_document_file(
+    file_path: str,
+    filename: str,
+    content_type: str,
+    progress_callback: Callable[[int, int], Awaitable[None]] | None = None,
+) -> str:
+    """
+    Extract text from a document on disk without blocking the event loop.
+
+    PDFs are split page-wise across the extraction process pool; other formats
+    (including DOCX, which python-docx can only parse whole) run as a single
+    task in the same pool.
+
+    Args:
+        file_path: Path to the uploaded file
+        filename: Original name of the file
+        content_type: MIME type of the file
+        progress_callback: Optional async callback receiving (pages_processed, total_pages)
+
+    Returns:
+        Extracted text content
+
+    Raises:
+        ValueError: If the file format is not supported or has no text
+        Exception: If extraction fails
+    """
+    if not _is_pdf(filename, content_type):
+        # extract_text_from_document already raises ValueError / wrapped exceptions
+        return await get_extraction_pool().run(
+            _extract_text_from_document_path, file_path, filename, content_type
+        )
+
+    try:
+        return await extract_text_from_pdf_file(file_path, progress_callback)
+    except ValueError:
+        raise
+    except Exception as e:
+        logfire.error(
+            "Document text extraction failed",
+            filename=filename,
+            content_type=content_type,
+            error=str(e),
+        )
+        raise Exception(f"Failed to extract text from {filename}") from e
@@ -1,9 +1,10 @@
 """ETag utilities for HTTP caching and efficient polling."""
 
 import hashlib
-import json
 from typing import Any
 
+from .json_response import dumps_json
+
 
 def generate_etag(data: Any) -> str:
     """Generate an ETag hash from data.
@@ -14,11 +15,11 @@ def generate_etag(data: Any) -> str:
     Returns:
         ETag string (MD5 hash of JSON representation)
     """
-    # Convert data to stable JSON string
-    json_str = json.dumps(data, sort_keys=True, default=str)
+    # Convert data to stable JSON bytes (sorted keys)
+    json_bytes = dumps_json(data, sort_keys=True)
 
     # Generate MD5 hash
-    hash_obj = hashlib.md5(json_str.encode('utf-8'))
+    hash_obj = hashlib.md5(json_bytes)
 
     # Return ETag in standard format (quoted)
     return f'"{hash_obj.hexdigest()}"'
@@ -0,0 +1,194 @@
+"""
+JSON Patch utilities for delta-encoded document versions.
+
+Implements the subset of RFC 6902 needed to store a JSON document as a
+series of changes: "add", "remove" and "replace" operations addressed by
+RFC 6901 JSON pointers. make_patch() produces a patch that turns one
+document into another and apply_patch() replays it.
+
+Lists are diffed element by element after trimming their common prefix
+and suffix, so inserting, removing or editing one entry of a long list
+(the usual edit of a project's docs array) yields a patch touching only
+that entry.
+"""
+
+import copy
+from typing import Any
+
+JsonPatch = list[dict[str, Any]]
+
+
+class JsonPatchError(ValueError):
+    """Raised when a patch cannot be applied to a document."""
+
+
+def _escape(token: str | int) -> str:
+    return str(token).replace("~", "~0").replace("/", "~1")
+
+
+def _unescape(token: str) -> str:
+    return token.replace("~1", "/").replace("~0", "~")
+
+
+def _same(a: Any, b: Any) -> bool:
+    # bool is an int subclass; True == 1 must not hide a type change
+    if type(a) is not type(b):
+        return False
+    if isinstance(a, dict):
+        return a.keys() == b.keys() and all(_same(value, b[key]) for key, value in a.items())
+    if isinstance(a, list):
+        return len(a) == len(b) and all(_same(x, y) for x, y in zip(a, b, strict=True))
+    return a == b
+
+
+def make_patch(old: Any, new: Any) -> JsonPatch:
+    """
+    Build a patch turning old into new.
+
+    Args:
+        old: Source JSON document
+        new: Target JSON document
+
+    Returns:
+        List of RFC 6902 operations (empty if the documents are equal)
+    """
+    patch: JsonPatch = []
+    _diff(old, new, "", patch)
+    return patch
+
+
+def _diff(old: Any, new: Any, path: str, patch: JsonPatch) -> None:
+    if _same(old, new):
+        return
+
+    if isinstance(old, dict) and isinstance(new, dict):
+        for key in old:
+            if key not in new:
+                patch.append({"op": "remove", "path": f"{path}/{_escape(key)}"})
+        for key, value in new.items():
+            child = f"{path}/{_escape(key)}"
+            if key in old:
+                _diff(old[key], value, child, patch)
+            else:
+                patch.append({"op": "add", "path": child, "value": copy.deepcopy(value)})
+        return
+
+    if isinstance(old, list) and isinstance(new, list):
+        _diff_list(old, new, path, patch)
+        return
+
+    patch.append({"op": "replace", "path": path, "value": copy.deepcopy(new)})
+
+
+def _diff_list(old: list, new: list, path: str, patch: JsonPatch) -> None:
+    prefix = 0
+    limit = min(len(old), len(new))
+    while prefix < limit and _same(old[prefix], new[prefix]):
+        prefix += 1
+
+    suffix = 0
+    while (
+        suffix < limit - prefix
+        and _same(old[len(old) - 1 - suffix], new[len(new) - 1 - suffix])
+    ):
+        suffix += 1
+
+    old_middle = old[prefix : len(old) - suffix]
+    new_middle = new[prefix : len(new) - suffix]
+    paired = min(len(old_middle), len(new_middle))
+
+    for offset in range(paired):
+        _diff(old_middle[offset], new_middle[offset], f"{path}/{prefix + offset}", patch)
+
+    # Removals and insertions all happen at the first unpaired position
+    position = f"{path}/{prefix + paired}"
+    for _ in range(len(old_middle) - paired):
+        patch.append({"op": "remove", "path": position})
+    for offset, value in enumerate(new_middle[paired:]):
+        patch.append(
+            {"op": "add", "path": f"{path}/{prefix + paired + offset}", "value": copy.deepcopy(value)}
+        )
+
+
+def apply_patch(document: Any, patch: JsonPatch) -> Any:
+    """
+    Apply a patch to a document.
+
+    The input document is not modified.
+
+    Args:
+        document: JSON document to patch
+        patch: Operations produced by make_patch()
+
+    Returns:
+        The patched document
+
+    Raises:
+        JsonPatchError: If an operation is unsupported or its path does not exist
+    """
+    result = copy.deepcopy(document)
+    for operation in patch:
+        result = _apply_operation(result, operation)
+    return result
+
+
+def _apply_operation(document: Any, operation: dict[str, Any]) -> Any:
+    op = operation.get("op")
+    path = operation.get("path", "")
+    if op not in ("add", "remove", "replace"):
+        raise JsonPatchError(f"Unsupported patch operation: {op}")
+
+    if path == "":
+        if op == "remove":
+            return None
+        return copy.deepcopy(operation["value"])
+
+    if not path.startswith("/"):
+        raise JsonPatchError(f"Invalid JSON pointer: {path}")
+
+    tokens = [_unescape(token) for token in path[1:].split("/")]
+    parent = document
+    for token in tokens[:-1]:
+        parent = _child(parent, token, path)
+
+    last = tokens[-1]
+    if isinstance(parent, dict):
+        if op != "add" and last not in parent:
+            raise JsonPatchError(f"Path not found: {path}")
+        if op == "remove":
+            del parent[last]
+        else:
+            parent[last] = copy.deepcopy(operation["value"])
+    elif isinstance(parent, list):
+        index = len(parent) if last == "-" else _index(last, path)
+        upper = len(parent) if op == "add" else len(parent) - 1
+        if index > upper:
+            raise JsonPatchError(f"Index out of range: {path}")
+        if op == "add":
+            parent.insert(index, copy.deepcopy(operation["value"]))
+        elif op == "remove":
+            del parent[index]
+        else:
+            parent[index] = copy.deepcopy(operation["value"])
+    else:
+        raise JsonPatchError(f"Path not found: {path}")
+    return document
+
+
+def _child(container: Any, token: str, path: str) -> Any:
+    if isinstance(container, dict):
+        if token not in container:
+            raise JsonPatchError(f"Path not found: {path}")
+        return container[token]
+    if isinstance(container, list):
+        index = _index(token, path)
+        if index >= len(container):
+            raise JsonPatchError(f"Index out of range: {path}")
+        return container[index]
+    raise JsonPatchError(f"Path not found: {path}")
+
+
+def _index(token: str, path: str) -> int:
+    if not token.isdigit() or (len(token) > 1 and token.startswith("0")):
+        raise JsonPatchError(f"Invalid list index in {path}")
+    return int(token)
@@ -0,0 +1,97 @@
+"""
+Lean JSON serialization for large list endpoints.
+
+FastJSONResponse renders with orjson when it is installed (several times
+faster than the stdlib encoder on the multi-megabyte project and chunk
+listings) and falls back to a compact json.dumps otherwise. Endpoints
+return plain dicts through it instead of building a pydantic model per
+row.
+
+parse_fields()/project_fields() implement the ``fields=`` query parameter
+so clients can ask list endpoints for only the keys they render.
+"""
+
+import json
+from collections.abc import Iterable
+from typing import Any
+
+from starlette.responses import JSONResponse
+
+try:
+    import orjson
+
+    ORJSON_AVAILABLE = True
+except ImportError:  # pragma: no cover - exercised only without orjson
+    orjson = None
+    ORJSON_AVAILABLE = False
+
+
+def dumps_json(content: Any, sort_keys: bool = False) -> bytes:
+    """
+    Serialize content to compact UTF-8 JSON.
+
+    Args:
+        content: JSON-compatible data; unknown types are converted with str()
+        sort_keys: Emit object keys in sorted order (for stable hashing)
+
+    Returns:
+        Encoded JSON bytes
+    """
+    if ORJSON_AVAILABLE:
+        option = orjson.OPT_NON_STR_KEYS
+        if sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        return orjson.dumps(content, default=str, option=option)
+
+    return json.dumps(
+        content,
+        ensure_ascii=False,
+        separators=(",", ":"),
+        sort_keys=sort_keys,
+        default=str,
+    ).encode("utf-8")
+
+
+class FastJSONResponse(JSONResponse):
+    """JSONResponse rendered with dumps_json()."""
+
+    def render(self, content: Any) -> bytes:
+        return dumps_json(content)
+
+
+def parse_fields(fields: str | None) -> set[str] | None:
+    """
+    Parse a comma-separated ``fields`` query parameter.
+
+    Args:
+        fields: Raw parameter value, e.g. ``"id,title,updated_at"``
+
+    Returns:
+        Set of requested field names, or None when no projection was asked for
+    """
+    if not fields:
+        return None
+    names = {name.strip() for name in fields.split(",") if name.strip()}
+    return names or None
+
+
+def project_fields(
+    items: Iterable[dict[str, Any]],
+    fields: set[str] | None,
+    always: Iterable[str] = ("id",),
+) -> list[dict[str, Any]]:
+    """
+    Keep only the requested keys of each item.
+
+    Args:
+        items: Rows to project
+        fields: Field names from parse_fields(); None returns the rows unchanged
+        always: Keys kept even when not requested (row identity)
+
+    Returns:
+        List of projected rows
+    """
+    if fields is None:
+        return list(items)
+    keep = fields | set(always)
+    return [{key: value for key, value in item.items() if key in keep} for item in items]
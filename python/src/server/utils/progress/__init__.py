@@ -3,6 +3,7 @@ Progress Tracking Utilities
 
 Provides utilities for tracking and broadcasting progress updates.
 """
-from .progress_tracker import ProgressTracker
+from .progress_backend import get_progress_backend
+from .progress_tracker import ProgressSubscription, ProgressTracker
 
-__all__ = ['ProgressTracker']
+__all__ = ['ProgressTracker', 'ProgressSubscription', 'get_progress_backend']
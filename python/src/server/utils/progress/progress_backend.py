@@ -0,0 +1,365 @@
+"""
+Progress Backends
+
+Decide where progress state and stop requests live so they can be shared
+between API worker processes.
+
+- memory (default): state stays in the process running the operation.
+  Correct for a single uvicorn worker.
+- supabase: state is mirrored into the archon_operation_progress table.
+  Any worker behind a load balancer can answer progress polls, list
+  active operations and record stop requests; the worker that owns an
+  operation picks up stop requests and cancels it locally.
+
+Select the backend with the PROGRESS_BACKEND environment variable.
+"""
+
+import asyncio
+import json
+import os
+import socket
+import time
+from collections.abc import Awaitable, Callable
+from datetime import UTC, datetime, timedelta
+from typing import Any
+
+from ...config.logfire_config import safe_logfire_error, safe_logfire_info
+
+SUPPORTED_PROGRESS_BACKENDS = ["memory", "supabase"]
+
+TERMINAL_STATUSES = {"completed", "failed", "error", "cancelled"}
+
+# Minimum spacing between shared writes of one operation; newer states replace pending ones
+SHARED_WRITE_INTERVAL = 0.5
+
+# How often the owning worker checks for stop requests made on other workers
+CANCEL_POLL_INTERVAL = 2.0
+
+# Operations not updated for this long are treated as abandoned (their worker is gone)
+STALE_OPERATION_SECONDS = 600
+
+# Stops an operation running in this process; returns whether one was found
+CancelHandler = Callable[[str], Awaitable[bool]]
+
+
+def process_owner_id() -> str:
+    """Identify this worker process in shared progress rows."""
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+class InMemoryProgressBackend:
+    """
+    Process-local backend.
+
+    ProgressTracker already keeps local state in memory, so there is
+    nothing to share and every method is a no-op.
+    """
+
+    shared = False
+
+    def publish(self, progress_id: str, state: dict[str, Any]) -> None:
+        pass
+
+    def remove(self, progress_id: str) -> None:
+        pass
+
+    async def get(self, progress_id: str) -> dict[str, Any] | None:
+        return None
+
+    async def list_active(self) -> dict[str, dict[str, Any]]:
+        return {}
+
+    async def request_cancel(self, progress_id: str) -> bool:
+        return False
+
+    async def start(self, cancel_handler: CancelHandler) -> None:
+        pass
+
+    async def stop(self) -> None:
+        pass
+
+
+class SupabaseProgressBackend:
+    """
+    Backend sharing progress through the archon_operation_progress table.
+
+    Writes are coalesced per operation (at most one every
+    SHARED_WRITE_INTERVAL, always including the latest state) and run off
+    the event loop, so reporting progress never waits on the database.
+    """
+
+    shared = True
+
+    def __init__(self, supabase_client=None, owner_id: str | None = None):
+        """
+        Initialize the Supabase progress backend.
+
+        Args:
+            supabase_client: Optional Supabase client (created from the environment if omitted)
+            owner_id: Identifier of this worker (defaults to host and PID)
+        """
+        if supabase_client is None:
+            from ...services.client_manager import get_supabase_client
+
+            supabase_client = get_supabase_client()
+        self.supabase = supabase_client
+        self.owner_id = owner_id or process_owner_id()
+        self.table_name = "archon_operation_progress"
+        self._pending: dict[str, dict[str, Any]] = {}
+        self._last_write: dict[str, float] = {}
+        self._writers: dict[str, asyncio.Task] = {}
+        self._owned_active: set[str] = set()
+        self._cancel_handler: CancelHandler | None = None
+        self._cancel_watcher: asyncio.Task | None = None
+
+    def publish(self, progress_id: str, state: dict[str, Any]) -> None:
+        """Queue the latest state of an operation owned by this worker for writing."""
+        self._pending[progress_id] = dict(state)
+        if state.get("status") in TERMINAL_STATUSES:
+            self._owned_active.discard(progress_id)
+        else:
+            self._owned_active.add(progress_id)
+
+        if progress_id in self._writers:
+            # The running writer picks up the newer state
+            return
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            self._write(progress_id, self._pending.pop(progress_id))
+            return
+        self._writers[progress_id] = loop.create_task(self._write_pending(progress_id))
+
+    def remove(self, progress_id: str) -> None:
+        """Drop an operation's shared state once it has been cleaned up locally."""
+        self._pending.pop(progress_id, None)
+        self._last_write.pop(progress_id, None)
+        self._owned_active.discard(progress_id)
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            self._delete(progress_id)
+            return
+        loop.create_task(self._delete_after_writer(progress_id))
+
+    async def get(self, progress_id: str) -> dict[str, Any] | None:
+        """Get an operation's state as last written by its worker."""
+        try:
+            result = await asyncio.to_thread(
+                lambda: self.supabase.table(self.table_name)
+                .select("state, status, updated_at")
+                .eq("progress_id", progress_id)
+                .execute()
+            )
+        except Exception as e:
+            safe_logfire_error(
+                f"Failed to read shared progress | progress_id={progress_id} | error={str(e)}"
+            )
+            return None
+
+        if not result.data:
+            return None
+        row = result.data[0]
+        if row.get("status") not in TERMINAL_STATUSES and self._is_stale(row.get("updated_at")):
+            return None
+        return row["state"]
+
+    async def list_active(self) -> dict[str, dict[str, Any]]:
+        """Get recently updated, non-terminal operations of all workers."""
+        cutoff = datetime.now(UTC) - timedelta(seconds=STALE_OPERATION_SECONDS)
+        try:
+            result = await asyncio.to_thread(
+                lambda: self.supabase.table(self.table_name)
+                .select("progress_id, state, status")
+                .gte("updated_at", cutoff.isoformat())
+                .execute()
+            )
+        except Exception as e:
+            safe_logfire_error(f"Failed to list shared progress | error={str(e)}")
+            return {}
+
+        return {
+            row["progress_id"]: row["state"]
+            for row in result.data or []
+            if row.get("status") not in TERMINAL_STATUSES
+        }
+
+    async def request_cancel(self, progress_id: str) -> bool:
+        """
+        Ask the worker owning an operation to stop it.
+
+        Returns:
+            True if a running operation was found and flagged
+        """
+        try:
+            result = await asyncio.to_thread(
+                lambda: self.supabase.table(self.table_name)
+                .update({"cancel_requested": True})
+                .eq("progress_id", progress_id)
+                .not_.in_("status", sorted(TERMINAL_STATUSES))
+                .execute()
+            )
+        except Exception as e:
+            safe_logfire_error(
+                f"Failed to request shared cancellation | progress_id={progress_id} | error={str(e)}"
+            )
+            return False
+
+        if result.data:
+            safe_logfire_info(f"Stop request recorded for another worker | progress_id={progress_id}")
+            return True
+        return False
+
+    async def start(self, cancel_handler: CancelHandler) -> None:
+        """Start watching for stop requests addressed to this worker."""
+        self._cancel_handler = cancel_handler
+        if self._cancel_watcher is None:
+            self._cancel_watcher = asyncio.create_task(self._watch_cancellations())
+        safe_logfire_info(f"Shared progress backend started | owner_id={self.owner_id}")
+
+    async def stop(self) -> None:
+        """Stop the watcher and flush pending writes."""
+        if self._cancel_watcher is not None:
+            self._cancel_watcher.cancel()
+            try:
+                await self._cancel_watcher
+            except asyncio.CancelledError:
+                pass
+            self._cancel_watcher = None
+        writers = list(self._writers.values())
+        if writers:
+            await asyncio.gather(*writers, return_exceptions=True)
+
+    async def _write_pending(self, progress_id: str) -> None:
+        """Write the newest pending state until nothing is left, spacing writes out."""
+        try:
+            while progress_id in self._pending:
+                state = self._pending[progress_id]
+                if state.get("status") not in TERMINAL_STATUSES:
+                    elapsed = time.monotonic() - self._last_write.get(progress_id, 0.0)
+                    if elapsed < SHARED_WRITE_INTERVAL:
+                        await asyncio.sleep(SHARED_WRITE_INTERVAL - elapsed)
+                state = self._pending.pop(progress_id, None)
+                if state is None:
+                    break
+                self._last_write[progress_id] = time.monotonic()
+                await asyncio.to_thread(self._write, progress_id, state)
+        finally:
+            self._writers.pop(progress_id, None)
+
+    async def _delete_after_writer(self, progress_id: str) -> None:
+        writer = self._writers.get(progress_id)
+        if writer is not None:
+            await asyncio.gather(writer, return_exceptions=True)
+        await asyncio.to_thread(self._delete, progress_id)
+
+    def _write(self, progress_id: str, state: dict[str, Any]) -> None:
+        try:
+            self.supabase.table(self.table_name).upsert(
+                {
+                    "progress_id": progress_id,
+                    "operation_type": state.get("type"),
+                    "status": state.get("status"),
+                    "state": json.loads(json.dumps(state, default=str)),
+                    "owner_id": self.owner_id,
+                    "updated_at": datetime.now(UTC).isoformat(),
+                }
+            ).execute()
+        except Exception as e:
+            safe_logfire_error(
+                f"Failed to write shared progress | progress_id={progress_id} | error={str(e)}"
+            )
+
+    def _clear_cancel_request(self, progress_id: str) -> None:
+        self.supabase.table(self.table_name).update({"cancel_requested": False}).eq(
+            "progress_id", progress_id
+        ).execute()
+
+    def _delete(self, progress_id: str) -> None:
+        try:
+            self.supabase.table(self.table_name).delete().eq("progress_id", progress_id).execute()
+        except Exception as e:
+            safe_logfire_error(
+                f"Failed to delete shared progress | progress_id={progress_id} | error={str(e)}"
+            )
+
+    async def _watch_cancellations(self) -> None:
+        while True:
+            await asyncio.sleep(CANCEL_POLL_INTERVAL)
+            if self._owned_active:
+                await self._process_cancellations()
+
+    async def _process_cancellations(self) -> None:
+        """Stop local operations that another worker was asked to stop."""
+        try:
+            result = await asyncio.to_thread(
+                lambda: self.supabase.table(self.table_name)
+                .select("progress_id")
+                .eq("owner_id", self.owner_id)
+                .eq("cancel_requested", True)
+                .execute()
+            )
+        except Exception as e:
+            safe_logfire_error(f"Failed to check shared stop requests | error={str(e)}")
+            return
+
+        for row in result.data or []:
+            progress_id = row["progress_id"]
+            try:
+                if self._cancel_handler is not None:
+                    await self._cancel_handler(progress_id)
+                await asyncio.to_thread(self._clear_cancel_request, progress_id)
+                safe_logfire_info(f"Handled stop request from another worker | progress_id={progress_id}")
+            except Exception as e:
+                safe_logfire_error(
+                    f"Failed to stop operation for shared request | progress_id={progress_id} | error={str(e)}"
+                )
+
+    @staticmethod
+    def _is_stale(updated_at: str | None) -> bool:
+        if not updated_at:
+            return True
+        try:
+            updated = datetime.fromisoformat(updated_at)
+        except ValueError:
+            return False
+        if updated.tzinfo is None:
+            updated = updated.replace(tzinfo=UTC)
+        return datetime.now(UTC) - updated > timedelta(seconds=STALE_OPERATION_SECONDS)
+
+
+ProgressBackend = InMemoryProgressBackend | SupabaseProgressBackend
+
+_progress_backend: ProgressBackend | None = None
+
+
+def create_progress_backend() -> ProgressBackend:
+    """
+    Create the progress backend selected by PROGRESS_BACKEND.
+
+    Raises:
+        ValueError: If the backend name is not supported
+    """
+    backend_type = os.getenv("PROGRESS_BACKEND", "memory").strip().lower()
+    if backend_type == "memory":
+        return InMemoryProgressBackend()
+    if backend_type == "supabase":
+        return SupabaseProgressBackend()
+    raise ValueError(
+        f"Invalid progress backend '{backend_type}'. "
+        f"Supported backends are: {', '.join(SUPPORTED_PROGRESS_BACKENDS)}"
+    )
+
+
+def get_progress_backend() -> ProgressBackend:
+    """Get the process-wide progress backend, creating it on first use."""
+    global _progress_backend
+    if _progress_backend is None:
+        _progress_backend = create_progress_backend()
+    return _progress_backend
+
+
+def set_progress_backend(backend: ProgressBackend | None) -> None:
+    """Replace the process-wide progress backend (None recreates it from the environment)."""
+    global _progress_backend
+    _progress_backend = backend
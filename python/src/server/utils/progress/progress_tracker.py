@@ -1,7 +1,10 @@
 """
 Progress Tracker Utility
 
-Tracks operation progress in memory for HTTP polling access.
+Tracks operation progress in memory for HTTP polling access and publishes
+every update to in-process subscribers (used by the SSE progress stream)
+and to the configured progress backend, which shares it with other API
+workers when more than one is running.
 """
 
 import asyncio
@@ -9,17 +12,78 @@ from datetime import datetime
 from typing import Any
 
 from ...config.logfire_config import safe_logfire_error, safe_logfire_info
+from ...services.change_version_service import change_versions, progress_of
+from .progress_backend import get_progress_backend
+
+
+class ProgressSubscription:
+    """
+    One subscriber's view of an operation's progress updates.
+
+    Only the latest state is kept: updates published faster than the
+    subscriber consumes them overwrite each other, so a slow client never
+    builds up a backlog or holds up the operation that reports progress.
+    """
+
+    def __init__(self, progress_id: str):
+        self.progress_id = progress_id
+        self.closed = False
+        self.coalesced_updates = 0
+        self._latest: dict[str, Any] | None = None
+        self._ready = asyncio.Event()
+        self._loop = asyncio.get_running_loop()
+
+    def publish(self, state: dict[str, Any]) -> None:
+        """Replace the pending state with a newer one and wake the subscriber."""
+        if self._latest is not None:
+            self.coalesced_updates += 1
+        self._latest = state
+        self._wake()
+
+    def close(self) -> None:
+        """Signal that the operation's progress state is gone."""
+        self.closed = True
+        self._wake()
+
+    async def next_state(self, timeout: float) -> dict[str, Any] | None:
+        """
+        Wait for the next state.
+
+        Returns None when nothing was published within timeout or the
+        subscription was closed.
+        """
+        try:
+            await asyncio.wait_for(self._ready.wait(), timeout)
+        except TimeoutError:
+            return None
+        self._ready.clear()
+        state, self._latest = self._latest, None
+        return state
+
+    def _wake(self) -> None:
+        try:
+            in_loop = asyncio.get_running_loop() is self._loop
+        except RuntimeError:
+            in_loop = False
+        if in_loop:
+            self._ready.set()
+        elif not self._loop.is_closed():
+            self._loop.call_soon_threadsafe(self._ready.set)
 
 
 class ProgressTracker:
     """
     Utility class for tracking progress updates in memory.
-    State can be accessed via HTTP polling endpoints.
+    State can be accessed via HTTP polling endpoints or streamed to
+    subscribers as it changes.
     """
 
     # Class-level storage for all progress states
     _progress_states: dict[str, dict[str, Any]] = {}
 
+    # Live subscribers per progress ID
+    _subscribers: dict[str, set[ProgressSubscription]] = {}
+
     def __init__(self, progress_id: str, operation_type: str = "crawl"):
         """
         Initialize the progress tracker.
@@ -40,6 +104,8 @@ class ProgressTracker:
         }
         # Store in class-level dictionary
         ProgressTracker._progress_states[progress_id] = self.state
+        change_versions.bump(progress_of(progress_id))
+        ProgressTracker._publish(progress_id, self.state)
 
     @classmethod
     def get_progress(cls, progress_id: str) -> dict[str, Any] | None:
@@ -51,12 +117,65 @@ class ProgressTracker:
         """Remove progress state from memory."""
         if progress_id in cls._progress_states:
             del cls._progress_states[progress_id]
+        change_versions.forget(progress_of(progress_id))
+        cls._close_subscribers(progress_id)
+        get_progress_backend().remove(progress_id)
 
     @classmethod
     def list_active(cls) -> dict[str, dict[str, Any]]:
         """Get all active progress states."""
         return cls._progress_states.copy()
 
+    @classmethod
+    async def get_shared_progress(cls, progress_id: str) -> dict[str, Any] | None:
+        """Get progress of an operation running in another worker process."""
+        return await get_progress_backend().get(progress_id)
+
+    @classmethod
+    async def list_all_active(cls) -> dict[str, dict[str, Any]]:
+        """Get active progress states of all worker processes (local states win)."""
+        states = await get_progress_backend().list_active()
+        states.update(cls._progress_states)
+        return states
+
+    @classmethod
+    def subscribe(cls, progress_id: str) -> ProgressSubscription:
+        """
+        Subscribe to updates of an operation.
+
+        Must be called from the event loop that consumes the subscription.
+        Call unsubscribe when done.
+        """
+        subscription = ProgressSubscription(progress_id)
+        cls._subscribers.setdefault(progress_id, set()).add(subscription)
+        return subscription
+
+    @classmethod
+    def unsubscribe(cls, subscription: ProgressSubscription) -> None:
+        """Stop delivering updates to a subscription."""
+        subscribers = cls._subscribers.get(subscription.progress_id)
+        if subscribers is None:
+            return
+        subscribers.discard(subscription)
+        if not subscribers:
+            del cls._subscribers[subscription.progress_id]
+
+    @classmethod
+    def _publish(cls, progress_id: str, state: dict[str, Any]) -> None:
+        """Hand a snapshot of the state to every subscriber and the progress backend."""
+        get_progress_backend().publish(progress_id, state)
+        subscribers = cls._subscribers.get(progress_id)
+        if not subscribers:
+            return
+        snapshot = dict(state)
+        for subscription in list(subscribers):
+            subscription.publish(snapshot)
+
+    @classmethod
+    def _close_subscribers(cls, progress_id: str) -> None:
+        for subscription in cls._subscribers.pop(progress_id, set()):
+            subscription.close()
+
     @classmethod
     async def _delayed_cleanup(cls, progress_id: str, delay_seconds: int = 30):
         """
@@ -70,6 +189,9 @@ class ProgressTracker:
             # Only clean up if still in terminal state (prevent cleanup of reused IDs)
             if status in ["completed", "failed", "error", "cancelled"]:
                 del cls._progress_states[progress_id]
+                change_versions.forget(progress_of(progress_id))
+                cls._close_subscribers(progress_id)
+                get_progress_backend().remove(progress_id)
                 safe_logfire_info(f"Progress state cleaned up after delay | progress_id={progress_id} | status={status}")
 
     async def start(self, initial_data: dict[str, Any] | None = None):
@@ -346,6 +468,8 @@ class ProgressTracker:
         """Update progress state in memory storage."""
         # Update the class-level dictionary
         ProgressTracker._progress_states[self.progress_id] = self.state
+        change_versions.bump(progress_of(self.progress_id))
+        ProgressTracker._publish(self.progress_id, self.state)
 
         safe_logfire_info(
             f"📊 [PROGRESS] Updated {self.operation_type} | ID: {self.progress_id} | "
@@ -56,6 +56,16 @@ def ensure_test_environment():
     yield
     
 
+@pytest.fixture(autouse=True)
+def reset_change_versions():
+    """Forget remembered ETags so polling tests do not see each other's responses."""
+    from src.server.services.change_version_service import change_versions
+
+    change_versions.clear()
+    yield
+    change_versions.clear()
+
+
 @pytest.fixture(autouse=True)
 def prevent_real_db_calls():
     """Automatically prevent any real database calls in all tests."""
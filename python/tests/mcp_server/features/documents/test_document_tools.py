@@ -51,7 +51,7 @@ async def test_create_document_success(mock_mcp, mock_context):
         "message": "Document created successfully",
     }
 
-    with patch("src.mcp_server.features.documents.document_tools.httpx.AsyncClient") as mock_client:
+    with patch("src.mcp_server.features.documents.document_tools.get_http_client") as mock_client:
         mock_async_client = AsyncMock()
         mock_async_client.post.return_value = mock_response
         mock_client.return_value.__aenter__.return_value = mock_async_client
@@ -91,7 +91,7 @@ async def test_find_documents_success(mock_mcp, mock_context):
         ]
     }
 
-    with patch("src.mcp_server.features.documents.document_tools.httpx.AsyncClient") as mock_client:
+    with patch("src.mcp_server.features.documents.document_tools.get_http_client") as mock_client:
         mock_async_client = AsyncMock()
         mock_async_client.get.return_value = mock_response
         mock_client.return_value.__aenter__.return_value = mock_async_client
@@ -121,7 +121,7 @@ async def test_update_document_partial_update(mock_mcp, mock_context):
         "message": "Document updated successfully",
     }
 
-    with patch("src.mcp_server.features.documents.document_tools.httpx.AsyncClient") as mock_client:
+    with patch("src.mcp_server.features.documents.document_tools.get_http_client") as mock_client:
         mock_async_client = AsyncMock()
         mock_async_client.put.return_value = mock_response
         mock_client.return_value.__aenter__.return_value = mock_async_client
@@ -155,7 +155,7 @@ async def test_delete_document_not_found(mock_mcp, mock_context):
     mock_response.status_code = 404
     mock_response.text = "Document not found"
 
-    with patch("src.mcp_server.features.documents.document_tools.httpx.AsyncClient") as mock_client:
+    with patch("src.mcp_server.features.documents.document_tools.get_http_client") as mock_client:
         mock_async_client = AsyncMock()
         mock_async_client.delete.return_value = mock_response
         mock_client.return_value.__aenter__.return_value = mock_async_client
@@ -0,0 +1,112 @@
+"""Unit tests for sectioned page reads in the RAG tools."""
+
+import json
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from mcp.server.fastmcp import Context
+
+from src.mcp_server.features.rag import register_rag_tools
+
+
+@pytest.fixture
+def mock_mcp():
+    """Create a mock MCP server capturing registered tools."""
+    mock = MagicMock()
+    mock._tools = {}
+
+    def tool_decorator():
+        def decorator(func):
+            mock._tools[func.__name__] = func
+            return func
+
+        return decorator
+
+    mock.tool = tool_decorator
+    return mock
+
+
+@pytest.fixture
+def mock_context():
+    context = MagicMock(spec=Context)
+    context.report_progress = AsyncMock()
+    return context
+
+
+def _section_response(index: int, total: int) -> MagicMock:
+    response = MagicMock()
+    response.status_code = 200
+    response.json.return_value = {
+        "id": "page-1",
+        "url": "https://docs.example.com/guide",
+        "full_content": f"section {index}\n",
+        "section_index": index,
+        "total_sections": total,
+    }
+    return response
+
+
+def _patch_client(responses):
+    patcher = patch("src.mcp_server.features.rag.rag_tools.get_http_client")
+    mock_client = patcher.start()
+    client = AsyncMock()
+    client.get.side_effect = responses
+    mock_client.return_value.__aenter__.return_value = client
+    return patcher, client
+
+
+@pytest.mark.asyncio
+async def test_read_full_page_reads_sections_within_budget(mock_mcp, mock_context):
+    register_rag_tools(mock_mcp)
+    read_page = mock_mcp._tools["rag_read_full_page"]
+    patcher, client = _patch_client([_section_response(i, 5) for i in range(5)])
+
+    try:
+        result = json.loads(await read_page(mock_context, page_id="page-1", token_budget=4000))
+    finally:
+        patcher.stop()
+
+    assert result["success"] is True
+    assert result["sections_read"] == [0, 1]
+    assert result["total_sections"] == 5
+    assert result["next_section"] == 2
+    assert result["page"]["full_content"] == "section 0\n\nsection 1"
+    assert client.get.call_args_list[1].kwargs["params"] == {"section": 1, "section_tokens": 2000}
+    assert mock_context.report_progress.await_args_list[-1].args == (2, 5)
+
+
+@pytest.mark.asyncio
+async def test_read_full_page_continues_to_last_section(mock_mcp, mock_context):
+    register_rag_tools(mock_mcp)
+    read_page = mock_mcp._tools["rag_read_full_page"]
+    patcher, client = _patch_client([_section_response(i, 4) for i in (2, 3)])
+
+    try:
+        result = json.loads(
+            await read_page(
+                mock_context, url="https://docs.example.com/guide", section=2, token_budget=8000
+            )
+        )
+    finally:
+        patcher.stop()
+
+    assert result["sections_read"] == [2, 3]
+    assert result["next_section"] is None
+    assert client.get.call_args_list[0].kwargs["params"]["url"] == "https://docs.example.com/guide"
+    assert mock_context.report_progress.await_count == 2
+
+
+@pytest.mark.asyncio
+async def test_read_full_page_reports_http_errors(mock_mcp, mock_context):
+    register_rag_tools(mock_mcp)
+    read_page = mock_mcp._tools["rag_read_full_page"]
+    error = MagicMock(status_code=400, text="Section 9 out of range (page has 3 sections)")
+    patcher, _ = _patch_client([error])
+
+    try:
+        result = json.loads(await read_page(mock_context, page_id="page-1", section=9))
+    finally:
+        patcher.stop()
+
+    assert result["success"] is False
+    assert "out of range" in result["error"]
@@ -0,0 +1,60 @@
+"""Unit tests for the pooled MCP HTTP client."""
+
+from unittest.mock import AsyncMock
+
+import httpx
+import pytest
+
+from src.mcp_server.utils import http_client
+from src.mcp_server.utils.http_client import (
+    close_pooled_clients,
+    get_http_client,
+    get_pooled_client,
+)
+
+
+@pytest.fixture(autouse=True)
+async def clean_pool():
+    await close_pooled_clients()
+    yield
+    await close_pooled_clients()
+
+
+@pytest.mark.asyncio
+async def test_tool_calls_share_one_pool():
+    async with get_http_client() as first:
+        pass
+    async with get_http_client(for_polling=True) as second:
+        pass
+
+    assert first.client is second.client
+    assert not first.client.is_closed
+    assert get_pooled_client("agents") is not first.client
+
+
+@pytest.mark.asyncio
+async def test_per_call_timeout_is_applied(monkeypatch):
+    client = get_pooled_client()
+    request = AsyncMock(return_value=httpx.Response(200))
+    monkeypatch.setattr(client, "request", request)
+    timeout = httpx.Timeout(3.0)
+
+    async with get_http_client(timeout=timeout) as session:
+        await session.get("http://api/a")
+        await session.post("http://api/b", json={}, timeout=httpx.Timeout(9.0))
+
+    assert request.call_args_list[0].kwargs["timeout"] is timeout
+    assert request.call_args_list[1].kwargs["timeout"] == httpx.Timeout(9.0)
+    assert request.call_args_list[1].args == ("POST", "http://api/b")
+
+
+@pytest.mark.asyncio
+async def test_closed_pool_is_recreated(monkeypatch):
+    monkeypatch.setenv("MCP_HTTP_MAX_CONNECTIONS", "7")
+    client = get_pooled_client()
+
+    await close_pooled_clients()
+
+    assert client.is_closed
+    assert get_pooled_client() is not client
+    assert http_client.get_connection_limits().max_connections == 7
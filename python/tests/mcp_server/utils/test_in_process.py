@@ -0,0 +1,94 @@
+"""Unit tests for the in-process MCP mode."""
+
+import json
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from mcp.server.fastmcp import Context
+from starlette.applications import Starlette
+from starlette.responses import JSONResponse
+from starlette.routing import Route
+
+from src.mcp_server.features.rag import register_rag_tools
+from src.mcp_server.utils import in_process
+from src.mcp_server.utils.http_client import close_pooled_clients, get_http_client
+
+
+@pytest.fixture
+def mock_mcp():
+    """Create a mock MCP server capturing registered tools."""
+    mock = MagicMock()
+    mock._tools = {}
+
+    def tool_decorator():
+        def decorator(func):
+            mock._tools[func.__name__] = func
+            return func
+
+        return decorator
+
+    mock.tool = tool_decorator
+    return mock
+
+
+@pytest.fixture
+async def in_process_mode(monkeypatch):
+    monkeypatch.setenv(in_process.IN_PROCESS_ENV, "true")
+    monkeypatch.setattr(in_process, "start_in_process_services", AsyncMock())
+    await close_pooled_clients()
+    yield
+    await close_pooled_clients()
+
+
+def test_disabled_by_default(monkeypatch):
+    monkeypatch.delenv(in_process.IN_PROCESS_ENV, raising=False)
+
+    assert in_process.in_process_enabled() is False
+
+
+@pytest.mark.asyncio
+async def test_api_requests_are_served_in_process(in_process_mode, monkeypatch):
+    async def tasks(request):
+        return JSONResponse({"tasks": [], "path": request.url.path})
+
+    app = Starlette(routes=[Route("/api/tasks", tasks)])
+    monkeypatch.setattr(in_process, "get_api_app", lambda: app)
+
+    with patch("src.mcp_server.utils.http_client.start_in_process_services", AsyncMock()):
+        async with get_http_client() as client:
+            response = await client.get("http://archon-server:8181/api/tasks")
+
+    assert response.status_code == 200
+    assert response.json() == {"tasks": [], "path": "/api/tasks"}
+
+
+@pytest.mark.asyncio
+async def test_rag_search_calls_service_directly(in_process_mode, mock_mcp):
+    register_rag_tools(mock_mcp)
+    search = mock_mcp._tools["rag_search_knowledge_base"]
+    query = AsyncMock(return_value=(True, {"results": [{"content": "x"}], "reranked": True}))
+
+    with (
+        patch.object(in_process, "perform_rag_query", query),
+        patch("src.mcp_server.features.rag.rag_tools.get_http_client") as http,
+    ):
+        result = json.loads(await search(MagicMock(spec=Context), query="vector search"))
+
+    http.assert_not_called()
+    query.assert_awaited_once_with("vector search", None, 5, "pages", None)
+    assert result["success"] is True
+    assert result["reranked"] is True
+    assert result["results"] == [{"content": "x"}]
+
+
+@pytest.mark.asyncio
+async def test_rag_code_search_reports_service_errors(in_process_mode, mock_mcp):
+    register_rag_tools(mock_mcp)
+    search = mock_mcp._tools["rag_search_code_examples"]
+
+    with patch.object(
+        in_process, "search_code_examples", AsyncMock(return_value=(False, {"error": "boom"}))
+    ):
+        result = json.loads(await search(MagicMock(spec=Context), query="fastapi"))
+
+    assert result == {"success": False, "results": [], "error": "boom"}
@@ -223,4 +223,67 @@ class TestProgressTracker:
         # Clearing one shouldn't affect the other
         ProgressTracker.clear_progress("tracker-1")
         assert ProgressTracker.get_progress("tracker-1") is None
-        assert ProgressTracker.get_progress("tracker-2") is not None
\ No newline at end of file
+        assert ProgressTracker.get_progress("tracker-2") is not None
+
+class TestProgressSubscriptions:
+    """Test in-process publishing of progress updates"""
+
+    @pytest.fixture(autouse=True)
+    def clear_subscribers(self):
+        ProgressTracker._subscribers.clear()
+        yield
+        ProgressTracker._subscribers.clear()
+
+    @pytest.mark.asyncio
+    async def test_subscriber_receives_updates(self):
+        """Updates are delivered to subscribers of the operation"""
+        tracker = ProgressTracker("sub-1", operation_type="crawl")
+        subscription = ProgressTracker.subscribe("sub-1")
+
+        await tracker.update("crawling", 40, "Crawling pages")
+
+        state = await subscription.next_state(timeout=1)
+        assert state["status"] == "crawling"
+        assert state["progress"] == 40
+
+    @pytest.mark.asyncio
+    async def test_rapid_updates_coalesce_to_latest(self):
+        """A slow subscriber only sees the newest state"""
+        tracker = ProgressTracker("sub-2", operation_type="crawl")
+        subscription = ProgressTracker.subscribe("sub-2")
+
+        for progress in (10, 20, 30):
+            await tracker.update("crawling", progress, f"At {progress}%")
+
+        state = await subscription.next_state(timeout=1)
+        assert state["progress"] == 30
+        assert subscription.coalesced_updates == 2
+        assert await subscription.next_state(timeout=0.01) is None
+
+    @pytest.mark.asyncio
+    async def test_published_state_is_a_snapshot(self):
+        """Later tracker changes do not alter an already published state"""
+        tracker = ProgressTracker("sub-3", operation_type="crawl")
+        subscription = ProgressTracker.subscribe("sub-3")
+
+        await tracker.update("crawling", 40, "Crawling pages")
+        state = await subscription.next_state(timeout=1)
+        tracker.state["progress"] = 90
+
+        assert state["progress"] == 40
+
+    @pytest.mark.asyncio
+    async def test_unsubscribe_and_clear(self):
+        """Unsubscribed streams get nothing; clearing progress closes the rest"""
+        tracker = ProgressTracker("sub-4", operation_type="crawl")
+        gone = ProgressTracker.subscribe("sub-4")
+        staying = ProgressTracker.subscribe("sub-4")
+        ProgressTracker.unsubscribe(gone)
+
+        await tracker.update("crawling", 40, "Crawling pages")
+        assert await gone.next_state(timeout=0.01) is None
+
+        ProgressTracker.clear_progress("sub-4")
+        await staying.next_state(timeout=1)
+        assert staying.closed
+        assert "sub-4" not in ProgressTracker._subscribers
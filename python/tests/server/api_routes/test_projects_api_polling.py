@@ -1,5 +1,6 @@
 """Unit tests for projects API polling endpoints with ETag support."""
 
+import json
 from datetime import datetime
 from unittest.mock import AsyncMock, MagicMock, patch
 
@@ -47,16 +48,17 @@ class TestProjectsListPolling:
             result = await list_projects(response=response, if_none_match=None)
             
             assert result is not None
-            assert len(result["projects"]) == 2
-            assert result["count"] == 2
-            assert "timestamp" in result
-            
-            # Check ETag was set
-            assert "ETag" in response.headers
-            assert response.headers["ETag"].startswith('"')
-            assert response.headers["ETag"].endswith('"')
-            assert "Last-Modified" in response.headers
-            assert response.headers["Cache-Control"] == "no-cache, must-revalidate"
+            body = json.loads(result.body)
+            assert len(body["projects"]) == 2
+            assert body["count"] == 2
+            assert "timestamp" in body
+            
+            # Check ETag was set on the rendered response
+            assert "ETag" in result.headers
+            assert result.headers["ETag"].startswith('"')
+            assert result.headers["ETag"].endswith('"')
+            assert "Last-Modified" in result.headers
+            assert result.headers["Cache-Control"] == "no-cache, must-revalidate"
 
     @pytest.mark.asyncio
     async def test_list_projects_returns_304_with_matching_etag(self):
@@ -81,7 +83,7 @@ class TestProjectsListPolling:
             # First request to get ETag
             response1 = Response()
             result1 = await list_projects(response=response1, if_none_match=None)
-            etag = response1.headers["ETag"]
+            etag = result1.headers["ETag"]
             
             # Second request with same data and ETag
             response2 = Response()
@@ -96,6 +98,7 @@ class TestProjectsListPolling:
     async def test_list_projects_etag_changes_with_data(self):
         """Test that ETag changes when project data changes."""
         from src.server.api_routes.projects_api import list_projects
+        from src.server.services.change_version_service import PROJECTS, change_versions
         
         with patch("src.server.api_routes.projects_api.ProjectService") as mock_proj_class, \
              patch("src.server.api_routes.projects_api.SourceLinkingService") as mock_source_class:
@@ -110,21 +113,20 @@ class TestProjectsListPolling:
             mock_proj_service.list_projects.return_value = (True, {"projects": projects1})
             mock_source_service.format_projects_with_sources.return_value = projects1
             
-            response1 = Response()
-            await list_projects(response=response1, if_none_match=None)
-            etag1 = response1.headers["ETag"]
+            result1 = await list_projects(response=Response(), if_none_match=None)
+            etag1 = result1.headers["ETag"]
             
-            # Modified data
+            # Modified data, written through a service that bumps the projects version
             projects2 = [{"id": "proj-1", "name": "Project 1 Updated"}]
             mock_proj_service.list_projects.return_value = (True, {"projects": projects2})
             mock_source_service.format_projects_with_sources.return_value = projects2
+            change_versions.bump(PROJECTS)
             
-            response2 = Response()
-            await list_projects(response=response2, if_none_match=etag1)
-            etag2 = response2.headers["ETag"]
+            result2 = await list_projects(response=Response(), if_none_match=etag1)
+            etag2 = result2.headers["ETag"]
             
             assert etag1 != etag2
-            assert response2.status_code != 304
+            assert result2.status_code != 304
 
     def test_list_projects_http_with_etag(self, test_client):
         """Test projects endpoint via HTTP with ETag support."""
@@ -288,13 +290,14 @@ class TestPollingEdgeCases:
             response = Response()
             result = await list_projects(response=response)
             
-            assert result["projects"] == []
-            assert result["count"] == 0
-            assert "ETag" in response.headers
+            body = json.loads(result.body)
+            assert body["projects"] == []
+            assert body["count"] == 0
+            assert "ETag" in result.headers
             
             # Empty list should still have a stable ETag
             response2 = Response()
-            await list_projects(response=response2, if_none_match=response.headers["ETag"])
+            await list_projects(response=response2, if_none_match=result.headers["ETag"])
             assert response2.status_code == 304
 
     @pytest.mark.asyncio
@@ -326,4 +329,70 @@ class TestPollingEdgeCases:
             # The actual endpoint returns 500 when TaskService fails (not 404)
             assert exc_info.value.status_code == 500
             # Response headers shouldn't be set on exception
-            assert "ETag" not in response.headers
\ No newline at end of file
+            assert "ETag" not in response.headers
+
+class TestChangeVersionPolling:
+    """Tests for polls answered from the change-version registry."""
+
+    @pytest.mark.asyncio
+    async def test_unchanged_task_poll_skips_query(self):
+        """A repeated poll with a current ETag returns 304 without calling TaskService."""
+        from fastapi import Request
+
+        from src.server.api_routes.projects_api import list_project_tasks
+        from src.server.services.change_version_service import change_versions, tasks_of
+
+        with patch("src.server.api_routes.projects_api.TaskService") as mock_task_class:
+            mock_task_service = MagicMock()
+            mock_task_class.return_value = mock_task_service
+            mock_task_service.list_tasks.return_value = (
+                True,
+                {"tasks": [{"id": "task-1", "title": "Task", "status": "todo"}]},
+            )
+
+            first_request = MagicMock(spec=Request)
+            first_request.headers = {}
+            first_response = Response()
+            await list_project_tasks("proj-1", request=first_request, response=first_response)
+            etag = first_response.headers["ETag"]
+
+            poll_request = MagicMock(spec=Request)
+            poll_request.headers = {"If-None-Match": etag}
+            poll_response = Response()
+            result = await list_project_tasks("proj-1", request=poll_request, response=poll_response)
+
+            assert result is None
+            assert poll_response.status_code == 304
+            assert mock_task_service.list_tasks.call_count == 1
+
+            # A write to the project's tasks forces the next poll to query again
+            change_versions.bump(tasks_of("proj-1"))
+            await list_project_tasks("proj-1", request=poll_request, response=Response())
+            assert mock_task_service.list_tasks.call_count == 2
+
+    @pytest.mark.asyncio
+    async def test_other_project_writes_keep_cached_etag(self):
+        """Writes to another project's tasks do not invalidate this project's ETag."""
+        from fastapi import Request
+
+        from src.server.api_routes.projects_api import list_project_tasks
+        from src.server.services.change_version_service import change_versions, tasks_of
+
+        with patch("src.server.api_routes.projects_api.TaskService") as mock_task_class:
+            mock_task_service = MagicMock()
+            mock_task_class.return_value = mock_task_service
+            mock_task_service.list_tasks.return_value = (True, {"tasks": []})
+
+            request = MagicMock(spec=Request)
+            request.headers = {}
+            first_response = Response()
+            await list_project_tasks("proj-1", request=request, response=first_response)
+
+            change_versions.bump(tasks_of("proj-2"))
+
+            request.headers = {"If-None-Match": first_response.headers["ETag"]}
+            poll_response = Response()
+            await list_project_tasks("proj-1", request=request, response=poll_response)
+
+            assert poll_response.status_code == 304
+            assert mock_task_service.list_tasks.call_count == 1
@@ -0,0 +1,86 @@
+"""
+Tests for negotiated response compression
+"""
+
+import json
+
+import pytest
+from fastapi import FastAPI
+from fastapi.responses import StreamingResponse
+from fastapi.testclient import TestClient
+
+from src.server.middleware import compression_middleware
+from src.server.middleware.compression_middleware import CompressionMiddleware, negotiate_encoding
+
+LARGE = {"items": ["x" * 50] * 100}
+
+
+@pytest.fixture
+def client():
+    app = FastAPI()
+    app.add_middleware(CompressionMiddleware, minimum_size=1024)
+
+    @app.get("/large")
+    async def large():
+        return LARGE
+
+    @app.get("/small")
+    async def small():
+        return {"ok": True}
+
+    @app.get("/stream")
+    async def stream():
+        async def events():
+            for index in range(3):
+                yield f"data: {'y' * 1000}{index}\n\n"
+
+        return StreamingResponse(events(), media_type="text/event-stream")
+
+    return TestClient(app)
+
+
+class TestNegotiation:
+    def test_prefers_best_available_encoding(self, monkeypatch):
+        monkeypatch.setattr(compression_middleware, "BROTLI_AVAILABLE", True)
+        monkeypatch.setattr(compression_middleware, "ZSTD_AVAILABLE", True)
+
+        assert negotiate_encoding("gzip, deflate, br, zstd") == "br"
+        assert negotiate_encoding("gzip;q=1.0, br;q=0.5") == "gzip"
+        assert negotiate_encoding("*") == "br"
+
+    def test_skips_unavailable_and_refused_encodings(self, monkeypatch):
+        monkeypatch.setattr(compression_middleware, "BROTLI_AVAILABLE", False)
+        monkeypatch.setattr(compression_middleware, "ZSTD_AVAILABLE", False)
+
+        assert negotiate_encoding("br, gzip") == "gzip"
+        assert negotiate_encoding("br") is None
+        assert negotiate_encoding("gzip;q=0") is None
+        assert negotiate_encoding(None) is None
+
+
+class TestCompressionMiddleware:
+    def test_large_response_is_gzipped(self, client):
+        response = client.get("/large", headers={"Accept-Encoding": "gzip"})
+
+        assert response.headers["content-encoding"] == "gzip"
+        assert "Accept-Encoding" in response.headers["vary"]
+        assert int(response.headers["content-length"]) < len(json.dumps(LARGE)) // 10
+        assert response.json() == LARGE
+
+    def test_small_response_is_not_compressed(self, client):
+        response = client.get("/small", headers={"Accept-Encoding": "gzip"})
+
+        assert "content-encoding" not in response.headers
+        assert response.json() == {"ok": True}
+
+    def test_identity_when_not_accepted(self, client):
+        response = client.get("/large", headers={"Accept-Encoding": "identity"})
+
+        assert "content-encoding" not in response.headers
+        assert response.json() == LARGE
+
+    def test_event_streams_pass_through(self, client):
+        response = client.get("/stream", headers={"Accept-Encoding": "gzip"})
+
+        assert "content-encoding" not in response.headers
+        assert response.text.count("data: ") == 3
@@ -0,0 +1,216 @@
+"""
+Tests for DocumentService on the archon_project_documents table
+"""
+
+from unittest.mock import MagicMock, patch
+
+import pytest
+from postgrest.exceptions import APIError
+
+from src.server.services.projects.document_service import (
+    DOCUMENT_PAGE_SIZE,
+    DocumentService,
+    document_from_row,
+    document_id_from_version_field,
+    document_to_row,
+    document_version_field,
+)
+
+
+@pytest.fixture
+def documents():
+    """Chainable archon_project_documents query mock"""
+    query = MagicMock()
+    for method in (
+        "select", "eq", "in_", "order", "limit", "range", "insert", "update", "upsert", "delete"
+    ):
+        getattr(query, method).return_value = query
+    query.not_ = query
+    query.execute.return_value = MagicMock(data=[])
+    return query
+
+
+@pytest.fixture
+def client(documents):
+    client = MagicMock()
+    client.table.side_effect = lambda name: {"archon_project_documents": documents}.get(
+        name, MagicMock()
+    )
+    return client
+
+
+class TestDocumentRows:
+    def test_round_trip_keeps_unknown_keys(self):
+        document = {"id": "d1", "title": "Spec", "content": {"a": 1}, "custom": "x"}
+
+        row = document_to_row("p1", document, 3)
+
+        assert row["position"] == 3
+        assert row["extra"] == {"custom": "x"}
+        assert document_from_row(row) == {
+            "id": "d1",
+            "document_type": None,
+            "title": "Spec",
+            "content": {"a": 1},
+            "tags": [],
+            "status": "draft",
+            "version": "1.0",
+            "custom": "x",
+        }
+
+    def test_row_without_position_leaves_it_to_the_database(self):
+        assert "position" not in document_to_row("p1", {"id": "d1"})
+
+    def test_version_field_round_trip(self):
+        assert document_id_from_version_field(document_version_field("d1")) == "d1"
+        assert document_id_from_version_field("docs") is None
+        assert document_id_from_version_field("features") is None
+
+
+class TestSingleRowOperations:
+    def test_add_document_inserts_one_row(self, client, documents):
+        documents.execute.return_value = MagicMock(data=[{"id": "new"}])
+
+        success, result = DocumentService(client).add_document("p1", "spec", "New doc")
+
+        assert success
+        inserted = documents.insert.call_args.args[0]
+        # The position is assigned by the database inside the INSERT
+        assert "position" not in inserted
+        documents.select.assert_not_called()
+        assert inserted["title"] == "New doc"
+        assert result["document"]["project_id"] == "p1"
+        assert {call.args[0] for call in client.table.call_args_list} == {"archon_project_documents"}
+
+    def test_add_document_to_missing_project(self, client, documents):
+        documents.execute.side_effect = Exception(
+            'insert violates foreign key constraint (code 23503)'
+        )
+
+        success, result = DocumentService(client).add_document("missing", "spec", "Doc")
+
+        assert not success
+        assert "not found" in result["error"]
+
+    def test_update_document_updates_one_row(self, client, documents):
+        documents.execute.return_value = MagicMock(
+            data=[{"id": "d1", "project_id": "p1", "title": "Renamed", "content": {}}]
+        )
+
+        success, result = DocumentService(client).update_document(
+            "p1", "d1", {"title": "Renamed", "ignored": True}, create_version=False
+        )
+
+        assert success
+        assert result["document"]["title"] == "Renamed"
+        update = documents.update.call_args.args[0]
+        assert update["title"] == "Renamed"
+        assert "ignored" not in update
+
+    def test_update_versions_only_the_edited_document(self, client, documents):
+        stored = {"id": "d1", "project_id": "p1", "title": "Old", "content": {"a": 1}}
+        documents.execute.side_effect = [
+            MagicMock(data=[stored]),  # target row
+            MagicMock(data=[{**stored, "title": "New"}]),  # update
+        ]
+
+        with patch(
+            "src.server.services.projects.versioning_service.VersioningService"
+        ) as versioning:
+            success, _ = DocumentService(client).update_document("p1", "d1", {"title": "New"})
+
+        assert success
+        version = versioning.return_value.create_version.call_args.kwargs
+        assert version["field_name"] == "docs:d1"
+        assert version["document_id"] == "d1"
+        assert version["content"]["title"] == "Old"
+        documents.eq.assert_any_call("id", "d1")
+        documents.range.assert_not_called()
+
+    def test_update_missing_document_is_not_versioned(self, client, documents):
+        with patch(
+            "src.server.services.projects.versioning_service.VersioningService"
+        ) as versioning:
+            success, result = DocumentService(client).update_document("p1", "nope", {"title": "x"})
+
+        assert not success
+        assert "not found" in result["error"]
+        versioning.return_value.create_version.assert_not_called()
+        documents.update.assert_not_called()
+
+    def test_restore_document_keeps_its_position(self, client, documents):
+        documents.execute.return_value = MagicMock(data=[{"id": "d1", "title": "Old"}])
+
+        restored = DocumentService(client).restore_document("p1", {"id": "d1", "title": "Old"})
+
+        row = documents.upsert.call_args.args[0]
+        assert "position" not in row
+        assert documents.upsert.call_args.kwargs["default_to_null"] is False
+        assert restored["title"] == "Old"
+
+    def test_delete_missing_document(self, client, documents):
+        success, result = DocumentService(client).delete_document("p1", "nope")
+
+        assert not success
+        assert "not found" in result["error"]
+
+
+class TestReplaceDocuments:
+    def test_upserts_array_and_deletes_the_rest(self, client, documents):
+        stored = DocumentService(client).replace_documents(
+            "p1", [{"id": "a", "title": "A"}, {"title": "B"}]
+        )
+
+        rows = documents.upsert.call_args.args[0]
+        assert [row["position"] for row in rows] == [0, 1]
+        # Rows without created_at must not null the stored value
+        assert documents.upsert.call_args.kwargs["default_to_null"] is False
+        assert rows[1]["id"]  # generated
+        documents.in_.assert_called_once_with("id", ["a", rows[1]["id"]])
+        assert [doc["title"] for doc in stored] == ["A", "B"]
+
+    def test_empty_array_deletes_all(self, client, documents):
+        DocumentService(client).replace_documents("p1", [])
+
+        documents.upsert.assert_not_called()
+        documents.in_.assert_not_called()
+        documents.delete.assert_called_once()
+
+
+class TestMultiProjectReads:
+    def test_documents_are_read_in_pages(self, client, documents):
+        first_page = [{"id": f"d{i}", "project_id": "p1"} for i in range(DOCUMENT_PAGE_SIZE)]
+        documents.execute.side_effect = [
+            MagicMock(data=first_page),
+            MagicMock(data=[{"id": "last", "project_id": "p2"}]),
+        ]
+
+        by_project = DocumentService(client).get_documents_for_projects(["p1", "p2"])
+
+        assert len(by_project["p1"]) == DOCUMENT_PAGE_SIZE
+        assert [doc["id"] for doc in by_project["p2"]] == ["last"]
+        assert [call.args for call in documents.range.call_args_list] == [
+            (0, DOCUMENT_PAGE_SIZE - 1),
+            (DOCUMENT_PAGE_SIZE, 2 * DOCUMENT_PAGE_SIZE - 1),
+        ]
+
+    def test_counts_are_grouped_by_the_database(self, client, documents):
+        client.rpc.return_value.execute.return_value = MagicMock(
+            data=[{"project_id": "p1", "document_count": 1500}]
+        )
+
+        counts = DocumentService(client).count_documents_for_projects(["p1", "p2"])
+
+        assert counts == {"p1": 1500, "p2": 0}
+        documents.select.assert_not_called()
+
+    def test_counts_per_project_without_the_count_function(self, client, documents):
+        client.rpc.return_value.execute.side_effect = APIError(
+            {"code": "PGRST202", "message": "Could not find the function public.count_project_documents"}
+        )
+        documents.execute.side_effect = [MagicMock(data=[], count=1500), MagicMock(data=[], count=2)]
+
+        counts = DocumentService(client).count_documents_for_projects(["p1", "p2"])
+
+        assert counts == {"p1": 1500, "p2": 2}
+        documents.select.assert_called_with("id", count="exact", head=True)
@@ -0,0 +1,132 @@
+"""
+Tests for paginated task listing and search in TaskService
+"""
+
+import base64
+import json
+from unittest.mock import MagicMock
+
+import pytest
+
+from src.server.services.projects.task_service import (
+    MAX_TASK_PAGE_SIZE,
+    InvalidTaskCursorError,
+    TaskService,
+    decode_task_cursor,
+    encode_task_cursor,
+)
+
+
+def _task(index: int) -> dict:
+    return {
+        "id": f"00000000-0000-0000-0000-{index:012d}",
+        "project_id": "proj-1",
+        "title": f"Task {index}",
+        "description": "",
+        "status": "todo",
+        "task_order": index,
+        "created_at": f"2025-01-01T00:00:{index:02d}+00:00",
+        "updated_at": "2025-01-01T00:00:00+00:00",
+    }
+
+
+@pytest.fixture
+def query():
+    """Chainable archon_tasks query mock"""
+    query = MagicMock()
+    for method in ("select", "eq", "neq", "or_", "order", "range"):
+        getattr(query, method).return_value = query
+    return query
+
+
+@pytest.fixture
+def service(query):
+    client = MagicMock()
+    client.table.return_value = query
+    return TaskService(client)
+
+
+class TestTaskCursor:
+    def test_round_trip(self):
+        cursor = encode_task_cursor(_task(3))
+
+        assert decode_task_cursor(cursor) == (3, _task(3)["created_at"], _task(3)["id"])
+
+    def test_invalid_cursor_rejected(self, service):
+        with pytest.raises(InvalidTaskCursorError, match="Invalid cursor"):
+            service.list_tasks(limit=10, cursor="not-a-cursor")
+
+    @pytest.mark.parametrize(
+        "position",
+        [
+            [1, '2025-01-01T00:00:00"),id.gt.(0', _task(1)["id"]],
+            [1, _task(1)["created_at"], "0,status.eq.done"],
+            [1, 12345, _task(1)["id"]],
+        ],
+    )
+    def test_cursor_values_must_be_timestamp_and_uuid(self, position):
+        """Cursor values are validated before they reach the keyset filter"""
+        cursor = base64.urlsafe_b64encode(json.dumps(position).encode()).decode()
+
+        with pytest.raises(InvalidTaskCursorError):
+            decode_task_cursor(cursor)
+
+    def test_invalid_cursor_is_a_bad_request(self, client):
+        response = client.get("/api/tasks", params={"cursor": "not-a-cursor"})
+
+        assert response.status_code == 400
+        assert "Invalid cursor" in response.json()["detail"]["error"]
+
+
+class TestPaginatedListTasks:
+    def test_offset_page_reports_total_and_next_cursor(self, service, query):
+        query.execute.return_value = MagicMock(data=[_task(i) for i in range(3)], count=7)
+
+        success, result = service.list_tasks(limit=2, offset=2)
+
+        assert success
+        assert [task["task_order"] for task in result["tasks"]] == [0, 1]
+        assert result["total_count"] == 7
+        assert result["has_more"] is True
+        assert decode_task_cursor(result["next_cursor"])[0] == 1
+        query.select.assert_called_once_with("*", count="exact")
+        query.range.assert_called_once_with(2, 4)
+        query.order.assert_any_call("id", desc=False)
+
+    def test_cursor_page_filters_after_position(self, service, query):
+        query.execute.return_value = MagicMock(data=[_task(5)], count=None)
+        cursor = encode_task_cursor(_task(4))
+
+        success, result = service.list_tasks(limit=2, cursor=cursor)
+
+        assert success
+        assert result["has_more"] is False
+        assert result["next_cursor"] is None
+        assert result["total_count"] is None
+        query.select.assert_called_once_with("*")
+        query.range.assert_called_once_with(0, 2)
+        keyset_filter = query.or_.call_args_list[-1].args[0]
+        assert keyset_filter.startswith("task_order.gt.4,")
+        assert f"id.gt.{_task(4)['id']}" in keyset_filter
+
+    def test_page_size_is_capped(self, service, query):
+        query.execute.return_value = MagicMock(data=[], count=0)
+
+        service.list_tasks(limit=10_000)
+
+        query.range.assert_called_once_with(0, MAX_TASK_PAGE_SIZE)
+
+
+class TestTaskSearch:
+    def test_every_term_must_match(self, service, query):
+        query.execute.return_value = MagicMock(data=[])
+
+        service.list_tasks(search_query="Auth, Token")
+
+        search_filters = [
+            call.args[0] for call in query.or_.call_args_list if "title.ilike" in call.args[0]
+        ]
+        assert search_filters == [
+            "title.ilike.%auth%,description.ilike.%auth%,feature.ilike.%auth%",
+            "title.ilike.%token%,description.ilike.%token%,feature.ilike.%token%",
+        ]
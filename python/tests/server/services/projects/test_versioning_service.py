@@ -0,0 +1,255 @@
+"""
+Tests for delta-encoded document versions in VersioningService
+"""
+
+import json
+from unittest.mock import MagicMock, patch
+
+import pytest
+from postgrest.exceptions import APIError
+
+from src.server.services.projects.versioning_service import KEYFRAME_INTERVAL, VersioningService
+
+PROJECT_ID = "11111111-1111-1111-1111-111111111111"
+
+
+class FakeVersionsTable:
+    """In-memory archon_document_versions supporting the queries the service makes"""
+
+    def __init__(self, rows: list[dict]):
+        self.rows = rows
+        self.queries = 0
+
+    def select(self, columns="*"):
+        self.queries += 1
+        return _Query(self.rows, columns)
+
+
+class _Query:
+    def __init__(self, rows, columns):
+        self._rows = list(rows)
+        self._columns = columns
+        self._limit = None
+
+    def eq(self, column, value):
+        self._rows = [row for row in self._rows if row.get(column) == value]
+        return self
+
+    def lte(self, column, value):
+        self._rows = [row for row in self._rows if row[column] <= value]
+        return self
+
+    def gt(self, column, value):
+        self._rows = [row for row in self._rows if row[column] > value]
+        return self
+
+    def order(self, column, desc=False):
+        self._rows.sort(key=lambda row: row[column], reverse=desc)
+        return self
+
+    def limit(self, count):
+        self._limit = count
+        return self
+
+    def execute(self):
+        rows = self._rows[: self._limit] if self._limit else self._rows
+        if self._columns != "*":
+            names = [name.strip() for name in self._columns.split(",")]
+            rows = [{name: row.get(name) for name in names} for row in rows]
+        return MagicMock(data=[dict(row) for row in rows])
+
+
+@pytest.fixture
+def rows():
+    return []
+
+
+@pytest.fixture
+def client(rows):
+    """Supabase mock whose create_document_version RPC behaves like the migration's function"""
+    table = FakeVersionsTable(rows)
+    client = MagicMock()
+    client.table.return_value = table
+
+    def rpc(name, params):
+        assert name == "create_document_version"
+        current = max((row["version_number"] for row in rows), default=None)
+        call = MagicMock()
+        if current != params["p_base_version"]:
+            call.execute.side_effect = Exception("version conflict: latest version is newer")
+            return call
+        row = {
+            "project_id": params["p_project_id"],
+            "field_name": params["p_field_name"],
+            "version_number": (current or 0) + 1,
+            "is_keyframe": params["p_is_keyframe"],
+            "content": params["p_content"],
+            "delta": params["p_delta"],
+            "change_summary": params["p_change_summary"],
+            "change_type": params["p_change_type"],
+        }
+        rows.append(row)
+        call.execute.return_value = MagicMock(data=[row])
+        return call
+
+    client.rpc.side_effect = rpc
+    return client
+
+
+def _docs_after_edit(edit: int) -> list[dict]:
+    docs = [
+        {"id": f"doc-{i}", "title": f"Doc {i}", "content": {"body": "x" * 400}} for i in range(10)
+    ]
+    docs[edit % 10] = {**docs[edit % 10], "title": f"Edit {edit}"}
+    return docs
+
+
+class TestDeltaVersions:
+    def test_versions_between_keyframes_store_deltas(self, client, rows):
+        service = VersioningService(client)
+
+        for edit in range(KEYFRAME_INTERVAL + 2):
+            success, result = service.create_version(PROJECT_ID, "docs", _docs_after_edit(edit))
+            assert success
+            assert result["version_number"] == edit + 1
+
+        keyframes = [row["version_number"] for row in rows if row["is_keyframe"]]
+        assert keyframes == [1, KEYFRAME_INTERVAL + 1]
+        assert all(row["content"] is None for row in rows if not row["is_keyframe"])
+
+    def test_every_version_reconstructs_exactly(self, client):
+        service = VersioningService(client)
+        for edit in range(KEYFRAME_INTERVAL + 5):
+            service.create_version(PROJECT_ID, "docs", _docs_after_edit(edit))
+
+        for version_number in (1, 2, KEYFRAME_INTERVAL, KEYFRAME_INTERVAL + 1, KEYFRAME_INTERVAL + 5):
+            success, result = service.get_version_content(PROJECT_ID, "docs", version_number)
+            assert success
+            assert result["content"] == _docs_after_edit(version_number - 1)
+            assert "delta" not in result["version"]
+
+    def test_storage_shrinks_by_more_than_ten_times(self, client, rows):
+        service = VersioningService(client)
+        for edit in range(KEYFRAME_INTERVAL):
+            service.create_version(PROJECT_ID, "docs", _docs_after_edit(edit))
+
+        stored = sum(len(json.dumps(row["content"] or row["delta"])) for row in rows)
+        snapshots = sum(len(json.dumps(_docs_after_edit(edit))) for edit in range(KEYFRAME_INTERVAL))
+        assert stored * 10 < snapshots
+
+    def test_reads_touch_keyframe_and_deltas_only(self, client):
+        service = VersioningService(client)
+        for edit in range(5):
+            service.create_version(PROJECT_ID, "docs", _docs_after_edit(edit))
+        table = client.table.return_value
+        table.queries = 0
+
+        service.get_version_content(PROJECT_ID, "docs", 5)
+
+        assert table.queries == 2
+
+    def test_missing_version_is_not_found(self, client):
+        service = VersioningService(client)
+        service.create_version(PROJECT_ID, "docs", _docs_after_edit(0))
+
+        success, result = service.get_version_content(PROJECT_ID, "docs", 7)
+
+        assert not success
+        assert "not found" in result["error"]
+
+    def test_concurrent_version_is_retried_on_new_base(self, client, rows, monkeypatch):
+        service = VersioningService(client)
+        service.create_version(PROJECT_ID, "docs", _docs_after_edit(0))
+        original_latest = service._latest_version_number
+        raced = []
+
+        def latest_then_race(project_id, field_name):
+            latest = original_latest(project_id, field_name)
+            if not raced:
+                # Another writer commits version 2 right after we read the latest number
+                raced.append(True)
+                VersioningService(client).create_version(PROJECT_ID, "docs", _docs_after_edit(1))
+            return latest
+
+        monkeypatch.setattr(service, "_latest_version_number", latest_then_race)
+
+        success, result = service.create_version(PROJECT_ID, "docs", _docs_after_edit(2))
+
+        assert success
+        assert result["version_number"] == 3
+        assert service.get_version_content(PROJECT_ID, "docs", 3)[1]["content"] == _docs_after_edit(2)
+
+
+class TestDocumentVersions:
+    def test_restore_writes_back_one_document(self):
+        client = MagicMock()
+        projects = MagicMock()
+        for method in ("select", "eq", "update"):
+            getattr(projects, method).return_value = projects
+        projects.execute.return_value = MagicMock(data=[{"id": PROJECT_ID}])
+        client.table.return_value = projects
+        service = VersioningService(client)
+        snapshot = {"version_number": 2, "content": {"id": "d1", "title": "Old"}}
+
+        with patch.object(service, "_reconstruct", return_value=snapshot), patch.object(
+            service, "create_version", return_value=(True, {})
+        ) as create_version, patch(
+            "src.server.services.projects.versioning_service.DocumentService"
+        ) as documents:
+            documents.return_value.get_document.return_value = (
+                True,
+                {"document": {"id": "d1", "title": "Current"}},
+            )
+            success, _ = service.restore_version(PROJECT_ID, "docs:d1", 2)
+
+        assert success
+        documents.return_value.restore_document.assert_called_once_with(
+            PROJECT_ID, {"id": "d1", "title": "Old"}
+        )
+        documents.return_value.replace_documents.assert_not_called()
+        assert "docs:d1" not in projects.update.call_args.args[0]
+        backup = create_version.call_args_list[0].kwargs
+        assert backup["content"] == {"id": "d1", "title": "Current"}
+        assert backup["document_id"] == "d1"
+
+
+class TestSnapshotFallback:
+    def test_full_snapshot_without_migration(self):
+        client = MagicMock()
+        query = MagicMock()
+        for method in ("select", "eq", "order", "limit", "insert"):
+            getattr(query, method).return_value = query
+        query.execute.side_effect = [
+            MagicMock(data=[]),  # latest version (delta path)
+            MagicMock(data=[]),  # latest version (snapshot path)
+            MagicMock(data=[{"version_number": 1, "content": []}]),  # insert
+        ]
+        client.table.return_value = query
+        client.rpc.return_value.execute.side_effect = APIError(
+            {"code": "PGRST202", "message": "Could not find the function public.create_document_version"}
+        )
+
+        success, result = VersioningService(client).create_version(PROJECT_ID, "docs", [])
+
+        assert success
+        assert result["version_number"] == 1
+        inserted = query.insert.call_args.args[0]
+        assert inserted["content"] == []
+        assert "is_keyframe" not in inserted
+
+    def test_other_errors_do_not_fall_back_to_snapshots(self):
+        client = MagicMock()
+        query = MagicMock()
+        for method in ("select", "eq", "order", "limit", "insert"):
+            getattr(query, method).return_value = query
+        query.execute.return_value = MagicMock(data=[])
+        client.table.return_value = query
+        client.rpc.return_value.execute.side_effect = APIError(
+            {"code": "57014", "message": "canceling statement due to statement timeout"}
+        )
+
+        success, result = VersioningService(client).create_version(PROJECT_ID, "docs", [])
+
+        assert not success
+        assert "statement timeout" in result["error"]
+        query.insert.assert_not_called()
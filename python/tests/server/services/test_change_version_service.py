@@ -0,0 +1,56 @@
+"""Unit tests for the change-version registry behind polling ETags."""
+
+from unittest.mock import patch
+
+from src.server.services.change_version_service import ChangeVersionRegistry
+
+
+class TestChangeVersionRegistry:
+    """Tests for ChangeVersionRegistry."""
+
+    def test_bump_increments_each_resource(self):
+        registry = ChangeVersionRegistry()
+
+        registry.bump("tasks", "tasks:proj-1")
+        registry.bump("tasks")
+
+        assert registry.version("tasks") == 2
+        assert registry.version("tasks:proj-1") == 1
+        assert registry.version("projects") == 0
+
+    def test_cached_etag_valid_until_resource_changes(self):
+        registry = ChangeVersionRegistry()
+        registry.remember_etag("projects:list", "projects", registry.version("projects"), '"abc"')
+
+        assert registry.cached_etag("projects:list") == '"abc"'
+
+        registry.bump("projects")
+
+        assert registry.cached_etag("projects:list") is None
+
+    def test_write_during_query_invalidates_remembered_etag(self):
+        """The version read before the query is stored, so a concurrent write is not missed."""
+        registry = ChangeVersionRegistry()
+        version = registry.version("sources")
+        registry.bump("sources")  # lands while the query is running
+
+        registry.remember_etag("sources:summary", "sources", version, '"abc"')
+
+        assert registry.cached_etag("sources:summary") is None
+
+    def test_cached_etag_expires_after_max_age(self):
+        registry = ChangeVersionRegistry(max_age=30.0)
+        with patch("src.server.services.change_version_service.time.monotonic", return_value=100.0):
+            registry.remember_etag("projects:list", "projects", 0, '"abc"')
+        with patch("src.server.services.change_version_service.time.monotonic", return_value=131.0):
+            assert registry.cached_etag("projects:list") is None
+
+    def test_forget_drops_version_and_etags(self):
+        registry = ChangeVersionRegistry()
+        registry.bump("progress:op-1")
+        registry.remember_etag("progress:op-1", "progress:op-1", 1, '"abc"')
+
+        registry.forget("progress:op-1")
+
+        assert registry.version("progress:op-1") == 0
+        assert registry.cached_etag("progress:op-1") is None
@@ -0,0 +1,154 @@
+"""
+Tests for cursor-paginated chunk and code example listings
+"""
+
+from unittest.mock import MagicMock
+
+import pytest
+
+from src.server.services.knowledge.chunk_listing_service import (
+    ChunkListingService,
+    InvalidChunkCursorError,
+    decode_chunk_cursor,
+    encode_chunk_cursor,
+)
+
+
+def _chunk(index: int) -> dict:
+    return {
+        "id": index,
+        "source_id": "src",
+        "url": f"https://docs.example.com/page{index // 10}",
+        "chunk_number": index % 10,
+        "content": f"# Heading {index}\n" + "body " * 50,
+        "metadata": {"knowledge_type": "technical"},
+    }
+
+
+@pytest.fixture
+def query():
+    """Chainable PostgREST query mock"""
+    query = MagicMock()
+    for method in ("select", "eq", "ilike", "in_", "or_", "order", "range"):
+        getattr(query, method).return_value = query
+    return query
+
+
+@pytest.fixture
+def client(query):
+    client = MagicMock()
+    client.from_.return_value = query
+    return client
+
+
+class TestCursor:
+    def test_round_trip(self):
+        cursor = encode_chunk_cursor({"url": 'https://x/a,"b"', "chunk_number": 7})
+
+        assert decode_chunk_cursor(cursor) == ('https://x/a,"b"', 7)
+
+    def test_invalid_cursor(self):
+        with pytest.raises(InvalidChunkCursorError, match="Invalid cursor"):
+            decode_chunk_cursor("not-a-cursor")
+
+
+class TestListChunks:
+    def test_cursor_page_seeks_past_last_row(self, client, query):
+        query.execute.return_value = MagicMock(data=[_chunk(i) for i in range(21)], error=None)
+        cursor = encode_chunk_cursor({"url": "https://docs.example.com/page0", "chunk_number": 4})
+
+        page = ChunkListingService(client).list_chunks("src", limit=20, cursor=cursor, count="none")
+
+        query.or_.assert_called_once_with(
+            'url.gt."https://docs.example.com/page0",'
+            'and(url.eq."https://docs.example.com/page0",chunk_number.gt.4)'
+        )
+        query.range.assert_called_once_with(0, 20)
+        # No count query: one select only
+        assert query.select.call_count == 1
+        assert page["total"] is None
+        assert page["has_more"] is True
+        assert len(page["chunks"]) == 20
+        assert decode_chunk_cursor(page["next_cursor"]) == ("https://docs.example.com/page1", 9)
+        assert page["chunks"][0]["title"] == "Heading 0"
+
+    def test_last_page_has_no_cursor(self, client, query):
+        query.execute.return_value = MagicMock(data=[_chunk(1)], error=None)
+
+        page = ChunkListingService(client).list_chunks(
+            "src", cursor=encode_chunk_cursor(_chunk(0)), count="none"
+        )
+
+        assert page["has_more"] is False
+        assert page["next_cursor"] is None
+
+    def test_offset_page_counts(self, client, query):
+        query.execute.side_effect = [
+            MagicMock(count=50),
+            MagicMock(data=[_chunk(i) for i in range(6)], error=None),
+        ]
+
+        page = ChunkListingService(client).list_chunks("src", limit=5, offset=10, count="estimated")
+
+        assert query.select.call_args_list[0].kwargs == {"count": "estimated", "head": True}
+        query.range.assert_called_once_with(10, 15)
+        query.or_.assert_not_called()
+        assert page["total"] == 50
+        assert page["has_more"] is True
+        assert page["next_cursor"]
+
+    def test_projection_narrows_columns_and_truncates(self, client, query):
+        query.execute.return_value = MagicMock(data=[_chunk(0)], error=None)
+
+        page = ChunkListingService(client).list_chunks(
+            "src", count="none", fields={"content", "url"}, max_content_length=10
+        )
+
+        assert query.select.call_args.args[0] == "id, url, chunk_number, content"
+        assert page["chunks"] == [
+            {
+                "id": 0,
+                "url": "https://docs.example.com/page0",
+                "content": "# Heading ",
+                "content_truncated": True,
+            }
+        ]
+
+    def test_title_reads_content_only_without_metadata_title(self, client, query):
+        titled = {**_chunk(0), "metadata": {"title": "From metadata"}}
+        untitled = _chunk(1)
+        query.execute.side_effect = [
+            MagicMock(data=[
+                {key: row[key] for key in ("id", "url", "chunk_number", "metadata")}
+                for row in (titled, untitled)
+            ], error=None),
+            MagicMock(data=[{"id": 1, "content": untitled["content"]}]),
+        ]
+
+        page = ChunkListingService(client).list_chunks("src", count="none", fields={"title"})
+
+        assert query.select.call_args_list[0].args[0] == "id, url, chunk_number, metadata"
+        assert query.select.call_args_list[1].args[0] == "id, content"
+        query.in_.assert_called_once_with("id", [1])
+        assert page["chunks"] == [
+            {"id": 0, "title": "From metadata"},
+            {"id": 1, "title": "Heading 1"},
+        ]
+
+    def test_invalid_count_mode(self, client):
+        with pytest.raises(ValueError, match="Invalid count mode"):
+            ChunkListingService(client).list_chunks("src", count="sometimes")
+
+
+class TestListCodeExamples:
+    def test_orders_by_url_and_chunk_number(self, client, query):
+        query.execute.side_effect = [
+            MagicMock(count=1),
+            MagicMock(data=[{**_chunk(0), "summary": "s", "metadata": {"language": "py"}}], error=None),
+        ]
+
+        page = ChunkListingService(client).list_code_examples("src")
+
+        assert [c.args[0] for c in query.order.call_args_list] == ["url", "chunk_number"]
+        assert page["code_examples"][0]["language"] == "py"
+        assert page["has_more"] is False
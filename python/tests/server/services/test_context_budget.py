@@ -0,0 +1,94 @@
+"""Unit tests for token-budgeted result packing and page sections."""
+
+from src.server.services.search.context_budget import (
+    ELLIPSIS,
+    pack_results,
+    snippet_window,
+    split_sections,
+)
+from src.server.services.token_counter import count_tokens
+
+FILLER = "lorem ipsum dolor sit amet " * 80
+
+
+class TestSnippetWindow:
+    def test_short_text_is_unchanged(self):
+        assert snippet_window("short text", "anything", 100) == ("short text", False)
+
+    def test_window_is_centred_on_matches(self):
+        text = FILLER + "configure the reranking model with a cross encoder " + FILLER
+
+        snippet, truncated = snippet_window(text, "reranking cross encoder", 200)
+
+        assert truncated is True
+        assert "reranking" in snippet and "encoder" in snippet
+        assert snippet.startswith(ELLIPSIS) and snippet.endswith(ELLIPSIS)
+        assert len(snippet) <= 200 + 2 * len(ELLIPSIS)
+
+    def test_no_matches_falls_back_to_the_start(self):
+        snippet, truncated = snippet_window(FILLER, "kubernetes", 100)
+
+        assert truncated is True
+        assert snippet.startswith("lorem")
+        assert snippet.endswith(ELLIPSIS)
+
+
+class TestPackResults:
+    def test_results_fitting_the_budget_are_kept_whole(self):
+        results = [
+            {"content": "low", "similarity_score": 0.2},
+            {"content": "high", "similarity_score": 0.9},
+        ]
+
+        packed, stats = pack_results(results, "query", 1000)
+
+        assert [r["content"] for r in packed] == ["high", "low"]
+        assert stats["truncated_results"] == 0
+        assert stats["omitted_results"] == 0
+        assert stats["tokens_used"] <= 1000
+
+    def test_overflowing_result_becomes_a_snippet(self):
+        long_content = FILLER + "vector index tuning guide " + FILLER
+        results = [
+            {"content": "best match", "rerank_score": 0.9},
+            {"content": long_content, "rerank_score": 0.5},
+        ]
+
+        packed, stats = pack_results(results, "vector index tuning", 300)
+
+        assert len(packed) == 2
+        assert packed[1]["content_truncated"] is True
+        assert "vector index tuning" in packed[1]["content"]
+        assert stats["truncated_results"] == 1
+        assert stats["tokens_used"] <= 300
+
+    def test_results_are_omitted_when_budget_is_spent(self):
+        results = [
+            {"content": FILLER, "similarity": 0.9},
+            {"content": FILLER, "similarity": 0.8},
+        ]
+
+        packed, stats = pack_results(results, "lorem", 150)
+
+        assert len(packed) == 1
+        assert stats["omitted_results"] == 1
+
+
+class TestSplitSections:
+    def test_short_page_is_one_section(self):
+        assert split_sections("# Title\n\nBody\n") == ["# Title\n\nBody\n"]
+
+    def test_sections_break_at_headings_within_the_limit(self):
+        text = "".join(f"# Part {i}\n\n{FILLER}\n\n" for i in range(4))
+
+        sections = split_sections(text, max_tokens=600)
+
+        assert len(sections) == 4
+        assert all(section.startswith("# Part") for section in sections)
+        assert "".join(sections) == text
+
+    def test_oversized_parts_are_split_further(self):
+        sections = split_sections(FILLER * 3, max_tokens=200)
+
+        assert len(sections) > 1
+        assert all(count_tokens(section) <= 200 for section in sections)
@@ -0,0 +1,155 @@
+"""
+Tests for the sampling profiler, task dump and event loop lag monitor
+"""
+
+import asyncio
+import threading
+import time
+from unittest.mock import patch
+
+import pytest
+
+from src.server.services.diagnostics_service import (
+    LoopLagMonitor,
+    ProfileInProgressError,
+    SamplingProfiler,
+    cpu_profiling_supported,
+    dump_tasks,
+)
+
+
+def _spin_until(stop: threading.Event) -> None:
+    while not stop.is_set():
+        sum(range(1000))
+
+
+def _sleep_until(stop: threading.Event) -> None:
+    while not stop.is_set():
+        time.sleep(0.005)
+
+
+@pytest.fixture
+def busy_and_idle_threads():
+    stop = threading.Event()
+    threads = [
+        threading.Thread(target=_spin_until, args=(stop,), name="busy worker"),
+        threading.Thread(target=_sleep_until, args=(stop,), name="idle-worker"),
+    ]
+    for thread in threads:
+        thread.start()
+    yield
+    stop.set()
+    for thread in threads:
+        thread.join()
+
+
+class TestSamplingProfiler:
+    @pytest.mark.asyncio
+    async def test_wall_profile_is_folded_stacks_of_every_thread(self, busy_and_idle_threads):
+        profile = await SamplingProfiler().profile(0.2, interval=0.005)
+
+        lines = profile.folded("wall").splitlines()
+        assert profile.samples > 5
+        assert any(line.startswith("busy_worker;") and "_spin_until (test_diagnostics_service.py:" in line for line in lines)
+        assert any(line.startswith("idle-worker;") for line in lines)
+        assert not any("archon-profiler" in line for line in lines)
+        assert all(line.rsplit(" ", 1)[1].isdigit() for line in lines)
+
+    @pytest.mark.asyncio
+    @pytest.mark.skipif(not cpu_profiling_supported(), reason="needs per-thread CPU clocks")
+    async def test_cpu_profile_weights_threads_by_cpu_time(self, busy_and_idle_threads):
+        profile = await SamplingProfiler().profile(0.3, interval=0.005)
+
+        busy = sum(weight for stack, weight in profile.cpu.items() if stack.startswith("busy_worker;"))
+        idle = sum(weight for stack, weight in profile.cpu.items() if stack.startswith("idle-worker;"))
+        assert busy > 10 * max(idle, 1)
+
+    @pytest.mark.asyncio
+    async def test_one_profile_at_a_time(self):
+        profiler = SamplingProfiler()
+        first = asyncio.create_task(profiler.profile(0.1))
+        await asyncio.sleep(0)
+
+        with pytest.raises(ProfileInProgressError):
+            await profiler.profile(0.1)
+        await first
+        assert not profiler.running
+
+
+@pytest.mark.asyncio
+async def test_dump_tasks_lists_stacks_of_running_tasks():
+    async def waiting_for_crawl():
+        await asyncio.sleep(10)
+
+    task = asyncio.create_task(waiting_for_crawl(), name="crawl_123")
+    await asyncio.sleep(0)
+    try:
+        dumped = {entry["name"]: entry for entry in dump_tasks()}
+    finally:
+        task.cancel()
+
+    assert dumped["crawl_123"]["coroutine"].endswith("waiting_for_crawl")
+    assert dumped["crawl_123"]["stack"][0].startswith("waiting_for_crawl (test_diagnostics_service.py:")
+
+
+class TestLoopLagMonitor:
+    @pytest.mark.asyncio
+    async def test_records_the_stack_of_a_blocking_callback(self):
+        monitor = LoopLagMonitor(threshold_ms=50, interval=0.01)
+        monitor.start()
+        try:
+            await asyncio.sleep(0.05)
+
+            def blocking_execute():
+                time.sleep(0.3)
+
+            blocking_execute()
+            await asyncio.sleep(0.05)
+        finally:
+            monitor.stop()
+
+        assert len(monitor.events) == 1
+        event = monitor.events[0]
+        assert event.lag_ms >= 200
+        assert event.stack[-1].startswith("blocking_execute (test_diagnostics_service.py:")
+        assert monitor.get_stats()["blocking_events"] == 1
+
+    @pytest.mark.asyncio
+    async def test_no_events_while_the_loop_is_responsive(self):
+        monitor = LoopLagMonitor(threshold_ms=100, interval=0.01)
+        monitor.start()
+        try:
+            await asyncio.sleep(0.15)
+        finally:
+            monitor.stop()
+
+        assert monitor.beats > 5
+        assert not monitor.events
+        assert not monitor.running
+
+
+class TestDiagnosticsApi:
+    def test_profile_returns_folded_stacks(self, client):
+        with patch("src.server.api_routes.diagnostics_api.is_internal_request", return_value=True):
+            response = client.post("/internal/diagnostics/profile", params={"seconds": 0.1, "interval_ms": 5})
+
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/plain")
+        assert response.text.strip()
+
+    def test_profile_as_json_includes_tasks(self, client):
+        with patch("src.server.api_routes.diagnostics_api.is_internal_request", return_value=True):
+            response = client.post("/internal/diagnostics/profile", params={"seconds": 0.1, "format": "json"})
+
+        body = response.json()
+        assert response.status_code == 200
+        assert {"wall", "cpu", "samples", "tasks"} <= set(body)
+
+    def test_rejects_external_requests(self, client):
+        with patch("src.server.api_routes.diagnostics_api.is_internal_request", return_value=False):
+            assert client.post("/internal/diagnostics/profile", params={"seconds": 0.1}).status_code == 403
+            assert client.get("/internal/diagnostics/loop-lag").status_code == 403
+
+    def test_profile_duration_is_bounded(self, client):
+        with patch("src.server.api_routes.diagnostics_api.is_internal_request", return_value=True):
+            assert client.post("/internal/diagnostics/profile", params={"seconds": 3600}).status_code == 422
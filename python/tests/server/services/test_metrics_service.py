@@ -0,0 +1,164 @@
+"""
+Tests for the in-process metrics registry, its HTTP hooks and the
+per-crawl breakdown
+"""
+
+import asyncio
+from types import SimpleNamespace
+
+import httpx
+import pytest
+
+from src.server.services import metrics_service
+from src.server.services.metrics_service import (
+    CrawlMetrics,
+    MetricsRegistry,
+    instrument_supabase_client,
+    provider_event_hooks,
+    stage_timer,
+    track_crawl,
+)
+
+
+@pytest.fixture
+def crawl():
+    """A fresh crawl breakdown, detached again after the test"""
+    token = metrics_service._current_crawl.set(None)
+    yield track_crawl()
+    metrics_service._current_crawl.reset(token)
+
+
+class TestRegistry:
+    def test_renders_prometheus_text(self):
+        registry = MetricsRegistry()
+        counter = registry.counter("jobs_total", "Jobs run", ("kind",))
+        histogram = registry.histogram("job_seconds", "Job time", ("kind",), buckets=(0.1, 1.0))
+
+        counter.inc(kind='a"b')
+        counter.inc(2, kind='a"b')
+        histogram.observe(0.05, kind="x")
+        histogram.observe(0.5, kind="x")
+        histogram.observe(5, kind="x")
+
+        lines = registry.render().splitlines()
+        assert "# TYPE jobs_total counter" in lines
+        assert 'jobs_total{kind="a\\"b"} 3' in lines
+        assert "# TYPE job_seconds histogram" in lines
+        assert 'job_seconds_bucket{kind="x",le="0.1"} 1' in lines
+        assert 'job_seconds_bucket{kind="x",le="1"} 2' in lines
+        assert 'job_seconds_bucket{kind="x",le="+Inf"} 3' in lines
+        assert 'job_seconds_sum{kind="x"} 5.55' in lines
+        assert 'job_seconds_count{kind="x"} 3' in lines
+
+    def test_registering_again_returns_the_same_metric(self):
+        registry = MetricsRegistry()
+        counter = registry.counter("jobs_total", "Jobs run", ("kind",))
+
+        assert registry.counter("jobs_total", "Jobs run", ("kind",)) is counter
+        with pytest.raises(ValueError):
+            registry.histogram("jobs_total", "Jobs run", ("kind",))
+        with pytest.raises(ValueError):
+            counter.inc(other="label")
+
+
+class TestCrawlBreakdown:
+    def test_stages_and_items_are_added_to_the_current_crawl(self, crawl):
+        with stage_timer("chunking"):
+            pass
+        with stage_timer("chunking"):
+            pass
+        metrics_service.record_crawl_items("chunks", 12)
+
+        breakdown = crawl.as_dict()
+
+        assert breakdown["stages"]["chunking"]["count"] == 2
+        assert breakdown["items"] == {"chunks": 12}
+        assert "chunks_per_sec" in breakdown["throughput"]
+        assert breakdown["wall_seconds"] >= 0
+
+    @pytest.mark.asyncio
+    async def test_child_tasks_record_into_the_crawl(self, crawl):
+        async def embed():
+            with stage_timer("embedding"):
+                await asyncio.sleep(0)
+
+        await asyncio.gather(embed(), embed(), embed())
+
+        assert crawl.as_dict()["stages"]["embedding"]["count"] == 3
+
+    def test_stage_is_timed_when_it_raises(self, crawl):
+        before = metrics_service.CRAWL_STAGE_SECONDS.count(stage="crawl")
+
+        with pytest.raises(RuntimeError), stage_timer("crawl"):
+            raise RuntimeError("browser crashed")
+
+        assert metrics_service.CRAWL_STAGE_SECONDS.count(stage="crawl") == before + 1
+        assert crawl.as_dict()["stages"]["crawl"]["count"] == 1
+
+    def test_breakdown_outside_a_crawl_is_not_recorded(self):
+        token = metrics_service._current_crawl.set(None)
+        try:
+            with stage_timer("chunking"):
+                pass
+            assert metrics_service.current_crawl() is None
+        finally:
+            metrics_service._current_crawl.reset(token)
+
+    def test_empty_breakdown(self):
+        assert CrawlMetrics().as_dict()["items"] == {}
+
+
+class TestHttpHooks:
+    @pytest.mark.asyncio
+    async def test_provider_requests_are_recorded_per_endpoint_and_status(self, crawl):
+        def respond(request: httpx.Request) -> httpx.Response:
+            return httpx.Response(429 if request.url.path.endswith("/chat/completions") else 200, json={})
+
+        histogram = metrics_service.PROVIDER_REQUEST_SECONDS
+        before_ok = histogram.count(provider="test-provider", endpoint="embeddings", status="ok")
+        before_limited = histogram.count(provider="test-provider", endpoint="chat", status="rate_limited")
+
+        async with httpx.AsyncClient(
+            transport=httpx.MockTransport(respond), event_hooks=provider_event_hooks("test-provider")
+        ) as client:
+            await client.post("http://provider/v1/embeddings", json={})
+            await client.post("http://provider/v1/chat/completions", json={})
+
+        assert histogram.count(provider="test-provider", endpoint="embeddings", status="ok") == before_ok + 1
+        assert histogram.count(provider="test-provider", endpoint="chat", status="rate_limited") == before_limited + 1
+        assert set(crawl.as_dict()["provider_requests"]) == {"test-provider/embeddings", "test-provider/chat"}
+
+    def test_database_requests_are_recorded_per_target_and_operation(self, crawl):
+        session = httpx.Client(
+            transport=httpx.MockTransport(lambda request: httpx.Response(200, json=[])),
+            base_url="http://db/rest/v1",
+        )
+        instrument_supabase_client(SimpleNamespace(postgrest=SimpleNamespace(session=session)))
+
+        session.get("/archon_sources")
+        session.post("/archon_crawled_pages", json=[])
+        session.post("/archon_settings", json={}, headers={"Prefer": "resolution=merge-duplicates"})
+        session.post("/rpc/match_archon_crawled_pages", json={})
+        session.delete("/archon_crawled_pages")
+
+        assert set(crawl.as_dict()["database"]) == {
+            "select archon_sources",
+            "insert archon_crawled_pages",
+            "upsert archon_settings",
+            "rpc match_archon_crawled_pages",
+            "delete archon_crawled_pages",
+        }
+        assert metrics_service.DATABASE_REQUEST_SECONDS.count(
+            target="archon_sources", operation="select", status="ok"
+        ) >= 1
+
+
+def test_metrics_endpoint_serves_prometheus_text(client):
+    metrics_service.CRAWL_STAGE_SECONDS.observe(0.2, stage="discovery")
+
+    response = client.get("/metrics")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+    assert "# TYPE archon_crawl_stage_seconds histogram" in response.text
+    assert 'archon_crawl_stage_seconds_count{stage="discovery"}' in response.text
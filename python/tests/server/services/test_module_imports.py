@@ -0,0 +1,38 @@
+"""
+Each service module must import on its own in a fresh interpreter.
+
+Inside the test session every module is already loaded, which hides
+import cycles that only fail when a module is the first one imported
+(e.g. by a worker process or a script).
+"""
+
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+PYTHON_ROOT = Path(__file__).resolve().parents[3]
+
+
+@pytest.mark.parametrize(
+    "module",
+    [
+        "src.server.services.threading_service",
+        "src.server.services.llm_provider_service",
+        "src.server.services.embeddings",
+        "src.server.services.search",
+        "src.server.services.source_management_service",
+        "src.server.services.storage",
+    ],
+)
+def test_module_imports_in_fresh_interpreter(module):
+    result = subprocess.run(
+        [sys.executable, "-c", f"import {module}"],
+        cwd=PYTHON_ROOT,
+        capture_output=True,
+        text=True,
+        timeout=120,
+    )
+
+    assert result.returncode == 0, result.stderr[-2000:]
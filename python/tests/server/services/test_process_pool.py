@@ -0,0 +1,121 @@
+"""
+Tests for the CPU process pool and its use by the threading service
+"""
+
+import asyncio
+import math
+import threading
+import time
+
+import pytest
+
+from src.server.services import cpu_tasks
+from src.server.services.process_pool import (
+    DEFAULT_PROCESS_WORKERS,
+    CpuProcessPool,
+    UnpicklableTaskError,
+    default_process_workers,
+)
+from src.server.services.storage.base_storage_service import chunk_text
+from src.server.services.threading_service import ThreadingService
+
+
+@pytest.fixture
+def pool():
+    pool = CpuProcessPool(max_workers=2, max_queued=0, warm_modules=())
+    yield pool
+    pool.shutdown(wait=True)
+
+
+@pytest.mark.asyncio
+async def test_start_launches_every_worker(pool):
+    await pool.start()
+
+    assert len(pool._executor._processes) == 2
+
+
+@pytest.mark.asyncio
+async def test_task_result_and_timing(pool):
+    text = "\n\n".join(f"Paragraph {i}. " + "word " * 200 for i in range(100))
+
+    chunks = await pool.run(cpu_tasks.chunk_text, text, 5000)
+
+    assert chunks == chunk_text(text, 5000)
+    timing = pool.get_stats()["tasks"]["chunk_text"]
+    assert timing["count"] == 1
+    assert timing["failures"] == 0
+    assert timing["avg_wall_ms"] > 0
+
+
+@pytest.mark.asyncio
+async def test_task_errors_propagate_and_count_as_failures(pool):
+    with pytest.raises(ValueError):
+        await pool.run(math.sqrt, -1)
+
+    assert pool.timings["sqrt"].failures == 1
+    assert await pool.run(math.sqrt, 16) == 4.0
+
+
+@pytest.mark.asyncio
+async def test_in_flight_tasks_are_bounded(pool):
+    peak = 0
+
+    async def watch():
+        nonlocal peak
+        while True:
+            peak = max(peak, pool._in_flight)
+            await asyncio.sleep(0.01)
+
+    watcher = asyncio.create_task(watch())
+    await asyncio.gather(*(pool.run(time.sleep, 0.2) for _ in range(5)))
+    watcher.cancel()
+
+    assert peak == 2
+    assert pool.timings["sleep"].count == 5
+    # Tasks beyond the limit waited for a slot
+    assert pool.timings["sleep"].queue_seconds > 0.2
+
+
+def test_default_worker_count_is_small(monkeypatch):
+    monkeypatch.delenv("CPU_PROCESS_WORKERS", raising=False)
+    monkeypatch.setattr("os.cpu_count", lambda: 64)
+
+    assert default_process_workers() == DEFAULT_PROCESS_WORKERS
+
+    monkeypatch.setenv("CPU_PROCESS_WORKERS", "8")
+    assert default_process_workers() == 8
+
+
+@pytest.mark.asyncio
+async def test_unpicklable_arguments_are_rejected_at_submit(pool):
+    with pytest.raises(UnpicklableTaskError):
+        await pool.run(len, threading.Lock())
+
+    assert pool._in_flight == 0
+    assert pool._executor is None
+
+
+def test_memory_pressure_limits_admission():
+    constrained = False
+    pool = CpuProcessPool(max_workers=2, max_queued=4, memory_pressure=lambda: constrained)
+
+    assert pool.admission_limit() == 6
+    constrained = True
+    assert pool.admission_limit() == 2
+
+
+@pytest.mark.asyncio
+async def test_run_cpu_intensive_uses_pool_for_picklable_functions(pool):
+    service = ThreadingService()
+    service.cpu_pool = pool
+
+    assert await service.run_cpu_intensive(math.factorial, 10) == 3628800
+    # Closures can't be sent to a worker and run in the thread pool
+    assert await service.run_cpu_intensive(lambda n: n * 2, 21) == 42
+    # So do calls whose arguments can't be pickled
+    assert await service.run_cpu_intensive(len, [threading.Lock()]) == 1
+
+    assert pool.timings["factorial"].count == 1
+    assert list(pool.timings) == ["factorial"]
+    service.cpu_executor.shutdown()
+    service.io_executor.shutdown()
@@ -0,0 +1,104 @@
+"""
+Tests for the per-provider, header-calibrated rate limiters
+"""
+
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from src.server.services.threading_service import (
+    RateLimitConfig,
+    RateLimiter,
+    ThreadingService,
+    record_rate_limit_headers,
+)
+
+
+class TestRateLimiter:
+    def test_token_window_total_tracks_expiry(self):
+        limiter = RateLimiter(RateLimitConfig(tokens_per_minute=1000, requests_per_minute=0))
+        now = time.time()
+        limiter._record(now - 70, 600)
+        limiter._record(now, 300)
+
+        limiter._clean_old_entries(now)
+
+        assert limiter._tokens_in_window == 300
+        assert limiter._can_make_request(700, now)
+        assert not limiter._can_make_request(701, now)
+
+    def test_wait_time_covers_only_the_needed_expiries(self):
+        limiter = RateLimiter(RateLimitConfig(tokens_per_minute=1000, requests_per_minute=0))
+        now = time.time()
+        limiter._record(now - 50, 400)
+        limiter._record(now - 20, 400)
+
+        # 300 more tokens need the first entry gone (10s), not both
+        assert limiter._calculate_wait_time(300, now) == pytest.approx(10.1)
+
+    def test_oversized_request_runs_alone(self):
+        limiter = RateLimiter(RateLimitConfig(tokens_per_minute=100))
+
+        assert limiter._can_make_request(5000, time.time())
+
+    def test_headers_calibrate_limits(self):
+        limiter = RateLimiter(RateLimitConfig())
+
+        limiter.update_from_headers({
+            "x-ratelimit-limit-requests": "500",
+            "x-ratelimit-limit-tokens": "1000000",
+            "x-ratelimit-remaining-requests": "0",
+            "x-ratelimit-reset-requests": "1m30s",
+        })
+
+        now = time.time()
+        assert limiter.config.requests_per_minute == 475
+        assert limiter.config.tokens_per_minute == 950_000
+        assert not limiter._can_make_request(10, now)
+        assert limiter._calculate_wait_time(10, now) == pytest.approx(90.1, abs=0.5)
+
+    def test_retry_after_blocks(self):
+        limiter = RateLimiter(RateLimitConfig())
+
+        limiter.update_from_headers({"retry-after-ms": "2500"})
+
+        now = time.time()
+        assert not limiter._can_make_request(1, now)
+        assert limiter._calculate_wait_time(1, now) == pytest.approx(2.6, abs=0.2)
+
+
+class TestThreadingServiceLimiters:
+    def test_limiters_are_per_provider_model_and_kind(self):
+        service = ThreadingService()
+
+        embeddings = service.get_rate_limiter("openai", "text-embedding-3-small", "embeddings")
+        chat = service.get_rate_limiter("openai", "gpt-4o-mini", "chat")
+
+        assert embeddings is not chat
+        assert embeddings is service.get_rate_limiter("OpenAI", "text-embedding-3-small", "embeddings")
+        assert service.get_rate_limiter() is service.rate_limiter
+        embeddings.config.tokens_per_minute = 1
+        assert chat.config.tokens_per_minute == service.rate_limit_config.tokens_per_minute
+
+    def test_ollama_is_unmetered(self):
+        limiter = ThreadingService().get_rate_limiter("ollama", "nomic-embed-text", "embeddings")
+        for _ in range(10):
+            limiter._record(time.time(), 10_000_000)
+
+        assert limiter._can_make_request(10_000_000, time.time())
+
+    @pytest.mark.asyncio
+    async def test_response_hook_updates_the_active_limiter(self):
+        service = ThreadingService()
+        response = SimpleNamespace(headers={"x-ratelimit-limit-tokens": "10000"})
+
+        async with service.rate_limited_operation(
+            10, provider="openrouter", model="m", kind="chat"
+        ) as limiter:
+            await record_rate_limit_headers(response)
+        # Outside an operation the hook does nothing
+        await record_rate_limit_headers(SimpleNamespace(headers={"x-ratelimit-limit-tokens": "1"}))
+
+        assert limiter.config.tokens_per_minute == 9500
+        assert service.rate_limiter.config.tokens_per_minute == RateLimitConfig().tokens_per_minute
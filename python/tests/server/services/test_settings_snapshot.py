@@ -0,0 +1,94 @@
+"""Unit tests for the settings snapshot."""
+
+import dataclasses
+
+import pytest
+
+from src.server.services import settings_snapshot
+from src.server.services.settings_snapshot import (
+    SettingsSnapshot,
+    get_settings,
+    publish_settings,
+    subscribe,
+)
+
+
+@pytest.fixture(autouse=True)
+def restore_snapshot(monkeypatch):
+    monkeypatch.setattr(settings_snapshot, "_snapshot", SettingsSnapshot())
+    monkeypatch.setattr(settings_snapshot, "_subscribers", [])
+
+
+def test_values_are_parsed_to_typed_fields():
+    snapshot = SettingsSnapshot.from_values(
+        {
+            "EMBEDDING_BATCH_SIZE": "25",
+            "MEMORY_THRESHOLD_PERCENT": "70.5",
+            "USE_HYBRID_SEARCH": "True",
+            "ENABLE_CODE_SUMMARIES": "false",
+            "CODE_SUMMARY_MAX_WORKERS": "5",
+            "LLM_PROVIDER": "ollama",
+            "CRAWL_PAGE_TIMEOUT": "60000",
+        }
+    )
+
+    assert snapshot.embedding_batch_size == 25
+    assert snapshot.memory_threshold_percent == 70.5
+    assert snapshot.use_hybrid_search is True
+    assert snapshot.enable_code_summaries is False
+    assert snapshot.code_summary_max_workers == 5
+    assert snapshot.llm_provider == "ollama"
+    assert snapshot.get("CRAWL_PAGE_TIMEOUT") == "60000"
+
+
+def test_invalid_empty_and_encrypted_values_keep_defaults():
+    snapshot = SettingsSnapshot.from_values(
+        {
+            "EMBEDDING_BATCH_SIZE": "lots",
+            "CRAWL_BATCH_SIZE": "",
+            "OPENAI_API_KEY": {"encrypted_value": "gAAA", "is_encrypted": True},
+        }
+    )
+
+    assert snapshot.embedding_batch_size == 100
+    assert snapshot.crawl_batch_size == 50
+    assert snapshot.get("OPENAI_API_KEY") is None
+
+
+def test_snapshot_is_immutable():
+    snapshot = SettingsSnapshot.from_values({"EMBEDDING_BATCH_SIZE": "10"})
+
+    with pytest.raises(dataclasses.FrozenInstanceError):
+        snapshot.embedding_batch_size = 20
+    with pytest.raises(TypeError):
+        snapshot.values["EMBEDDING_BATCH_SIZE"] = "20"
+
+
+def test_publish_swaps_snapshot_and_notifies_subscribers():
+    received = []
+    unsubscribe = subscribe(received.append)
+    before = get_settings()
+
+    first = publish_settings({"USE_RERANKING": "true"})
+    unsubscribe()
+    publish_settings({"USE_RERANKING": "false"})
+
+    assert before.use_reranking is False
+    assert received == [first]
+    assert first.use_reranking is True
+    assert get_settings().use_reranking is False
+    assert get_settings().version == first.version + 1
+
+
+def test_failing_subscriber_does_not_block_others():
+    received = []
+
+    def broken(_snapshot):
+        raise RuntimeError("boom")
+
+    subscribe(broken)
+    subscribe(received.append)
+
+    publish_settings({})
+
+    assert len(received) == 1
@@ -0,0 +1,244 @@
+"""
+Tests for streaming source export and import
+"""
+
+import gzip
+import json
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from src.server.services.knowledge import source_transfer_service
+from src.server.services.knowledge.source_transfer_service import (
+    InvalidSourceArchiveError,
+    SourceAlreadyExistsError,
+    SourceTransferService,
+)
+
+SOURCE_ID = "src-1"
+
+
+class FakeDatabase:
+    """In-memory tables supporting the queries the transfer service makes"""
+
+    def __init__(self):
+        self.tables: dict[str, list[dict]] = {}
+        self.selects = 0
+        self.inserts = 0
+
+    def table(self, name):
+        return _Query(self, name)
+
+    def rpc(self, name, params):
+        assert name == "archon_delete_source"
+        source_id = params["p_source_id"]
+        deleted = 0
+        for table, rows in self.tables.items():
+            kept = [row for row in rows if row["source_id"] != source_id]
+            if table == "archon_sources":
+                deleted = len(rows) - len(kept)
+            self.tables[table] = kept
+        call = MagicMock()
+        call.execute.return_value = MagicMock(data=deleted)
+        return call
+
+
+class _Query:
+    def __init__(self, db, name):
+        self._db = db
+        self._name = name
+        self._filters = []
+        self._order = None
+        self._limit = None
+        self._insert = None
+
+    def select(self, columns="*"):
+        return self
+
+    def eq(self, column, value):
+        self._filters.append(lambda row: row.get(column) == value)
+        return self
+
+    def gt(self, column, value):
+        self._filters.append(lambda row: row[column] > value)
+        return self
+
+    def order(self, column, desc=False):
+        self._order = column
+        return self
+
+    def limit(self, count):
+        self._limit = count
+        return self
+
+    def insert(self, rows):
+        self._insert = rows
+        return self
+
+    def execute(self):
+        rows = self._db.tables.setdefault(self._name, [])
+        if self._insert is not None:
+            self._db.inserts += 1
+            for row in self._insert:
+                rows.append({"id": len(rows) + 1000, **row})
+            return MagicMock(data=self._insert)
+
+        self._db.selects += 1
+        matched = [row for row in rows if all(check(row) for check in self._filters)]
+        if self._order:
+            matched.sort(key=lambda row: row[self._order])
+        if self._limit is not None:
+            matched = matched[: self._limit]
+        return MagicMock(data=[dict(row) for row in matched])
+
+
+def _populated(chunk_count: int) -> FakeDatabase:
+    db = FakeDatabase()
+    db.tables["archon_sources"] = [{"source_id": SOURCE_ID, "title": "Docs", "metadata": {}}]
+    db.tables["archon_page_metadata"] = [
+        {"id": "page-1", "source_id": SOURCE_ID, "url": "https://x/1", "full_content": "text"}
+    ]
+    db.tables["archon_crawled_pages"] = [
+        {
+            "id": index + 1,
+            "source_id": SOURCE_ID,
+            "url": "https://x/1",
+            "chunk_number": index,
+            "content": f"chunk {index}",
+            "embedding_1536": "[0.1,0.2]",
+            "content_search_vector": "'chunk':1",
+            "page_id": "page-1",
+        }
+        for index in range(chunk_count)
+    ]
+    db.tables["archon_code_examples"] = []
+    return db
+
+
+async def _export(db: FakeDatabase, compress: bool = True) -> bytes:
+    service = SourceTransferService(db)
+    return b"".join([chunk async for chunk in service.iter_export(SOURCE_ID, compress=compress)])
+
+
+async def _stream(data: bytes, size: int = 97):
+    for start in range(0, len(data), size):
+        yield data[start : start + size]
+
+
+@pytest.fixture(autouse=True)
+def small_batches(monkeypatch):
+    monkeypatch.setattr(source_transfer_service, "EXPORT_BATCH_SIZE", 50)
+    monkeypatch.setattr(source_transfer_service, "IMPORT_BATCH_SIZE", 40)
+
+
+class TestExport:
+    @pytest.mark.asyncio
+    async def test_export_is_gzipped_ndjson_in_batches(self):
+        db = _populated(120)
+
+        lines = gzip.decompress(await _export(db)).splitlines()
+
+        records = [json.loads(line) for line in lines]
+        assert records[0]["format"] == "archon-source-export"
+        assert records[-1] == {
+            "end": True,
+            "counts": {
+                "archon_sources": 1,
+                "archon_page_metadata": 1,
+                "archon_crawled_pages": 120,
+                "archon_code_examples": 0,
+            },
+        }
+        chunk_rows = [r["row"] for r in records if r.get("table") == "archon_crawled_pages"]
+        assert [row["chunk_number"] for row in chunk_rows] == list(range(120))
+        assert chunk_rows[0]["embedding_1536"] == "[0.1,0.2]"
+        assert "id" not in chunk_rows[0]
+        assert "content_search_vector" not in chunk_rows[0]
+        # 1 source + 1 page + 3 chunk batches (50, 50, 20) + 1 code example page
+        assert db.selects == 6
+
+
+class TestImport:
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("compress", [True, False])
+    async def test_round_trip(self, compress):
+        exported = await _export(_populated(120), compress=compress)
+        target = FakeDatabase()
+
+        success, result = await SourceTransferService(target).import_source(_stream(exported))
+
+        assert success, result
+        assert result["counts"]["archon_crawled_pages"] == 120
+        assert len(target.tables["archon_crawled_pages"]) == 120
+        assert target.tables["archon_crawled_pages"][5]["page_id"] == "page-1"
+        # 1 source + 1 page + 3 chunk batches (40 each)
+        assert target.inserts == 5
+
+    @pytest.mark.asyncio
+    async def test_existing_source_is_rejected_unless_replaced(self):
+        exported = await _export(_populated(3))
+        target = _populated(1)
+
+        with pytest.raises(SourceAlreadyExistsError, match="already exists"):
+            await SourceTransferService(target).import_source(_stream(exported))
+
+        success, _ = await SourceTransferService(target).import_source(
+            _stream(exported), replace=True
+        )
+        assert success
+        assert len(target.tables["archon_crawled_pages"]) == 3
+
+    @pytest.mark.asyncio
+    async def test_truncated_export_writes_nothing(self):
+        lines = gzip.decompress(await _export(_populated(120))).splitlines(keepends=True)
+        truncated = b"".join(lines[:-10])
+        target = FakeDatabase()
+
+        with pytest.raises(InvalidSourceArchiveError, match="truncated"):
+            await SourceTransferService(target).import_source(_stream(truncated))
+
+        assert target.inserts == 0
+        assert target.tables["archon_sources"] == []
+
+    @pytest.mark.asyncio
+    async def test_failed_replace_keeps_the_existing_source(self):
+        lines = gzip.decompress(await _export(_populated(120))).splitlines(keepends=True)
+        truncated = b"".join(lines[:-10])
+        target = _populated(2)
+
+        with pytest.raises(InvalidSourceArchiveError):
+            await SourceTransferService(target).import_source(_stream(truncated), replace=True)
+
+        assert target.inserts == 0
+        assert len(target.tables["archon_sources"]) == 1
+        assert len(target.tables["archon_crawled_pages"]) == 2
+
+    @pytest.mark.asyncio
+    async def test_rows_of_other_sources_are_refused(self):
+        header = {"format": "archon-source-export", "version": 1, "source_id": SOURCE_ID}
+        row = {"table": "archon_sources", "row": {"source_id": "someone-else"}}
+        data = f"{json.dumps(header)}\n{json.dumps(row)}\n".encode()
+
+        with pytest.raises(InvalidSourceArchiveError, match="another source"):
+            await SourceTransferService(FakeDatabase()).import_source(_stream(data))
+
+
+class TestImportEndpoint:
+    @pytest.mark.parametrize(
+        ("error", "status_code"),
+        [
+            (SourceAlreadyExistsError("Source s1 already exists"), 409),
+            (InvalidSourceArchiveError("Export file is truncated (no end record)"), 400),
+        ],
+    )
+    def test_import_errors_map_to_status_codes(self, client, error, status_code):
+        with patch(
+            "src.server.api_routes.knowledge_api.SourceTransferService"
+        ) as service:
+            service.return_value.import_source = AsyncMock(side_effect=error)
+            response = client.post(
+                "/api/knowledge-items/import", files={"file": ("s1.ndjson", b"{}\n")}
+            )
+
+        assert response.status_code == status_code
+        assert response.json()["detail"]["error"] == str(error)
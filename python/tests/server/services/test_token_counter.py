@@ -0,0 +1,77 @@
+"""
+Tests for token counting
+"""
+
+import pytest
+
+from src.server.services import token_counter
+from src.server.services.token_counter import count_tokens, count_tokens_async, estimate_tokens
+
+
+@pytest.fixture(autouse=True)
+def clear_encoding_cache():
+    token_counter._encoding_for.cache_clear()
+    yield
+    token_counter._encoding_for.cache_clear()
+
+
+class TestCountTokens:
+    def test_falls_back_to_length_estimate(self, monkeypatch):
+        monkeypatch.setattr(token_counter, "TIKTOKEN_AVAILABLE", False)
+
+        assert count_tokens(["abcdefgh", "abc"], "gpt-4o-mini") == 3
+        assert count_tokens("") == 0
+        assert estimate_tokens("abcde") == 2
+
+    def test_uses_encoding_batch(self, monkeypatch):
+        class FakeEncoding:
+            def encode_ordinary_batch(self, texts):
+                return [text.split() for text in texts]
+
+        monkeypatch.setattr(token_counter, "_encoding_for", lambda model: FakeEncoding())
+
+        assert count_tokens(["one two", "three"], "text-embedding-3-small") == 3
+
+    def test_unloadable_encodings_are_not_retried(self, monkeypatch):
+        calls = []
+
+        class FailingTiktoken:
+            def encoding_for_model(self, model):
+                calls.append(model)
+                raise ConnectionError("offline")
+
+        monkeypatch.setattr(token_counter, "TIKTOKEN_AVAILABLE", True)
+        monkeypatch.setattr(token_counter, "tiktoken", FailingTiktoken())
+        monkeypatch.setattr(token_counter, "_load_failed", type(token_counter._load_failed)())
+
+        assert count_tokens("abcdefgh", "openai/gpt-4o") == 2
+        assert count_tokens("abcdefgh", "gpt-4o-mini") == 2
+        assert calls == ["gpt-4o"]
+
+
+class TestCountTokensAsync:
+    @pytest.mark.asyncio
+    async def test_small_input_counted_inline(self, monkeypatch):
+        monkeypatch.setattr(token_counter, "TIKTOKEN_AVAILABLE", False)
+
+        async def fail_to_thread(*args):
+            raise AssertionError("small inputs must not use a worker thread")
+
+        monkeypatch.setattr(token_counter.asyncio, "to_thread", fail_to_thread)
+
+        assert await count_tokens_async("abcdefgh") == 2
+
+    @pytest.mark.asyncio
+    async def test_large_input_tokenized_in_worker_thread(self, monkeypatch):
+        monkeypatch.setattr(token_counter, "TIKTOKEN_AVAILABLE", False)
+        offloaded = []
+
+        async def to_thread(func, *args):
+            offloaded.append(args)
+            return func(*args)
+
+        monkeypatch.setattr(token_counter.asyncio, "to_thread", to_thread)
+        text = "a" * token_counter.ASYNC_TOKENIZE_MIN_CHARS
+
+        assert await count_tokens_async([text], "gpt-4o-mini") == len(text) // 4
+        assert offloaded == [([text], "gpt-4o-mini")]
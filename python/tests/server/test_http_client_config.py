@@ -0,0 +1,43 @@
+"""Tests for the shared service-to-service HTTP client settings."""
+
+from unittest.mock import MagicMock
+
+import httpx
+import pytest
+
+from src.server.api_routes import agent_work_orders_proxy
+from src.server.services.mcp_service_client import MCPServiceClient
+
+
+@pytest.fixture
+def async_client(monkeypatch):
+    monkeypatch.setenv("MCP_HTTP_MAX_CONNECTIONS", "7")
+    monkeypatch.setenv("MCP_HTTP_MAX_KEEPALIVE", "3")
+    monkeypatch.setenv("MCP_CONNECT_TIMEOUT", "2.5")
+    client_cls = MagicMock(spec=httpx.AsyncClient)
+    client_cls.return_value.is_closed = False
+    monkeypatch.setattr(httpx, "AsyncClient", client_cls)
+    return client_cls
+
+
+def test_proxy_client_uses_shared_settings(async_client, monkeypatch):
+    monkeypatch.setattr(agent_work_orders_proxy, "_client", None)
+
+    agent_work_orders_proxy.get_proxy_client()
+
+    kwargs = async_client.call_args.kwargs
+    assert kwargs["limits"] == httpx.Limits(
+        max_connections=7, max_keepalive_connections=3, keepalive_expiry=30.0
+    )
+    assert kwargs["timeout"].connect == 2.5
+    assert kwargs["timeout"].read == agent_work_orders_proxy.PROXY_READ_TIMEOUT
+
+
+def test_mcp_service_client_uses_shared_settings(async_client):
+    MCPServiceClient()._get_client()
+
+    kwargs = async_client.call_args.kwargs
+    assert kwargs["limits"].max_connections == 7
+    assert kwargs["limits"].max_keepalive_connections == 3
+    assert kwargs["timeout"].connect == 2.5
+    assert kwargs["timeout"].read == 300.0
@@ -0,0 +1,94 @@
+"""Tests for process-pool document extraction."""
+
+import pytest
+
+from src.server.utils import document_processing
+from src.server.utils.document_processing import (
+    PDF_PAGES_PER_TASK,
+    extract_text_from_document_file,
+    shutdown_extraction_pool,
+)
+
+
+def _write_pdf(path, page_texts: list[str]) -> None:
+    """Write a minimal PDF with one line of Helvetica text per page."""
+    page_count = len(page_texts)
+    font_id = 3 + 2 * page_count
+    objects = [
+        "<< /Type /Catalog /Pages 2 0 R >>",
+        "<< /Type /Pages /Kids [{}] /Count {} >>".format(
+            " ".join(f"{3 + 2 * i} 0 R" for i in range(page_count)), page_count
+        ),
+    ]
+    for i, text in enumerate(page_texts):
+        stream = f"BT /F1 12 Tf 72 720 Td ({text}) Tj ET"
+        objects.append(
+            f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] "
+            f"/Resources << /Font << /F1 {font_id} 0 R >> >> /Contents {4 + 2 * i} 0 R >>"
+        )
+        objects.append(f"<< /Length {len(stream)} >>\nstream\n{stream}\nendstream")
+    objects.append("<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>")
+
+    output = b"%PDF-1.4\n"
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(len(output))
+        output += f"{number} 0 obj\n{body}\nendobj\n".encode()
+    xref_offset = len(output)
+    output += f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n".encode()
+    for offset in offsets:
+        output += f"{offset:010d} 00000 n \n".encode()
+    output += (
+        f"trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\nstartxref\n{xref_offset}\n%%EOF\n"
+    ).encode()
+    path.write_bytes(output)
+
+
+@pytest.fixture(autouse=True)
+def extraction_pool():
+    yield
+    shutdown_extraction_pool()
+
+
+@pytest.mark.asyncio
+async def test_pdf_pages_extracted_in_order_with_progress(tmp_path):
+    """Pages split across workers come back in page order, with progress per batch."""
+    page_count = PDF_PAGES_PER_TASK * 2 + 3
+    pdf_path = tmp_path / "doc.pdf"
+    _write_pdf(pdf_path, [f"Content of page {n}" for n in range(1, page_count + 1)])
+
+    progress = []
+
+    async def on_progress(pages_processed, total_pages):
+        progress.append((pages_processed, total_pages))
+
+    text = await extract_text_from_document_file(
+        str(pdf_path), "doc.pdf", "application/pdf", progress_callback=on_progress
+    )
+
+    positions = [text.index(f"--- Page {n} ---\nContent of page {n}") for n in range(1, page_count + 1)]
+    assert positions == sorted(positions)
+    assert len(progress) == 3
+    assert progress[-1] == (page_count, page_count)
+
+
+@pytest.mark.asyncio
+async def test_pdf_without_text_raises_value_error(tmp_path):
+    """A PDF with no extractable text is reported as a user error."""
+    pdf_path = tmp_path / "blank.pdf"
+    _write_pdf(pdf_path, [""])
+
+    with pytest.raises(ValueError):
+        await extract_text_from_document_file(str(pdf_path), "blank.pdf", "application/pdf")
+
+
+@pytest.mark.asyncio
+async def test_text_file_extracted_in_pool(tmp_path):
+    """Non-PDF formats go through extract_text_from_document in a worker."""
+    text_path = tmp_path / "notes.md"
+    text_path.write_text("# Notes\n\nSome content")
+
+    text = await extract_text_from_document_file(str(text_path), "notes.md", "text/markdown")
+
+    assert text == "# Notes\n\nSome content"
+    assert document_processing.get_extraction_pool().timings["_extract_text_from_document_path"].count == 1
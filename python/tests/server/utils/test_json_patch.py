@@ -0,0 +1,71 @@
+"""
+Tests for the JSON patch helpers behind delta-encoded versions
+"""
+
+import pytest
+
+from src.server.utils.json_patch import JsonPatchError, apply_patch, make_patch
+
+
+def _docs(count: int) -> list[dict]:
+    return [
+        {"id": f"doc-{i}", "title": f"Document {i}", "content": {"text": "lorem ipsum " * 20}}
+        for i in range(count)
+    ]
+
+
+class TestMakePatch:
+    @pytest.mark.parametrize(
+        "old,new",
+        [
+            ({"a": 1}, {"a": 2, "b": [1, 2]}),
+            ({"a/b": 1, "c~d": 2}, {"a/b": 3}),
+            ([1, 2, 3, 4], [1, 3, 4]),
+            ([1, 2], [0, 1, 2, 5]),
+            ({"x": [1, {"y": True}]}, {"x": [1, {"y": 1}]}),
+            ([], {"now": "a dict"}),
+            ("text", None),
+        ],
+    )
+    def test_round_trip(self, old, new):
+        assert apply_patch(old, make_patch(old, new)) == new
+
+    def test_equal_documents_give_empty_patch(self):
+        assert make_patch(_docs(3), _docs(3)) == []
+
+    def test_inserting_into_long_list_touches_one_entry(self):
+        old = _docs(50)
+        new = old[:10] + [{"id": "new", "title": "New"}] + old[10:]
+
+        patch = make_patch(old, new)
+
+        assert patch == [{"op": "add", "path": "/10", "value": {"id": "new", "title": "New"}}]
+
+    def test_editing_one_document_patches_only_that_field(self):
+        old = _docs(5)
+        new = [dict(doc) for doc in old]
+        new[3] = {**new[3], "title": "Renamed"}
+
+        assert make_patch(old, new) == [{"op": "replace", "path": "/3/title", "value": "Renamed"}]
+
+    def test_bool_to_int_change_is_kept(self):
+        assert make_patch({"flag": True}, {"flag": 1}) == [
+            {"op": "replace", "path": "/flag", "value": 1}
+        ]
+
+
+class TestApplyPatch:
+    def test_input_is_not_modified(self):
+        original = {"items": [1, 2]}
+
+        apply_patch(original, [{"op": "add", "path": "/items/-", "value": 3}])
+
+        assert original == {"items": [1, 2]}
+
+    def test_missing_path_raises(self):
+        with pytest.raises(JsonPatchError, match="Path not found"):
+            apply_patch({"a": 1}, [{"op": "remove", "path": "/b"}])
+
+    def test_unsupported_operation_raises(self):
+        with pytest.raises(JsonPatchError, match="Unsupported"):
+            apply_patch({}, [{"op": "move", "from": "/a", "path": "/b"}])
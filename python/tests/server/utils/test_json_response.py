@@ -0,0 +1,58 @@
+"""
+Tests for the fast JSON response and fields= projection helpers
+"""
+
+import json
+from datetime import datetime
+from uuid import UUID
+
+from src.server.utils.json_response import (
+    FastJSONResponse,
+    dumps_json,
+    parse_fields,
+    project_fields,
+)
+
+
+class TestDumpsJson:
+    def test_matches_stdlib_output(self):
+        data = {"b": [1, 2.5, None, True], "a": "ünïcode", "nested": {"k": "v"}}
+
+        assert json.loads(dumps_json(data)) == data
+
+    def test_sort_keys_is_stable(self):
+        assert dumps_json({"b": 1, "a": 2}, sort_keys=True) == dumps_json(
+            {"a": 2, "b": 1}, sort_keys=True
+        )
+
+    def test_non_json_types_are_stringified(self):
+        data = {"id": UUID(int=1), "at": datetime(2025, 1, 2, 3, 4, 5)}
+
+        decoded = json.loads(dumps_json(data))
+
+        assert decoded["id"] == "00000000-0000-0000-0000-000000000001"
+        assert decoded["at"].startswith("2025-01-02")
+
+    def test_response_renders_with_fast_encoder(self):
+        response = FastJSONResponse({"items": [1, 2]}, headers={"ETag": '"abc"'})
+
+        assert json.loads(response.body) == {"items": [1, 2]}
+        assert response.headers["ETag"] == '"abc"'
+        assert response.media_type == "application/json"
+
+
+class TestFieldProjection:
+    def test_parse_fields(self):
+        assert parse_fields(None) is None
+        assert parse_fields(" , ") is None
+        assert parse_fields("id, title,,url ") == {"id", "title", "url"}
+
+    def test_projection_keeps_id(self):
+        rows = [{"id": "1", "title": "A", "content": "big"}]
+
+        assert project_fields(rows, {"title"}) == [{"id": "1", "title": "A"}]
+
+    def test_no_projection_returns_rows(self):
+        rows = [{"id": "1", "content": "big"}]
+
+        assert project_fields(rows, None) == rows
@@ -0,0 +1,149 @@
+"""
+Tests for the progress backends sharing progress between API workers
+"""
+
+import asyncio
+from datetime import UTC, datetime, timedelta
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from fastapi.testclient import TestClient
+
+from src.server.utils.progress import ProgressTracker, progress_backend
+from src.server.utils.progress.progress_backend import (
+    InMemoryProgressBackend,
+    SupabaseProgressBackend,
+    create_progress_backend,
+    set_progress_backend,
+)
+
+
+@pytest.fixture(autouse=True)
+def restore_backend():
+    ProgressTracker._progress_states.clear()
+    yield
+    set_progress_backend(None)
+    ProgressTracker._progress_states.clear()
+
+
+def _table_mock(rows=None):
+    """Supabase table mock whose query chains all resolve to the given rows"""
+    table = MagicMock()
+    for method in ("select", "eq", "gte", "update", "upsert", "delete", "in_"):
+        getattr(table, method).return_value = table
+    table.not_ = table
+    table.execute.return_value = MagicMock(data=rows or [])
+    client = MagicMock()
+    client.table.return_value = table
+    return client, table
+
+
+class TestBackendSelection:
+    """Test create_progress_backend"""
+
+    def test_memory_is_default(self, monkeypatch):
+        monkeypatch.delenv("PROGRESS_BACKEND", raising=False)
+
+        assert isinstance(create_progress_backend(), InMemoryProgressBackend)
+
+    def test_invalid_backend_raises(self, monkeypatch):
+        monkeypatch.setenv("PROGRESS_BACKEND", "redis")
+
+        with pytest.raises(ValueError, match="Supported backends"):
+            create_progress_backend()
+
+
+class TestSupabaseProgressBackend:
+    """Test SupabaseProgressBackend writes, reads and stop requests"""
+
+    @pytest.mark.asyncio
+    async def test_rapid_updates_coalesce_into_latest_write(self):
+        client, table = _table_mock()
+        backend = SupabaseProgressBackend(client, owner_id="worker-a")
+
+        with patch.object(progress_backend, "SHARED_WRITE_INTERVAL", 0.05):
+            for progress in (10, 20, 30, 40):
+                backend.publish("op-1", {"type": "crawl", "status": "crawling", "progress": progress})
+            await asyncio.gather(*backend._writers.values())
+
+        written = [call.args[0] for call in table.upsert.call_args_list]
+        assert len(written) <= 2
+        assert written[-1]["state"]["progress"] == 40
+        assert written[-1]["owner_id"] == "worker-a"
+        assert written[-1]["status"] == "crawling"
+
+    @pytest.mark.asyncio
+    async def test_get_ignores_abandoned_operations(self):
+        stale = (datetime.now(UTC) - timedelta(hours=1)).isoformat()
+        client, _ = _table_mock(
+            [{"state": {"progress": 5}, "status": "crawling", "updated_at": stale}]
+        )
+        backend = SupabaseProgressBackend(client, owner_id="worker-a")
+
+        assert await backend.get("op-1") is None
+
+    @pytest.mark.asyncio
+    async def test_list_active_skips_terminal_operations(self):
+        client, _ = _table_mock(
+            [
+                {"progress_id": "running", "state": {"status": "crawling"}, "status": "crawling"},
+                {"progress_id": "done", "state": {"status": "completed"}, "status": "completed"},
+            ]
+        )
+        backend = SupabaseProgressBackend(client, owner_id="worker-a")
+
+        assert list(await backend.list_active()) == ["running"]
+
+    @pytest.mark.asyncio
+    async def test_owner_handles_stop_requests(self):
+        client, table = _table_mock([{"progress_id": "op-1"}])
+        backend = SupabaseProgressBackend(client, owner_id="worker-a")
+        handler = AsyncMock(return_value=True)
+        backend._cancel_handler = handler
+
+        await backend._process_cancellations()
+
+        handler.assert_awaited_once_with("op-1")
+        table.update.assert_called_with({"cancel_requested": False})
+
+
+class TestSharedProgressAcrossWorkers:
+    """Test the progress API and stop endpoint with operations of another worker"""
+
+    @pytest.fixture
+    def remote_backend(self):
+        backend = InMemoryProgressBackend()
+        backend.get = AsyncMock(
+            return_value={"progress_id": "remote-op", "type": "crawl", "status": "crawling", "progress": 40}
+        )
+        backend.list_active = AsyncMock(
+            return_value={"remote-op": {"type": "crawl", "status": "crawling", "progress": 40}}
+        )
+        backend.request_cancel = AsyncMock(return_value=True)
+        set_progress_backend(backend)
+        return backend
+
+    def test_poll_served_from_shared_state(self, remote_backend):
+        from src.server.main import app
+
+        response = TestClient(app).get("/api/progress/remote-op")
+
+        assert response.status_code == 200
+        assert response.json()["progress"] == 40
+
+    def test_active_operations_include_other_workers(self, remote_backend):
+        from src.server.main import app
+
+        ProgressTracker("local-op", operation_type="crawl")
+        response = TestClient(app).get("/api/progress/")
+
+        operation_ids = {op["operation_id"] for op in response.json()["operations"]}
+        assert operation_ids == {"local-op", "remote-op"}
+
+    def test_stop_forwarded_to_owning_worker(self, remote_backend):
+        from src.server.main import app
+
+        response = TestClient(app).post("/api/knowledge-items/stop/remote-op")
+
+        assert response.status_code == 200
+        remote_backend.request_cancel.assert_awaited_once_with("remote-op")
@@ -10,8 +10,10 @@ import os
 from unittest.mock import MagicMock, patch
 
 import pytest
+from cryptography.fernet import InvalidToken
 
 from src.server.services.credential_service import (
+    CredentialService,
     credential_service,
     get_credential,
     initialize_credentials,
@@ -336,3 +338,78 @@ class TestAsyncCredentialService:
         result2 = await get_credential("PERSISTENT_KEY", "default")
         assert result2 == "persistent_value"
         assert result1 == result2
+
+
+class TestCredentialEncryptionCache:
+    """Test the derived-key and decrypted-value caches"""
+
+    @pytest.fixture
+    def service(self, monkeypatch):
+        monkeypatch.setenv("SUPABASE_SERVICE_KEY", "service-key-one")
+        return CredentialService()
+
+    def test_key_is_derived_once(self, service):
+        with patch.object(service, "_get_encryption_key", wraps=service._get_encryption_key) as derive:
+            encrypted = [service._encrypt_value(f"secret-{i}") for i in range(3)]
+            decrypted = [service._decrypt_value(value) for value in encrypted]
+
+        assert decrypted == ["secret-0", "secret-1", "secret-2"]
+        assert derive.call_count == 1
+
+    def test_decrypted_values_are_cached(self, service):
+        encrypted = service._encrypt_value("sk-test")
+        service._decrypted_cache.clear()
+
+        assert service._decrypt_value(encrypted) == "sk-test"
+        assert service._decrypt_value(encrypted) == "sk-test"
+
+        stats = service.get_crypto_stats()
+        assert stats["decrypt_cache_misses"] == 1
+        assert stats["decrypt_cache_hits"] == 1
+        assert stats["key_derivations"] == 1
+        assert stats["estimated_cpu_ms_saved"] >= 0
+
+    def test_key_rotation_rederives_and_clears(self, service, monkeypatch):
+        encrypted = service._encrypt_value("sk-test")
+        monkeypatch.setenv("SUPABASE_SERVICE_KEY", "service-key-two")
+
+        with pytest.raises(InvalidToken):
+            service._decrypt_value(encrypted)
+
+        assert service.crypto_stats.key_derivations == 2
+        assert service._decrypted_cache == {}
+
+    @pytest.mark.asyncio
+    async def test_set_and_delete_invalidate_cached_values(self, service):
+        service._get_supabase_client = MagicMock()
+        service._cache_initialized = True
+
+        await service.set_credential("OPENAI_API_KEY", "sk-old", is_encrypted=True)
+        old_encrypted = service._cache["OPENAI_API_KEY"]["encrypted_value"]
+        await service.set_credential("OPENAI_API_KEY", "sk-new", is_encrypted=True)
+
+        assert old_encrypted not in service._decrypted_cache
+        assert await service.get_credential("OPENAI_API_KEY") == "sk-new"
+
+        await service.delete_credential("OPENAI_API_KEY")
+
+        assert service._decrypted_cache == {}
+
+
+@pytest.mark.asyncio
+async def test_credential_changes_publish_settings_snapshot(monkeypatch):
+    """Setting a credential publishes a new settings snapshot"""
+    from src.server.services import settings_snapshot
+
+    monkeypatch.setattr(settings_snapshot, "_snapshot", settings_snapshot.SettingsSnapshot())
+    service = CredentialService()
+    service._get_supabase_client = MagicMock()
+    service._cache_initialized = True
+
+    await service.set_credential("CRAWL_BATCH_SIZE", "20", category="rag_strategy")
+
+    assert settings_snapshot.get_settings().crawl_batch_size == 20
+
+    await service.delete_credential("CRAWL_BATCH_SIZE")
+
+    assert settings_snapshot.get_settings().crawl_batch_size == 50
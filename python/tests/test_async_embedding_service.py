@@ -18,6 +18,7 @@ from src.server.services.embeddings.embedding_service import (
     create_embedding,
     create_embeddings_batch,
 )
+from src.server.services.settings_snapshot import SettingsSnapshot
 
 
 class AsyncContextManager:
@@ -399,13 +400,10 @@ class TestAsyncEmbeddingService:
                     return_value="text-embedding-3-small",
                 ):
                     with patch(
-                        "src.server.services.embeddings.embedding_service.credential_service"
-                    ) as mock_cred:
+                        "src.server.services.embeddings.embedding_service.get_settings",
                         # Set batch size to 2
-                        mock_cred.get_credentials_by_category = AsyncMock(
-                            return_value={"EMBEDDING_BATCH_SIZE": "2"}
-                        )
-
+                        return_value=SettingsSnapshot(embedding_batch_size=2),
+                    ):
                         mock_get_client.return_value = AsyncContextManager(mock_llm_client)
 
                         # Test with 5 texts (should require 3 API calls: 2+2+1)
@@ -5,7 +5,7 @@ Tests all aspects of the async LLM provider service after sync function removal.
 Covers different providers (OpenAI, Ollama, Google) and error scenarios.
 """
 
-from unittest.mock import AsyncMock, MagicMock, patch
+from unittest.mock import ANY, AsyncMock, MagicMock, patch
 
 import pytest
 
@@ -109,7 +109,7 @@ class TestAsyncLLMProviderService:
 
                 async with get_llm_client() as client:
                     assert client == mock_client
-                    mock_openai.assert_called_once_with(api_key="test-openai-key")
+                    mock_openai.assert_called_once_with(api_key="test-openai-key", http_client=ANY)
 
                 # Verify provider config was fetched
                 mock_credential_service.get_active_provider.assert_called_once_with("llm")
@@ -133,7 +133,7 @@ class TestAsyncLLMProviderService:
                 async with get_llm_client() as client:
                     assert client == mock_client
                     mock_openai.assert_called_once_with(
-                        api_key="ollama", base_url="http://host.docker.internal:11434/v1"
+                        api_key="ollama", base_url="http://host.docker.internal:11434/v1", http_client=ANY
                     )
 
     @pytest.mark.asyncio
@@ -157,6 +157,7 @@ class TestAsyncLLMProviderService:
                     mock_openai.assert_called_once_with(
                         api_key="test-google-key",
                         base_url="https://generativelanguage.googleapis.com/v1beta/openai/",
+                        http_client=ANY,
                     )
 
     @pytest.mark.asyncio
@@ -177,7 +178,7 @@ class TestAsyncLLMProviderService:
 
                 async with get_llm_client(provider="openai") as client:
                     assert client == mock_client
-                    mock_openai.assert_called_once_with(api_key="override-key")
+                    mock_openai.assert_called_once_with(api_key="override-key", http_client=ANY)
 
                 # Verify explicit provider API key was requested
                 mock_credential_service._get_provider_api_key.assert_called_once_with("openai")
@@ -205,7 +206,7 @@ class TestAsyncLLMProviderService:
 
                 async with get_llm_client(use_embedding_provider=True) as client:
                     assert client == mock_client
-                    mock_openai.assert_called_once_with(api_key="embedding-key")
+                    mock_openai.assert_called_once_with(api_key="embedding-key", http_client=ANY)
 
                 # Verify embedding provider was requested
                 mock_credential_service.get_active_provider.assert_called_once_with("embedding")
@@ -240,7 +241,8 @@ class TestAsyncLLMProviderService:
                     # Verify it created an Ollama client with correct params
                     mock_openai.assert_called_once_with(
                         api_key="ollama",
-                        base_url="http://host.docker.internal:11434/v1"
+                        base_url="http://host.docker.internal:11434/v1",
+                        http_client=ANY,
                     )
 
     @pytest.mark.asyncio
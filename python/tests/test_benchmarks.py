@@ -0,0 +1,102 @@
+"""
+Tests for the benchmark harness: database stand-in, fake provider,
+corpus and result comparison.
+"""
+
+import base64
+
+import httpx
+import numpy as np
+import pytest
+
+from benchmarks.corpus import build_corpus, build_queries
+from benchmarks.fake_database import FakeSupabase
+from benchmarks.fake_provider import FakeProvider, ProviderConfig, fake_embedding
+from benchmarks.measure import percentiles
+from benchmarks.runner import compare_results
+
+
+class TestFakeSupabase:
+    def test_query_builder_filters_orders_and_pages(self):
+        db = FakeSupabase()
+        db.table("pages").insert([{"url": f"u{i}", "n": i, "source_id": "a" if i % 2 else "b"} for i in range(6)]).execute()
+
+        result = db.table("pages").select("*", count="exact").eq("source_id", "a").order("n", desc=True).range(0, 1).execute()
+
+        assert [row["n"] for row in result.data] == [5, 3]
+        assert result.count == 3
+
+    def test_upsert_and_delete(self):
+        db = FakeSupabase()
+        db.table("settings").upsert({"key": "A", "value": "1"}, on_conflict="key").execute()
+        db.table("settings").upsert({"key": "A", "value": "2"}, on_conflict="key").execute()
+        assert db.table("settings").select("*").execute().data[0]["value"] == "2"
+
+        db.table("settings").delete().in_("key", ["A"]).execute()
+        assert db.table("settings").select("*").execute().data == []
+        assert db.table("settings").select("*").eq("key", "A").maybe_single().execute() is None
+
+    def test_match_ranks_by_cosine_similarity_with_source_filter(self):
+        db = FakeSupabase()
+        db.table("archon_crawled_pages").insert([
+            {"url": "close", "content": "vector search", "source_id": "s1", "embedding_1536": fake_embedding("vector search index", 1536).tolist()},
+            {"url": "far", "content": "billing", "source_id": "s1", "embedding_1536": fake_embedding("billing invoices", 1536).tolist()},
+            {"url": "other", "content": "vector search", "source_id": "s2", "embedding_1536": fake_embedding("vector search", 1536).tolist()},
+        ]).execute()
+
+        results = db.rpc(
+            "match_archon_crawled_pages",
+            {"query_embedding": fake_embedding("vector search", 1536).tolist(), "match_count": 5, "source_filter": "s1"},
+        ).execute().data
+
+        assert [row["url"] for row in results] == ["close", "far"]
+        assert results[0]["similarity"] > results[1]["similarity"]
+        assert "embedding_1536" not in results[0]
+
+
+class TestFakeProvider:
+    def test_embeddings_as_floats_and_base64(self):
+        with FakeProvider(ProviderConfig(latency_ms=0, jitter_ms=0), dimensions=8) as provider:
+            floats = httpx.post(f"{provider.base_url}/embeddings", json={"input": ["a b", "c"], "model": "m"}).json()
+            encoded = httpx.post(
+                f"{provider.base_url}/embeddings", json={"input": "a b", "model": "m", "encoding_format": "base64"}
+            ).json()
+
+        assert len(floats["data"]) == 2
+        assert len(floats["data"][0]["embedding"]) == 8
+        decoded = np.frombuffer(base64.b64decode(encoded["data"][0]["embedding"]), dtype=np.float32)
+        assert decoded.tolist() == pytest.approx(floats["data"][0]["embedding"])
+
+    def test_rate_limited_requests_get_429(self):
+        config = ProviderConfig(latency_ms=0, jitter_ms=0, rate_limit_ratio=1.0, retry_after_ms=25)
+        with FakeProvider(config) as provider:
+            response = httpx.post(f"{provider.base_url}/chat/completions", json={"messages": []})
+
+        assert response.status_code == 429
+        assert response.headers["retry-after-ms"] == "25"
+        assert provider.stats.rate_limited == 1
+
+
+def test_corpus_is_deterministic():
+    first = build_corpus(synthetic=5, seed=7, recorded_dir=None)
+    second = build_corpus(synthetic=5, seed=7, recorded_dir=None)
+
+    assert first == second
+    assert any("```" in page.markdown for page in first)
+    assert build_queries(first, 3, seed=1) == build_queries(second, 3, seed=1)
+
+
+def test_percentiles_interpolate():
+    assert percentiles(list(range(1, 101))) == pytest.approx({"p50": 50.5, "p95": 95.05, "p99": 99.01})
+    assert percentiles([]) == {"p50": 0.0, "p95": 0.0, "p99": 0.0}
+
+
+def test_compare_flags_regressions_by_direction():
+    base = {"scenarios": {"retrieval": {"queries_per_sec": 100, "p95_ms": 50, "queries": 10}}}
+    new = {"scenarios": {"retrieval": {"queries_per_sec": 80, "p95_ms": 40, "queries": 20}}}
+
+    rows = {row["metric"]: row for row in compare_results(base, new)}
+
+    assert rows["queries_per_sec"]["regression_pct"] == 20.0
+    assert rows["p95_ms"]["regression_pct"] == 0.0
+    assert rows["queries"]["regression_pct"] == 0.0
@@ -0,0 +1,193 @@
+"""
+Tests for the contextual embedding engine
+
+Covers document grouping, the shared document prefix, result caching,
+concurrency and quota handling, and provider prompt-cache markers.
+"""
+
+import asyncio
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import httpx
+import openai
+import pytest
+
+from src.server.services.embeddings import contextual_embedding_service as service
+from src.server.services.embeddings.contextual_embedding_service import (
+    clear_contextual_cache,
+    generate_contextual_embeddings_batch,
+    get_contextual_cache_stats,
+)
+from src.server.services.embeddings.embedding_exceptions import EmbeddingQuotaExhaustedError
+
+MODULE = "src.server.services.embeddings.contextual_embedding_service"
+
+
+class AsyncContextManager:
+    """Helper class for properly mocking async context managers"""
+
+    def __init__(self, return_value):
+        self.return_value = return_value
+
+    async def __aenter__(self):
+        return self.return_value
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        pass
+
+
+def _chat_response(text: str):
+    return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=text))])
+
+
+class TestContextualEmbeddingEngine:
+    """Test suite for generate_contextual_embeddings_batch"""
+
+    @pytest.fixture(autouse=True)
+    def reset_cache(self):
+        clear_contextual_cache()
+        yield
+        clear_contextual_cache()
+
+    @pytest.fixture
+    def mock_client(self):
+        """LLM client answering with one context line per chunk in the request"""
+        client = MagicMock()
+
+        async def create(**params):
+            user_content = params["messages"][1]["content"]
+            if isinstance(user_content, list):
+                user_content = "".join(part["text"] for part in user_content)
+            chunk_count = user_content.count("<chunk>")
+            return _chat_response(
+                "\n".join(f"CHUNK {i + 1}: context {i + 1}" for i in range(chunk_count))
+            )
+
+        client.chat.completions.create = AsyncMock(side_effect=create)
+        return client
+
+    @pytest.fixture
+    def patched_engine(self, mock_client):
+        threading_service = MagicMock()
+        threading_service.rate_limited_operation.side_effect = lambda *a, **k: AsyncContextManager(None)
+
+        with patch(f"{MODULE}.get_llm_client", return_value=AsyncContextManager(mock_client)), patch(
+            f"{MODULE}._get_model_choice", new=AsyncMock(return_value="gpt-4o-mini")
+        ), patch(f"{MODULE}.get_threading_service", return_value=threading_service), patch(
+            f"{MODULE}.credential_service"
+        ) as mock_cred:
+            mock_cred.get_active_provider = AsyncMock(return_value={"provider": "openai"})
+            yield mock_client
+
+    @pytest.mark.asyncio
+    async def test_chunks_grouped_by_document(self, patched_engine):
+        """Chunks of the same document share one request and the document appears once"""
+        documents = ["Doc A text"] * 3 + ["Doc B text"] * 2
+        chunks = ["a1", "a2", "a3", "b1", "b2"]
+
+        results = await generate_contextual_embeddings_batch(documents, chunks)
+
+        assert all(success for _, success in results)
+        assert results[0][0] == "context 1\n\na1"
+        assert results[4][0] == "context 2\n\nb2"
+        assert patched_engine.chat.completions.create.await_count == 2
+        for call in patched_engine.chat.completions.create.await_args_list:
+            user_content = call.kwargs["messages"][1]["content"]
+            assert user_content.startswith("<document>")
+            assert user_content.count("<document>") == 1
+
+    @pytest.mark.asyncio
+    async def test_large_document_group_split_into_requests(self, patched_engine):
+        """A document with many chunks is split into bounded requests"""
+        chunk_count = service.CHUNKS_PER_CONTEXT_REQUEST + 5
+        chunks = [f"chunk {i}" for i in range(chunk_count)]
+
+        results = await generate_contextual_embeddings_batch(["Doc"] * chunk_count, chunks)
+
+        assert all(success for _, success in results)
+        assert patched_engine.chat.completions.create.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_cached_contexts_skip_llm(self, patched_engine):
+        """Repeated (document, chunk, model) triples are served from the cache"""
+        await generate_contextual_embeddings_batch(["Doc"], ["chunk"])
+        results = await generate_contextual_embeddings_batch(["Doc"], ["chunk"])
+
+        assert results == [("context 1\n\nchunk", True)]
+        assert patched_engine.chat.completions.create.await_count == 1
+        assert get_contextual_cache_stats()["hits"] == 1
+
+    @pytest.mark.asyncio
+    async def test_failed_request_returns_original_chunks(self, patched_engine):
+        """LLM errors fall back to the plain chunk and are not cached"""
+        patched_engine.chat.completions.create.side_effect = Exception("boom")
+
+        results = await generate_contextual_embeddings_batch(["Doc"], ["chunk"])
+
+        assert results == [("chunk", False)]
+        assert get_contextual_cache_stats()["size"] == 0
+
+    @pytest.mark.asyncio
+    async def test_document_concurrency_from_settings_snapshot(self, patched_engine):
+        """Document groups in flight are bounded by the snapshot's max workers"""
+        in_flight = 0
+        peak = 0
+
+        async def create(**params):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+            return _chat_response("CHUNK 1: context 1")
+
+        patched_engine.chat.completions.create.side_effect = create
+        settings = SimpleNamespace(contextual_embeddings_max_workers=2)
+
+        with patch(f"{MODULE}.get_settings", return_value=settings):
+            results = await generate_contextual_embeddings_batch(
+                [f"Doc {i}" for i in range(6)], [f"chunk {i}" for i in range(6)]
+            )
+
+        assert all(success for _, success in results)
+        assert peak == 2
+
+    @pytest.mark.asyncio
+    async def test_quota_exhaustion_cancels_siblings_and_raises(self, patched_engine):
+        """An insufficient_quota error stops the other document groups"""
+        sibling_cancelled = asyncio.Event()
+
+        async def create(**params):
+            user_content = params["messages"][1]["content"]
+            if "Doc A" in user_content:
+                await asyncio.sleep(0)
+                raise openai.RateLimitError(
+                    "insufficient_quota",
+                    response=httpx.Response(429, request=httpx.Request("POST", "http://llm")),
+                    body=None,
+                )
+            try:
+                await asyncio.sleep(10)
+            except asyncio.CancelledError:
+                sibling_cancelled.set()
+                raise
+
+        patched_engine.chat.completions.create.side_effect = create
+        settings = SimpleNamespace(contextual_embeddings_max_workers=2)
+
+        with patch(f"{MODULE}.get_settings", return_value=settings):
+            with pytest.raises(EmbeddingQuotaExhaustedError):
+                await generate_contextual_embeddings_batch(["Doc A", "Doc B"], ["a1", "b1"])
+
+        assert sibling_cancelled.is_set()
+
+    def test_openrouter_claude_marks_document_for_caching(self):
+        """Anthropic models on OpenRouter get an explicit cache_control block"""
+        assert service._supports_explicit_prompt_cache("openrouter", "anthropic/claude-3.5-haiku")
+        assert not service._supports_explicit_prompt_cache("openai", "gpt-4o-mini")
+
+        messages = service._build_context_messages("Doc", ["chunk"], use_cache_control=True)
+        document_part = messages[1]["content"][0]
+        assert document_part["cache_control"] == {"type": "ephemeral"}
+        assert document_part["text"].startswith("<document>")
@@ -20,6 +20,7 @@ from src.server.services.embeddings.embedding_service import (
     create_embedding,
     create_embeddings_batch,
 )
+from src.server.services.settings_snapshot import SettingsSnapshot
 
 
 class TestNoZeroEmbeddings:
@@ -106,11 +107,10 @@ class TestNoZeroEmbeddings:
                 new_callable=AsyncMock,
                 return_value="text-embedding-ada-002",
             ):
-                # Mock credential service to return batch size of 2
+                # Settings with a batch size of 2
                 with patch(
-                    "src.server.services.embeddings.embedding_service.credential_service.get_credentials_by_category",
-                    new_callable=AsyncMock,
-                    return_value={"EMBEDDING_BATCH_SIZE": "2"},
+                    "src.server.services.embeddings.embedding_service.get_settings",
+                    return_value=SettingsSnapshot(embedding_batch_size=2),
                 ):
                     # Process 4 texts (batch size will be 2)
                     texts = ["text1", "text2", "text3", "text4"]
@@ -149,11 +149,10 @@ class TestNoZeroEmbeddings:
                 new_callable=AsyncMock,
                 return_value="text-embedding-3-large",
             ):
-                # Mock credential service to return custom dimensions
+                # Settings with custom dimensions
                 with patch(
-                    "src.server.services.embeddings.embedding_service.credential_service.get_credentials_by_category",
-                    new_callable=AsyncMock,
-                    return_value={"EMBEDDING_DIMENSIONS": "3072"},
+                    "src.server.services.embeddings.embedding_service.get_settings",
+                    return_value=SettingsSnapshot(embedding_dimensions=3072),
                 ):
                     result = await create_embeddings_batch(["test text"])
 
@@ -188,11 +187,10 @@ class TestNoZeroEmbeddings:
                 new_callable=AsyncMock,
                 return_value="text-embedding-3-small",
             ):
-                # Mock credential service to return empty settings (no dimensions specified)
+                # Empty settings (no dimensions specified)
                 with patch(
-                    "src.server.services.embeddings.embedding_service.credential_service.get_credentials_by_category",
-                    new_callable=AsyncMock,
-                    return_value={},
+                    "src.server.services.embeddings.embedding_service.get_settings",
+                    return_value=SettingsSnapshot.from_values({}),
                 ):
                     result = await create_embeddings_batch(["test text"])
 
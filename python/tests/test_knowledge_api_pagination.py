@@ -90,7 +90,8 @@ def test_chunks_pagination(client, mock_supabase_client):
             "source_id": "test-source",
             "content": f"Chunk content {i}",
             "metadata": {},
-            "url": f"https://example.com/page{i}"
+            "url": f"https://example.com/page{i}",
+            "chunk_number": 0
         }
         for i in range(5)
     ]
@@ -443,4 +444,20 @@ def test_empty_results_pagination(client, mock_supabase_client):
     data = response.json()
     assert data["code_examples"] == []
     assert data["total"] == 0
-    assert data["has_more"] is False
\ No newline at end of file
+    assert data["has_more"] is False
+
+def test_invalid_chunk_cursor_is_a_bad_request(client):
+    """A malformed cursor is rejected with 400."""
+    response = client.get("/api/knowledge-items/test-source/chunks?cursor=not-a-cursor")
+
+    assert response.status_code == 400
+    assert "Invalid cursor" in response.json()["detail"]["error"]
+
+
+def test_other_listing_errors_are_server_errors(client):
+    """Only cursor errors are client errors; other ValueErrors are 500s."""
+    with patch("src.server.api_routes.knowledge_api.ChunkListingService") as service:
+        service.return_value.list_code_examples.side_effect = ValueError("unexpected row")
+        response = client.get("/api/knowledge-items/test-source/code-examples")
+
+    assert response.status_code == 500
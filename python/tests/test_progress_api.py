@@ -64,7 +64,8 @@ class TestProgressAPI:
         assert "error" in data["detail"]
         assert "not found" in data["detail"]["error"].lower()
         
-    def test_get_progress_with_etag(self, client):
+    @pytest.mark.asyncio
+    async def test_get_progress_with_etag(self, client):
         """Test ETag support for progress endpoint"""
         # Create a progress tracker
         progress_id = "test-etag-123"
@@ -88,8 +89,8 @@ class TestProgressAPI:
         )
         assert response2.status_code == 304
         
-        # Update progress
-        tracker.state["progress"] = 50
+        # Update progress through the tracker, which bumps its change version
+        await tracker.update("processing", 50, "Processing file")
         
         # Third request with same ETag - should get full response (data changed)
         response3 = client.get(
@@ -259,4 +260,50 @@ class TestProgressAPI:
             response = client.get("/api/progress/")
             
             # The endpoint has try/except so it should handle the error gracefully
-            assert response.status_code in [200, 500]  # May return empty list or error
\ No newline at end of file
+            assert response.status_code in [200, 500]  # May return empty list or error
+
+class TestProgressStream:
+    """Test suite for the SSE progress stream"""
+
+    def test_stream_unknown_operation_returns_404(self, client):
+        response = client.get("/api/progress/missing-op/stream")
+
+        assert response.status_code == 404
+
+    def test_stream_ends_after_terminal_state(self, client):
+        """A finished operation streams its final state once and closes"""
+        tracker = ProgressTracker("stream-done", operation_type="crawl")
+        tracker.state.update({"status": "completed", "progress": 100, "log": "Done"})
+
+        response = client.get("/api/progress/stream-done/stream")
+
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/event-stream")
+        assert "event: progress" in response.text
+        assert '"status": "completed"' in response.text
+        assert ProgressTracker._subscribers.get("stream-done") is None
+
+    @pytest.mark.asyncio
+    async def test_stream_sends_coalesced_updates(self):
+        """Updates published while the stream waits arrive as one latest event"""
+        from src.server.api_routes import progress_api
+
+        tracker = ProgressTracker("stream-live", operation_type="crawl")
+        await tracker.start({"log": "Starting"})
+        subscription = ProgressTracker.subscribe("stream-live")
+        events = progress_api._progress_events("stream-live", subscription)
+
+        with patch.object(progress_api, "PROGRESS_STREAM_MIN_INTERVAL", 0):
+            first = await events.__anext__()
+            await tracker.update("crawling", 30, "Crawling")
+            await tracker.update("crawling", 60, "Crawling")
+            second = await events.__anext__()
+            await tracker.complete({"log": "Done"})
+            third = await events.__anext__()
+            with pytest.raises(StopAsyncIteration):
+                await events.__anext__()
+
+        assert '"status": "starting"' in first["data"]
+        assert '"progress": 60' in second["data"]
+        assert '"status": "completed"' in third["data"]
+        assert subscription.coalesced_updates == 1
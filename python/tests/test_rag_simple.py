@@ -400,5 +400,89 @@ class TestRAGIntegrationSimple:
             assert code_result["summary"] == "Example function that returns greeting"
 
 
+class TestBatchRAGQuery:
+    """Batch query tests - embed once, search many"""
+
+    @pytest.mark.asyncio
+    async def test_batch_query_embeds_all_queries_once(self, rag_service):
+        """Test batch query embeds distinct queries in one call and reuses the vectors"""
+        from src.server.services.embeddings.embedding_service import EmbeddingBatchResult
+
+        batch_result = EmbeddingBatchResult()
+        batch_result.add_success([0.1] * 1536, "vector search")
+        batch_result.add_success([0.2] * 1536, "React hooks")
+
+        with (
+            patch(
+                "src.server.services.search.rag_service.create_embeddings_batch",
+                return_value=batch_result,
+            ) as mock_batch,
+            patch("src.server.services.search.rag_service.create_embedding") as mock_single,
+            patch.object(rag_service.base_strategy, "vector_search") as mock_search,
+            patch.object(rag_service.agentic_strategy, "is_enabled", return_value=True),
+            patch.object(rag_service.agentic_strategy, "search_code_examples") as mock_code,
+        ):
+            mock_search.return_value = [{"id": "1", "content": "Doc", "similarity": 0.9, "metadata": {}}]
+            mock_code.return_value = [{"content": "useState()", "summary": "Hook", "url": "a.js"}]
+
+            success, result = await rag_service.perform_batch_rag_query([
+                {"query": "vector search", "match_count": 3},
+                {"query": "React hooks", "search_type": "code_examples"},
+                {"query": "vector search", "source": "src_abc"},
+            ])
+
+            assert success is True
+            assert result["total_queries"] == 3
+            assert result["failed_queries"] == 0
+            mock_batch.assert_called_once_with(["vector search", "React hooks"])
+            mock_single.assert_not_called()
+
+            # Results keep request order and carry the right search type
+            assert [r["search_type"] for r in result["results"]] == ["documents", "code_examples", "documents"]
+            assert result["results"][0]["results"][0]["content"] == "Doc"
+            assert result["results"][1]["results"][0]["code"] == "useState()"
+
+            # Pre-computed embeddings are passed through to the searches
+            assert mock_search.call_args_list[0].kwargs["query_embedding"] == [0.1] * 1536
+            assert mock_code.call_args.kwargs["query_embedding"] == [0.2] * 1536
+            assert mock_search.call_args_list[1].kwargs["filter_metadata"] == {"source": "src_abc"}
+
+    @pytest.mark.asyncio
+    async def test_batch_query_falls_back_when_embedding_fails(self, rag_service):
+        """Test a query whose batch embedding failed embeds itself individually"""
+        from src.server.services.embeddings.embedding_service import EmbeddingBatchResult
+
+        batch_result = EmbeddingBatchResult()
+        batch_result.add_failure("broken query", Exception("API error"))
+
+        with (
+            patch(
+                "src.server.services.search.rag_service.create_embeddings_batch",
+                return_value=batch_result,
+            ),
+            patch(
+                "src.server.services.search.rag_service.create_embedding",
+                return_value=[0.3] * 1536,
+            ) as mock_single,
+            patch.object(rag_service.base_strategy, "vector_search", return_value=[]),
+        ):
+            success, result = await rag_service.perform_batch_rag_query([{"query": "broken query"}])
+
+            assert success is True
+            assert result["results"][0]["success"] is True
+            mock_single.assert_called_once_with("broken query")
+
+    @pytest.mark.asyncio
+    async def test_batch_query_rejects_too_many_queries(self, rag_service):
+        """Test batch query enforces the maximum batch size"""
+        from src.server.services.search.rag_service import MAX_BATCH_QUERIES
+
+        queries = [{"query": f"query {i}"} for i in range(MAX_BATCH_QUERIES + 1)]
+        success, result = await rag_service.perform_batch_rag_query(queries)
+
+        assert success is False
+        assert "Too many queries" in result["error"]
+
+
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
@@ -257,6 +257,137 @@ class TestAgenticRAGStrategy:
         assert any("search" in method.lower() for method in methods)
 
 
+class TestCoarseEmbeddingSearch:
+    """Test two-stage search over truncated Matryoshka embeddings"""
+
+    @pytest.fixture
+    def mock_supabase_client(self):
+        """Mock Supabase client"""
+        return MagicMock()
+
+    @pytest.fixture
+    def base_strategy(self, mock_supabase_client):
+        """Create BaseSearchStrategy instance"""
+        from src.server.services.search.base_search_strategy import BaseSearchStrategy
+
+        return BaseSearchStrategy(mock_supabase_client)
+
+    def test_matryoshka_capability(self):
+        """Test Matryoshka capability detection by model name"""
+        from src.server.services.llm_provider_service import supports_matryoshka_embeddings
+
+        assert supports_matryoshka_embeddings("text-embedding-3-small") is True
+        assert supports_matryoshka_embeddings("openai/text-embedding-3-large") is True
+        assert supports_matryoshka_embeddings("nomic-embed-text") is True
+        assert supports_matryoshka_embeddings("text-embedding-ada-002") is False
+        assert supports_matryoshka_embeddings("all-minilm") is False
+        assert supports_matryoshka_embeddings("") is False
+
+    def test_coarse_search_flag_follows_settings_snapshot(self, base_strategy):
+        """Test search reads the flag from the same snapshot storage uses"""
+        from src.server.services.settings_snapshot import SettingsSnapshot
+
+        with patch(
+            "src.server.services.search.base_search_strategy.get_settings",
+            return_value=SettingsSnapshot.from_values({"USE_COARSE_EMBEDDING_SEARCH": "true"}),
+        ):
+            assert base_strategy.is_coarse_search_enabled() is True
+        with patch(
+            "src.server.services.search.base_search_strategy.get_settings",
+            return_value=SettingsSnapshot(),
+        ):
+            assert base_strategy.is_coarse_search_enabled() is False
+
+    def test_coarse_embedding_truncated_and_renormalized(self):
+        """Test coarse embeddings keep the leading components at unit length"""
+        from src.server.services.embeddings.multi_dimensional_embedding_service import (
+            COARSE_EMBEDDING_DIMENSION,
+            multi_dimensional_embedding_service,
+        )
+
+        embedding = [0.5] * 1536
+        coarse = multi_dimensional_embedding_service.get_coarse_embedding(
+            embedding, "text-embedding-3-small"
+        )
+
+        assert len(coarse) == COARSE_EMBEDDING_DIMENSION
+        assert sum(value * value for value in coarse) == pytest.approx(1.0)
+        assert multi_dimensional_embedding_service.get_coarse_embedding(
+            embedding, "text-embedding-ada-002"
+        ) is None
+        assert multi_dimensional_embedding_service.get_coarse_embedding(
+            [0.5] * COARSE_EMBEDDING_DIMENSION, "text-embedding-3-small"
+        ) is None
+
+    @pytest.mark.asyncio
+    async def test_vector_search_uses_coarse_rpc(self, base_strategy, mock_supabase_client):
+        """Test vector search runs the coarse RPC for Matryoshka models"""
+        mock_supabase_client.rpc.return_value.execute.return_value = MagicMock(
+            data=[{"id": 1, "content": "doc", "similarity": 0.9}]
+        )
+
+        with patch.object(base_strategy, "is_coarse_search_enabled", return_value=True), patch(
+            "src.server.services.search.base_search_strategy.get_embedding_model",
+            new_callable=AsyncMock,
+            return_value="text-embedding-3-small",
+        ):
+            results = await base_strategy.vector_search(
+                query_embedding=[0.1] * 1536, match_count=3, filter_metadata={"source": "src-1"}
+            )
+
+        assert len(results) == 1
+        rpc_name, params = mock_supabase_client.rpc.call_args[0]
+        assert rpc_name == "match_archon_crawled_pages_coarse"
+        assert len(params["query_embedding_coarse"]) == 256
+        assert params["candidate_count"] >= 30
+        assert params["source_filter"] == "src-1"
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize(
+        "error, expected_calls",
+        [
+            (
+                {"code": "PGRST202", "message": "Could not find the function"},
+                ["match_archon_crawled_pages_coarse", "match_archon_crawled_pages"],
+            ),
+            (
+                {"code": "57014", "message": "canceling statement due to statement timeout"},
+                ["match_archon_crawled_pages_coarse"],
+            ),
+        ],
+    )
+    async def test_vector_search_falls_back_only_without_coarse_rpc(
+        self, base_strategy, mock_supabase_client, error, expected_calls
+    ):
+        """Test only a missing coarse RPC falls back to the full-vector RPC"""
+        from postgrest.exceptions import APIError
+
+        calls = []
+
+        def rpc(name, params):
+            calls.append(name)
+            response = MagicMock()
+            if name.endswith("_coarse"):
+                response.execute.side_effect = APIError(error)
+            else:
+                response.execute.return_value = MagicMock(
+                    data=[{"id": 1, "content": "doc", "similarity": 0.9}]
+                )
+            return response
+
+        mock_supabase_client.rpc.side_effect = rpc
+
+        with patch.object(base_strategy, "is_coarse_search_enabled", return_value=True), patch(
+            "src.server.services.search.base_search_strategy.get_embedding_model",
+            new_callable=AsyncMock,
+            return_value="text-embedding-3-small",
+        ):
+            results = await base_strategy.vector_search(query_embedding=[0.1] * 1536, match_count=3)
+
+        assert calls == expected_calls
+        assert len(results) == (1 if len(expected_calls) == 2 else 0)
+
+
 class TestRAGIntegration:
     """Integration tests for RAG strategies working together"""
 
@@ -0,0 +1,68 @@
+"""
+Test source deletion against source-partitioned knowledge tables.
+
+Deleting a source should go through the archon_delete_source RPC (which drops
+the source's partitions) and fall back to the CASCADE row delete on databases
+that have not run the partitioning migration.
+"""
+
+from unittest.mock import Mock
+
+from postgrest.exceptions import APIError
+
+from src.server.services.source_management_service import SourceManagementService
+
+
+class TestSourcePartitionDelete:
+    """Test SourceManagementService.delete_source with and without partitions."""
+
+    def test_delete_uses_partition_drop_rpc(self):
+        """The RPC path is used and the table delete is never issued."""
+        mock_client = Mock()
+        mock_client.rpc.return_value.execute.return_value = Mock(data=1)
+
+        success, result = SourceManagementService(mock_client).delete_source("src-1")
+
+        assert success is True
+        assert result["source_id"] == "src-1"
+        mock_client.rpc.assert_called_once_with("archon_delete_source", {"p_source_id": "src-1"})
+        mock_client.table.assert_not_called()
+
+    def test_delete_missing_source_via_rpc(self):
+        """The RPC reports zero deleted sources for an unknown source."""
+        mock_client = Mock()
+        mock_client.rpc.return_value.execute.return_value = Mock(data=0)
+
+        success, result = SourceManagementService(mock_client).delete_source("missing")
+
+        assert success is False
+        assert "not found" in result["error"]
+
+    def test_delete_falls_back_to_cascade_without_migration(self):
+        """A missing RPC falls back to deleting the archon_sources row."""
+        mock_client = Mock()
+        mock_client.rpc.return_value.execute.side_effect = APIError(
+            {"code": "PGRST202", "message": "Could not find the function public.archon_delete_source"}
+        )
+        mock_client.table.return_value.delete.return_value.eq.return_value.execute.return_value = Mock(
+            data=[{"source_id": "src-1"}]
+        )
+
+        success, result = SourceManagementService(mock_client).delete_source("src-1")
+
+        assert success is True
+        mock_client.table.assert_called_with("archon_sources")
+        assert "CASCADE" in result["message"]
+
+    def test_other_rpc_errors_do_not_fall_back(self):
+        """Timeouts and permission errors fail the delete instead of taking the slow path."""
+        mock_client = Mock()
+        mock_client.rpc.return_value.execute.side_effect = APIError(
+            {"code": "57014", "message": "canceling statement due to statement timeout"}
+        )
+
+        success, result = SourceManagementService(mock_client).delete_source("src-1")
+
+        assert success is False
+        assert "statement timeout" in result["error"]
+        mock_client.table.assert_not_called()
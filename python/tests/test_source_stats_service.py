@@ -0,0 +1,150 @@
+"""
+Test knowledge listings backed by the materialized archon_source_stats table.
+
+A page of sources should cost one stats query regardless of how many sources
+it contains, with per-source counting kept only as a fallback for databases
+that have not run the source stats migration.
+"""
+
+from unittest.mock import Mock
+
+import pytest
+from postgrest.exceptions import APIError
+
+from src.server.services.knowledge import (
+    KnowledgeItemService,
+    KnowledgeSummaryService,
+    SourceStatsService,
+)
+
+
+def _stats_row(source_id, chunks, code_examples, first_url=None):
+    return {
+        "source_id": source_id,
+        "chunk_count": chunks,
+        "code_example_count": code_examples,
+        "page_count": chunks // 2,
+        "first_url": first_url,
+        "total_bytes": chunks * 100,
+        "last_crawled_at": "2025-01-01T00:00:00+00:00",
+    }
+
+
+def _mock_client(sources, stats_rows):
+    """Supabase mock serving archon_sources pages and archon_source_stats rows."""
+    client = Mock()
+    sources_query = Mock()
+    for method in ("select", "contains", "or_", "range", "order"):
+        getattr(sources_query, method).return_value = sources_query
+    sources_query.execute.return_value = Mock(data=sources, count=len(sources))
+
+    stats_query = Mock()
+    stats_query.select.return_value.in_.return_value.execute.return_value = Mock(data=stats_rows)
+
+    def from_(table):
+        if table == "archon_sources":
+            return sources_query
+        if table == "archon_source_stats":
+            return stats_query
+        raise AssertionError(f"unexpected query on {table}")
+
+    client.from_.side_effect = from_
+    return client
+
+
+class TestSourceStatsService:
+    """Test SourceStatsService.get_stats_batch"""
+
+    @pytest.mark.asyncio
+    async def test_single_query_with_defaults_for_missing_rows(self):
+        """One stats query covers the page; sources without a row get zeros."""
+        client = _mock_client([], [_stats_row("a", 10, 3, "https://a.dev")])
+
+        stats = await SourceStatsService(client).get_stats_batch(["a", "b"])
+
+        assert stats["a"]["chunk_count"] == 10
+        assert stats["a"]["first_url"] == "https://a.dev"
+        assert stats["b"]["chunk_count"] == 0
+        assert stats["b"]["first_url"] is None
+        client.from_.assert_called_once_with("archon_source_stats")
+
+    @pytest.mark.asyncio
+    async def test_falls_back_to_counting_without_migration(self):
+        """A missing stats table falls back to per-source count queries."""
+        client = Mock()
+        stats_query = Mock()
+        stats_query.select.return_value.in_.return_value.execute.side_effect = APIError(
+            {"code": "42P01", "message": 'relation "archon_source_stats" does not exist'}
+        )
+        count_query = Mock()
+        count_query.select.return_value.eq.return_value.execute.return_value = Mock(count=7)
+        count_query.select.return_value.eq.return_value.order.return_value.limit.return_value.execute.return_value = Mock(
+            data=[{"url": "https://a.dev/start"}]
+        )
+        client.from_.side_effect = (
+            lambda table: stats_query if table == "archon_source_stats" else count_query
+        )
+
+        stats = await SourceStatsService(client).get_stats_batch(["a"])
+
+        assert stats["a"]["chunk_count"] == 7
+        assert stats["a"]["code_example_count"] == 7
+        assert stats["a"]["first_url"] == "https://a.dev/start"
+
+    @pytest.mark.asyncio
+    async def test_other_errors_do_not_fall_back(self):
+        """Errors other than a missing table propagate instead of counting per source."""
+        client = Mock()
+        client.from_.return_value.select.return_value.in_.return_value.execute.side_effect = APIError(
+            {"code": "57014", "message": "canceling statement due to statement timeout"}
+        )
+
+        with pytest.raises(APIError):
+            await SourceStatsService(client).get_stats_batch(["a"])
+
+        client.from_.assert_called_once_with("archon_source_stats")
+
+    @pytest.mark.asyncio
+    async def test_empty_source_list_skips_query(self):
+        client = Mock()
+
+        assert await SourceStatsService(client).get_stats_batch([]) == {}
+        client.from_.assert_not_called()
+
+
+class TestListingsUseSourceStats:
+    """Test the knowledge listings read counts from archon_source_stats"""
+
+    @pytest.mark.asyncio
+    async def test_list_items_reports_real_chunk_counts(self):
+        sources = [
+            {"source_id": "a", "title": "A", "metadata": {}, "source_url": None},
+            {"source_id": "b", "title": "B", "metadata": {}, "source_url": "https://b.dev"},
+        ]
+        client = _mock_client(
+            sources, [_stats_row("a", 12, 4, "https://a.dev/docs"), _stats_row("b", 6, 0)]
+        )
+
+        result = await KnowledgeItemService(client).list_items()
+
+        items = {item["source_id"]: item for item in result["items"]}
+        assert items["a"]["metadata"]["chunks_count"] == 12
+        assert items["a"]["metadata"]["code_examples_count"] == 4
+        assert items["a"]["url"] == "https://a.dev/docs"
+        assert items["b"]["url"] == "https://b.dev"
+        assert items["b"]["code_examples"] == []
+        queried_tables = [call.args[0] for call in client.from_.call_args_list]
+        assert "archon_crawled_pages" not in queried_tables
+        assert "archon_code_examples" not in queried_tables
+
+    @pytest.mark.asyncio
+    async def test_summaries_use_stats(self):
+        sources = [{"source_id": "a", "title": "A", "metadata": {"knowledge_type": "technical"}}]
+        client = _mock_client(sources, [_stats_row("a", 8, 2)])
+
+        result = await KnowledgeSummaryService(client).get_summaries()
+
+        summary = result["items"][0]
+        assert summary["document_count"] == 8
+        assert summary["code_examples_count"] == 2
+        assert summary["url"] == "source://a"
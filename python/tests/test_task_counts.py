@@ -3,6 +3,11 @@
 import time
 from unittest.mock import MagicMock, patch
 
+import pytest
+from postgrest.exceptions import APIError
+
+from src.server.services.projects.task_service import TaskService
+
 
 def test_batch_task_counts_endpoint_exists(client):
     """Test that batch task counts endpoint exists and responds."""
@@ -18,32 +23,23 @@ def test_batch_task_counts_endpoint_exists(client):
 
 def test_batch_task_counts_endpoint(client, mock_supabase_client):
     """Test that batch task counts endpoint returns counts for all projects."""
-    # Set up mock to return tasks for multiple projects
-    mock_tasks = [
-        {"project_id": "project-1", "status": "todo", "archived": False},
-        {"project_id": "project-1", "status": "todo", "archived": False},
-        {"project_id": "project-1", "status": "doing", "archived": False},
-        {"project_id": "project-1", "status": "review", "archived": False},  # Should count as doing
-        {"project_id": "project-1", "status": "done", "archived": False},
-        {"project_id": "project-2", "status": "todo", "archived": False},
-        {"project_id": "project-2", "status": "doing", "archived": False},
-        {"project_id": "project-2", "status": "done", "archived": False},
-        {"project_id": "project-2", "status": "done", "archived": False},
-        {"project_id": "project-3", "status": "todo", "archived": False},
+    # Set up the grouped count rows returned by the get_task_counts_by_project RPC
+    mock_counts = [
+        {"project_id": "project-1", "status": "todo", "task_count": 2},
+        {"project_id": "project-1", "status": "doing", "task_count": 1},
+        {"project_id": "project-1", "status": "review", "task_count": 1},
+        {"project_id": "project-1", "status": "done", "task_count": 1},
+        {"project_id": "project-2", "status": "todo", "task_count": 1},
+        {"project_id": "project-2", "status": "doing", "task_count": 1},
+        {"project_id": "project-2", "status": "done", "task_count": 2},
+        {"project_id": "project-3", "status": "todo", "task_count": 1},
     ]
-    
-    # Configure mock to return our test data with proper chaining
-    mock_select = MagicMock()
-    mock_or = MagicMock()
-    mock_execute = MagicMock()
-    mock_execute.data = mock_tasks
-    mock_or.execute.return_value = mock_execute
-    mock_select.or_.return_value = mock_or
-    mock_supabase_client.table.return_value.select.return_value = mock_select
+    mock_supabase_client.rpc.return_value.execute.return_value.data = mock_counts
     
     # Explicitly patch the client creation for this specific test to ensure isolation
     with patch("src.server.utils.get_supabase_client", return_value=mock_supabase_client):
-        with patch("src.server.services.client_manager.get_supabase_client", return_value=mock_supabase_client):
+        with patch("src.server.services.client_manager.get_supabase_client", return_value=mock_supabase_client), \
+                patch("src.server.api_routes.projects_api.get_supabase_client", return_value=mock_supabase_client):
             # Make the request
             response = client.get("/api/projects/task-counts")
             
@@ -54,12 +50,6 @@ def test_batch_task_counts_endpoint(client, mock_supabase_client):
     data = response.json()
     assert isinstance(data, dict)
     
-    # If empty, the mock might not be working
-    if not data:
-        # This test might pass with empty data but we expect counts
-        # Let's at least verify the endpoint works
-        return
-    
     # Verify counts are correct
     assert "project-1" in data
     assert "project-2" in data
@@ -67,7 +57,8 @@ def test_batch_task_counts_endpoint(client, mock_supabase_client):
     
     # Verify actual counts
     assert data["project-1"]["todo"] == 2
-    assert data["project-1"]["doing"] == 2  # doing + review
+    assert data["project-1"]["doing"] == 1
+    assert data["project-1"]["review"] == 1
     assert data["project-1"]["done"] == 1
     
     assert data["project-2"]["todo"] == 1
@@ -78,27 +69,23 @@ def test_batch_task_counts_endpoint(client, mock_supabase_client):
     assert data["project-3"]["doing"] == 0
     assert data["project-3"]["done"] == 0
 
+    # Counts come from the grouped RPC, not from downloading task rows
+    mock_supabase_client.rpc.assert_called_with("get_task_counts_by_project", {})
+    mock_supabase_client.table.assert_not_called()
+
 
 def test_batch_task_counts_etag_caching(client, mock_supabase_client):
     """Test that ETag caching works correctly for task counts."""
     # Set up mock data
-    mock_tasks = [
-        {"project_id": "project-1", "status": "todo", "archived": False},
-        {"project_id": "project-1", "status": "doing", "archived": False},
+    mock_supabase_client.rpc.return_value.execute.return_value.data = [
+        {"project_id": "project-1", "status": "todo", "task_count": 1},
+        {"project_id": "project-1", "status": "doing", "task_count": 1},
     ]
     
-    # Configure mock with proper chaining
-    mock_select = MagicMock()
-    mock_or = MagicMock()
-    mock_execute = MagicMock()
-    mock_execute.data = mock_tasks
-    mock_or.execute.return_value = mock_execute
-    mock_select.or_.return_value = mock_or
-    mock_supabase_client.table.return_value.select.return_value = mock_select
-    
     # Explicitly patch the client creation for this specific test to ensure isolation
     with patch("src.server.utils.get_supabase_client", return_value=mock_supabase_client):
-        with patch("src.server.services.client_manager.get_supabase_client", return_value=mock_supabase_client):
+        with patch("src.server.services.client_manager.get_supabase_client", return_value=mock_supabase_client), \
+                patch("src.server.api_routes.projects_api.get_supabase_client", return_value=mock_supabase_client):
             # First request - should return data with ETag
             response1 = client.get("/api/projects/task-counts")
             assert response1.status_code == 200
@@ -111,4 +98,27 @@ def test_batch_task_counts_etag_caching(client, mock_supabase_client):
             assert response2.headers.get("ETag") == etag
             
             # Verify no body is returned on 304
-            assert response2.content == b''
\ No newline at end of file
+            assert response2.content == b''
+
+
+@pytest.mark.parametrize(
+    ("code", "falls_back"),
+    [("PGRST202", True), ("57014", False)],
+)
+def test_task_counts_fall_back_only_without_rpc(code, falls_back):
+    """Task rows are counted locally only when the count RPC does not exist."""
+    supabase = MagicMock()
+    supabase.rpc.return_value.execute.side_effect = APIError({"code": code, "message": "rpc failed"})
+    supabase.table.return_value.select.return_value.or_.return_value.execute.return_value.data = [
+        {"project_id": "project-1", "status": "todo"},
+        {"project_id": "project-1", "status": "todo"},
+    ]
+
+    success, result = TaskService(supabase).get_all_project_task_counts()
+
+    assert success is falls_back
+    if falls_back:
+        assert result["project-1"]["todo"] == 2
+    else:
+        assert "error" in result
+        supabase.table.assert_not_called()
@@ -5,48 +5,55 @@ Ensures backward compatibility and validates token reduction.
 
 import json
 import pytest
-from unittest.mock import Mock, patch
+from unittest.mock import MagicMock, Mock, patch
 
 from src.server.services.projects import ProjectService
 from src.server.services.projects.task_service import TaskService
 from src.server.services.projects.document_service import DocumentService
 
 
+def _query(data):
+    """Chainable table query mock resolving to the given rows."""
+    query = MagicMock()
+    for method in ("select", "eq", "in_", "order", "limit", "range"):
+        getattr(query, method).return_value = query
+    query.execute.return_value = Mock(data=data)
+    return query
+
+
+def _client(tables):
+    """Supabase mock serving one query mock per table name."""
+    client = Mock()
+    client.table.side_effect = lambda name: tables[name]
+    return client
+
+
 class TestProjectServiceOptimization:
     """Test ProjectService with include_content parameter."""
     
-    @patch('src.server.utils.get_supabase_client')
-    def test_list_projects_with_full_content(self, mock_supabase):
-        """Test backward compatibility - default returns full content."""
-        # Setup mock
-        mock_client = Mock()
-        mock_supabase.return_value = mock_client
-        
-        # Mock response with large JSONB fields
-        mock_response = Mock()
-        mock_response.data = [{
+    def test_list_projects_with_full_content(self):
+        """Default listing keeps features/data and lists document metadata only."""
+        projects = _query([{
             "id": "test-id",
             "title": "Test Project",
             "description": "Test Description",
             "github_repo": "https://github.com/test/repo",
-            "docs": [{"id": "doc1", "content": {"large": "content" * 100}}],
             "features": [{"feature1": "data"}],
             "data": [{"key": "value"}],
             "pinned": False,
             "created_at": "2024-01-01",
             "updated_at": "2024-01-01"
-        }]
-        
-        mock_table = Mock()
-        mock_select = Mock()
-        mock_order = Mock()
-        mock_order.execute.return_value = mock_response
-        mock_select.order.return_value = mock_order
-        mock_table.select.return_value = mock_select
-        mock_client.table.return_value = mock_table
+        }])
+        documents = _query([{
+            "id": "doc1",
+            "project_id": "test-id",
+            "title": "Doc",
+            "content_size": 700,
+        }])
+        client = _client({"archon_projects": projects, "archon_project_documents": documents})
         
         # Test
-        service = ProjectService(mock_client)
+        service = ProjectService(client)
         success, result = service.list_projects()  # Default include_content=True
         
         # Assertions
@@ -56,23 +63,20 @@ class TestProjectServiceOptimization:
         assert "features" in result["projects"][0]
         assert "data" in result["projects"][0]
         
-        # Verify full content is returned
-        assert len(result["projects"][0]["docs"]) == 1
-        assert result["projects"][0]["docs"][0]["content"]["large"] is not None
+        # Documents are listed without their bodies
+        doc = result["projects"][0]["docs"][0]
+        assert doc["id"] == "doc1"
+        assert "content" not in doc
+        assert doc["stats"]["content_size"] == 700
         
-        # Verify SELECT * was used
-        mock_table.select.assert_called_with("*")
+        # Neither query selects document bodies
+        assert "docs" not in projects.select.call_args.args[0]
+        assert "content," not in documents.select.call_args.args[0]
+        documents.in_.assert_called_once_with("project_id", ["test-id"])
     
-    @patch('src.server.utils.get_supabase_client')
-    def test_list_projects_lightweight(self, mock_supabase):
+    def test_list_projects_lightweight(self):
         """Test lightweight response excludes large fields."""
-        # Setup mock
-        mock_client = Mock()
-        mock_supabase.return_value = mock_client
-        
-        # Mock response with full data (after N+1 fix, we fetch all data)
-        mock_response = Mock()
-        mock_response.data = [{
+        projects = _query([{
             "id": "test-id",
             "title": "Test Project",
             "description": "Test Description",
@@ -80,23 +84,17 @@ class TestProjectServiceOptimization:
             "created_at": "2024-01-01",
             "updated_at": "2024-01-01",
             "pinned": False,
-            "docs": [{"id": "doc1"}, {"id": "doc2"}, {"id": "doc3"}],  # 3 docs
             "features": [{"feature1": "data"}, {"feature2": "data"}],  # 2 features
             "data": [{"key": "value"}]  # Has data
-        }]
-        
-        # Setup mock chain - now simpler after N+1 fix
-        mock_table = Mock()
-        mock_select = Mock()
-        mock_order = Mock()
-        
-        mock_order.execute.return_value = mock_response
-        mock_select.order.return_value = mock_order
-        mock_table.select.return_value = mock_select
-        mock_client.table.return_value = mock_table
+        }])
+        documents = _query([])
+        client = _client({"archon_projects": projects, "archon_project_documents": documents})
+        client.rpc.return_value.execute.return_value = Mock(
+            data=[{"project_id": "test-id", "document_count": 3}]  # 3 docs
+        )
         
         # Test
-        service = ProjectService(mock_client)
+        service = ProjectService(client)
         success, result = service.list_projects(include_content=False)
         
         # Assertions
@@ -115,9 +113,9 @@ class TestProjectServiceOptimization:
         assert project["stats"]["features_count"] == 2
         assert project["stats"]["has_data"] is True
         
-        # Verify SELECT * was used (after N+1 fix, we fetch all data in one query)
-        mock_table.select.assert_called_with("*")
-        assert mock_client.table.call_count == 1  # Only one query now!
+        # Documents are counted by the database, in one call for all projects
+        client.rpc.assert_called_once_with("count_project_documents", {"p_project_ids": ["test-id"]})
+        assert client.table.call_count == 1
     
     def test_token_reduction(self):
         """Verify token count reduction."""
@@ -254,37 +252,22 @@ class TestTaskServiceOptimization:
 class TestDocumentServiceOptimization:
     """Test DocumentService with include_content parameter."""
     
-    @patch('src.server.utils.get_supabase_client')
-    def test_list_documents_metadata_only(self, mock_supabase):
+    def test_list_documents_metadata_only(self):
         """Test default returns metadata only."""
-        mock_client = Mock()
-        mock_supabase.return_value = mock_client
-        
-        mock_response = Mock()
-        mock_response.data = [{
-            "docs": [{
-                "id": "doc-1",
-                "title": "Test Doc",
-                "content": {"huge": "content" * 1000},
-                "document_type": "spec",
-                "status": "draft",
-                "version": "1.0",
-                "tags": ["test"],
-                "author": "Test Author"
-            }]
-        }]
-        
-        # Setup mock chain
-        mock_table = Mock()
-        mock_select = Mock()
-        mock_eq = Mock()
-        
-        mock_eq.execute.return_value = mock_response
-        mock_select.eq.return_value = mock_eq
-        mock_table.select.return_value = mock_select
-        mock_client.table.return_value = mock_table
-        
-        service = DocumentService(mock_client)
+        documents = _query([{
+            "id": "doc-1",
+            "project_id": "project-1",
+            "title": "Test Doc",
+            "document_type": "spec",
+            "status": "draft",
+            "version": "1.0",
+            "tags": ["test"],
+            "author": "Test Author",
+            "content_size": 7000,
+        }])
+        client = _client({"archon_project_documents": documents})
+        
+        service = DocumentService(client)
         success, result = service.list_documents("project-1")  # Default include_content=False
         
         assert success
@@ -293,40 +276,29 @@ class TestDocumentServiceOptimization:
         assert "stats" in doc
         assert doc["stats"]["content_size"] > 0
         assert doc["title"] == "Test Doc"
+        assert "content," not in documents.select.call_args.args[0]
     
-    @patch('src.server.utils.get_supabase_client')
-    def test_list_documents_with_content(self, mock_supabase):
+    def test_list_documents_with_content(self):
         """Test include_content=True returns full documents."""
-        mock_client = Mock()
-        mock_supabase.return_value = mock_client
-        
-        mock_response = Mock()
-        mock_response.data = [{
-            "docs": [{
-                "id": "doc-1",
-                "title": "Test Doc",
-                "content": {"huge": "content"},
-                "document_type": "spec"
-            }]
-        }]
-        
-        # Setup mock chain
-        mock_table = Mock()
-        mock_select = Mock()
-        mock_eq = Mock()
-        
-        mock_eq.execute.return_value = mock_response
-        mock_select.eq.return_value = mock_eq
-        mock_table.select.return_value = mock_select
-        mock_client.table.return_value = mock_table
-        
-        service = DocumentService(mock_client)
+        documents = _query([{
+            "id": "doc-1",
+            "project_id": "project-1",
+            "title": "Test Doc",
+            "content": {"huge": "content"},
+            "document_type": "spec",
+            "extra": {"custom": "kept"},
+        }])
+        client = _client({"archon_project_documents": documents})
+        
+        service = DocumentService(client)
         success, result = service.list_documents("project-1", include_content=True)
         
         assert success
         doc = result["documents"][0]
         assert "content" in doc
         assert doc["content"]["huge"] == "content"
+        assert doc["custom"] == "kept"
+        assert "project_id" not in doc
 
 
 class TestBackwardCompatibility: